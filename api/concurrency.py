@@ -0,0 +1,50 @@
+"""Bounded offloading of blocking service calls for the async routers.
+
+The service layer is synchronous (requests, notion_client, stripe) with
+15–30 second timeouts. Routers run on the event loop and push anything that
+may touch an upstream onto worker threads through one shared capacity
+limiter, so slow upstreams can occupy at most API_UPSTREAM_CONCURRENCY
+threads. Requests answered from the in-memory cache never take a token and
+never wait behind them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import weakref
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+import anyio
+import anyio.to_thread
+
+T = TypeVar("T")
+
+UPSTREAM_CONCURRENCY = int(os.getenv("API_UPSTREAM_CONCURRENCY", "8"))
+
+# Primitives are bound to the loop that first waits on them; keep one set per loop
+_limiters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def upstream_limiter() -> anyio.CapacityLimiter:
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = _limiters[loop] = anyio.CapacityLimiter(UPSTREAM_CONCURRENCY)
+    return limiter
+
+
+def single_flight(name: str) -> anyio.Lock:
+    """Named lock so only one request recomputes a shared result at a time."""
+    loop = asyncio.get_running_loop()
+    locks = _locks.setdefault(loop, {})
+    if name not in locks:
+        locks[name] = anyio.Lock()
+    return locks[name]
+
+
+async def run_upstream(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on a worker thread, bounded by the upstream limiter."""
+    return await anyio.to_thread.run_sync(partial(fn, *args, **kwargs), limiter=upstream_limiter())
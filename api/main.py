@@ -17,7 +17,8 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from api.routers import clients, kpis, pipeline, analytics, health  # noqa: E402
+from api.metrics import MetricsMiddleware  # noqa: E402
+from api.routers import clients, dashboard, kpis, pipeline, analytics, health, metrics, stream  # noqa: E402
 
 app = FastAPI(
     title="Creative Hotline API",
@@ -26,18 +27,23 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
 )
 
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count", "X-Next-Cursor"],
 )
 
+app.include_router(dashboard.router, prefix="/api")
 app.include_router(kpis.router, prefix="/api")
 app.include_router(clients.router, prefix="/api")
 app.include_router(pipeline.router, prefix="/api")
 app.include_router(analytics.router, prefix="/api")
 app.include_router(health.router, prefix="/api")
+app.include_router(stream.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 
 @app.get("/api/ping")
@@ -0,0 +1,265 @@
+"""Prometheus metrics for the API, on a small pure-Python registry.
+
+Exposed as text format 0.0.4 by GET /api/metrics:
+
+    api_requests_total{method,route,status}          counter
+    api_request_duration_seconds{method,route}       histogram
+    api_requests_in_flight                           gauge
+    upstream_calls_total{service,method,outcome}     counter
+    upstream_call_duration_seconds{service,method}   histogram
+    api_snapshot_build_seconds                       histogram
+    cache_lookups_total{tier,result}                 counter   (from CacheManager)
+    cache_stale_lookups_total{tier}                  counter   (from CacheManager)
+    cache_hit_ratio{tier}                            gauge     (from CacheManager)
+    cache_load_duration_seconds{tier}                histogram (from CacheManager)
+    cache_bytes                                      gauge     (from CacheManager)
+
+Routes are labelled by their template, not the raw path, so label
+cardinality stays bounded. Upstream calls are the HTTP requests and SDK
+calls the service clients make (app.services.upstream), labelled by
+endpoint in `method`; a service method answered from the cache makes none.
+
+cache_lookups_total has one hit and one miss per lookup, so the two sum to
+the lookups. A stale lookup (an entry past its TTL) is one kind of miss,
+so it is exported on its own counter rather than as a third result.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from app.services import upstream
+from app.services.cache_manager import LATENCY_BUCKETS, cache
+
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=REQUEST_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += 1
+            state[2] += value
+
+    def samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        for key, (counts, count, total) in items:
+            yield from histogram_samples(self.name, dict(zip(self.labelnames, key)), self.buckets, counts, count, total)
+
+
+def histogram_samples(name, labels, buckets, cumulative, count, total):
+    for bound, n in zip(buckets, cumulative):
+        yield f"{name}_bucket", {**labels, "le": _fmt(bound)}, n
+    yield f"{name}_bucket", {**labels, "le": "+Inf"}, count
+    yield f"{name}_count", labels, count
+    yield f"{name}_sum", labels, total
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[tuple[str, str, str, list]]]] = []
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=REQUEST_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def collector(self, fn: Callable[[], Iterable[tuple[str, str, str, list]]]) -> None:
+        """Register fn() -> [(name, kind, help, samples)], evaluated at scrape time."""
+        self._collectors.append(fn)
+
+    def exposition(self) -> str:
+        families = [(m.name, m.kind, m.help, list(m.samples())) for m in self._metrics]
+        for fn in self._collectors:
+            families.extend(fn())
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample, labels, value in samples:
+                lines.append(f"{sample}{_labels(labels)} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+registry = Registry()
+
+REQUESTS = registry.counter("api_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+REQUEST_SECONDS = registry.histogram(
+    "api_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+IN_FLIGHT = registry.gauge("api_requests_in_flight", "HTTP requests currently being handled.")
+UPSTREAM_CALLS = registry.counter(
+    "upstream_calls_total", "Requests made to upstream APIs.", ("service", "method", "outcome"))
+UPSTREAM_SECONDS = registry.histogram(
+    "upstream_call_duration_seconds", "Upstream API request latency.", ("service", "method"), LATENCY_BUCKETS)
+SNAPSHOT_SECONDS = registry.histogram(
+    "api_snapshot_build_seconds", "Analytics snapshot recompute time.", (), LATENCY_BUCKETS)
+
+
+def _cache_families():
+    metrics = cache.metrics()
+    tiers = metrics["tiers"]
+    lookups, stale, ratios, loads = [], [], [], []
+    for tier, m in tiers.items():
+        lookups += [
+            ("cache_lookups_total", {"tier": tier, "result": "hit"}, m["hits"]),
+            ("cache_lookups_total", {"tier": tier, "result": "miss"}, m["misses"]),
+        ]
+        stale.append(("cache_stale_lookups_total", {"tier": tier}, m["stale"]))
+        ratios.append(("cache_hit_ratio", {"tier": tier}, m["hit_ratio"]))
+        # CacheManager buckets are per-interval with a trailing overflow slot
+        per_bucket = m["load_buckets"]
+        cumulative = [sum(per_bucket[:i + 1]) for i in range(len(LATENCY_BUCKETS))]
+        loads += histogram_samples("cache_load_duration_seconds", {"tier": tier}, LATENCY_BUCKETS,
+                                   cumulative, m["loads"], m["load_avg_ms"] * m["loads"] / 1000)
+    return [
+        ("cache_lookups_total", "counter", "Cache lookups by tier and result.", lookups),
+        ("cache_stale_lookups_total", "counter", "Cache misses that found an expired entry.", stale),
+        ("cache_hit_ratio", "gauge", "Cache hit ratio by tier.", ratios),
+        ("cache_load_duration_seconds", "histogram", "Cache loader latency by tier.", loads),
+        ("cache_bytes", "gauge", "Approximate bytes held in memory.", [("cache_bytes", {}, metrics["totals"]["bytes"])]),
+    ]
+
+
+registry.collector(_cache_families)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency and status, and in-flight requests.
+
+    The route is only known after routing, so it is read once the app returns.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            route, method = _route(scope), scope["method"]
+            REQUESTS.inc(method=method, route=route, status=str(status))
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method=method, route=route)
+
+
+def _observe_upstream(service: str, operation: str, outcome: str, seconds: float) -> None:
+    UPSTREAM_CALLS.inc(service=service, method=operation, outcome=outcome)
+    UPSTREAM_SECONDS.observe(seconds, service=service, method=operation)
+
+
+upstream.add_observer(_observe_upstream)
+
+
+def _route(scope) -> str:
+    """Matched route template; unmatched paths share one label.
+
+    Newer FastAPI resolves included routers lazily and leaves the
+    un-prefixed APIRoute in scope["route"]; the prefixed template is on the
+    effective route context.
+    """
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    path = getattr(context, "path_format", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value.is_integer():
+            return str(int(value)) if abs(value) < 1e15 else repr(value)
+        return repr(value)
+    return str(value)
@@ -0,0 +1,134 @@
+"""Response models for the API.
+
+These declare the payload contract in the OpenAPI schema (and mirror the
+types in web/src/lib/api.ts). Routers don't serialize through them: bodies
+are pre-encoded by api.encoding at snapshot build time, and the tests check
+every snapshot section validates against its model.
+"""
+
+from __future__ import annotations
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class KpiSummary(BaseModel):
+    total_revenue: float
+    total_clients: int
+    active_pipeline: int
+    booking_rate: float
+    avg_deal_size: float
+    monthly_revenue: float
+    revenue_trend: float
+    conversion_rate: float
+
+
+class Client(BaseModel):
+    id: str
+    name: str
+    email: str
+    phone: Optional[str] = None
+    status: str
+    product: str
+    amount: float
+    payment_date: Optional[str] = None
+    call_date: Optional[str] = None
+    lead_source: str
+    days_to_convert: Optional[float] = None
+    created: str
+
+
+class ScoredClient(Client):
+    score: float
+    tier: Literal["Hot", "Warm", "Cool", "Cold"]
+    engagement: float
+    recency: float
+    value: float
+    fit: float
+
+
+class RankedLead(ScoredClient):
+    rank: int
+
+
+class SearchResult(Client):
+    relevance: float
+    matched: list[str]
+
+
+class PipelineClient(BaseModel):
+    id: str
+    name: str
+    email: str
+    status: str
+    product: str
+    amount: float
+    lead_source: str
+    created: str
+
+
+class PipelineStageSummary(BaseModel):
+    stage: str
+    count: int
+    value: float
+
+
+class PipelineStage(PipelineStageSummary):
+    clients: list[PipelineClient]
+
+
+class MonthlyRevenue(BaseModel):
+    month: str
+    revenue: float
+
+
+class ChannelMetric(BaseModel):
+    channel: str
+    leads: int
+    conversions: int
+    revenue: float
+    conversion_rate: float
+    avg_deal_size: float
+
+
+class FunnelStage(BaseModel):
+    stage: str
+    count: int
+    conversion_rate: float
+
+
+class LtvData(BaseModel):
+    overall_ltv: float
+    by_source: dict[str, float]
+    by_product: dict[str, float]
+    projected_12mo: float
+
+
+class Dashboard(BaseModel):
+    kpis: KpiSummary
+    pipeline: list[PipelineStageSummary]
+    funnel: list[FunnelStage]
+    channels: list[ChannelMetric]
+    revenue_monthly: list[MonthlyRevenue]
+
+
+class HealthCheck(BaseModel):
+    service: str
+    status: Literal["healthy", "degraded", "down", "not_configured"]
+    latency_ms: Optional[float] = None
+    message: Optional[str] = None
+
+
+# Snapshot section -> model of its payload
+SECTION_MODELS = {
+    "kpis": KpiSummary,
+    "clients": list[Client],
+    "clients_scored": list[ScoredClient],
+    "pipeline": list[PipelineStage],
+    "channels": list[ChannelMetric],
+    "revenue_monthly": list[MonthlyRevenue],
+    "funnel": list[FunnelStage],
+    "ltv": LtvData,
+    "dashboard": Dashboard,
+}
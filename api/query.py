@@ -0,0 +1,234 @@
+"""In-memory client indexes for filtered, sorted, cursor-paginated reads.
+
+A ClientIndex is built once per snapshot section (clients, clients_scored)
+and answers list queries without rescanning or re-serializing every row:
+
+* equality filters (status, lead_source, tier) are posting sets;
+* range filters (score, dates) bisect a sorted column;
+* every sortable field has a precomputed (value, id) order, so a page is a
+  bisect to the cursor plus a walk until `limit` rows match;
+* rows are JSON-encoded once, so an unprojected page is a byte join.
+
+The total count comes from the filter candidates, but `q` is a substring
+scan: it costs one pass over the candidates (every row, with no other
+filter). The BM25 index behind /clients/search is the indexed alternative
+for text.
+
+Cursors are keyset cursors — the (sort value, id) of the last row served,
+plus its position to break ties between duplicate ids — so pages stay stable
+while rows are added or removed between requests. A cursor also names the
+sort it was issued for and is rejected under any other.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from api.encoding import dumps
+
+SORTABLE = {
+    "name", "email", "status", "product", "amount", "payment_date", "call_date",
+    "lead_source", "created", "days_to_convert", "score", "tier",
+}
+NUMERIC = {"amount", "days_to_convert", "score"}
+DATE_FIELDS = ("created", "payment_date", "call_date")
+FILTERABLE = ("status", "lead_source", "tier")
+SEARCHABLE = ("name", "email", "product", "lead_source", "status")
+MAX_LIMIT = 500
+
+
+class QueryError(ValueError):
+    """A malformed filter, sort, field list or cursor."""
+
+
+@dataclass
+class ClientQuery:
+    status: list[str] = field(default_factory=list)
+    lead_source: list[str] = field(default_factory=list)
+    tier: list[str] = field(default_factory=list)
+    min_score: float | None = None
+    max_score: float | None = None
+    date_field: str = "created"
+    date_from: str = ""
+    date_to: str = ""
+    q: str = ""
+    sort: str = ""
+    cursor: str = ""
+    limit: int | None = None
+    fields: list[str] = field(default_factory=list)
+
+    def canonical(self) -> str:
+        """Stable string form, used to derive per-query ETags."""
+        return json.dumps(self.__dict__, sort_keys=True, default=str)
+
+
+@dataclass
+class Page:
+    body: bytes
+    total: int
+    next_cursor: str = ""
+
+
+class ClientIndex:
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.fields = set(rows[0]) if rows else set()
+        self._ids = [str(r.get("id") or "") for r in rows]
+        self._encoded = [dumps(r) for r in rows]
+        self._text = [" ".join(str(r.get(f) or "") for f in SEARCHABLE).lower() for r in rows]
+
+        self._postings: dict[str, dict[str, set[int]]] = {}
+        for name in FILTERABLE:
+            if name in self.fields:
+                postings: dict[str, set[int]] = {}
+                for pos, r in enumerate(rows):
+                    postings.setdefault(_norm(r.get(name)), set()).add(pos)
+                self._postings[name] = postings
+
+        # field -> ascending [(sort key, id, position)]; also the cursor format
+        self._orders: dict[str, list[tuple]] = {}
+        for name in SORTABLE & self.fields:
+            self._orders[name] = sorted(
+                (_sort_key(name, r.get(name)), self._ids[pos], pos) for pos, r in enumerate(rows)
+            )
+
+    def query(self, query: ClientQuery, default_sort: str) -> Page:
+        sort = query.sort or default_sort
+        descending = sort.startswith("-")
+        sort_field = sort.lstrip("-")
+        if sort_field not in self._orders and self.rows:
+            raise QueryError(f"Cannot sort by {sort_field!r}")
+        unknown = [f for f in query.fields if f not in self.fields]
+        if unknown and self.rows:
+            raise QueryError(f"Unknown fields: {', '.join(unknown)}")
+        if query.date_field not in DATE_FIELDS:
+            raise QueryError(f"date_field must be one of {', '.join(DATE_FIELDS)}")
+        if query.limit is not None and not 1 <= query.limit <= MAX_LIMIT:
+            raise QueryError(f"limit must be between 1 and {MAX_LIMIT}")
+        if query.cursor and query.limit is None:
+            raise QueryError("cursor requires limit")
+
+        if not self.rows:
+            return Page(body=b"[]", total=0)
+
+        after = _decode_cursor(query.cursor, sort_field, descending) if query.cursor else None
+        candidates = self._candidates(query)
+        needle = query.q.strip().lower()
+        if needle:
+            text = self._text
+            candidates = {pos for pos in (candidates if candidates is not None else range(len(text)))
+                          if needle in text[pos]}
+        total = len(candidates) if candidates is not None else len(self.rows)
+
+        def matches(pos: int) -> bool:
+            return candidates is None or pos in candidates
+
+        order = self._walk(sort_field, descending, after)
+
+        selected: list[int] = []
+        next_cursor = ""
+        for entry in order:
+            pos = entry[-1]
+            if not matches(pos):
+                continue
+            if query.limit is not None and len(selected) == query.limit:
+                last = selected[-1]
+                key = (_sort_key(sort_field, self.rows[last].get(sort_field)), self._ids[last], last)
+                next_cursor = _encode_cursor(key, sort_field, descending)
+                break
+            selected.append(pos)
+
+        if query.fields:
+            projected = [{f: self.rows[pos].get(f) for f in query.fields} for pos in selected]
+            body = dumps(projected)
+        else:
+            body = b"[" + b",".join(self._encoded[pos] for pos in selected) + b"]"
+        return Page(body=body, total=total, next_cursor=next_cursor)
+
+    def _candidates(self, query: ClientQuery) -> set[int] | None:
+        sets: list[set[int]] = []
+        for name in FILTERABLE:
+            wanted = getattr(query, name)
+            if not wanted:
+                continue
+            postings = self._postings.get(name, {})
+            sets.append(set().union(*(postings.get(_norm(v), set()) for v in wanted)))
+        if query.min_score is not None or query.max_score is not None:
+            sets.append(self._range("score", query.min_score, query.max_score))
+        if query.date_from or query.date_to:
+            # Dates compare as ISO strings; date_to is inclusive of the whole day
+            sets.append(self._range(query.date_field, query.date_from or None,
+                                    (query.date_to + "\uffff") if query.date_to else None, skip_empty=True))
+        if not sets:
+            return None
+        return set.intersection(*sorted(sets, key=len))
+
+    def _range(self, name: str, low: Any, high: Any, skip_empty: bool = False) -> set[int]:
+        order = self._orders.get(name)
+        if order is None:
+            return set()
+        keys = [e[0] for e in order]
+        start = bisect.bisect_left(keys, _sort_key(name, low)) if low is not None else 0
+        end = bisect.bisect_right(keys, _sort_key(name, high)) if high is not None else len(order)
+        return {e[-1] for e in order[start:end] if not (skip_empty and e[0] == "")}
+
+    def _walk(self, sort_field: str, descending: bool, after: tuple | None) -> Iterator[tuple]:
+        """Rows in sort order, starting strictly after the cursor position."""
+        order = self._orders[sort_field]
+        if after is None:
+            return reversed(order) if descending else iter(order)
+        if descending:
+            return reversed(order[:bisect.bisect_left(order, after)])
+        return iter(order[bisect.bisect_right(order, after):])
+
+
+def parse_list(value: str | None) -> list[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+def _norm(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _sort_key(name: str, value: Any) -> Any:
+    if name in NUMERIC:
+        try:
+            return float(value) if value not in (None, "") else float("-inf")
+        except (TypeError, ValueError):
+            raise QueryError(f"{name} must be numeric") from None
+    return str(value or "").lower() if name not in DATE_FIELDS else str(value or "")
+
+
+def _encode_cursor(entry: tuple, sort_field: str, descending: bool) -> str:
+    value, rid, pos = entry
+    if value == float("-inf"):
+        value = None
+    sort = f"-{sort_field}" if descending else sort_field
+    raw = json.dumps([sort, value, rid, pos], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_field: str, descending: bool) -> tuple:
+    """The (sort key, id, position) a cursor resumes after, checked against the sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort, value, rid, pos = json.loads(raw)
+    except (ValueError, TypeError):
+        raise QueryError("Invalid cursor") from None
+    if sort != (f"-{sort_field}" if descending else sort_field):
+        raise QueryError(f"Cursor was issued for sort={sort!r}; restart without it to sort differently")
+    numeric = sort_field in NUMERIC
+    if numeric and value is None:
+        value = float("-inf")
+    # bool is an int subclass, but never a valid position or amount
+    valid = (
+        isinstance(rid, str) and type(pos) is int
+        and (type(value) in (int, float) if numeric else isinstance(value, str))
+    )
+    if not valid:
+        raise QueryError("Invalid cursor")
+    return (float(value) if numeric else value, rid, pos)
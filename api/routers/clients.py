@@ -2,52 +2,81 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, Request
 
-from app.utils.demo_data import DEMO_PAYMENTS
-from app.utils.lead_scorer import score_all_clients
+from api.models import Client, RankedLead, ScoredClient, SearchResult
+from api.query import MAX_LIMIT, ClientQuery, parse_list
+from api.snapshot import next_leads_response, query_response, search_response, snapshot_response
 
 router = APIRouter()
 
+# Parameters that turn a full-list read into an indexed query
+QUERY_PARAMS = {
+    "status", "lead_source", "tier", "min_score", "max_score", "date_field",
+    "date_from", "date_to", "q", "sort", "cursor", "limit", "fields",
+}
 
-def _to_client(p: dict) -> dict:
-    return {
-        "id": p.get("stripe_session_id", p.get("email", "")),
-        "name": p.get("client_name", "Unknown"),
-        "email": p.get("email", ""),
-        "phone": p.get("phone", ""),
-        "status": p.get("status", ""),
-        "product": p.get("product_purchased", ""),
-        "amount": p.get("payment_amount", 0),
-        "payment_date": p.get("payment_date", ""),
-        "call_date": p.get("call_date", ""),
-        "lead_source": p.get("lead_source", ""),
-        "days_to_convert": p.get("days_to_convert"),
-        "created": p.get("created", ""),
-    }
-
-
-@router.get("/clients")
-def get_clients():
-    return [_to_client(p) for p in DEMO_PAYMENTS]
-
-
-@router.get("/clients/scored")
-def get_scored_clients():
-    merged = [{"payment": p} for p in DEMO_PAYMENTS]
-    scored = score_all_clients(merged)
-    results = []
-    for item in scored:
-        client = _to_client(item.get("payment", {}))
-        score = item.get("score", {})
-        tier = score.get("tier", "Cold")
-        client.update({
-            "score": score.get("total", 0),
-            "tier": tier,
-            "engagement": score.get("engagement", 0),
-            "recency": score.get("recency", 0),
-            "value": score.get("value", 0),
-            "fit": score.get("fit", 0),
-        })
-        results.append(client)
-    return results
+
+def client_query(
+    status: str | None = Query(None, description="Comma-separated statuses"),
+    lead_source: str | None = Query(None, description="Comma-separated lead sources"),
+    tier: str | None = Query(None, description="Comma-separated tiers (scored clients)"),
+    min_score: float | None = None,
+    max_score: float | None = None,
+    date_field: str = Query("created", description="created, payment_date or call_date"),
+    date_from: str = Query("", description="Inclusive ISO date"),
+    date_to: str = Query("", description="Inclusive ISO date"),
+    q: str = Query("", description="Case-insensitive text search"),
+    sort: str = Query("", description="Field to sort by; prefix with - for descending"),
+    cursor: str = Query("", description="X-Next-Cursor from the previous page"),
+    limit: int | None = Query(None, description="Page size (1-500); omit for all rows"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
+) -> ClientQuery:
+    return ClientQuery(
+        status=parse_list(status),
+        lead_source=parse_list(lead_source),
+        tier=parse_list(tier),
+        min_score=min_score,
+        max_score=max_score,
+        date_field=date_field,
+        date_from=date_from,
+        date_to=date_to,
+        q=q,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        fields=parse_list(fields),
+    )
+
+
+@router.get("/clients", response_model=list[Client])
+async def get_clients(request: Request, query: ClientQuery = Depends(client_query)):
+    if not QUERY_PARAMS & request.query_params.keys():
+        return await snapshot_response(request, "clients")
+    return await query_response(request, "clients", query, default_sort="-created")
+
+
+@router.get("/clients/search", response_model=list[SearchResult])
+async def search_clients(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Words to find in client names and intake text"),
+    limit: int = Query(20, ge=1, le=MAX_LIMIT, description="How many clients to return"),
+    match_all: bool = Query(False, alias="all", description="Only clients matching every word"),
+):
+    return await search_response(request, q, limit, match_all)
+
+
+@router.get("/clients/scored", response_model=list[ScoredClient])
+async def get_scored_clients(request: Request, query: ClientQuery = Depends(client_query)):
+    if not QUERY_PARAMS & request.query_params.keys():
+        return await snapshot_response(request, "clients_scored")
+    return await query_response(request, "clients_scored", query, default_sort="-score")
+
+
+@router.get("/leads/next", response_model=list[RankedLead])
+async def get_next_leads(
+    request: Request,
+    limit: int = Query(10, ge=1, le=MAX_LIMIT, description="How many leads to return"),
+    tier: str | None = Query(None, description="Comma-separated tiers"),
+):
+    return await next_leads_response(request, limit, parse_list(tier))
@@ -0,0 +1,16 @@
+"""Combined dashboard endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Request
+
+from api.models import Dashboard
+from api.snapshot import snapshot_response
+
+router = APIRouter()
+
+
+@router.get("/dashboard", response_model=Dashboard)
+async def get_dashboard(request: Request):
+    """KPIs, pipeline stage totals, funnel, channels and monthly revenue in one payload."""
+    return await snapshot_response(request, "dashboard")
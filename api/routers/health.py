@@ -2,20 +2,58 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter
+import anyio
+from fastapi import APIRouter, Request
+
+from api.concurrency import run_upstream, single_flight
+from api.models import HealthCheck
+from api.services import get_services
+from api.snapshot import encode, etag_response
+from app.services.cache_manager import cache
 
 router = APIRouter()
 
+HEALTH_KEY = "api_health"
+
+
+@router.get("/health", response_model=list[HealthCheck])
+async def get_health(request: Request):
+    # Live checks hit every upstream, so results are shared for the hot TTL
+    cached = cache.get(HEALTH_KEY)
+    if cached is None:
+        async with single_flight(HEALTH_KEY):
+            cached = cache.get(HEALTH_KEY)
+            if cached is None:
+                cached = encode(await _check_all())
+                cache.set(HEALTH_KEY, cached, tier="hot")
+    body, etag = cached
+    return etag_response(request, body, etag)
+
+
+@router.get("/cache/metrics")
+async def get_cache_metrics():
+    return {"stats": cache.stats(), **cache.metrics()}
+
+
+async def _check_all() -> list[dict]:
+    """Check every configured service concurrently on the upstream executor."""
+    services = get_services()
+    targets = services.health_targets()
+    results: dict[str, dict] = {}
+
+    async def check(name: str, svc) -> None:
+        status = await run_upstream(services.health.check_service, name, svc.is_healthy)
+        results[name] = {
+            "service": name,
+            "status": "healthy" if status.healthy else "down",
+            "latency_ms": status.latency_ms,
+            "message": "Connected" if status.healthy else (status.error or "Unreachable"),
+        }
 
-@router.get("/health")
-def get_health():
-    # In demo mode, return simulated health data
-    return [
-        {"service": "Notion", "status": "healthy", "latency_ms": 245, "message": "Connected"},
-        {"service": "Stripe", "status": "healthy", "latency_ms": 180, "message": "Connected"},
-        {"service": "Calendly", "status": "healthy", "latency_ms": 310, "message": "Connected"},
-        {"service": "Claude AI", "status": "healthy", "latency_ms": 520, "message": "claude-sonnet-4-5-20250929"},
-        {"service": "n8n", "status": "healthy", "latency_ms": 150, "message": "5 workflows active"},
-        {"service": "ManyChat", "status": "not_configured", "message": "API key not set"},
-        {"service": "Fireflies", "status": "not_configured", "message": "API key not set"},
-    ]
+    async with anyio.create_task_group() as tg:
+        for name, svc in targets.items():
+            if svc is None:
+                results[name] = {"service": name, "status": "not_configured", "message": "API key not set"}
+            else:
+                tg.start_soon(check, name, svc)
+    return [results[name] for name in targets]
@@ -2,44 +2,36 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, Request
 
-from app.utils.demo_data import DEMO_PAYMENTS
+from api.models import PipelineStage
+from api.query import parse_list
+from api.snapshot import derived_etag, encode, etag_response, get_snapshot_async, snapshot_response
 
 router = APIRouter()
 
-PIPELINE_ORDER = [
-    "Lead - Laylo",
-    "Paid - Needs Booking",
-    "Booked - Needs Intake",
-    "Intake Complete",
-    "Ready for Call",
-    "Call Complete",
-    "Follow-Up Sent",
-]
-
-
-@router.get("/pipeline")
-def get_pipeline():
-    result = []
-    for stage in PIPELINE_ORDER:
-        clients = [p for p in DEMO_PAYMENTS if p.get("status") == stage]
-        result.append({
-            "stage": stage,
-            "count": len(clients),
-            "value": sum(p.get("payment_amount", 0) for p in clients),
-            "clients": [
-                {
-                    "id": p.get("stripe_session_id", p.get("email", "")),
-                    "name": p.get("client_name", "Unknown"),
-                    "email": p.get("email", ""),
-                    "status": stage,
-                    "product": p.get("product_purchased", ""),
-                    "amount": p.get("payment_amount", 0),
-                    "lead_source": p.get("lead_source", ""),
-                    "created": p.get("created", ""),
-                }
-                for p in clients
-            ],
-        })
-    return result
+
+@router.get("/pipeline", response_model=list[PipelineStage])
+async def get_pipeline(
+    request: Request,
+    clients_limit: int | None = Query(None, ge=0, description="Clients embedded per stage; page the rest via /clients?status="),
+    fields: str | None = Query(None, description="Comma-separated client fields to embed"),
+):
+    if clients_limit is None and not fields:
+        return await snapshot_response(request, "pipeline")
+
+    snap = await get_snapshot_async()
+    selected = parse_list(fields)
+    etag = derived_etag(snap.etags["pipeline"], f"{clients_limit}|{','.join(selected)}")
+
+    stages = []
+    for stage in snap.data["pipeline"]:
+        clients = stage["clients"][:clients_limit] if clients_limit is not None else stage["clients"]
+        if selected:
+            unknown = [f for f in selected if clients and f not in clients[0]]
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+            clients = [{f: c.get(f) for f in selected} for c in clients]
+        stages.append({**stage, "clients": clients})
+    body, _ = encode(stages)
+    return etag_response(request, body, etag)
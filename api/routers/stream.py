@@ -0,0 +1,24 @@
+"""Server-Sent Events stream of pipeline changes."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+
+from api.stream import event_stream
+
+router = APIRouter()
+
+
+@router.get("/stream")
+async def get_stream(request: Request, last_event_id: str | None = Header(None)):
+    """client.upserted / client.stage_changed / client.removed / kpi.delta events.
+
+    Reconnecting EventSources send Last-Event-ID and resume where they left
+    off; an unresumable id gets one "resync" event instead.
+    """
+    return StreamingResponse(
+        event_stream(request, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,117 @@
+"""Service clients for the API process.
+
+Mirrors init_services() in app/main.py without Streamlit session state: real
+clients when their keys are configured, the demo service layer when no keys
+are set at all (or API_DEMO_MODE=1). Built once per process and shared by
+every request.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from app.config import load_settings
+from app.services.health_checker import HealthChecker
+
+
+@dataclass
+class Services:
+    notion: Any
+    stripe: Any
+    calendly: Any
+    manychat: Any
+    claude: Any
+    fireflies: Any
+    n8n: Any
+    health: HealthChecker
+    demo_mode: bool = False
+
+    def health_targets(self) -> dict[str, Any]:
+        """Service name → client (None when not configured), in display order."""
+        return {
+            "Notion": self.notion,
+            "Stripe": self.stripe,
+            "Calendly": self.calendly,
+            "Claude AI": self.claude,
+            "n8n": self.n8n,
+            "ManyChat": self.manychat,
+            "Fireflies": self.fireflies,
+        }
+
+
+def _demo_services() -> Services:
+    from app.services.demo_service import (
+        DemoCalendlyService,
+        DemoClaudeService,
+        DemoFirefliesService,
+        DemoN8nService,
+        DemoNotionService,
+        DemoStripeService,
+    )
+
+    return Services(
+        notion=DemoNotionService(),
+        stripe=DemoStripeService(),
+        calendly=DemoCalendlyService(),
+        manychat=None,
+        claude=DemoClaudeService(),
+        fireflies=DemoFirefliesService(),
+        n8n=DemoN8nService(),
+        health=HealthChecker(),
+        demo_mode=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_services() -> Services:
+    """Process-wide service clients (demo layer when no API keys are set)."""
+    return _build_services()
+
+
+def _build_services() -> Services:
+    settings = load_settings()
+    if os.getenv("API_DEMO_MODE", "") == "1" or not any([settings.NOTION_API_KEY, settings.STRIPE_SECRET_KEY,
+                settings.CALENDLY_API_KEY, settings.ANTHROPIC_API_KEY]):
+        return _demo_services()
+
+    from app.services.calendly_client import CalendlyService
+    from app.services.claude_client import ClaudeService
+    from app.services.fireflies_client import FirefliesService
+    from app.services.local_store import LocalStore
+    from app.services.manychat_client import ManyChatService
+    from app.services.n8n_client import N8nService
+    from app.services.notion_client import NotionService
+    from app.services.stripe_client import StripeService
+
+    store = LocalStore()
+    return Services(
+        notion=(
+            NotionService(settings.NOTION_API_KEY, settings.NOTION_PAYMENTS_DB, settings.NOTION_INTAKE_DB)
+            if settings.NOTION_API_KEY else None
+        ),
+        stripe=(
+            StripeService(settings.STRIPE_SECRET_KEY, settings.STRIPE_WEBHOOK_SECRET, store)
+            if settings.STRIPE_SECRET_KEY else None
+        ),
+        calendly=(
+            CalendlyService(
+                settings.CALENDLY_API_KEY, settings.CALENDLY_ORG_URI, settings.CALENDLY_EVENT_TYPE_URI,
+                settings.CALENDLY_WEBHOOK_SECRET, store,
+            )
+            if settings.CALENDLY_API_KEY else None
+        ),
+        manychat=(
+            ManyChatService(settings.MANYCHAT_API_KEY, settings.MANYCHAT_WEBHOOK_SECRET, store)
+            if settings.MANYCHAT_API_KEY else None
+        ),
+        claude=(
+            ClaudeService(settings.ANTHROPIC_API_KEY, settings.ANTHROPIC_MODEL)
+            if settings.ANTHROPIC_API_KEY else None
+        ),
+        fireflies=FirefliesService(settings.FIREFLIES_API_KEY) if settings.FIREFLIES_API_KEY else None,
+        n8n=N8nService(settings.N8N_BASE_URL, settings.N8N_API_KEY) if settings.N8N_API_KEY else None,
+        health=HealthChecker(),
+    )
@@ -0,0 +1,455 @@
+"""Precomputed analytics snapshot served by the API routers.
+
+Every router payload (KPIs, clients, scores, pipeline, channels, revenue,
+funnel, LTV) is built in one pass over the Notion data and cached as a
+derived entry that depends on the payments/intakes keys. Requests between
+data changes are served the pre-encoded JSON body; a webhook, refresh or TTL
+refetch of the source data drops the snapshot and the next request rebuilds
+it once.
+
+Routers are async: a request whose snapshot and sources are still fresh is
+answered straight from memory on the event loop. Anything that may block is
+offloaded to the bounded upstream executor: a rebuild (which may refetch
+from Notion) and, at most once a second, applying the webhook journal (an
+upsert may fetch the changed page).
+
+Each section carries an ETag (content hash), so clients revalidating with
+If-None-Match get a 304 whenever their section didn't change — even if the
+snapshot was rebuilt.
+
+The client lists also get a ClientIndex (api/query.py) at build time, so
+filtered, sorted and paginated reads never rescan or re-encode the full list.
+The "who to call next" list reads the LeadRanking kept by
+app.services.derived, which only moves the clients whose score changed;
+client search reads its SearchIndex, which only re-indexes the clients
+whose text changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException, Request, Response
+
+from api.concurrency import run_upstream
+from api.encoding import MIN_COMPRESS_BYTES, compress, dumps, negotiate
+from api.metrics import SNAPSHOT_SECONDS
+from api.query import ClientIndex, ClientQuery, QueryError
+from api.services import get_services
+from app.services.cache_manager import cache
+from app.services.derived import (
+    CLIENT_SOURCES,
+    attribution_comparison,
+    client_frame,
+    derived_key,
+    lead_ranking,
+    scored_clients,
+    search_index,
+)
+from app.utils.attribution import attribute_conversions
+from app.utils.client_frame import ClientFrame
+from app.utils.lead_ranking import LeadRanking, client_key
+from app.utils.lead_scorer import TIERS, score_all_clients
+from app.utils.ltv_calculator import calculate_ltv, ltv_by_entry_product, ltv_by_source
+from app.utils.search_index import SearchIndex
+
+PIPELINE_ORDER = [
+    "Lead - Laylo",
+    "Paid - Needs Booking",
+    "Booked - Needs Intake",
+    "Intake Complete",
+    "Ready for Call",
+    "Call Complete",
+    "Follow-Up Sent",
+]
+
+ACTIVE_STATUSES = {
+    "Paid - Needs Booking",
+    "Booked - Needs Intake",
+    "Intake Complete",
+    "Ready for Call",
+}
+
+FUNNEL_STAGES = ["Leads", "Paid", "Booked", "Intake Done", "Call Complete", "Follow-Up Sent"]
+
+# Status → the status-driven funnel stages it has reached
+STATUS_FUNNEL = {
+    "Intake Complete": ("Intake Done",),
+    "Ready for Call": ("Intake Done",),
+    "Call Complete": ("Intake Done", "Call Complete"),
+    "Follow-Up Sent": ("Intake Done", "Call Complete", "Follow-Up Sent"),
+}
+
+PIPELINE_CLIENT_FIELDS = ("id", "name", "email", "status", "product", "amount", "lead_source", "created")
+
+# Sections served together by /api/dashboard
+DASHBOARD_SECTIONS = ("kpis", "pipeline", "funnel", "channels", "revenue_monthly")
+
+# One rebuild at a time; concurrent requests wait for it instead of repeating it
+_build_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    computed_at: float
+    data: dict[str, Any]
+    bodies: dict[str, bytes]
+    etags: dict[str, str]
+    indexes: dict[str, ClientIndex] = field(default_factory=dict)
+    ranking: LeadRanking | None = None
+    search: SearchIndex | None = None
+    # section -> content-coding -> compressed body, filled on first request
+    compressed: dict[str, dict[str, bytes]] = field(default_factory=dict)
+
+
+def get_snapshot() -> Snapshot:
+    """Current snapshot, rebuilt only after the source data changed (blocking)."""
+    notion = get_services().notion
+    if notion is not None:
+        # Refetch expired sources first so a change drops the stale snapshot
+        notion.get_all_payments()
+        notion.get_all_intakes()
+    key = derived_key(notion, "api_snapshot")
+    with _build_lock:
+        return cache.get_or_compute(key, lambda: _compute(notion), depends_on=CLIENT_SOURCES)
+
+
+async def get_snapshot_async() -> Snapshot:
+    """get_snapshot() that never blocks the event loop.
+
+    Pending webhook events are applied on the upstream executor first. The
+    cached snapshot is then returned inline while none of its sources is due
+    for a refetch; otherwise the refresh runs on the upstream executor too.
+    """
+    if cache.events_due():
+        await run_upstream(cache.poll_events)
+    if not any(cache.is_expired(k) for k in CLIENT_SOURCES):
+        snap = cache.peek(derived_key(get_services().notion, "api_snapshot"))
+        if snap is not None:
+            return snap
+    return await run_upstream(get_snapshot)
+
+
+async def snapshot_response(request: Request, section: str) -> Response:
+    """Serve one snapshot section, honouring If-None-Match."""
+    snap = await get_snapshot_async()
+    variants = snap.compressed.setdefault(section, {})
+    return etag_response(request, snap.bodies[section], snap.etags[section], variants=variants)
+
+
+async def query_response(request: Request, section: str, query: ClientQuery, default_sort: str) -> Response:
+    """Serve a filtered/sorted/paginated slice of a client list section.
+
+    The ETag is derived from the section ETag and the query, so a
+    revalidation is answered with 304 without running the query.
+    """
+    snap = await get_snapshot_async()
+    etag = derived_etag(snap.etags[section], query.canonical())
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return etag_response(request, b"", etag)
+    try:
+        page = snap.indexes[section].query(query, default_sort)
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from None
+    headers = {"X-Total-Count": str(page.total)}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return etag_response(request, page.body, etag, headers)
+
+
+async def next_leads_response(request: Request, limit: int, tiers: list[str]) -> Response:
+    """The top `limit` scored clients, optionally of some tiers, with their overall rank."""
+    unknown = [t for t in tiers if t not in TIERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown tiers: {', '.join(unknown)}")
+    snap = await get_snapshot_async()
+    etag = derived_etag(snap.etags["clients_scored"], f"next|{limit}|{','.join(tiers)}")
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return etag_response(request, b"", etag)
+    ranking = snap.ranking
+    rows = [
+        {**_to_scored(item), "rank": ranking.rank(client_key(item["payment"]))}
+        for item in ranking.top(limit, tiers or None)
+    ]
+    return etag_response(request, dumps(rows), etag)
+
+
+async def search_response(request: Request, q: str, limit: int, match_all: bool) -> Response:
+    """Clients whose name or intake text match q, best BM25 match first.
+
+    The search runs on the upstream executor: it waits on the index lock,
+    which a re-sync holds while it re-indexes changed clients.
+    """
+    snap = await get_snapshot_async()
+    # Rows carry the payment fields too, so the clients ETag is part of the validator
+    etag = derived_etag(f'{snap.etags["clients"]}|{snap.search.digest}', f"search|{q}|{limit}|{match_all}")
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return etag_response(request, b"", etag)
+    hits, total = await run_upstream(snap.search.search_page, q, limit, match_all)
+    rows = [
+        {**to_client(hit.item.get("payment", {})), "relevance": round(hit.score, 4), "matched": list(hit.matched)}
+        for hit in hits
+    ]
+    return etag_response(request, dumps(rows), etag, {"X-Total-Count": str(total)})
+
+
+def etag_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    headers: dict[str, str] | None = None,
+    variants: dict[str, bytes] | None = None,
+) -> Response:
+    """JSON response with ETag revalidation and negotiated compression.
+
+    `variants` memoizes compressed bodies across requests for the same body.
+    """
+    encoding = negotiate(request.headers.get("accept-encoding")) if len(body) >= MIN_COMPRESS_BYTES else ""
+    # A compressed representation isn't byte-identical, so its validator is weak
+    headers = {
+        "ETag": f"W/{etag}" if encoding else etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        **(headers or {}),
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        cached = variants.get(encoding) if variants is not None else None
+        if cached is None:
+            cached = compress(body, encoding)
+            if variants is not None:
+                variants[encoding] = cached
+        body = cached
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def derived_etag(etag: str, variant: str) -> str:
+    """ETag for a view of a section (same content + same parameters)."""
+    return f'"{hashlib.sha1(f"{etag}|{variant}".encode()).hexdigest()[:20]}"'
+
+
+def encode(payload: Any) -> tuple[bytes, str]:
+    """JSON body and its strong ETag."""
+    body = dumps(payload)
+    return body, f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def build_snapshot(
+    payments: list[dict],
+    merged: list[dict],
+    scored: list[dict] | None = None,
+    channel_metrics: dict | None = None,
+    now: datetime | None = None,
+    frame: ClientFrame | None = None,
+    ranking: LeadRanking | None = None,
+    search: SearchIndex | None = None,
+) -> Snapshot:
+    """Build every API section from the source data in one pass.
+
+    With a ClientFrame of the same clients, LTV is computed from its columns;
+    ranking is the maintained LeadRanking of scored and search the
+    SearchIndex of merged (each built here if omitted). The snapshot keeps a
+    copy of the ranking, so its leads stay those its clients_scored ETag
+    describes while the shared ranking moves on.
+    """
+    now = now or datetime.now()
+    if scored is None:
+        scored = score_all_clients(merged)
+    if channel_metrics is None:
+        channel_metrics = attribute_conversions(payments)
+
+    agg = _aggregate(payments, now)
+    data = {
+        "kpis": agg["kpis"],
+        "clients": agg["clients"],
+        "clients_scored": [_to_scored(item) for item in scored],
+        "pipeline": agg["pipeline"],
+        "channels": _channels(channel_metrics),
+        "revenue_monthly": agg["revenue_monthly"],
+        "funnel": agg["funnel"],
+        "ltv": _ltv(frame if frame is not None else agg["paid"]),
+    }
+    bodies, etags = {}, {}
+    for name, payload in data.items():
+        bodies[name], etags[name] = encode(payload)
+    # The dashboard splices the already-encoded sections instead of re-encoding them
+    stages = [{k: v for k, v in stage.items() if k != "clients"} for stage in data["pipeline"]]
+    parts = {name: bodies[name] for name in DASHBOARD_SECTIONS}
+    parts["pipeline"] = encode(stages)[0]
+    data["dashboard"] = {name: data[name] for name in DASHBOARD_SECTIONS} | {"pipeline": stages}
+    bodies["dashboard"] = b"{" + b",".join(b'"%s":%s' % (name.encode(), body) for name, body in parts.items()) + b"}"
+    etags["dashboard"] = derived_etag("|".join(etags[name] for name in DASHBOARD_SECTIONS), "dashboard")
+    indexes = {name: ClientIndex(data[name]) for name in ("clients", "clients_scored")}
+    ranking = LeadRanking(scored) if ranking is None else ranking.copy()
+    if search is None:
+        search = SearchIndex(merged)
+    return Snapshot(computed_at=time.time(), data=data, bodies=bodies, etags=etags, indexes=indexes,
+                    ranking=ranking, search=search)
+
+
+def to_client(p: dict) -> dict:
+    return {
+        "id": p.get("stripe_session_id") or p.get("email", ""),
+        "name": p.get("client_name") or "Unknown",
+        "email": p.get("email", ""),
+        "phone": p.get("phone", ""),
+        "status": p.get("status", ""),
+        "product": p.get("product_purchased", ""),
+        "amount": p.get("payment_amount") or 0,
+        "payment_date": p.get("payment_date", ""),
+        "call_date": p.get("call_date", ""),
+        "lead_source": p.get("lead_source", ""),
+        "days_to_convert": p.get("days_to_convert"),
+        "created": p.get("created", ""),
+    }
+
+
+def _compute(notion) -> Snapshot:
+    start = time.perf_counter()
+    if notion is None:
+        snap = build_snapshot([], [])
+    else:
+        snap = build_snapshot(
+            notion.get_all_payments(),
+            notion.get_merged_clients(),
+            scored=scored_clients(notion),
+            channel_metrics=attribution_comparison(notion).get("linear"),
+            frame=client_frame(notion),
+            ranking=lead_ranking(notion),
+            search=search_index(notion),
+        )
+    SNAPSHOT_SECONDS.observe(time.perf_counter() - start)
+    return snap
+
+
+def _to_scored(item: dict) -> dict:
+    client = to_client(item.get("payment", {}))
+    score = item.get("score", {})
+    client.update({
+        "score": score.get("total", 0),
+        "tier": score.get("tier", "Cold"),
+        # The web client's four bars, mapped onto the scorer's categories
+        "engagement": _category(score, "engagement"),
+        "recency": _category(score, "velocity"),
+        "value": _category(score, "upsell"),
+        "fit": _category(score, "source"),
+    })
+    return client
+
+
+def _category(score: dict, name: str) -> int:
+    part = score.get(name, 0)
+    return part.get("score", 0) if isinstance(part, dict) else part
+
+
+def _aggregate(payments: list[dict], now: datetime) -> dict:
+    """KPIs, clients, pipeline, funnel and monthly revenue in one pass."""
+    recent_start = (now - timedelta(days=30)).strftime("%Y-%m-%d")
+    prior_start = (now - timedelta(days=60)).strftime("%Y-%m-%d")
+    stages = {stage: {"stage": stage, "count": 0, "value": 0, "clients": []} for stage in PIPELINE_ORDER}
+    funnel = dict.fromkeys(FUNNEL_STAGES, 0)
+    monthly: dict[str, float] = {}
+    clients, paid = [], []
+    total_revenue = booked_paid = active = recent = prior = 0
+
+    for p in payments:
+        client = to_client(p)
+        clients.append(client)
+        amount = client["amount"]
+        status = p.get("status")
+        date = p.get("payment_date") or ""
+        has_call = bool(p.get("call_date"))
+
+        if amount > 0:
+            paid.append(p)
+            total_revenue += amount
+            booked_paid += has_call
+            if date >= recent_start:
+                recent += amount
+            elif date >= prior_start:
+                prior += amount
+        if status in ACTIVE_STATUSES:
+            active += 1
+        if date:
+            monthly[date[:7]] = monthly.get(date[:7], 0) + amount
+
+        stage = stages.get(status)
+        if stage is not None:
+            stage["count"] += 1
+            stage["value"] += amount
+            stage["clients"].append({k: client[k] for k in PIPELINE_CLIENT_FIELDS})
+
+        funnel["Leads"] += 1
+        funnel["Paid"] += amount > 0
+        funnel["Booked"] += has_call
+        for name in STATUS_FUNNEL.get(status, ()):
+            funnel[name] += 1
+
+    n_paid = len(paid)
+    kpis = {
+        "total_revenue": total_revenue,
+        "total_clients": len(payments),
+        "active_pipeline": active,
+        "booking_rate": round(booked_paid / n_paid, 3) if n_paid else 0,
+        "avg_deal_size": round(total_revenue / n_paid, 2) if n_paid else 0,
+        "monthly_revenue": recent,
+        "revenue_trend": round((recent - prior) / prior, 3) if prior else 0,
+        "conversion_rate": round(n_paid / len(payments), 3) if payments else 0,
+    }
+
+    funnel_rows, prev = [], None
+    for name, count in funnel.items():
+        prev = count if prev is None else prev
+        funnel_rows.append({"stage": name, "count": count, "conversion_rate": round(count / prev, 3) if prev > 0 else 0})
+        prev = count
+
+    return {
+        "kpis": kpis,
+        "clients": clients,
+        "paid": paid,
+        "pipeline": list(stages.values()),
+        "funnel": funnel_rows,
+        "revenue_monthly": [{"month": m, "revenue": r} for m, r in sorted(monthly.items())],
+    }
+
+
+def _channels(metrics: dict) -> list[dict]:
+    return [
+        {
+            "channel": m.channel,
+            "leads": m.lead_count,
+            "conversions": m.paid_count,
+            "revenue": round(m.revenue, 2),
+            "conversion_rate": round(m.conversion_rate / 100, 3),
+            "avg_deal_size": round(m.avg_deal_size, 2),
+        }
+        for m in sorted(metrics.values(), key=lambda m: m.revenue, reverse=True)
+    ]
+
+
+def _ltv(paid: list[dict] | ClientFrame) -> dict:
+    clients = calculate_ltv(paid)
+    if not clients:
+        return {"overall_ltv": 0, "by_source": {}, "by_product": {}, "projected_12mo": 0}
+    return {
+        "overall_ltv": round(sum(c.total_revenue for c in clients) / len(clients), 2),
+        "by_source": {k: round(v["avg_ltv"], 2) for k, v in ltv_by_source(paid).items()},
+        "by_product": {k: round(v["avg_ltv"], 2) for k, v in ltv_by_entry_product(paid).items()},
+        "projected_12mo": round(sum(c.projected_ltv for c in clients) / len(clients), 2),
+    }
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
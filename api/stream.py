@@ -0,0 +1,188 @@
+"""Change feed behind the /api/stream Server-Sent Events endpoint.
+
+Webhook events reach the API through the event journal: the cache tails it
+on access and drops (or upserts) the affected source entries, which drops
+the analytics snapshot. While at least one stream client is connected, a
+producer task re-reads the snapshot every STREAM_POLL_SECONDS; whenever a
+new snapshot appears it is diffed against the previous one and the result
+is published as typed change events:
+
+    client.upserted       {"client": {...}}                  new or changed client
+    client.stage_changed  {"id", "name", "from", "to"}       pipeline status moved
+    client.removed        {"id"}
+    kpi.delta             {"changes": {kpi: {"old", "new", "delta"}}}
+
+Events carry ids of the form "<boot>-<n>" and are kept in a bounded ring
+buffer, so a reconnecting EventSource resumes from Last-Event-ID. An id from
+another process lifetime, or one already evicted from the buffer, gets a
+single "resync" event telling the client to refetch over REST.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+import anyio
+
+from api.encoding import dumps
+from api.snapshot import get_snapshot_async
+
+logger = logging.getLogger(__name__)
+
+STREAM_POLL_SECONDS = float(os.getenv("API_STREAM_POLL_SECONDS", "1"))
+HEARTBEAT_SECONDS = 15
+BUFFER_SIZE = 1000
+RETRY_MS = 3000
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    id: str
+    type: str
+    data: dict
+
+    def encode(self) -> bytes:
+        return b"id: %s\nevent: %s\ndata: %s\n\n" % (self.id.encode(), self.type.encode(), dumps(self.data))
+
+
+class ChangeFeed:
+    """Diffs successive snapshots into a replayable buffer of change events."""
+
+    def __init__(self, buffer_size: int = BUFFER_SIZE):
+        self.boot = format(int(time.time() * 1000), "x")
+        self._seq = 0
+        self._events: deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self._snapshot: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> str:
+        return f"{self.boot}-{self._seq}"
+
+    def observe(self, snap) -> list[ChangeEvent]:
+        """Record a snapshot; publish and return what changed since the last one."""
+        with self._lock:
+            previous, self._snapshot = self._snapshot, snap
+            if previous is None or previous is snap:
+                return []
+            published = []
+            for event_type, data in diff_snapshots(previous.data, snap.data):
+                self._seq += 1
+                event = ChangeEvent(f"{self.boot}-{self._seq}", event_type, data)
+                self._events.append(event)
+                published.append(event)
+            return published
+
+    def since(self, last_event_id: str) -> list[ChangeEvent] | None:
+        """Events after last_event_id, or None if it can't be resumed from."""
+        boot, _, seq = last_event_id.rpartition("-")
+        if boot != self.boot or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        after = int(seq)
+        with self._lock:
+            events = list(self._events)
+        if after < self._seq and (not events or _seq_of(events[0]) > after + 1):
+            return None  # part of the gap was evicted
+        return [e for e in events if _seq_of(e) > after]
+
+
+def diff_snapshots(old: dict, new: dict) -> list[tuple[str, dict]]:
+    changes: list[tuple[str, dict]] = []
+    before = {c["id"]: c for c in old.get("clients", [])}
+    after = {c["id"]: c for c in new.get("clients", [])}
+    for cid, client in after.items():
+        prior = before.get(cid)
+        if prior == client:
+            continue
+        changes.append(("client.upserted", {"client": client}))
+        if prior is not None and prior.get("status") != client.get("status"):
+            changes.append(("client.stage_changed", {
+                "id": cid, "name": client.get("name"), "from": prior.get("status"), "to": client.get("status"),
+            }))
+    for cid in before.keys() - after.keys():
+        changes.append(("client.removed", {"id": cid}))
+
+    old_kpis, new_kpis = old.get("kpis", {}), new.get("kpis", {})
+    deltas = {
+        k: {"old": old_kpis.get(k), "new": v, "delta": round(v - (old_kpis.get(k) or 0), 3)}
+        for k, v in new_kpis.items() if old_kpis.get(k) != v
+    }
+    if deltas:
+        changes.append(("kpi.delta", {"changes": deltas}))
+    return changes
+
+
+feed = ChangeFeed()
+
+
+class _Producer:
+    """Per-event-loop poller; runs only while stream clients are connected."""
+
+    def __init__(self):
+        self.subscribers = 0
+        self.changed = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    async def run(self) -> None:
+        while self.subscribers:
+            try:
+                published = feed.observe(await get_snapshot_async())
+            except Exception as e:
+                logger.error(f"Change feed snapshot refresh failed: {e}")
+                published = []
+            if published:
+                self.changed.set()
+                self.changed = asyncio.Event()
+            await anyio.sleep(STREAM_POLL_SECONDS)
+        self.task = None
+
+
+_producers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _producer() -> _Producer:
+    loop = asyncio.get_running_loop()
+    producer = _producers.get(loop)
+    if producer is None:
+        producer = _producers[loop] = _Producer()
+    return producer
+
+
+async def event_stream(request, last_event_id: str | None) -> AsyncIterator[bytes]:
+    """SSE body: resume backlog, then live events with periodic heartbeats."""
+    producer = _producer()
+    producer.subscribers += 1
+    if producer.task is None:
+        producer.task = asyncio.get_running_loop().create_task(producer.run())
+    try:
+        yield b"retry: %d\n\n" % RETRY_MS
+        cursor = last_event_id or feed.last_id
+        while True:
+            changed = producer.changed
+            events = feed.since(cursor)
+            if events is None:
+                cursor = feed.last_id
+                yield ChangeEvent(cursor, "resync", {"reason": "history unavailable"}).encode()
+            elif events:
+                cursor = events[-1].id
+                yield b"".join(e.encode() for e in events)
+            if await request.is_disconnected():
+                return
+            with anyio.move_on_after(HEARTBEAT_SECONDS) as scope:
+                await changed.wait()
+            if scope.cancelled_caught:
+                yield b": keep-alive\n\n"
+    finally:
+        producer.subscribers -= 1
+
+
+def _seq_of(event: ChangeEvent) -> int:
+    return int(event.id.rpartition("-")[2])
@@ -22,9 +22,11 @@ class Settings:
     CALENDLY_API_KEY: str = ""
     CALENDLY_EVENT_TYPE_URI: str = ""
     CALENDLY_ORG_URI: str = ""
+    CALENDLY_WEBHOOK_SECRET: str = ""
 
     # ManyChat
     MANYCHAT_API_KEY: str = ""
+    MANYCHAT_WEBHOOK_SECRET: str = ""
 
     # Anthropic (action plan generation)
     ANTHROPIC_API_KEY: str = ""
@@ -85,7 +87,9 @@ def load_settings() -> Settings:
         CALENDLY_API_KEY=_get_secret("CALENDLY_API_KEY"),
         CALENDLY_EVENT_TYPE_URI=_get_secret("CALENDLY_EVENT_TYPE_URI"),
         CALENDLY_ORG_URI=_get_secret("CALENDLY_ORG_URI"),
+        CALENDLY_WEBHOOK_SECRET=_get_secret("CALENDLY_WEBHOOK_SECRET"),
         MANYCHAT_API_KEY=_get_secret("MANYCHAT_API_KEY"),
+        MANYCHAT_WEBHOOK_SECRET=_get_secret("MANYCHAT_WEBHOOK_SECRET"),
         ANTHROPIC_API_KEY=_get_secret("ANTHROPIC_API_KEY"),
         ANTHROPIC_MODEL=_get_secret("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929"),
         FIREFLIES_API_KEY=_get_secret("FIREFLIES_API_KEY"),
@@ -154,6 +158,10 @@ CACHE_HOT = 60
 CACHE_WARM = 300
 CACHE_COLD = 1800
 
+# With signed webhooks feeding the local store, the Stripe/Calendly/ManyChat
+# APIs are only swept this often to reconcile missed deliveries (seconds)
+WEBHOOK_RECONCILE_SECONDS = 3600
+
 # Attribution models
 ATTRIBUTION_MODELS = ["first_touch", "last_touch", "linear", "time_decay"]
 
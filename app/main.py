@@ -61,6 +61,7 @@ def init_services():
 
     from app.services.notion_client import NotionService
     from app.services.stripe_client import StripeService
+    from app.services.local_store import LocalStore
     from app.services.calendly_client import CalendlyService
     from app.services.manychat_client import ManyChatService
     from app.services.claude_client import ClaudeService
@@ -68,20 +69,24 @@ def init_services():
     from app.services.n8n_client import N8nService
     from app.services.health_checker import HealthChecker
 
+    store = LocalStore()
     st.session_state.notion = (
         NotionService(settings.NOTION_API_KEY, settings.NOTION_PAYMENTS_DB, settings.NOTION_INTAKE_DB)
         if settings.NOTION_API_KEY else None
     )
     st.session_state.stripe = (
-        StripeService(settings.STRIPE_SECRET_KEY)
+        StripeService(settings.STRIPE_SECRET_KEY, settings.STRIPE_WEBHOOK_SECRET, store)
         if settings.STRIPE_SECRET_KEY else None
     )
     st.session_state.calendly = (
-        CalendlyService(settings.CALENDLY_API_KEY, settings.CALENDLY_ORG_URI, settings.CALENDLY_EVENT_TYPE_URI)
+        CalendlyService(
+            settings.CALENDLY_API_KEY, settings.CALENDLY_ORG_URI, settings.CALENDLY_EVENT_TYPE_URI,
+            settings.CALENDLY_WEBHOOK_SECRET, store,
+        )
         if settings.CALENDLY_API_KEY else None
     )
     st.session_state.manychat = (
-        ManyChatService(settings.MANYCHAT_API_KEY)
+        ManyChatService(settings.MANYCHAT_API_KEY, settings.MANYCHAT_WEBHOOK_SECRET, store)
         if settings.MANYCHAT_API_KEY else None
     )
     st.session_state.claude = (
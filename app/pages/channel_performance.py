@@ -6,13 +6,12 @@ import streamlit as st
 import plotly.graph_objects as go
 
 from app.utils.attribution import (
-    attribute_conversions,
-    compare_models,
     channel_roi,
     get_revenue_by_source_over_time,
     ATTRIBUTION_MODELS,
 )
-from app.utils.lead_scorer import score_all_clients, get_tier_color
+from app.services.derived import attribution_comparison, scored_clients
+from app.utils.lead_scorer import get_tier_color
 from app.components.channel_chart import (
     render_channel_bars,
     render_channel_radar,
@@ -40,8 +39,7 @@ def render():
         empty_state("No payment data yet.")
         return
 
-    merged = notion.get_merged_clients()
-    scored = score_all_clients(merged)
+    scored = scored_clients(notion)
 
     # ── Channel ROI Cards ─────────────────────────────────────────
 
@@ -110,7 +108,7 @@ def render():
         format_func=lambda x: x.replace("_", " ").title(),
     )
 
-    metrics = attribute_conversions(payments, model=model_choice)
+    metrics = attribution_comparison(notion)[model_choice]
     if metrics:
         # Build channel_metrics dict for chart components
         chart_data = {}
@@ -5,8 +5,10 @@ from __future__ import annotations
 import streamlit as st
 
 from app.components.client_timeline import render_timeline, render_client_card
+from app.services.derived import search_index
 from app.utils.formatters import format_date, format_currency
 from app.utils.activity_feed import build_activity_feed
+from app.utils.lead_ranking import client_key
 from app.utils import design_tokens as tok
 from app.utils.ui import (
     page_header,
@@ -59,7 +61,8 @@ def render():
     col_search, col_status, col_source = st.columns([3, 2, 2])
 
     with col_search:
-        search = st.text_input("Search by name or email", placeholder="Type to filter...")
+        search = st.text_input("Search clients", placeholder="Name, email or anything from their intake...")
+        match_all = st.checkbox("Match all words", value=True)
 
     with col_status:
         status_filter = st.selectbox(
@@ -76,11 +79,17 @@ def render():
     # Apply filters
     filtered = merged
     if search:
+        # Names and intake text from the search index, best match first; then
+        # name/email substring matches it doesn't cover (partial emails)
+        ranked = [hit.item for hit in search_index(notion).search(search, k=None, match_all=match_all)]
+        seen = {client_key(m["payment"]) for m in ranked}
         search_lower = search.lower()
-        filtered = [
+        filtered = ranked + [
             m for m in filtered
-            if search_lower in (m["payment"].get("client_name", "") or "").lower()
-            or search_lower in (m["payment"].get("email", "") or "").lower()
+            if client_key(m["payment"]) not in seen and (
+                search_lower in (m["payment"].get("client_name", "") or "").lower()
+                or search_lower in (m["payment"].get("email", "") or "").lower()
+            )
         ]
     if status_filter != "All":
         filtered = [m for m in filtered if m["payment"]["status"] == status_filter]
@@ -98,6 +98,70 @@ def render():
     for tier, count in stats["tiers"].items():
         st.caption(f"  {tier}: {count} active entries")
 
+    # ── Cache Performance ────────────────────────────────────────
+
+    section_header("Cache Performance", "Hit ratios and loader cost per tier and key since startup.")
+    metrics = cache.metrics()
+    totals = metrics["totals"]
+
+    metric_row([
+        {"label": "Hit Ratio", "value": f"{totals['hit_ratio']:.0%}"},
+        {"label": "Hits", "value": str(totals["hits"])},
+        {"label": "Misses", "value": str(totals["misses"])},
+        {"label": "Stale", "value": str(totals["stale"])},
+        {"label": "Held", "value": _format_bytes(totals["bytes"])},
+    ])
+
+    if not metrics["keys"]:
+        empty_state("No cache lookups recorded yet.")
+        return
+
+    import pandas as pd
+
+    tier_rows = [
+        {
+            "Tier": tier,
+            "Hit Ratio": f"{m['hit_ratio']:.0%}",
+            "Hits": m["hits"],
+            "Misses": m["misses"],
+            "Stale": m["stale"],
+            "Loads": m["loads"],
+            "Load p50 (ms)": m["load_p50_ms"],
+            "Load p95 (ms)": m["load_p95_ms"],
+            "Held": _format_bytes(m["bytes"]),
+        }
+        for tier, m in metrics["tiers"].items()
+    ]
+    st.dataframe(pd.DataFrame(tier_rows), use_container_width=True, hide_index=True)
+
+    with st.expander("Per-key breakdown"):
+        key_rows = [
+            {
+                "Key": key,
+                "Tier": m["tier"],
+                "Hit Ratio": f"{m['hit_ratio']:.0%}",
+                "Hits": m["hits"],
+                "Misses": m["misses"],
+                "Stale": m["stale"],
+                "Disk Hits": m["disk_hits"],
+                "Loads": m["loads"],
+                "Load avg (ms)": m["load_avg_ms"],
+                "Load p95 (ms)": m["load_p95_ms"],
+                "Held": _format_bytes(m["bytes"]),
+            }
+            for key, m in metrics["keys"].items()
+        ]
+        st.dataframe(pd.DataFrame(key_rows), use_container_width=True, hide_index=True)
+
+
+def _format_bytes(n: int) -> str:
+    """Human-readable byte count."""
+    if n < 1024:
+        return f"{n} B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / (1024 * 1024):.1f} MB"
+
 
 def _timestamp_to_iso(ts: float) -> str:
     """Convert Unix timestamp to ISO string."""
@@ -3,7 +3,9 @@
 import streamlit as st
 import plotly.graph_objects as go
 
-from app.utils.lead_scorer import score_all_clients, get_tier_color, TIER_HOT, TIER_WARM, TIER_COOL
+from app.services.derived import learned_scores, score_matrix, scored_clients
+from app.utils.lead_model import LeadModel, train
+from app.utils.lead_scorer import CATEGORY_MAX, Reweighted, get_tier_color, TIER_HOT, TIER_WARM, TIER_COOL
 from app.utils.formatters import format_currency
 from app.utils.benchmarks import sample_size_warning, MIN_LEADS_FOR_SCORING, MIN_LEADS_FOR_PREDICTIVE
 from app.utils import design_tokens as t
@@ -30,13 +32,55 @@ def render():
         empty_state("No client records found.")
         return
 
-    scored = score_all_clients(merged)
+    scored = scored_clients(notion)
+
+    # ── Scoring Model ─────────────────────────────────────────────
+
+    model_choice = st.radio(
+        "Scoring Model", ["Heuristic", "Learned"], horizontal=True,
+        help="Heuristic: the hand-set point rules. Learned: a logistic model fitted to who "
+             "completed a call or bought within 30 days of each past date.",
+    )
+    model = LeadModel.load() if model_choice == "Learned" else None
+    if model_choice == "Learned":
+        _render_model_status(model, merged)
+
+    # ── What-if Weights ───────────────────────────────────────────
+
+    weights = dict(CATEGORY_MAX)
+    with st.expander("What-if: Category Weights & Tier Thresholds"):
+        if model is None:
+            st.caption(
+                "Points each category is worth and where each tier starts. Leads are "
+                "re-ranked from their stored category scores — nothing is re-scored."
+            )
+            for col, (category, points) in zip(st.columns(len(CATEGORY_MAX)), CATEGORY_MAX.items()):
+                with col:
+                    weights[category] = st.slider(category.title(), 0, 50, points, key=f"whatif_{category}")
+        else:
+            st.caption("Where each tier starts on the learned model's 0–100 conversion score.")
+        col_hot, col_warm, col_cool = st.columns(3)
+        with col_hot:
+            hot = st.slider("Hot from", 0, 100, TIER_HOT, key="whatif_hot")
+        with col_warm:
+            warm = st.slider("Warm from", 0, 100, TIER_WARM, key="whatif_warm")
+        with col_cool:
+            cool = st.slider("Cool from", 0, 100, TIER_COOL, key="whatif_cool")
+        if st.button("Reset to Scorer Defaults"):
+            for key in [k for k in st.session_state if str(k).startswith("whatif_")]:
+                del st.session_state[key]
+            st.rerun()
+
+    if model is None:
+        reweighted = score_matrix(notion).reweight(weights, (hot, warm, cool))
+    else:
+        reweighted = Reweighted.from_totals(learned_scores(notion, model), (hot, warm, cool))
+    totals = reweighted.total.tolist()
+    tier_of = reweighted.tier.tolist()
 
     # ── Tier Summary ──────────────────────────────────────────────
 
-    tiers = {"Hot": 0, "Warm": 0, "Cool": 0, "Cold": 0}
-    for s in scored:
-        tiers[s["score"]["tier"]] += 1
+    tiers = reweighted.tier_counts()
 
     cols = st.columns(4)
     for col, (tier, count) in zip(cols, tiers.items()):
@@ -52,18 +96,17 @@ def render():
 
     section_header("Score Distribution", "Distribution of lead scores with tier thresholds.")
 
-    all_scores = [s["score"]["total"] for s in scored]
     fig = go.Figure(go.Histogram(
-        x=all_scores,
+        x=totals,
         nbinsx=20,
         marker_color=t.PRIMARY,
         opacity=0.85,
     ))
     # Tier threshold lines
     for threshold, tier_label, color in [
-        (TIER_HOT, f"Hot ({TIER_HOT}+)", get_tier_color("Hot")),
-        (TIER_WARM, f"Warm ({TIER_WARM}+)", get_tier_color("Warm")),
-        (TIER_COOL, f"Cool ({TIER_COOL}+)", get_tier_color("Cool")),
+        (hot, f"Hot ({hot}+)", get_tier_color("Hot")),
+        (warm, f"Warm ({warm}+)", get_tier_color("Warm")),
+        (cool, f"Cool ({cool}+)", get_tier_color("Cool")),
     ]:
         fig.add_vline(
             x=threshold, line_dash="dash", line_color=color,
@@ -106,35 +149,30 @@ def render():
             options=["Total Score", "Engagement", "Velocity", "Urgency", "Source", "Upsell"],
         )
 
+    # Apply sort (positions into scored, so the cached list is never reordered)
+    if sort_by == "Total Score":
+        positions = reweighted.order.tolist()
+    else:
+        category = sort_by.lower()
+        positions = sorted(range(len(scored)), key=lambda i: scored[i]["score"][category]["score"], reverse=True)
+
     # Apply filters
-    filtered = scored
     if tier_filter != "All":
-        filtered = [s for s in scored if s["score"]["tier"] == tier_filter]
-
-    # Apply sort
-    sort_keys = {
-        "Total Score": lambda x: x["score"]["total"],
-        "Engagement": lambda x: x["score"]["engagement"]["score"],
-        "Velocity": lambda x: x["score"]["velocity"]["score"],
-        "Urgency": lambda x: x["score"]["urgency"]["score"],
-        "Source": lambda x: x["score"]["source"]["score"],
-        "Upsell": lambda x: x["score"]["upsell"]["score"],
-    }
-    filtered.sort(key=sort_keys[sort_by], reverse=True)
+        positions = [i for i in positions if tier_of[i] == tier_filter]
 
-    st.caption(f"Showing {len(filtered)} of {len(scored)} leads")
+    st.caption(f"Showing {len(positions)} of {len(scored)} leads")
 
     # ── Scored Client Cards ───────────────────────────────────────
 
-    for item in filtered:
+    for i in positions:
+        item = scored[i]
         payment = item["payment"]
-        intake = item.get("intake")
         score = item["score"]
 
-        tier = score["tier"]
+        tier = tier_of[i]
         color = get_tier_color(tier)
         name = payment.get("client_name") or payment.get("email", "Unknown")
-        total = score["total"]
+        total = totals[i]
 
         with st.container():
             st.markdown(
@@ -188,9 +226,9 @@ def render():
     # Score by lead source
     with col_chart1:
         source_scores: dict[str, list[int]] = {}
-        for item in scored:
+        for item, total in zip(scored, totals):
             source = item["payment"].get("lead_source") or "Unknown"
-            source_scores.setdefault(source, []).append(item["score"]["total"])
+            source_scores.setdefault(source, []).append(total)
 
         sources = list(source_scores.keys())
         avg_scores = [sum(v) / len(v) for v in source_scores.values()]
@@ -204,9 +242,9 @@ def render():
             marker_color=t.PRIMARY,
         ))
         # Add tier threshold reference lines
-        fig.add_hline(y=TIER_HOT, line_dash="dot", line_color=get_tier_color("Hot"),
+        fig.add_hline(y=hot, line_dash="dot", line_color=get_tier_color("Hot"),
                       annotation_text="Hot", annotation_position="right")
-        fig.add_hline(y=TIER_WARM, line_dash="dot", line_color=get_tier_color("Warm"),
+        fig.add_hline(y=warm, line_dash="dot", line_color=get_tier_color("Warm"),
                       annotation_text="Warm", annotation_position="right")
         fig.update_layout(
             title="Avg Score by Lead Source",
@@ -292,3 +330,21 @@ def render():
                 empty_state("No industry data yet.")
     else:
         empty_state("No intake data available for keyword analysis.")
+
+
+def _render_model_status(model: LeadModel | None, merged: list[dict]) -> None:
+    """Trained model summary, or how to get one, plus the (re)train button."""
+    if model is None:
+        st.info("No learned model yet. Train one on the full client history to rank leads with it.")
+    else:
+        metrics = model.metrics
+        summary = f"Trained {model.trained_at} on {model.samples:,} client-dates"
+        if metrics:
+            summary += (f" · holdout AUC {metrics['auc']:.2f} "
+                        f"(heuristic {metrics['heuristic_auc']:.2f})")
+        st.caption(summary)
+
+    if st.button("Retrain on Full History" if model else "Train on Full History"):
+        with st.spinner("Training lead model..."):
+            train(merged).save()
+        st.rerun()
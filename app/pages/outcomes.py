@@ -12,9 +12,9 @@ import plotly.express as px
 import pandas as pd
 
 from app.config import CHANNEL_COLORS, NPS_SCALE
+from app.services.derived import client_ltv
 from app.utils.formatters import format_currency, format_percentage
 from app.utils.ltv_calculator import (
-    calculate_ltv,
     ltv_by_source,
     ltv_by_entry_product,
     ltv_by_cohort,
@@ -75,7 +75,7 @@ def render():
     section_header("Client Lifetime Value")
 
     if payments:
-        ltv_data = calculate_ltv(payments)
+        ltv_data = client_ltv(notion)
         upsell_data = upsell_rate(payments)
         exp_data = expansion_revenue(payments)
 
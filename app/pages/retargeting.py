@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import streamlit as st
 
-from app.utils.segment_builder import build_all_segments, segment_summary
-from app.utils.lead_scorer import score_all_clients, get_tier_color
+from app.services.derived import client_segments, scored_clients
+from app.utils.segment_builder import segment_summary
+from app.utils.lead_scorer import get_tier_color
 from app.components.segment_cards import render_segment_cards, render_segment_detail
 from app.utils.formatters import format_currency
 from html import escape
@@ -26,10 +27,8 @@ def render():
         st.info("No payment data yet.")
         return
 
-    merged = notion.get_merged_clients()
-    scored = score_all_clients(merged)
-
-    segments = build_all_segments(payments, scores=scored)
+    scored = scored_clients(notion)
+    segments = client_segments(notion)
     summary = segment_summary(segments)
 
     # ── Summary Bar ───────────────────────────────────────────────
@@ -5,26 +5,83 @@ Tiers:
 - Warm (5min): Notion pipeline stats, ManyChat stats
 - Cold (30min): Historical data, cohort analysis
 
-Webhook invalidation: n8n writes a JSON signal file that Streamlit polls.
+Webhook invalidation: webhook_receiver.py appends every n8n event to the
+event journal; the cache tails it (at most once per second) and applies each
+event in order. The legacy single-event signal file is still honored.
+Events that carry the changed record (or its Notion page id) are handed to
+registered event handlers, which upsert just that record into the cached
+list — and its lookup indexes — instead of dropping the whole tier.
+
+Dependencies: derived entries (scores, segments, LTV) declare the source keys
+they were computed from. Setting or invalidating a source drops every entry
+derived from it, transitively, so derived results can be cached in the cold
+tier and still never outlive their inputs. Every change to a key (set,
+upsert, removal) bumps its generation; get_or_compute() only caches its
+result if no source's generation moved while compute() ran, so a value
+derived from data that was upserted mid-compute is returned but not kept.
+
+L2 disk tier (optional): when a DiskCache is attached (CACHE_DISK_DIR), cold
+entries and entries whose loader took longer than spill_min_load_seconds are
+also written to disk. On an in-memory miss the disk copy is reloaded with its
+original timestamp, so TTLs still hold across restarts; a derived entry is
+only reloaded if none of its sources is newer than it. Pickling, file writes
+and reads happen outside the lock. A write whose key changed before it
+finished deletes its file rather than leave superseded data on disk, and
+a key is not reloaded while a write to it is in flight.
+
+Instrumentation: every lookup is counted per key and per tier (hits, misses,
+stale lookups), the time between a miss and the matching set() is recorded
+as loader latency, and the approximate size of each entry is reported so TTLs
+can be tuned from measurements instead of guesswork. Sizes are measured when
+metrics() is read, not on set(), and kept until the entry's data changes; a
+spilled entry reuses the payload size of its disk copy.
+
+Thread safety: the cache is shared by the Streamlit script threads, the
+API's worker threads and the journal tail, so the store, the dependency
+graph and the metrics are only touched under one re-entrant lock. Loaders
+(get_or_compute), webhook event handlers and disk tier I/O run outside it —
+a handler may fetch a page from Notion — and only their upserts take it.
 """
 
 from __future__ import annotations
 
 import json
+import logging
 import os
+import pickle
+import sys
+import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable, Iterable
+
+from app.services.disk_cache import DiskCache, DiskRecord
+from app.services.event_journal import JOURNAL_FILE, OFFSET_FILE_NAME, JournalReader
+
+logger = logging.getLogger(__name__)
 
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 SIGNAL_FILE = os.path.join(_PROJECT_ROOT, "plans", ".cache_signal.json")
 
+# Journal events "<source>.<type>" from provider webhooks; cache keys for a
+# source share the "<source>_" prefix
+PROVIDER_SOURCES = ("stripe", "calendly", "manychat")
+
+# Loader latency histogram bucket upper bounds (seconds); last bucket is +inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
 
 @dataclass
 class CacheEntry:
     data: Any
     timestamp: float
     ttl: float
+    tier: str = ""
+    size_bytes: int | None = None  # Measured lazily by metrics(); None until then
+    spilled: bool = False  # The disk tier holds a copy of this data
+    depends_on: tuple[str, ...] = ()
+    # field -> {normalized value: position in data}, built lazily by index()
+    indexes: dict[str, dict[Any, int]] = field(default_factory=dict)
 
     @property
     def is_expired(self) -> bool:
@@ -35,96 +92,682 @@ class CacheEntry:
         return time.time() - self.timestamp
 
 
+@dataclass
+class KeyMetrics:
+    """Lookup and loader counters for a single cache key.
+
+    A stale lookup found an entry past its TTL; it is also counted as a miss
+    because the expired data is never returned.
+    """
+
+    tier: str = ""
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    disk_hits: int = 0
+    loads: int = 0
+    load_seconds_total: float = 0.0
+    load_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    bytes: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def observe_load(self, seconds: float) -> None:
+        self.loads += 1
+        self.load_seconds_total += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.load_buckets[i] += 1
+                return
+        self.load_buckets[-1] += 1
+
+    def load_quantile(self, q: float) -> float:
+        """Estimate a loader latency quantile (seconds) from the histogram."""
+        return _histogram_quantile(self.load_buckets, q)
+
+    def to_dict(self) -> dict:
+        return {
+            "tier": self.tier,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "disk_hits": self.disk_hits,
+            "hit_ratio": round(self.hit_ratio, 4),
+            "loads": self.loads,
+            "load_avg_ms": round(self.load_seconds_total / self.loads * 1000, 1) if self.loads else 0.0,
+            "load_p50_ms": round(self.load_quantile(0.5) * 1000, 1),
+            "load_p95_ms": round(self.load_quantile(0.95) * 1000, 1),
+            "load_buckets": list(self.load_buckets),
+            "bytes": self.bytes,
+        }
+
+
 class CacheManager:
     """In-memory cache with 3 TTL tiers and webhook invalidation."""
 
-    def __init__(self, hot_ttl: float = 60, warm_ttl: float = 300, cold_ttl: float = 1800):
+    def __init__(
+        self,
+        hot_ttl: float = 60,
+        warm_ttl: float = 300,
+        cold_ttl: float = 1800,
+        disk: DiskCache | None = None,
+        spill_tiers: tuple[str, ...] = ("cold",),
+        spill_min_load_seconds: float = 1.0,
+        journal: JournalReader | None = None,
+    ):
         self._store: dict[str, CacheEntry] = {}
         self._ttls = {"hot": hot_ttl, "warm": warm_ttl, "cold": cold_ttl}
+        self._disk = disk
+        self._spill_tiers = spill_tiers
+        self._spill_min_load = spill_min_load_seconds
+        self._journal = journal
         self._last_signal_check: float = 0
+        self._metrics: dict[str, KeyMetrics] = {}
+        self._miss_started: dict[str, float] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._generations: dict[str, int] = {}  # key -> number of changes to it
+        self._spilling: dict[str, int] = {}  # key -> disk writes in flight
+        self._event_handlers: dict[str, Callable[[str, dict], set[str]]] = {}
+        self._lock = threading.RLock()
+        self._signal_lock = threading.Lock()  # One journal poll at a time
 
     def get(self, key: str) -> Any | None:
         """Get cached value if not expired. Returns None on miss."""
         self._check_webhook_signal()
-        entry = self._store.get(key)
-        if entry is None or entry.is_expired:
-            return None
-        return entry.data
+        entry = self._lookup(key)
+        return entry.data if entry is not None else None
 
     def get_with_age(self, key: str) -> tuple[Any | None, float]:
         """Get cached value and its age in seconds. Returns (None, 0) on miss."""
         self._check_webhook_signal()
-        entry = self._store.get(key)
-        if entry is None or entry.is_expired:
+        entry = self._lookup(key)
+        if entry is None:
             return None, 0
         return entry.data, entry.age_seconds
 
-    def set(self, key: str, data: Any, tier: str = "warm") -> None:
-        """Cache data with the specified tier's TTL."""
-        ttl = self._ttls.get(tier, self._ttls["warm"])
-        self._store[key] = CacheEntry(data=data, timestamp=time.time(), ttl=ttl)
+    def set(
+        self,
+        key: str,
+        data: Any,
+        tier: str = "warm",
+        depends_on: Iterable[str] | None = None,
+    ) -> None:
+        """Cache data with the specified tier's TTL.
+
+        Args:
+            depends_on: Source keys this value was derived from. The entry is
+                dropped whenever any of them is set or invalidated.
+        """
+        self._set(key, data, tier, tuple(depends_on or ()))
+
+    def _set(
+        self,
+        key: str,
+        data: Any,
+        tier: str,
+        deps: tuple[str, ...],
+        sources: list[int] | None = None,
+    ) -> bool:
+        """set(). Given sources, the generations of deps when data was read,
+        data is only cached (and True returned) if none of deps changed since."""
+        if tier not in self._ttls:
+            tier = "warm"
+        with self._lock:
+            if sources is not None and sources != [self._generations.get(dep, 0) for dep in deps]:
+                return False
+            self._bump(key)
+            # New data for this key makes everything derived from it stale
+            self._invalidate_dependents(key)
+            self._unlink(key)
+            for dep in deps:
+                self._dependents.setdefault(dep, set()).add(key)
+
+            now = time.time()
+            entry = CacheEntry(data=data, timestamp=now, ttl=self._ttls[tier], tier=tier, depends_on=deps)
+            self._store[key] = entry
+
+            m = self._key_metrics(key)
+            m.tier = tier
+            started = self._miss_started.pop(key, None)
+            load_seconds = max(0.0, now - started) if started is not None else 0.0
+            if started is not None:
+                m.observe_load(load_seconds)
+
+            spill = self._disk is not None and (tier in self._spill_tiers or load_seconds >= self._spill_min_load)
+            if spill:
+                self._spilling[key] = self._spilling.get(key, 0) + 1
+            elif self._disk is not None:
+                # Don't let an older spilled copy resurface after a restart
+                self._disk.delete(key)
+            generation = self._generations[key]
+        if spill:
+            self._spill(key, entry, data, generation)
+        return True
+
+    def peek(self, key: str) -> Any | None:
+        """The live in-memory value of key, or None, without any I/O.
+
+        Unlike get(), pending webhook events aren't applied first (a handler
+        may fetch from Notion) and the disk tier isn't read, so it is safe on
+        an event loop. A hit is counted; a miss is left to the get() that
+        should follow it.
+        """
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None or entry.is_expired:
+                return None
+            self._key_metrics(key).hits += 1
+            return entry.data
+
+    def events_due(self) -> bool:
+        """True if the next get() will poll the event journal (at most once per second)."""
+        return time.time() - self._last_signal_check >= 1
+
+    def poll_events(self) -> None:
+        """Apply pending webhook events now, if a poll is due (what get() does first)."""
+        self._check_webhook_signal()
+
+    def is_expired(self, key: str) -> bool:
+        """True if the key is held in memory past its TTL (a refetch is due).
+
+        Unlike get(), this records no metrics and never touches the disk tier.
+        """
+        with self._lock:
+            entry = self._store.get(key)
+        return entry is not None and entry.is_expired
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        depends_on: Iterable[str],
+        tier: str = "cold",
+    ) -> Any:
+        """Return the cached derived value, computing and caching it on miss.
+
+        A compute() result of None is returned but not cached, and so is one
+        whose sources were set, upserted or dropped while it was computed.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        deps = tuple(depends_on)
+        with self._lock:
+            sources = [self._generations.get(dep, 0) for dep in deps]
+        data = compute()
+        if data is not None:
+            self._set(key, data, tier, deps, sources)
+        return data
+
+    def upsert(self, key: str, record: dict, id_field: str = "id") -> bool:
+        """Insert or replace one record in a cached list, matched on id_field.
+
+        The list is copied on write (readers holding the old list are not
+        affected), built indexes are updated in place, the entry keeps its
+        original timestamp and derived entries are invalidated. Returns False
+        if the key isn't cached as a live list.
+        """
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None or entry.is_expired or not isinstance(entry.data, list):
+                return False
+
+            positions = self._index(entry, id_field)
+            rid = _index_value(record.get(id_field))
+            pos = positions.get(rid)
+            data = list(entry.data)
+            old = data[pos] if pos is not None else None
+            if pos is None:
+                pos = len(data)
+                data.append(record)
+            else:
+                data[pos] = record
+
+            for name, index in list(entry.indexes.items()):
+                old_value = _index_value(old.get(name)) if old is not None else None
+                new_value = _index_value(record.get(name))
+                if old is not None and old_value != new_value and index.get(old_value) == pos:
+                    # A later duplicate may now own old_value — rebuild on next use
+                    del entry.indexes[name]
+                    continue
+                if new_value is not None and (new_value not in index or index[new_value] > pos):
+                    index[new_value] = pos
+
+            self._invalidate_dependents(key)
+            self._bump(key)
+            entry.data = data
+            entry.size_bytes = None
+            spill = entry.spilled
+            if spill:
+                self._spilling[key] = self._spilling.get(key, 0) + 1
+            generation = self._generations[key]
+        if spill:
+            self._spill(key, entry, data, generation)
+        return True
+
+    def find(self, key: str, field_name: str, value: Any) -> dict | None:
+        """First record in a cached list whose field equals value, via an index.
+
+        String values are compared case-insensitively.
+        """
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None or entry.is_expired or not isinstance(entry.data, list):
+                return None
+            pos = self._index(entry, field_name).get(_index_value(value))
+            return entry.data[pos] if pos is not None else None
+
+    def register_event_handler(self, name: str, handler: Callable[[str, dict], set[str]]) -> None:
+        """Register (or replace) a webhook event handler.
+
+        Handlers receive (event, data) and return the cache keys they brought
+        up to date from the event payload.
+        """
+        with self._lock:
+            self._event_handlers[name] = handler
 
     def invalidate(self, key: str) -> None:
-        """Remove a specific key from cache."""
-        self._store.pop(key, None)
+        """Remove a specific key (and everything derived from it) from cache."""
+        with self._lock:
+            self._remove(key)
+            self._invalidate_dependents(key)
 
     def invalidate_tier(self, tier: str) -> None:
-        """Invalidate all entries matching a tier's TTL."""
-        ttl = self._ttls.get(tier)
-        if ttl is None:
+        """Invalidate all entries in a tier, plus anything derived from them."""
+        if tier not in self._ttls:
             return
-        keys_to_remove = [
-            k for k, v in self._store.items() if v.ttl == ttl
-        ]
-        for k in keys_to_remove:
-            del self._store[k]
+        with self._lock:
+            keys_to_remove = [
+                k for k, v in self._store.items() if v.tier == tier
+            ]
+            for k in keys_to_remove:
+                self.invalidate(k)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Invalidate every key starting with prefix, plus anything derived from them."""
+        with self._lock:
+            for k in [k for k in self._store if k.startswith(prefix)]:
+                self.invalidate(k)
 
     def invalidate_all(self) -> None:
         """Clear entire cache."""
-        self._store.clear()
+        with self._lock:
+            for key in self._store:
+                self._bump(key)
+            self._store.clear()
+            self._dependents.clear()
+            if self._disk is not None:
+                self._disk.clear()
+
+    def dependents(self, key: str) -> set[str]:
+        """Keys currently registered as derived (directly) from a key."""
+        with self._lock:
+            return set(self._dependents.get(key, ()))
 
     def stats(self) -> dict:
         """Return cache statistics."""
-        now = time.time()
-        total = len(self._store)
-        expired = sum(1 for v in self._store.values() if v.is_expired)
-        return {
-            "total_entries": total,
-            "active_entries": total - expired,
-            "expired_entries": expired,
-            "tiers": {
-                tier: sum(1 for v in self._store.values() if v.ttl == ttl and not v.is_expired)
-                for tier, ttl in self._ttls.items()
-            },
-        }
+        with self._lock:
+            now = time.time()
+            total = len(self._store)
+            expired = sum(1 for v in self._store.values() if v.is_expired)
+            return {
+                "total_entries": total,
+                "active_entries": total - expired,
+                "expired_entries": expired,
+                "tiers": {
+                    tier: sum(1 for v in self._store.values() if v.ttl == ttl and not v.is_expired)
+                    for tier, ttl in self._ttls.items()
+                },
+            }
+
+    def metrics(self) -> dict:
+        """Return per-key and per-tier hit/miss/loader-latency/bytes counters."""
+        self._measure_entries()
+        with self._lock:
+            for key, m in self._metrics.items():
+                entry = self._store.get(key)
+                m.bytes = (entry.size_bytes or 0) if entry is not None else 0
+            keys = {k: m.to_dict() for k, m in sorted(self._metrics.items())}
+
+            tiers: dict[str, KeyMetrics] = {}
+            for m in self._metrics.values():
+                agg = tiers.setdefault(m.tier or "unknown", KeyMetrics(tier=m.tier or "unknown"))
+                agg.hits += m.hits
+                agg.misses += m.misses
+                agg.stale += m.stale
+                agg.loads += m.loads
+                agg.load_seconds_total += m.load_seconds_total
+                agg.load_buckets = [a + b for a, b in zip(agg.load_buckets, m.load_buckets)]
+                agg.bytes += m.bytes
+
+            hits = sum(m.hits for m in self._metrics.values())
+            lookups = sum(m.lookups for m in self._metrics.values())
+            return {
+                "keys": keys,
+                "tiers": {tier: agg.to_dict() for tier, agg in sorted(tiers.items())},
+                "totals": {
+                    "hits": hits,
+                    "misses": lookups - hits,
+                    "stale": sum(m.stale for m in self._metrics.values()),
+                    "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                    "bytes": sum(e.size_bytes or 0 for e in self._store.values()),
+                },
+                "latency_buckets_s": list(LATENCY_BUCKETS),
+            }
+
+    def reset_metrics(self) -> None:
+        """Zero all counters (entries are kept)."""
+        with self._lock:
+            self._metrics.clear()
+            self._miss_started.clear()
+            for key, entry in self._store.items():
+                self._key_metrics(key).tier = entry.tier
+
+    def _lookup(self, key: str) -> CacheEntry | None:
+        """Fetch a live entry and record the hit/miss against its key.
+
+        A key not held in memory is read from the disk tier, outside the lock.
+        """
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None and not entry.is_expired:
+                self._key_metrics(key).hits += 1
+                return entry
+            # A file still being written may already be superseded
+            promote = entry is None and self._disk is not None and key not in self._spilling
+            generation = self._generations.get(key, 0)
+        record = self._disk.read(key) if promote else None
+        with self._lock:
+            m = self._key_metrics(key)
+            if record is not None:
+                promoted = self._promote(key, record, generation)
+                if promoted is not None:
+                    m.hits += 1
+                    m.disk_hits += 1
+                    m.tier = promoted.tier
+                    return promoted
+            m.misses += 1
+            if entry is not None:
+                m.stale += 1
+            # The caller is expected to load and set() the value next; the gap is
+            # recorded as loader latency.
+            self._miss_started[key] = time.time()
+            return None
+
+    @staticmethod
+    def _index(entry: CacheEntry, field_name: str) -> dict[Any, int]:
+        index = entry.indexes.get(field_name)
+        if index is None:
+            index = {}
+            for pos, record in enumerate(entry.data):
+                if isinstance(record, dict):
+                    value = _index_value(record.get(field_name))
+                    if value is not None:
+                        index.setdefault(value, pos)
+            entry.indexes[field_name] = index
+        return index
+
+    def _promote(self, key: str, record: DiskRecord, generation: int) -> CacheEntry | None:
+        """Install a live L2 entry read at generation, keeping its original timestamp.
+
+        If the key was set or promoted while the file was read, that entry
+        is used instead; if it changed in any other way, nothing is.
+        """
+        current = self._store.get(key)
+        if current is not None:
+            return current if not current.is_expired else None
+        if self._generations.get(key, 0) != generation or key in self._spilling:
+            return None
+        entry = CacheEntry(
+            data=record.data, timestamp=record.timestamp, ttl=record.ttl,
+            tier=record.tier, spilled=True, depends_on=record.depends_on,
+        )
+        if entry.is_expired or not self._sources_unchanged(entry):
+            self._disk.delete(key)
+            return None
+        self._store[key] = entry
+        for dep in entry.depends_on:
+            self._dependents.setdefault(dep, set()).add(key)
+        return entry
+
+    def _sources_unchanged(self, entry: CacheEntry) -> bool:
+        """True if every source of a derived entry predates it."""
+        for dep in entry.depends_on:
+            source = self._store.get(dep)
+            ts = source.timestamp if source is not None else self._disk.timestamp(dep)
+            if ts is None or ts > entry.timestamp:
+                return False
+        return True
+
+    def _remove(self, key: str) -> None:
+        self._unlink(key)
+        if self._store.pop(key, None) is not None:
+            self._bump(key)
+        if self._disk is not None:
+            self._disk.delete(key)
+
+    def _unlink(self, key: str) -> None:
+        """Forget the dependency edges recorded for a key's current entry."""
+        entry = self._store.get(key)
+        if entry is None:
+            return
+        for dep in entry.depends_on:
+            derived = self._dependents.get(dep)
+            if derived is not None:
+                derived.discard(key)
+                if not derived:
+                    del self._dependents[dep]
+
+    def _invalidate_dependents(self, key: str) -> None:
+        """Drop every entry transitively derived from key."""
+        pending = list(self._dependents.pop(key, ()))
+        seen = {key}
+        while pending:
+            k = pending.pop()
+            if k in seen:
+                continue
+            seen.add(k)
+            self._remove(k)
+            pending.extend(self._dependents.pop(k, ()))
+
+    def _spill(self, key: str, entry: CacheEntry, data: Any, generation: int) -> None:
+        """Write an entry's data to the disk tier, outside the lock.
+
+        The copy is recorded on the entry if the key is still at generation;
+        otherwise a newer set(), an upsert or a removal overtook the write,
+        and the file, which may now hold the older data, is deleted.
+        """
+        written = self._disk.write(key, data, entry.timestamp, entry.ttl, entry.tier, entry.depends_on)
+        with self._lock:
+            pending = self._spilling.pop(key) - 1
+            if pending:
+                self._spilling[key] = pending
+            if self._generations.get(key) == generation:
+                entry.spilled = written
+            elif written:
+                self._disk.delete(key)
+                current = self._store.get(key)
+                if current is not None:
+                    current.spilled = False
+
+    def _bump(self, key: str) -> None:
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _key_metrics(self, key: str) -> KeyMetrics:
+        m = self._metrics.get(key)
+        if m is None:
+            m = self._metrics[key] = KeyMetrics()
+        return m
+
+    def _measure_entries(self) -> None:
+        """Size the entries not measured since their data last changed.
+
+        Measuring (pickling) happens outside the lock; a size is only kept if
+        the entry still holds the data that was measured.
+        """
+        with self._lock:
+            unmeasured = [(k, e, e.data) for k, e in self._store.items() if e.size_bytes is None]
+        for key, entry, data in unmeasured:
+            size = self._disk.size(key) if entry.spilled else None
+            if size is None:
+                size = _estimate_bytes(data)
+            with self._lock:
+                if entry.data is data and entry.size_bytes is None:
+                    entry.size_bytes = size
 
     def _check_webhook_signal(self) -> None:
-        """Poll the signal file for webhook-triggered invalidation.
+        """Poll the event journal and signal file for webhook-triggered invalidation.
         Only checks once per second to avoid excessive I/O.
         """
         now = time.time()
         if now - self._last_signal_check < 1:
             return
-        self._last_signal_check = now
-
+        # Another thread is already applying events: don't wait for it
+        if not self._signal_lock.acquire(blocking=False):
+            return
         try:
-            if not os.path.exists(SIGNAL_FILE):
-                return
-            with open(SIGNAL_FILE) as f:
-                signal = json.load(f)
-            os.remove(SIGNAL_FILE)
+            self._last_signal_check = now
+            if self._journal is not None:
+                for record in self._journal.poll():
+                    self.apply_event(record.get("event", ""), record.get("data") or {})
+
+            try:
+                if not os.path.exists(SIGNAL_FILE):
+                    return
+                with open(SIGNAL_FILE) as f:
+                    signal = json.load(f)
+                os.remove(SIGNAL_FILE)
+                self.apply_event(signal.get("event", ""), signal.get("data") or {})
+            except (json.JSONDecodeError, OSError):
+                pass
+        finally:
+            self._signal_lock.release()
+
+    def apply_event(self, event: str, data: dict | None = None) -> None:
+        """Apply a webhook event: upsert carried records, else invalidate tiers."""
+        data = data or {}
+        updated: set[str] = set()
+        with self._lock:
+            handlers = list(self._event_handlers.items())
+        for name, handler in handlers:
+            try:
+                updated |= handler(event, data) or set()
+            except Exception as e:
+                logger.error(f"Cache event handler {name} failed for {event}: {e}")
 
-            event = signal.get("event", "")
+        if updated:
+            # The changed records are already in the cache — only the hot
+            # tier (Stripe sessions, Calendly events) still needs a refetch.
             if event in ("payment_completed", "booking_created"):
                 self.invalidate_tier("hot")
-                self.invalidate_tier("warm")
-            elif event in ("intake_submitted", "new_lead", "action_plan_sent"):
-                self.invalidate_tier("warm")
-            else:
-                self.invalidate_all()
-        except (json.JSONDecodeError, OSError):
-            pass
+            return
+
+        source = event.split(".", 1)[0]
+        if source in PROVIDER_SOURCES and "." in event:
+            # Provider webhook (stripe.*, calendly.*, manychat.*) — the record
+            # is already in the local store; re-read that source on next access.
+            self.invalidate_prefix(f"{source}_")
+        elif event in ("payment_completed", "booking_created"):
+            self.invalidate_tier("hot")
+            self.invalidate_tier("warm")
+        elif event in ("intake_submitted", "new_lead", "action_plan_sent"):
+            self.invalidate_tier("warm")
+        else:
+            # Unknown events, and a journal.gap (events rotated away unread)
+            self.invalidate_all()
+
+
+def _index_value(value: Any) -> Any:
+    """Normalize an index key: strings are case-folded, empty values skipped."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value if isinstance(value, (int, float, bool, tuple)) else None
+
+
+def _estimate_bytes(data: Any) -> int:
+    """Approximate in-memory footprint via serialized size.
+
+    Objects that can't be pickled (one holding a lock, say) are measured
+    by walking what they reference instead.
+    """
+    try:
+        return len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return _deep_sizeof(data)
+
+
+def _deep_sizeof(data: Any) -> int:
+    """sys.getsizeof summed over everything reachable from data (each object once)."""
+    seen: set[int] = set()
+    pending = [data]
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        else:
+            attrs = getattr(obj, "__dict__", None)
+            if isinstance(attrs, dict):
+                pending.append(attrs)
+            slots = getattr(type(obj), "__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                value = getattr(obj, name, None)
+                if value is not None:
+                    pending.append(value)
+    return total
+
+
+def _histogram_quantile(buckets: list[int], q: float) -> float:
+    """Upper bound of the bucket holding the q-th observation (0 if empty)."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    rank = q * total
+    running = 0
+    for i, count in enumerate(buckets):
+        running += count
+        if running >= rank and count:
+            return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+    return LATENCY_BUCKETS[-1]
+
+
+def _default_disk() -> DiskCache | None:
+    """L2 tier from CACHE_DISK_DIR, if configured."""
+    directory = os.getenv("CACHE_DISK_DIR", "")
+    if not directory:
+        return None
+    try:
+        return DiskCache(directory)
+    except OSError:
+        return None
+
+
+def _default_journal(disk: DiskCache | None) -> JournalReader:
+    """Tail the webhook journal. With an L2 tier the offset is persisted next
+    to it, so events that arrived while the app was down still invalidate
+    the entries reloaded from disk."""
+    offset_file = os.path.join(disk.directory, OFFSET_FILE_NAME) if disk is not None else None
+    return JournalReader(JOURNAL_FILE, offset_file=offset_file)
 
 
 # Singleton instance
-cache = CacheManager()
+_disk = _default_disk()
+cache = CacheManager(disk=_disk, journal=_default_journal(_disk))
@@ -2,28 +2,53 @@
 
 Event type: Creative Hotline Call (45 min, Stripe-gated $499).
 Calendly API uses Personal Access Token auth.
+
+With a webhook signing key and a LocalStore, invitee.created/invitee.canceled
+webhooks (ingest_webhook, called by the webhook receiver) keep a local
+bookings table current, and booking rate / time-to-book are computed from it.
+The API is then only swept every WEBHOOK_RECONCILE_SECONDS (following
+pagination) to backfill missed deliveries.
 """
 
 from __future__ import annotations
 
+import hashlib
+import hmac
+import json
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
 import requests
 
+from app.config import WEBHOOK_RECONCILE_SECONDS
 from app.services.cache_manager import cache
+from app.services import upstream
+from app.services.local_store import LocalStore
 
 logger = logging.getLogger(__name__)
 
 CALENDLY_API_BASE = "https://api.calendly.com"
+BOOKING_EVENTS = {"invitee.created", "invitee.canceled"}
+SIGNATURE_TOLERANCE = 180
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%S"
 
 
 class CalendlyService:
-    def __init__(self, api_key: str, org_uri: str = "", event_type_uri: str = ""):
+    def __init__(
+        self,
+        api_key: str,
+        org_uri: str = "",
+        event_type_uri: str = "",
+        webhook_secret: str = "",
+        store: LocalStore | None = None,
+    ):
         self._api_key = api_key
         self._org_uri = org_uri
         self._event_type_uri = event_type_uri
+        # Local bookings are only authoritative when webhooks feed them
+        self._store = store if webhook_secret else None
         self._headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
@@ -34,7 +59,8 @@ class CalendlyService:
         if not self._api_key:
             return False
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "Calendly", "users/me", requests.get,
                 f"{CALENDLY_API_BASE}/users/me",
                 headers=self._headers,
                 timeout=10,
@@ -46,7 +72,8 @@ class CalendlyService:
     def get_user_info(self) -> dict:
         """Get current user info (also discovers org URI)."""
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "Calendly", "users/me", requests.get,
                 f"{CALENDLY_API_BASE}/users/me",
                 headers=self._headers,
                 timeout=10,
@@ -89,7 +116,8 @@ class CalendlyService:
             if self._event_type_uri:
                 params["event_type"] = self._event_type_uri
 
-            resp = requests.get(
+            resp = upstream.call(
+                "Calendly", "scheduled_events", requests.get,
                 f"{CALENDLY_API_BASE}/scheduled_events",
                 headers=self._headers,
                 params=params,
@@ -107,7 +135,8 @@ class CalendlyService:
     def get_event_invitees(self, event_uuid: str) -> list[dict]:
         """Get invitees for a specific event."""
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "Calendly", "scheduled_events/invitees", requests.get,
                 f"{CALENDLY_API_BASE}/scheduled_events/{event_uuid}/invitees",
                 headers=self._headers,
                 timeout=10,
@@ -136,7 +165,8 @@ class CalendlyService:
 
         min_start = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "Calendly", "scheduled_events", requests.get,
                 f"{CALENDLY_API_BASE}/scheduled_events",
                 headers=self._headers,
                 params={
@@ -155,8 +185,15 @@ class CalendlyService:
 
     def get_booking_rate(self, days: int = 30) -> dict:
         """Calculate booking vs cancellation rate."""
-        active = self.get_scheduled_events(days_back=days, days_forward=0)
-        cancelled = self.get_no_shows(days=days)
+        if self._use_store(days):
+            since = (datetime.utcnow() - timedelta(days=days)).strftime(_TS_FORMAT)
+            now = datetime.utcnow().strftime(_TS_FORMAT)
+            bookings = self._store.calendly_bookings(start_after=since)
+            active = [b for b in bookings if b["status"] == "active" and b["start_time"] <= now]
+            cancelled = [b for b in bookings if b["status"] == "canceled"]
+        else:
+            active = self.get_scheduled_events(days_back=days, days_forward=0)
+            cancelled = self.get_no_shows(days=days)
         total = len(active) + len(cancelled)
         return {
             "booked": len(active),
@@ -169,7 +206,15 @@ class CalendlyService:
         """Average hours from event creation to event start (proxy for time-to-book).
         Returns None if no data available.
         """
-        events = self.get_scheduled_events(days_back=90, days_forward=0)
+        if self._use_store(90):
+            since = (datetime.utcnow() - timedelta(days=90)).strftime(_TS_FORMAT)
+            now = datetime.utcnow().strftime(_TS_FORMAT)
+            events = [
+                b for b in self._store.calendly_bookings(start_after=since, start_before=now)
+                if b["status"] == "active"
+            ]
+        else:
+            events = self.get_scheduled_events(days_back=90, days_forward=0)
         deltas = []
         for e in events:
             if e.get("created_at") and e.get("start_time"):
@@ -183,6 +228,68 @@ class CalendlyService:
                     continue
         return sum(deltas) / len(deltas) if deltas else None
 
+    def reconcile(self, days: int = 90) -> bool:
+        """Sweep active + canceled events from the API into the local store."""
+        if self._store is None:
+            return False
+        org_uri = self._org_uri or self._discover_org_uri()
+        if not org_uri:
+            return False
+
+        min_start = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        bookings = []
+        try:
+            for status in ("active", "canceled"):
+                params: dict[str, Any] = {
+                    "organization": org_uri,
+                    "min_start_time": min_start,
+                    "count": 100,
+                    "status": status,
+                }
+                if self._event_type_uri:
+                    params["event_type"] = self._event_type_uri
+                for event in self._paginate(f"{CALENDLY_API_BASE}/scheduled_events", params, "scheduled_events"):
+                    parsed = self._parse_event(event)
+                    bookings.append({
+                        "event_uri": parsed["uri"],
+                        "status": parsed["status"],
+                        "created_at": parsed["created_at"],
+                        "start_time": parsed["start_time"],
+                    })
+        except Exception as e:
+            logger.error(f"Calendly reconciliation failed: {e}")
+            return False
+
+        self._store.upsert_calendly_bookings(bookings)
+        self._store.mark_synced("calendly_bookings", days)
+        return True
+
+    def _use_store(self, days: int) -> bool:
+        """True when metrics should come from the webhook-fed store.
+
+        A stale store is reconciled first; if that fails, local data is
+        still used rather than a truncated API read.
+        """
+        if self._store is None:
+            return False
+        if not self._store.is_synced("calendly_bookings", WEBHOOK_RECONCILE_SECONDS, days):
+            self.reconcile(days)
+        return True
+
+    def _paginate(self, url: str, params: dict, operation: str) -> list[dict]:
+        """Follow Calendly's pagination.next_page links."""
+        collection = []
+        next_url: str | None = url
+        while next_url:
+            resp = upstream.call("Calendly", operation, requests.get,
+                                 next_url, headers=self._headers, params=params, timeout=15)
+            resp.raise_for_status()
+            body = resp.json()
+            collection.extend(body.get("collection", []))
+            next_url = (body.get("pagination") or {}).get("next_page")
+            params = None  # next_page already carries the query
+        return collection
+
     def _discover_org_uri(self) -> str:
         """Auto-discover org URI from current user."""
         info = self.get_user_info()
@@ -208,3 +315,59 @@ class CalendlyService:
             "event_type": event.get("event_type", ""),
             "invitees_count": event.get("invitees_counter", {}).get("total", 0),
         }
+
+
+def ingest_webhook(payload: bytes, sig_header: str, secret: str, store: LocalStore) -> str:
+    """Verify a signed Calendly webhook and record the booking it carries.
+
+    Returns the Calendly event name. Raises ValueError for a bad signature
+    or payload. Events other than invitee.created/canceled are ignored.
+    """
+    _verify_signature(payload, sig_header, secret)
+    try:
+        body = json.loads(payload)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+    if not isinstance(body, dict):
+        raise ValueError("Expected a JSON object")
+
+    event = body.get("event", "")
+    if event in BOOKING_EVENTS:
+        booking = _parse_invitee(body.get("payload") or {}, event, body.get("created_at", ""))
+        if booking["event_uri"]:
+            store.upsert_calendly_bookings([booking])
+    return event
+
+
+def _verify_signature(payload: bytes, sig_header: str, secret: str) -> None:
+    """Check a Calendly-Webhook-Signature header (t=<ts>,v1=<hex hmac>)."""
+    parts = dict(
+        part.strip().split("=", 1) for part in (sig_header or "").split(",") if "=" in part
+    )
+    try:
+        ts = int(parts["t"])
+        provided = parts["v1"]
+    except (KeyError, ValueError):
+        raise ValueError("Malformed Calendly signature header") from None
+    if abs(time.time() - ts) > SIGNATURE_TOLERANCE:
+        raise ValueError("Calendly signature timestamp out of tolerance")
+    expected = hmac.new(secret.encode(), f"{ts}.".encode() + payload, hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, provided):
+        raise ValueError("Calendly signature mismatch")
+
+
+def _parse_invitee(invitee: dict, event: str, event_created_at: str = "") -> dict:
+    """Flatten an invitee webhook payload into a local booking row."""
+    scheduled = invitee.get("scheduled_event") or {}
+    canceled = event == "invitee.canceled"
+    return {
+        "event_uri": scheduled.get("uri") or invitee.get("event", ""),
+        "invitee_uri": invitee.get("uri", ""),
+        "email": invitee.get("email", ""),
+        "name": invitee.get("name", ""),
+        "status": "canceled" if canceled else "active",
+        "rescheduled": invitee.get("rescheduled", False),
+        "created_at": "" if canceled else invitee.get("created_at") or event_created_at,
+        "start_time": scheduled.get("start_time", ""),
+        "canceled_at": (invitee.get("cancellation") or {}).get("canceled_at") or (event_created_at if canceled else ""),
+    }
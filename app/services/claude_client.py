@@ -6,6 +6,7 @@ import logging
 
 import anthropic
 
+from app.services import upstream
 from app.utils.frankie_prompts import (
     ACTION_PLAN_SYSTEM_PROMPT,
     ICP_ANALYSIS_SYSTEM_PROMPT,
@@ -41,7 +42,7 @@ class ClaudeService:
     def is_healthy(self) -> bool:
         """Check if Claude API key is valid without burning tokens."""
         try:
-            self._client.models.list(limit=1)
+            upstream.call("Claude AI", "models.list", self._client.models.list, limit=1)
             return True
         except Exception:
             return False
@@ -81,7 +82,8 @@ class ClaudeService:
         )
 
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=2048,
                 system=ACTION_PLAN_SYSTEM_PROMPT,
@@ -100,7 +102,8 @@ class ClaudeService:
         user_message = build_transcript_processing_prompt(raw_transcript)
 
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=4096,
                 system=TRANSCRIPT_PROCESSING_PROMPT,
@@ -143,7 +146,8 @@ class ClaudeService:
         )
 
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=2048,
                 system=ACTION_PLAN_SYSTEM_PROMPT,
@@ -180,7 +184,8 @@ class ClaudeService:
             constraints=constraints,
         )
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=800,
                 system=INTAKE_ANALYSIS_PROMPT,
@@ -213,7 +218,8 @@ class ClaudeService:
             constraints=constraints,
         )
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=500,
                 system=UPSELL_DETECTION_PROMPT,
@@ -254,7 +260,8 @@ class ClaudeService:
             call_date=call_date,
         )
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=500,
                 system=PRE_CALL_BRIEFING_PROMPT,
@@ -272,7 +279,8 @@ class ClaudeService:
         that need Frankie-voiced responses without specific system prompts.
         """
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=max_tokens,
                 messages=[{"role": "user", "content": prompt}],
@@ -293,7 +301,8 @@ class ClaudeService:
         user_message = build_icp_prompt(clients)
 
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=1500,
                 system=ICP_ANALYSIS_SYSTEM_PROMPT,
@@ -321,7 +330,8 @@ class ClaudeService:
             product_purchased=product_purchased,
         )
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=500,
                 system=TESTIMONIAL_GENERATION_PROMPT,
@@ -353,7 +363,8 @@ class ClaudeService:
             product_purchased=product_purchased,
         )
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=2048,
                 system=CASE_STUDY_PROMPT,
@@ -383,7 +394,8 @@ class ClaudeService:
             key_themes=key_themes,
         )
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=2048,
                 system=SPRINT_ROADMAP_PROMPT,
@@ -404,7 +416,8 @@ class ClaudeService:
             upsell_rate_pct=metrics.get("upsell_rate", 0),
         )
         try:
-            response = self._client.messages.create(
+            response = upstream.call(
+                "Claude AI", "messages.create", self._client.messages.create,
                 model=self._model,
                 max_tokens=1500,
                 system=REVENUE_STRATEGY_PROMPT,
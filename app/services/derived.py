@@ -0,0 +1,145 @@
+"""Cached derived analytics — computed once per source-data change.
+
+Scores, segments, LTV and attribution comparisons are expensive and used by
+several pages. Each is cached in the cold tier with a dependency on the
+Notion source keys it was built from, so it is recomputed only after the
+payments/intakes are refetched or invalidated (webhook, refresh button).
+
+All of them read from the ClientFrame (columnar, pre-parsed payment
+records), itself cached per refresh of the payments, rather than from the
+raw dicts.
+
+Keys are namespaced by the service class so Demo Mode and live data never
+share derived results.
+"""
+
+from __future__ import annotations
+
+from app.services.cache_manager import cache
+from app.utils.attribution import compare_models
+from app.utils.client_frame import ClientFrame
+from app.utils.lead_model import LeadModel
+from app.utils.lead_ranking import LeadRanking
+from app.utils.lead_scorer import ScoreMatrix, ScoreMemo, score_all_clients
+from app.utils.ltv_calculator import calculate_ltv
+from app.utils.search_index import SearchIndex
+from app.utils.segment_builder import build_all_segments
+
+PAYMENTS_KEY = "notion_payments"
+INTAKES_KEY = "notion_intakes"
+CLIENT_SOURCES = (PAYMENTS_KEY, INTAKES_KEY)
+
+# Outlive cache invalidation so a refresh re-scores (and re-ranks, re-indexes)
+# only the changed clients
+_score_memos: dict[str, ScoreMemo] = {}
+_rankings: dict[str, LeadRanking] = {}
+_search_indexes: dict[str, SearchIndex] = {}
+
+
+def derived_key(notion, name: str) -> str:
+    """Cache key for a derived result of the given Notion-like service."""
+    return f"derived:{type(notion).__name__}:{name}"
+
+
+def client_frame(notion) -> ClientFrame:
+    """ClientFrame over all payments."""
+    payments = notion.get_all_payments()
+    return cache.get_or_compute(
+        derived_key(notion, "client_frame"),
+        lambda: ClientFrame(payments),
+        depends_on=(PAYMENTS_KEY,),
+    )
+
+
+def _frame_key(notion) -> str:
+    return derived_key(notion, "client_frame")
+
+
+def scored_clients(notion) -> list[dict]:
+    """score_all_clients() over the merged client list."""
+    frame = client_frame(notion)
+    merged = notion.get_merged_clients()
+    key = derived_key(notion, "scored_clients")
+    memo = _score_memos.setdefault(key, ScoreMemo())
+    return cache.get_or_compute(
+        key,
+        lambda: score_all_clients(frame.with_intakes([c.get("intake") for c in merged]), memo=memo),
+        depends_on=CLIENT_SOURCES + (_frame_key(notion),),
+    )
+
+
+def lead_ranking(notion) -> LeadRanking:
+    """scored_clients() in rank order, moved client by client as scores change."""
+    scored = scored_clients(notion)
+    key = derived_key(notion, "lead_ranking")
+    ranking = _rankings.setdefault(key, LeadRanking())
+
+    def synced() -> LeadRanking:
+        ranking.sync(scored)
+        return ranking
+
+    return cache.get_or_compute(key, synced, depends_on=CLIENT_SOURCES + (derived_key(notion, "scored_clients"),))
+
+
+def search_index(notion) -> SearchIndex:
+    """Full-text index of the merged clients, re-indexing only those whose text changed."""
+    merged = notion.get_merged_clients()
+    key = derived_key(notion, "search_index")
+    index = _search_indexes.setdefault(key, SearchIndex())
+
+    def synced() -> SearchIndex:
+        index.sync(merged)
+        return index
+
+    return cache.get_or_compute(key, synced, depends_on=CLIENT_SOURCES)
+
+
+def score_matrix(notion) -> ScoreMatrix:
+    """ScoreMatrix over scored_clients(), rows in the same order."""
+    scored = scored_clients(notion)
+    return cache.get_or_compute(
+        derived_key(notion, "score_matrix"),
+        lambda: ScoreMatrix.from_scored(scored),
+        depends_on=CLIENT_SOURCES + (derived_key(notion, "scored_clients"),),
+    )
+
+
+def learned_scores(notion, model: LeadModel):
+    """The learned model's 0-100 scores for scored_clients(), rows in the same order."""
+    scored = scored_clients(notion)
+    return cache.get_or_compute(
+        derived_key(notion, f"learned_scores:{model.trained_at}"),
+        lambda: model.score(ClientFrame([s["payment"] for s in scored], [s.get("intake") for s in scored])),
+        depends_on=CLIENT_SOURCES + (derived_key(notion, "scored_clients"),),
+    )
+
+
+def client_segments(notion) -> list:
+    """build_all_segments() with lead scores attached."""
+    frame = client_frame(notion)
+    scored = scored_clients(notion)
+    return cache.get_or_compute(
+        derived_key(notion, "segments"),
+        lambda: build_all_segments(frame, scores=scored),
+        depends_on=CLIENT_SOURCES + (_frame_key(notion), derived_key(notion, "scored_clients")),
+    )
+
+
+def client_ltv(notion) -> list:
+    """calculate_ltv() over all payments."""
+    frame = client_frame(notion)
+    return cache.get_or_compute(
+        derived_key(notion, "ltv"),
+        lambda: calculate_ltv(frame),
+        depends_on=(PAYMENTS_KEY, _frame_key(notion)),
+    )
+
+
+def attribution_comparison(notion) -> dict:
+    """compare_models() — channel metrics for every attribution model."""
+    frame = client_frame(notion)
+    return cache.get_or_compute(
+        derived_key(notion, "attribution_models"),
+        lambda: compare_models(frame),
+        depends_on=(PAYMENTS_KEY, _frame_key(notion)),
+    )
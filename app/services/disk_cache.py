@@ -0,0 +1,198 @@
+"""On-disk L2 tier for CacheManager.
+
+One file per key under a cache directory. Each file is a small binary header
+followed by a pickle (protocol 5) payload:
+
+    b"CHC1" | uint32 header length | JSON header | pickle payload
+
+The header carries the original timestamp, TTL, tier and dependency list so
+an entry reloaded after a restart keeps its age and expires on schedule.
+Reads go through mmap, so only the bytes actually unpickled are paged in.
+
+Files are written to a temp name and renamed into place, so a crash mid-write
+never leaves a torn entry behind. Only this app writes the directory — never
+point it at a location other processes can write to (pickle is not safe for
+untrusted input).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CHC1"
+_LEN = struct.Struct("<I")
+_PREFIX = len(MAGIC) + _LEN.size
+SUFFIX = ".bin"
+
+
+@dataclass
+class DiskRecord:
+    key: str
+    data: Any
+    timestamp: float
+    ttl: float
+    tier: str
+    depends_on: tuple[str, ...]
+
+
+class DiskCache:
+    """Persistent key → entry store backing CacheManager."""
+
+    def __init__(self, directory: str):
+        self._dir = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self._dir
+
+    def write(
+        self,
+        key: str,
+        data: Any,
+        timestamp: float,
+        ttl: float,
+        tier: str,
+        depends_on: tuple[str, ...] = (),
+    ) -> bool:
+        """Persist an entry. Returns False if the data can't be serialized."""
+        try:
+            payload = pickle.dumps(data, protocol=5)
+        except Exception as e:
+            logger.warning(f"Disk cache skip {key}: {e}")
+            return False
+
+        header = json.dumps({
+            "key": key,
+            "timestamp": timestamp,
+            "ttl": ttl,
+            "tier": tier,
+            "depends_on": list(depends_on),
+        }).encode()
+
+        fd, tmp = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC)
+                f.write(_LEN.pack(len(header)))
+                f.write(header)
+                f.write(payload)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            logger.warning(f"Disk cache write failed for {key}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def read(self, key: str) -> DiskRecord | None:
+        """Load an entry (including its original timestamp), or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    header = self._read_header(mm)
+                    if header is None or header.get("key") != key:
+                        return None
+                    offset = _PREFIX + header["_len"]
+                    with memoryview(mm)[offset:] as payload:
+                        data = pickle.loads(payload)
+        except (OSError, ValueError):
+            # Missing file, or empty file (mmap can't map zero bytes)
+            return None
+        except Exception as e:
+            logger.warning(f"Disk cache entry for {key} unreadable, dropping: {e}")
+            self.delete(key)
+            return None
+
+        return DiskRecord(
+            key=key,
+            data=data,
+            timestamp=header["timestamp"],
+            ttl=header["ttl"],
+            tier=header["tier"],
+            depends_on=tuple(header.get("depends_on", ())),
+        )
+
+    def timestamp(self, key: str) -> float | None:
+        """Original timestamp of an entry without unpickling its payload."""
+        try:
+            with open(self._path(key), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    header = self._read_header(mm)
+        except (OSError, ValueError):
+            return None
+        if header is None or header.get("key") != key:
+            return None
+        return header["timestamp"]
+
+    def size(self, key: str) -> int | None:
+        """Payload size of an entry in bytes (its pickled data), without unpickling it."""
+        try:
+            with open(self._path(key), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    header = self._read_header(mm)
+                    if header is None or header.get("key") != key:
+                        return None
+                    return len(mm) - _PREFIX - header["_len"]
+        except (OSError, ValueError):
+            return None
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self._dir):
+            if name.endswith(SUFFIX) or name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(self._dir, name))
+                except OSError:
+                    pass
+
+    def keys(self) -> list[str]:
+        """All keys currently on disk (reads headers only)."""
+        result = []
+        for name in os.listdir(self._dir):
+            if not name.endswith(SUFFIX):
+                continue
+            try:
+                with open(os.path.join(self._dir, name), "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        header = self._read_header(mm)
+            except (OSError, ValueError):
+                continue
+            if header is not None:
+                result.append(header["key"])
+        return result
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self._dir, digest + SUFFIX)
+
+    @staticmethod
+    def _read_header(mm: mmap.mmap) -> dict | None:
+        if len(mm) < _PREFIX or mm[:len(MAGIC)] != MAGIC:
+            return None
+        (length,) = _LEN.unpack(mm[len(MAGIC):_PREFIX])
+        try:
+            header = json.loads(mm[_PREFIX:_PREFIX + length])
+        except ValueError:
+            return None
+        header["_len"] = length
+        return header
@@ -0,0 +1,396 @@
+"""Durable, sequence-numbered event journal for webhook events.
+
+The webhook receiver appends every event as one JSON line:
+
+    {"seq": 42, "ts": 1760000000.0, "event": "payment_completed", "data": {...}}
+
+Appends are written through to the OS immediately (so other processes can
+tail them) and fsync'd in batches by a background thread — at most
+fsync_interval seconds or fsync_batch events after the write. The fsync
+runs outside the append lock, so appends never wait on the disk. Sequence
+numbers are strictly increasing and survive restarts.
+
+Once the journal passes max_bytes it is rotated: the file is renamed to a
+segment named after its last seq (events.jsonl.000000000042) and a new one
+is started. A segment is deleted once every consumer listed in `consumers`
+(their offset files) has read past it, and the oldest are deleted beyond
+keep_segments regardless.
+
+Consumers tail with JournalReader, which remembers its position and can
+persist it to an offset file so a restarted consumer resumes exactly where it
+left off. A reader notices a rotation and finishes the segments it hadn't
+read before moving on; if they were already deleted it reports a
+"journal.gap" event so the consumer can drop whatever it derived. replay()
+walks the journal (segments included) from any sequence number for
+rebuilding derived state.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+JOURNAL_FILE = os.getenv("EVENT_JOURNAL_PATH") or os.path.join(_PROJECT_ROOT, "plans", "events.jsonl")
+# Name of a reader's offset file when it is kept next to other state (the cache's L2 directory)
+OFFSET_FILE_NAME = "journal.offset"
+# Reported by JournalReader when events it never read were rotated away
+GAP_EVENT = "journal.gap"
+
+
+class EventJournal:
+    """Append-only writer. One instance per journal file per process."""
+
+    def __init__(
+        self,
+        path: str = JOURNAL_FILE,
+        fsync_interval: float = 0.05,
+        fsync_batch: int = 64,
+        max_bytes: int = 16 * 1024 * 1024,
+        keep_segments: int = 4,
+        consumers: tuple[str, ...] = (),
+    ):
+        self._path = path
+        self._fsync_interval = fsync_interval
+        self._fsync_batch = fsync_batch
+        self._max_bytes = max_bytes
+        self._keep_segments = keep_segments
+        self._consumers = consumers
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        # Held around fsync and around swapping/closing the file, never with an
+        # fsync inside self._lock except when rotating or closing
+        self._fsync_lock = threading.Lock()
+        self._pending = 0
+        self._synced_seq = 0
+        self._closed = False
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._seq = _journal_last_seq(path)
+        self._synced_seq = self._seq
+        self._file = open(path, "ab")
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-fsync", daemon=True)
+        self._flusher.start()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def append(self, event: str, data: dict | None = None, sync: bool = False) -> int:
+        """Append an event and return its sequence number.
+
+        With sync=True, block until the event has been fsync'd.
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError("journal is closed")
+            self._seq += 1
+            seq = self._seq
+            record = {"seq": seq, "ts": time.time(), "event": event, "data": data or {}}
+            self._file.write(json.dumps(record, separators=(",", ":"), default=str).encode() + b"\n")
+            self._file.flush()
+            self._pending += 1
+            if self._file.tell() >= self._max_bytes:
+                self._rotate_locked()
+            elif self._pending >= self._fsync_batch:
+                self._synced.notify_all()
+            if sync:
+                while self._synced_seq < seq and not self._closed:
+                    self._synced.notify_all()
+                    self._synced.wait(self._fsync_interval)
+        return seq
+
+    def segments(self) -> list[str]:
+        """Rotated segment paths, oldest first."""
+        return [segment for _, segment in _segments(self._path)]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._synced.notify_all()
+            file, seq, pending = self._file, self._seq, self._pending
+        self._flusher.join(timeout=1)
+        self._sync(file, seq, pending)
+        with self._fsync_lock:
+            self._file.close()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                self._synced.wait(self._fsync_interval)
+                if self._closed or not self._pending:
+                    continue
+                file, seq, pending = self._file, self._seq, self._pending
+            self._sync(file, seq, pending)
+
+    def _sync(self, file, seq: int, pending: int) -> None:
+        """fsync file (the journal as of seq) without holding the append lock."""
+        with self._fsync_lock:
+            if file is not self._file or file.closed:
+                return  # Rotated meanwhile; the rotation synced it
+            try:
+                os.fsync(file.fileno())
+            except OSError as e:
+                logger.error(f"Journal fsync failed: {e}")
+                return
+        with self._lock:
+            self._synced_seq = max(self._synced_seq, seq)
+            self._pending = max(0, self._pending - pending)
+            self._synced.notify_all()
+
+    def _rotate_locked(self) -> None:
+        """Move the full journal to a segment and start a new file (rare, so fsync under the lock)."""
+        segment = f"{self._path}.{self._seq:012d}"
+        with self._fsync_lock:
+            try:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                os.replace(self._path, segment)
+            except OSError as e:
+                logger.error(f"Journal rotation failed: {e}")
+                if self._file.closed:
+                    self._file = open(self._path, "ab")
+                return
+            self._file = open(self._path, "ab")
+        self._pending = 0
+        self._synced_seq = self._seq
+        self._synced.notify_all()
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete segments every consumer has read past, and any beyond keep_segments."""
+        segments = _segments(self._path)
+        lowest = min(((_read_offset(f) or (0, 0))[0] for f in self._consumers), default=None)
+        excess = len(segments) - self._keep_segments
+        for i, (last, segment) in enumerate(segments):
+            if i < excess or (lowest is not None and last <= lowest):
+                try:
+                    os.remove(segment)
+                except OSError as e:
+                    logger.error(f"Journal segment cleanup failed: {e}")
+
+
+class JournalReader:
+    """Tails a journal from a saved offset.
+
+    The offset ({"seq", "pos"}) is kept in memory and, when offset_file is
+    given, persisted after every poll() that consumed events. A reader with
+    no saved offset starts at the end of the journal unless from_start=True.
+    A segment holding its seq means the file it was reading was rotated: it
+    reads the segments it hasn't seen, then the new file from the start.
+    """
+
+    def __init__(self, path: str = JOURNAL_FILE, offset_file: str | None = None, from_start: bool = False):
+        self._path = path
+        self._offset_file = offset_file
+        self.seq = 0
+        self.pos = 0
+        self._rotated = False
+
+        saved = self._load_offset()
+        if saved is not None:
+            self.seq, self.pos = saved
+        elif not from_start:
+            self.seq = _journal_last_seq(path)
+            self.pos = _size(path)
+
+    def poll(self, limit: int | None = None) -> list[dict]:
+        """Return events appended since the last poll (in sequence order)."""
+        events: list[dict] = []
+        try:
+            f = open(self._path, "rb")
+        except OSError:
+            f = None
+        try:
+            # Listed after opening: if the file is rotated in between, the
+            # segments cover it (and seqs already taken are skipped)
+            segments = _segments(self._path)
+            if segments and segments[-1][0] >= self.seq:
+                self._rotated = True
+                for last, segment in segments:
+                    if last <= self.seq:
+                        continue
+                    for record in _iter_file(segment, self.seq):
+                        if not self._take(record, events, limit):
+                            return self._done(events)
+                self.pos = 0
+            if f is None:
+                return self._done(events)
+
+            size = os.fstat(f.fileno()).st_size
+            if size < self.pos:
+                # Journal was truncated or replaced — rescan, skipping what we've seen
+                self.pos = 0
+            if size == self.pos:
+                return self._done(events)
+            f.seek(self.pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial write; pick it up next poll
+                self.pos += len(line)
+                record = _parse_line(line)
+                if record is not None and not self._take(record, events, limit):
+                    break
+        except OSError as e:
+            logger.error(f"Journal read failed: {e}")
+        finally:
+            if f is not None:
+                f.close()
+        return self._done(events)
+
+    def _take(self, record: dict, events: list[dict], limit: int | None) -> bool:
+        """Append record if unseen; False once limit is reached."""
+        seq = record["seq"]
+        if seq <= self.seq:
+            return True
+        if self._rotated:
+            self._rotated = False
+            if self.seq and seq > self.seq + 1:
+                logger.warning(f"Journal events {self.seq + 1}-{seq - 1} were rotated away unread")
+                events.append({
+                    "seq": self.seq, "ts": time.time(), "event": GAP_EVENT,
+                    "data": {"after": self.seq, "resumed": seq},
+                })
+        self.seq = seq
+        events.append(record)
+        return limit is None or len(events) < limit
+
+    def _done(self, events: list[dict]) -> list[dict]:
+        if events:
+            self._save_offset()
+        return events
+
+    def _load_offset(self) -> tuple[int, int] | None:
+        return _read_offset(self._offset_file) if self._offset_file else None
+
+    def _save_offset(self) -> None:
+        if not self._offset_file:
+            return
+        tmp = self._offset_file + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"seq": self.seq, "pos": self.pos}, f)
+            os.replace(tmp, self._offset_file)
+        except OSError as e:
+            logger.error(f"Journal offset save failed: {e}")
+
+
+def iter_events(path: str = JOURNAL_FILE, from_seq: int = 0) -> Iterator[dict]:
+    """Yield every complete event with seq > from_seq, from retained segments on."""
+    for last, segment in _segments(path):
+        if last > from_seq:
+            yield from _iter_file(segment, from_seq)
+    yield from _iter_file(path, from_seq)
+
+
+def replay(handler: Callable[[dict], None], path: str = JOURNAL_FILE, from_seq: int = 0) -> int:
+    """Feed every event after from_seq to handler, in order. Returns the last seq."""
+    last = from_seq
+    for record in iter_events(path, from_seq):
+        handler(record)
+        last = record["seq"]
+    return last
+
+
+def _iter_file(path: str, from_seq: int) -> Iterator[dict]:
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return
+    with f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            record = _parse_line(line)
+            if record is not None and record["seq"] > from_seq:
+                yield record
+
+
+def _segments(path: str) -> list[tuple[int, str]]:
+    """(last seq, path) of each rotated segment of a journal, oldest first."""
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "."
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    found = []
+    for name in names:
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and suffix.isdigit():
+            found.append((int(suffix), os.path.join(directory, name)))
+    return sorted(found)
+
+
+def _read_offset(offset_file: str) -> tuple[int, int] | None:
+    """(seq, pos) saved by a JournalReader, or None if it hasn't saved one."""
+    try:
+        with open(offset_file) as f:
+            saved = json.load(f)
+        return int(saved["seq"]), int(saved["pos"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _parse_line(line: bytes) -> dict | None:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("seq"), int):
+        return None
+    return record
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _journal_last_seq(path: str) -> int:
+    """Highest sequence number in the journal or, if it was just rotated, its newest segment."""
+    last = _last_seq(path)
+    if not last:
+        segments = _segments(path)
+        if segments:
+            return segments[-1][0]
+    return last
+
+
+def _last_seq(path: str) -> int:
+    """Highest sequence number in the journal (reads only the tail)."""
+    size = _size(path)
+    if not size:
+        return 0
+    chunk = 64 * 1024
+    with open(path, "rb") as f:
+        while True:
+            start = max(0, size - chunk)
+            f.seek(start)
+            lines = f.read(size - start).split(b"\n")
+            # First line may be cut off unless we're at the start of the file
+            candidates = lines if start == 0 else lines[1:]
+            for line in reversed(candidates):
+                record = _parse_line(line) if line.strip() else None
+                if record is not None:
+                    return record["seq"]
+            if start == 0:
+                return 0
+            chunk *= 4
@@ -7,6 +7,7 @@ from datetime import datetime
 
 import requests
 
+from app.services import upstream
 from app.services.cache_manager import cache
 
 logger = logging.getLogger(__name__)
@@ -27,7 +28,8 @@ class FirefliesService:
         payload: dict = {"query": query}
         if variables:
             payload["variables"] = variables
-        resp = requests.post(
+        resp = upstream.call(
+            "Fireflies", "graphql", requests.post,
             GRAPHQL_ENDPOINT, json=payload, headers=self._headers, timeout=30,
         )
         resp.raise_for_status()
@@ -0,0 +1,295 @@
+"""Local SQLite event store for webhook-ingested data.
+
+Webhooks (Stripe, Calendly, ManyChat) upsert records here as they happen, so revenue and
+booking metrics can be read locally instead of polling upstream APIs. The
+upstream APIs are still swept periodically to reconcile anything a webhook
+missed; sync_state records when each sweep last ran and how far back it
+reached.
+
+One short-lived connection per operation keeps the store safe to use from
+the threaded webhook receiver and the Streamlit app at the same time (WAL
+mode lets readers proceed while a writer commits). ":memory:" (tests,
+throwaway runs) is the exception: it keeps a single connection, since an
+in-memory database is gone once its connection closes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STORE_FILE = os.getenv("LOCAL_STORE_PATH") or os.path.join(_PROJECT_ROOT, "plans", "local_store.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stripe_sessions (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL DEFAULT '',
+    amount REAL NOT NULL DEFAULT 0,
+    product_name TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    payment_status TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL DEFAULT '',
+    payment_intent TEXT NOT NULL DEFAULT '',
+    metadata TEXT NOT NULL DEFAULT '{}',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stripe_sessions_created ON stripe_sessions(created);
+
+CREATE TABLE IF NOT EXISTS stripe_refunds (
+    id TEXT PRIMARY KEY,
+    payment_intent TEXT NOT NULL DEFAULT '',
+    amount REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stripe_refunds_created ON stripe_refunds(created);
+
+CREATE TABLE IF NOT EXISTS calendly_bookings (
+    event_uri TEXT PRIMARY KEY,
+    invitee_uri TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    rescheduled INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT '',
+    start_time TEXT NOT NULL DEFAULT '',
+    canceled_at TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_calendly_bookings_start ON calendly_bookings(start_time);
+
+CREATE TABLE IF NOT EXISTS manychat_subscribers (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    subscribed_at TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '[]',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_manychat_subscribers_at ON manychat_subscribers(subscribed_at);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    days INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_SESSION_FIELDS = (
+    "id", "email", "name", "amount", "product_name", "status",
+    "payment_status", "created", "payment_intent", "metadata",
+)
+_REFUND_FIELDS = ("id", "payment_intent", "amount", "status", "created")
+_BOOKING_FIELDS = (
+    "event_uri", "invitee_uri", "email", "name", "status", "rescheduled",
+    "created_at", "start_time", "canceled_at",
+)
+_SUBSCRIBER_FIELDS = ("id", "name", "email", "subscribed_at", "tags")
+
+
+class LocalStore:
+    """Thin data-access layer over the local SQLite file."""
+
+    def __init__(self, path: str = STORE_FILE):
+        self._path = path
+        # An in-memory database lives as long as its connection, so ":memory:"
+        # keeps one (shared across threads, serialized by a lock)
+        self._memory: sqlite3.Connection | None = None
+        self._memory_lock = threading.Lock()
+        if path == ":memory:":
+            self._memory = sqlite3.connect(path, check_same_thread=False)
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    # ── Stripe ───────────────────────────────────────────────────
+
+    def upsert_stripe_sessions(self, sessions: list[dict]) -> int:
+        """Insert or replace parsed checkout sessions. Returns rows written."""
+        now = time.time()
+        rows = [
+            (
+                s["id"], s.get("email") or "", s.get("name") or "", float(s.get("amount") or 0),
+                s.get("product_name") or "", s.get("status") or "", s.get("payment_status") or "",
+                s.get("created") or "", s.get("payment_intent") or "",
+                json.dumps(s.get("metadata") or {}), now,
+            )
+            for s in sessions if s.get("id")
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO stripe_sessions ({', '.join(_SESSION_FIELDS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(_SESSION_FIELDS) + 1))})",
+                rows,
+            )
+        return len(rows)
+
+    def stripe_sessions(self, since: str = "", status: str = "complete") -> list[dict]:
+        """Sessions created at or after `since` (ISO string), oldest first."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"SELECT {', '.join(_SESSION_FIELDS)} FROM stripe_sessions "
+                "WHERE created >= ? AND status = ? ORDER BY created",
+                (since, status),
+            )
+            rows = cur.fetchall()
+        sessions = []
+        for row in rows:
+            s = dict(zip(_SESSION_FIELDS, row))
+            s["metadata"] = json.loads(s["metadata"] or "{}")
+            sessions.append(s)
+        return sessions
+
+    def upsert_stripe_refunds(self, refunds: list[dict]) -> int:
+        now = time.time()
+        rows = [
+            (
+                r["id"], r.get("payment_intent") or "", float(r.get("amount") or 0),
+                r.get("status") or "", r.get("created") or "", now,
+            )
+            for r in refunds if r.get("id")
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO stripe_refunds ({', '.join(_REFUND_FIELDS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(_REFUND_FIELDS) + 1))})",
+                rows,
+            )
+        return len(rows)
+
+    def stripe_refunds(self, since: str = "") -> list[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_REFUND_FIELDS)} FROM stripe_refunds WHERE created >= ? ORDER BY created",
+                (since,),
+            ).fetchall()
+        return [dict(zip(_REFUND_FIELDS, row)) for row in rows]
+
+    # ── Calendly ─────────────────────────────────────────────────
+
+    def upsert_calendly_bookings(self, bookings: list[dict]) -> int:
+        """Insert or merge bookings keyed by scheduled event URI.
+
+        Empty fields never overwrite stored values, so an API sweep (which
+        has no invitee email) doesn't erase what a webhook recorded.
+        """
+        now = time.time()
+        rows = [
+            (
+                b["event_uri"], b.get("invitee_uri") or "", b.get("email") or "", b.get("name") or "",
+                b.get("status") or "", int(bool(b.get("rescheduled"))), b.get("created_at") or "",
+                b.get("start_time") or "", b.get("canceled_at") or "", now,
+            )
+            for b in bookings if b.get("event_uri")
+        ]
+        merge = ", ".join(
+            f"{f} = CASE WHEN excluded.{f} != '' THEN excluded.{f} ELSE {f} END"
+            for f in _BOOKING_FIELDS[1:] if f != "rescheduled"
+        )
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO calendly_bookings ({', '.join(_BOOKING_FIELDS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(_BOOKING_FIELDS) + 1))}) "
+                f"ON CONFLICT(event_uri) DO UPDATE SET {merge}, "
+                "rescheduled = MAX(rescheduled, excluded.rescheduled), updated_at = excluded.updated_at",
+                rows,
+            )
+        return len(rows)
+
+    def calendly_bookings(self, start_after: str = "", start_before: str = "\uffff") -> list[dict]:
+        """Bookings whose call starts in [start_after, start_before], by start time."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_BOOKING_FIELDS)} FROM calendly_bookings "
+                "WHERE start_time >= ? AND start_time <= ? ORDER BY start_time",
+                (start_after, start_before),
+            ).fetchall()
+        bookings = []
+        for row in rows:
+            b = dict(zip(_BOOKING_FIELDS, row))
+            b["rescheduled"] = bool(b["rescheduled"])
+            bookings.append(b)
+        return bookings
+
+    # ── ManyChat ─────────────────────────────────────────────────
+
+    def upsert_manychat_subscribers(self, subscribers: list[dict]) -> int:
+        now = time.time()
+        rows = [
+            (
+                str(s["id"]), s.get("name") or "", s.get("email") or "",
+                s.get("subscribed_at") or "", json.dumps(s.get("tags") or []), now,
+            )
+            for s in subscribers if s.get("id")
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO manychat_subscribers ({', '.join(_SUBSCRIBER_FIELDS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(_SUBSCRIBER_FIELDS) + 1))})",
+                rows,
+            )
+        return len(rows)
+
+    def manychat_subscribers(self, since: str = "") -> list[dict]:
+        """Subscribers who subscribed at or after `since`, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_SUBSCRIBER_FIELDS)} FROM manychat_subscribers "
+                "WHERE subscribed_at >= ? ORDER BY subscribed_at",
+                (since,),
+            ).fetchall()
+        subscribers = []
+        for row in rows:
+            s = dict(zip(_SUBSCRIBER_FIELDS, row))
+            s["tags"] = json.loads(s["tags"] or "[]")
+            subscribers.append(s)
+        return subscribers
+
+    # ── Reconciliation bookkeeping ───────────────────────────────
+
+    def mark_synced(self, name: str, days: int = 0) -> None:
+        """Record a completed upstream sweep covering the last `days` days."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (name, synced_at, days) VALUES (?, ?, ?)",
+                (name, time.time(), days),
+            )
+
+    def is_synced(self, name: str, max_age: float, days: int = 0) -> bool:
+        """True if a sweep covering at least `days` ran within max_age seconds."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT synced_at, days FROM sync_state WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None:
+            return False
+        synced_at, covered = row
+        return time.time() - synced_at <= max_age and covered >= days
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if self._memory is not None:
+            with self._memory_lock, self._memory:
+                yield self._memory
+            return
+        conn = sqlite3.connect(self._path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
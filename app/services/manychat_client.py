@@ -3,18 +3,30 @@
 ManyChat handles Instagram DM automation for @creative.hotline.
 Provides subscriber counts, keyword trigger stats, and flow completion rates.
 Falls back to CSV import if API is unavailable.
+
+ManyChat can't sign webhooks, so an "External Request" action in the new
+subscriber automation POSTs the contact to the webhook receiver with a shared
+secret header (X-Webhook-Secret = MANYCHAT_WEBHOOK_SECRET). With that secret
+and a LocalStore, new-subscriber metrics are read from the local table and
+the API is only swept every WEBHOOK_RECONCILE_SECONDS.
 """
 
 from __future__ import annotations
 
 import csv
+import hmac
 import io
+import json
 import logging
+from datetime import datetime, timedelta
 from typing import Any
 
 import requests
 
+from app.config import WEBHOOK_RECONCILE_SECONDS
 from app.services.cache_manager import cache
+from app.services import upstream
+from app.services.local_store import LocalStore
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +34,10 @@ MANYCHAT_API_BASE = "https://api.manychat.com"
 
 
 class ManyChatService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, webhook_secret: str = "", store: LocalStore | None = None):
         self._api_key = api_key
+        # Local subscribers are only authoritative when webhooks feed them
+        self._store = store if webhook_secret else None
         self._headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
@@ -35,7 +49,8 @@ class ManyChatService:
         if not self._api_key:
             return False
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "ManyChat", "fb/page/getInfo", requests.get,
                 f"{MANYCHAT_API_BASE}/fb/page/getInfo",
                 headers=self._headers,
                 timeout=10,
@@ -51,7 +66,8 @@ class ManyChatService:
             return cached
 
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "ManyChat", "fb/page/getInfo", requests.get,
                 f"{MANYCHAT_API_BASE}/fb/page/getInfo",
                 headers=self._headers,
                 timeout=10,
@@ -72,34 +88,51 @@ class ManyChatService:
         if cached is not None:
             return cached
 
+        if self._store is not None:
+            if not self._store.is_synced("manychat_subscribers", WEBHOOK_RECONCILE_SECONDS, days):
+                self.reconcile(days)
+            since = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
+            subscribers = self._store.manychat_subscribers(since=since)
+            cache.set(cache_key, subscribers, tier="warm")
+            return subscribers
+
         try:
-            resp = requests.post(
-                f"{MANYCHAT_API_BASE}/fb/subscriber/getSubscribers",
-                headers=self._headers,
-                json={
-                    "filter": {
-                        "date_added": {"from": f"-{days} days", "to": "now"},
-                    },
-                    "limit": 100,
-                },
-                timeout=15,
-            )
-            resp.raise_for_status()
-            subscribers = []
-            for sub in resp.json().get("data", []):
-                subscribers.append({
-                    "id": sub.get("id", ""),
-                    "name": sub.get("name", ""),
-                    "email": sub.get("email", ""),
-                    "subscribed_at": sub.get("subscribed_time", ""),
-                    "tags": [t.get("name", "") for t in sub.get("tags", [])],
-                })
+            subscribers = self._fetch_new_subscribers(days)
             cache.set(cache_key, subscribers, tier="warm")
             return subscribers
         except Exception as e:
             logger.error(f"ManyChat new subscribers failed: {e}")
             return []
 
+    def reconcile(self, days: int = 30) -> bool:
+        """Sweep recent subscribers from the API into the local store."""
+        if self._store is None:
+            return False
+        try:
+            subscribers = self._fetch_new_subscribers(days)
+        except Exception as e:
+            logger.error(f"ManyChat reconciliation failed: {e}")
+            return False
+        self._store.upsert_manychat_subscribers(subscribers)
+        self._store.mark_synced("manychat_subscribers", days)
+        return True
+
+    def _fetch_new_subscribers(self, days: int) -> list[dict]:
+        resp = upstream.call(
+            "ManyChat", "fb/subscriber/getSubscribers", requests.post,
+            f"{MANYCHAT_API_BASE}/fb/subscriber/getSubscribers",
+            headers=self._headers,
+            json={
+                "filter": {
+                    "date_added": {"from": f"-{days} days", "to": "now"},
+                },
+                "limit": 100,
+            },
+            timeout=15,
+        )
+        resp.raise_for_status()
+        return [_parse_subscriber(sub) for sub in resp.json().get("data", [])]
+
     def get_keyword_stats(self) -> dict[str, int]:
         """Get trigger keyword hit counts.
         Note: ManyChat doesn't expose keyword stats directly via API.
@@ -110,7 +143,8 @@ class ManyChatService:
             return cached
 
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "ManyChat", "fb/sending/getFlows", requests.get,
                 f"{MANYCHAT_API_BASE}/fb/sending/getFlows",
                 headers=self._headers,
                 timeout=10,
@@ -138,7 +172,8 @@ class ManyChatService:
             return cached
 
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "ManyChat", "fb/sending/getFlows", requests.get,
                 f"{MANYCHAT_API_BASE}/fb/sending/getFlows",
                 headers=self._headers,
                 timeout=10,
@@ -165,7 +200,8 @@ class ManyChatService:
             return cached
 
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "ManyChat", "fb/page/getTags", requests.get,
                 f"{MANYCHAT_API_BASE}/fb/page/getTags",
                 headers=self._headers,
                 timeout=10,
@@ -224,3 +260,37 @@ class ManyChatService:
         )
 
         return (booked / len(sub_emails)) * 100
+
+
+def ingest_webhook(payload: bytes, token: str, secret: str, store: LocalStore) -> str:
+    """Check the shared secret and record the subscriber a ManyChat request carries.
+
+    Accepts ManyChat's "full contact data" body, or {"event": ..., "subscriber": {...}}.
+    Returns the event name (default "subscriber.created"). Raises ValueError
+    for a wrong secret or a payload without a subscriber id.
+    """
+    if not token or not hmac.compare_digest(token.encode(), secret.encode()):
+        raise ValueError("Invalid ManyChat webhook secret")
+    try:
+        body = json.loads(payload)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+    if not isinstance(body, dict):
+        raise ValueError("Expected a JSON object")
+
+    subscriber = body.get("subscriber") if isinstance(body.get("subscriber"), dict) else body
+    if not subscriber.get("id"):
+        raise ValueError("Subscriber id missing")
+    store.upsert_manychat_subscribers([_parse_subscriber(subscriber)])
+    return body.get("event") or "subscriber.created"
+
+
+def _parse_subscriber(sub: dict) -> dict:
+    """Flatten a ManyChat subscriber (API or webhook shape)."""
+    return {
+        "id": str(sub.get("id", "")),
+        "name": sub.get("name", ""),
+        "email": sub.get("email") or "",
+        "subscribed_at": sub.get("subscribed_time") or sub.get("subscribed") or "",
+        "tags": [t.get("name", "") if isinstance(t, dict) else str(t) for t in sub.get("tags") or []],
+    }
@@ -6,6 +6,8 @@ import logging
 
 import requests
 
+from app.services import upstream
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,7 +19,8 @@ class N8nService:
     def is_healthy(self) -> bool:
         """Check if n8n API is reachable."""
         try:
-            resp = requests.get(
+            resp = upstream.call(
+                "n8n", "workflows", requests.get,
                 f"{self._base_url}/api/v1/workflows",
                 headers={"X-N8N-API-KEY": self._api_key},
                 params={"limit": 1},
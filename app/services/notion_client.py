@@ -2,6 +2,10 @@
 
 Follows the established n8n pattern: fetch all records, filter/aggregate in Python.
 Parses all Notion property types into clean Python dicts.
+
+Webhook events that carry a changed record (or just its page id) are
+upserted straight into the cached payment/intake lists, so a new payment or
+intake shows up without refetching the whole database.
 """
 
 from __future__ import annotations
@@ -13,21 +17,29 @@ from typing import Any
 from notion_client import Client
 
 from app.config import PIPELINE_STATUSES
+from app.services import upstream
 from app.services.cache_manager import cache
 
 logger = logging.getLogger(__name__)
 
+PAYMENTS_KEY = "notion_payments"
+INTAKES_KEY = "notion_intakes"
+
+# Events whose record belongs to the Intake DB when "database" isn't given
+INTAKE_EVENTS = {"intake_submitted", "action_plan_sent"}
+
 
 class NotionService:
     def __init__(self, api_key: str, payments_db_id: str, intake_db_id: str):
         self._client = Client(auth=api_key)
         self._payments_db = payments_db_id
         self._intake_db = intake_db_id
+        cache.register_event_handler("notion", self.apply_webhook_event)
 
     def is_healthy(self) -> bool:
         """Check if Notion API is reachable."""
         try:
-            self._client.databases.retrieve(database_id=self._payments_db)
+            upstream.call("Notion", "databases.retrieve", self._client.databases.retrieve, database_id=self._payments_db)
             return True
         except Exception:
             return False
@@ -36,12 +48,12 @@ class NotionService:
 
     def get_all_payments(self) -> list[dict]:
         """Fetch all records from Payments DB. Cached warm (5min)."""
-        cached = cache.get("notion_payments")
+        cached = cache.get(PAYMENTS_KEY)
         if cached is not None:
             return cached
         records = self._query_all(self._payments_db)
         parsed = [self._parse_payment(r) for r in records]
-        cache.set("notion_payments", parsed, tier="warm")
+        cache.set(PAYMENTS_KEY, parsed, tier="warm")
         return parsed
 
     def get_payments_by_status(self, status: str) -> list[dict]:
@@ -59,30 +71,100 @@ class NotionService:
         return counts
 
     def get_client_by_email(self, email: str) -> dict | None:
-        """Find a payment record by email."""
-        for p in self.get_all_payments():
-            if p.get("email", "").lower() == email.lower():
-                return p
-        return None
+        """Find a payment record by email (indexed lookup on the cached list)."""
+        self.get_all_payments()  # make sure the cached list is loaded
+        return cache.find(PAYMENTS_KEY, "email", email)
 
     def update_page(self, page_id: str, properties: dict) -> None:
         """Update a Notion page's properties."""
-        self._client.pages.update(page_id=page_id, properties=properties)
-        cache.invalidate("notion_payments")
-        cache.invalidate("notion_intakes")
+        upstream.call("Notion", "pages.update", self._client.pages.update, page_id=page_id, properties=properties)
+        cache.invalidate(PAYMENTS_KEY)
+        cache.invalidate(INTAKES_KEY)
 
     # ── Intake DB ────────────────────────────────────────────────
 
     def get_all_intakes(self) -> list[dict]:
         """Fetch all records from Intake DB. Cached warm (5min)."""
-        cached = cache.get("notion_intakes")
+        cached = cache.get(INTAKES_KEY)
         if cached is not None:
             return cached
         records = self._query_all(self._intake_db)
         parsed = [self._parse_intake(r) for r in records]
-        cache.set("notion_intakes", parsed, tier="warm")
+        cache.set(INTAKES_KEY, parsed, tier="warm")
         return parsed
 
+    # ── Single-Record Webhook Updates ────────────────────────────
+
+    def fetch_page(self, page_id: str) -> tuple[str, dict] | None:
+        """Retrieve one page and parse it. Returns (cache key, record)."""
+        try:
+            page = upstream.call("Notion", "pages.retrieve", self._client.pages.retrieve, page_id=page_id)
+        except Exception as e:
+            logger.error(f"Notion page retrieve failed for {page_id}: {e}")
+            return None
+        key = self._key_for_parent(page)
+        if key is None:
+            return None
+        return key, self._parse_for_key(key, page)
+
+    def apply_webhook_event(self, event: str, data: dict) -> set[str]:
+        """Upsert the record(s) carried by a webhook event into the cache.
+
+        Accepts {"record": {...}} (a raw Notion page or an already-flat
+        record), {"page_id": "..."} (fetched individually), or a "records"
+        list of either. An optional "database" ("payments" or "intakes")
+        picks the target; otherwise the event name decides. Returns the cache
+        keys that were updated.
+        """
+        items = data.get("records")
+        if not isinstance(items, list):
+            items = [data] if (data.get("record") or data.get("page_id")) else []
+
+        updated: set[str] = set()
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            resolved = self._resolve_webhook_record(event, item)
+            if resolved is None:
+                continue
+            key, record = resolved
+            if cache.upsert(key, record):
+                updated.add(key)
+        return updated
+
+    def _resolve_webhook_record(self, event: str, item: dict) -> tuple[str, dict] | None:
+        record = item.get("record")
+        database = item.get("database", "")
+        if database in ("payments", "intakes"):
+            key = PAYMENTS_KEY if database == "payments" else INTAKES_KEY
+        else:
+            key = INTAKES_KEY if event in INTAKE_EVENTS else PAYMENTS_KEY
+
+        if isinstance(record, dict) and record.get("id"):
+            if "properties" in record:
+                key = self._key_for_parent(record) or key
+                return key, self._parse_for_key(key, record)
+            # Flat record: fill in any fields the sender left out
+            blank = self._parse_for_key(key, {"id": record["id"]})
+            return key, {**blank, **record}
+
+        page_id = item.get("page_id") or ""
+        if page_id:
+            return self.fetch_page(page_id)
+        return None
+
+    def _key_for_parent(self, page: dict) -> str | None:
+        parent = (page.get("parent") or {}).get("database_id", "")
+        normalized = parent.replace("-", "")
+        if normalized == self._payments_db.replace("-", ""):
+            return PAYMENTS_KEY
+        if normalized == self._intake_db.replace("-", ""):
+            return INTAKES_KEY
+        return None
+
+    def _parse_for_key(self, key: str, page: dict) -> dict:
+        return self._parse_payment(page) if key == PAYMENTS_KEY else self._parse_intake(page)
+
     # ── Merged Client View ───────────────────────────────────────
 
     def get_merged_clients(self) -> list[dict]:
@@ -117,7 +199,7 @@ class NotionService:
             if start_cursor:
                 kwargs["start_cursor"] = start_cursor
             try:
-                response = self._client.databases.query(**kwargs)
+                response = upstream.call("Notion", "databases.query", self._client.databases.query, **kwargs)
             except Exception as e:
                 logger.error(f"Notion query failed for {database_id}: {e}")
                 return results
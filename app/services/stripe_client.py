@@ -2,6 +2,12 @@
 
 Payment happens at Calendly booking via Stripe integration.
 Products: First Call ($499), Single Call ($699), Sprint ($1,495).
+
+With a webhook signing secret and a LocalStore, checkout sessions and
+refunds arrive through signed webhooks (ingest_webhook, called by the webhook
+receiver) and are read from the local store. The Stripe API is then only
+swept every WEBHOOK_RECONCILE_SECONDS to backfill anything a webhook missed.
+Without them, sessions are polled on every hot-tier expiry as before.
 """
 
 from __future__ import annotations
@@ -12,32 +18,51 @@ from typing import Any
 
 import stripe as stripe_sdk
 
-from app.config import PRODUCT_TYPES
+from app.config import CACHE_HOT, PRODUCT_TYPES, WEBHOOK_RECONCILE_SECONDS
+from app.services import upstream
 from app.services.cache_manager import cache
+from app.services.local_store import LocalStore
 
 logger = logging.getLogger(__name__)
 
+SESSION_EVENTS = {"checkout.session.completed", "checkout.session.async_payment_succeeded"}
+REFUND_EVENTS = {"refund.created", "refund.updated", "charge.refund.updated"}
+SIGNATURE_TOLERANCE = 300
+
 
 class StripeService:
-    def __init__(self, secret_key: str):
+    def __init__(self, secret_key: str, webhook_secret: str = "", store: LocalStore | None = None):
         self._key = secret_key
+        self._store = store
+        # Only trust the local store as primary source when webhooks feed it
+        self._reconcile_seconds = WEBHOOK_RECONCILE_SECONDS if webhook_secret and store else CACHE_HOT
         stripe_sdk.api_key = secret_key
 
     def is_healthy(self) -> bool:
         """Check if Stripe API is reachable."""
         try:
-            stripe_sdk.Balance.retrieve()
+            upstream.call("Stripe", "Balance.retrieve", stripe_sdk.Balance.retrieve)
             return True
         except Exception:
             return False
 
     def get_recent_sessions(self, days: int = 90) -> list[dict]:
-        """Fetch completed checkout sessions. Cached hot (60s)."""
+        """Fetch completed checkout sessions. Cached hot (60s).
+
+        Served from the local store while a reconciliation sweep covering
+        `days` is fresh; otherwise polls Stripe and refreshes the store.
+        """
         cache_key = f"stripe_sessions_{days}"
         cached = cache.get(cache_key)
         if cached is not None:
             return cached
 
+        if self._store is not None and self._store.is_synced("stripe_sessions", self._reconcile_seconds, days):
+            since = (datetime.now() - timedelta(days=days)).isoformat()
+            sessions = self._store.stripe_sessions(since=since)
+            cache.set(cache_key, sessions, tier="hot")
+            return sessions
+
         created_after = int((datetime.now() - timedelta(days=days)).timestamp())
         sessions = []
         try:
@@ -53,7 +78,7 @@ class StripeService:
                 if starting_after:
                     params["starting_after"] = starting_after
 
-                response = stripe_sdk.checkout.Session.list(**params)
+                response = upstream.call("Stripe", "checkout.Session.list", stripe_sdk.checkout.Session.list, **params)
                 for s in response.data:
                     sessions.append(self._parse_session(s))
                 has_more = response.has_more
@@ -63,13 +88,16 @@ class StripeService:
             logger.error(f"Stripe sessions query failed: {e}")
             return sessions
 
+        if self._store is not None:
+            self._store.upsert_stripe_sessions(sessions)
+            self._store.mark_synced("stripe_sessions", days)
         cache.set(cache_key, sessions, tier="hot")
         return sessions
 
     def get_session_by_id(self, session_id: str) -> dict | None:
         """Fetch a single checkout session."""
         try:
-            s = stripe_sdk.checkout.Session.retrieve(session_id)
+            s = upstream.call("Stripe", "checkout.Session.retrieve", stripe_sdk.checkout.Session.retrieve, session_id)
             return self._parse_session(s)
         except Exception as e:
             logger.error(f"Stripe session retrieve failed: {e}")
@@ -123,55 +151,124 @@ class StripeService:
         if cached is not None:
             return cached
 
+        if self._store is not None and self._store.is_synced("stripe_refunds", self._reconcile_seconds, days):
+            since = (datetime.now() - timedelta(days=days)).isoformat()
+            refunds = self._store.stripe_refunds(since=since)
+            cache.set(cache_key, refunds, tier="warm")
+            return refunds
+
         created_after = int((datetime.now() - timedelta(days=days)).timestamp())
         refunds = []
         try:
-            response = stripe_sdk.Refund.list(
+            response = upstream.call(
+                "Stripe", "Refund.list", stripe_sdk.Refund.list,
                 limit=100,
                 created={"gte": created_after},
             )
             for r in response.data:
-                refunds.append({
-                    "id": r.id,
-                    "amount": r.amount / 100,
-                    "status": r.status,
-                    "created": datetime.fromtimestamp(r.created).isoformat(),
-                })
+                refunds.append(_parse_refund(r))
         except Exception as e:
             logger.error(f"Stripe refunds query failed: {e}")
+        else:
+            if self._store is not None:
+                self._store.upsert_stripe_refunds(refunds)
+                self._store.mark_synced("stripe_refunds", days)
 
         cache.set(cache_key, refunds, tier="warm")
         return refunds
 
     def _parse_session(self, session: Any) -> dict:
         """Parse a Stripe checkout session into a flat dict."""
-        amount_cents = session.amount_total or 0
-        amount = amount_cents / 100
-
-        # Map amount to product name
-        product_name = self._amount_to_product(amount)
-
-        # Check metadata for explicit product_type
-        metadata = session.metadata or {}
-        if metadata.get("product_type"):
-            product_name = metadata["product_type"]
-
-        return {
-            "id": session.id,
-            "email": session.customer_details.email if session.customer_details else "",
-            "name": session.customer_details.name if session.customer_details else "",
-            "amount": amount,
-            "product_name": product_name,
-            "status": session.status,
-            "payment_status": session.payment_status,
-            "created": datetime.fromtimestamp(session.created).isoformat() if session.created else "",
-            "metadata": dict(metadata),
-        }
+        return _parse_session(session)
 
     @staticmethod
     def _amount_to_product(amount: float) -> str:
         """Map payment amount to product name (fallback when metadata missing)."""
-        for product, price in PRODUCT_TYPES.items():
-            if abs(amount - price) < 1:
-                return product
-        return "Unknown"
+        return _amount_to_product(amount)
+
+
+def ingest_webhook(payload: bytes, sig_header: str, secret: str, store: LocalStore) -> str:
+    """Verify a signed Stripe webhook and upsert what it carries into the store.
+
+    Returns the Stripe event type. Raises ValueError for a bad payload or
+    signature (stale timestamps beyond SIGNATURE_TOLERANCE included). Event
+    types other than completed sessions and refunds are accepted and ignored.
+    """
+    try:
+        event = stripe_sdk.Webhook.construct_event(payload, sig_header, secret, tolerance=SIGNATURE_TOLERANCE)
+    except stripe_sdk.SignatureVerificationError as e:
+        raise ValueError(f"Invalid Stripe signature: {e}") from e
+
+    obj = event.data.object
+    if event.type in SESSION_EVENTS:
+        store.upsert_stripe_sessions([_parse_session(obj)])
+    elif event.type in REFUND_EVENTS:
+        store.upsert_stripe_refunds([_parse_refund(obj)])
+    elif event.type == "charge.refunded":
+        store.upsert_stripe_refunds([_parse_refund(r) for r in _charge_refunds(obj)])
+    return event.type
+
+
+def _charge_refunds(charge: Any) -> list:
+    """A refunded charge's refunds: embedded by older API versions, else listed.
+
+    Since API version 2022-11-15 charge objects no longer embed `refunds`,
+    so they're fetched with the secret key. Without one, nothing is stored
+    here and the refund.created event that accompanies the charge carries it.
+    """
+    refunds = getattr(charge, "refunds", None)
+    if refunds is not None:
+        return list(refunds.data)
+    if not stripe_sdk.api_key:
+        logger.warning(f"charge.refunded for {charge.id} without embedded refunds and no STRIPE_SECRET_KEY to list them")
+        return []
+    # Errors propagate: the receiver answers 5xx and Stripe retries the event
+    return list(upstream.call("Stripe", "Refund.list", stripe_sdk.Refund.list, charge=charge.id, limit=100).data)
+
+
+def _parse_session(session: Any) -> dict:
+    """Parse a Stripe checkout session (API or webhook object) into a flat dict."""
+    amount_cents = session.amount_total or 0
+    amount = amount_cents / 100
+
+    # Map amount to product name
+    product_name = _amount_to_product(amount)
+
+    # Check metadata for explicit product_type
+    metadata = session.metadata or {}
+    if hasattr(metadata, "to_dict"):
+        # StripeObject (stripe>=13) no longer behaves like a dict
+        metadata = metadata.to_dict()
+    if metadata.get("product_type"):
+        product_name = metadata["product_type"]
+
+    return {
+        "id": session.id,
+        "email": session.customer_details.email if session.customer_details else "",
+        "name": session.customer_details.name if session.customer_details else "",
+        "amount": amount,
+        "product_name": product_name,
+        "status": session.status,
+        "payment_status": session.payment_status,
+        "created": datetime.fromtimestamp(session.created).isoformat() if session.created else "",
+        "payment_intent": getattr(session, "payment_intent", None) or "",
+        "metadata": dict(metadata),
+    }
+
+
+def _amount_to_product(amount: float) -> str:
+    """Map payment amount to product name (fallback when metadata missing)."""
+    for product, price in PRODUCT_TYPES.items():
+        if abs(amount - price) < 1:
+            return product
+    return "Unknown"
+
+
+def _parse_refund(refund: Any) -> dict:
+    return {
+        "id": refund.id,
+        "amount": refund.amount / 100,
+        "status": refund.status,
+        "created": datetime.fromtimestamp(refund.created).isoformat(),
+        "payment_intent": getattr(refund, "payment_intent", None) or "",
+    }
@@ -0,0 +1,50 @@
+"""Timing of the calls that actually reach an upstream API.
+
+Service clients make each HTTP request and SDK call through call(), so
+whatever exports metrics (api/metrics.py) observes real upstream traffic
+only: a method answered from the cache never gets here.
+
+    resp = upstream.call("Calendly", "scheduled_events", requests.get, url, timeout=15)
+    page = upstream.call("Notion", "pages.retrieve", self._client.pages.retrieve, page_id=page_id)
+
+Operations are labelled by endpoint rather than URL, so label cardinality
+stays bounded. A call that raises, or returns an HTTP response with a
+status of 400 or more, counts as an error.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# observer(service, operation, outcome, seconds)
+Observer = Callable[[str, str, str, float], None]
+
+_observers: list[Observer] = []
+
+
+def add_observer(observer: Observer) -> None:
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_observer(observer: Observer) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def call(service: str, operation: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """fn(*args, **kwargs), timed and reported as one upstream call."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        result = fn(*args, **kwargs)
+        status = getattr(result, "status_code", None)
+        outcome = "error" if isinstance(status, int) and status >= 400 else "ok"
+        return result
+    finally:
+        seconds = time.perf_counter() - start
+        for observer in list(_observers):
+            observer(service, operation, outcome, seconds)
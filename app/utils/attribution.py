@@ -9,6 +9,9 @@ channel — because pipeline stages (paid, booked, intake) are NOT
 independent marketing touchpoints.
 
 Time decay weights by recency of the payment event.
+
+Every function also accepts a ClientFrame; channels are then tallied with
+np.bincount over its categorical source codes.
 """
 
 from __future__ import annotations
@@ -17,6 +20,10 @@ import math
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from app.utils.client_frame import ClientFrame
 
 ATTRIBUTION_MODELS = ["first_touch", "last_touch", "linear", "time_decay"]
 
@@ -50,7 +57,7 @@ class ChannelMetrics:
 
 
 def attribute_conversions(
-    payments: list[dict], model: str = "linear"
+    payments: list[dict] | ClientFrame, model: str = "linear"
 ) -> dict[str, ChannelMetrics]:
     """Attribute conversions across channels using the specified model.
 
@@ -63,6 +70,8 @@ def attribute_conversions(
     """
     if model not in ATTRIBUTION_MODELS:
         model = "linear"
+    if isinstance(payments, ClientFrame):
+        return _attribute_conversions_frame(payments, model)
 
     channels: dict[str, ChannelMetrics] = {}
 
@@ -92,7 +101,7 @@ def attribute_conversions(
     return channels
 
 
-def compare_models(payments: list[dict]) -> dict[str, dict[str, ChannelMetrics]]:
+def compare_models(payments: list[dict] | ClientFrame) -> dict[str, dict[str, ChannelMetrics]]:
     """Run all 4 attribution models and return comparison.
 
     Returns:
@@ -105,7 +114,7 @@ def compare_models(payments: list[dict]) -> dict[str, dict[str, ChannelMetrics]]
 
 
 def channel_roi(
-    payments: list[dict],
+    payments: list[dict] | ClientFrame,
     channel_costs: dict[str, float] | None = None,
 ) -> list[dict]:
     """Calculate ROI per channel.
@@ -139,12 +148,15 @@ def channel_roi(
     return results
 
 
-def get_revenue_by_source_over_time(payments: list[dict]) -> dict[str, dict[str, float]]:
+def get_revenue_by_source_over_time(payments: list[dict] | ClientFrame) -> dict[str, dict[str, float]]:
     """Group revenue by source and month.
 
     Returns:
         Dict of {month: {source: revenue}}, e.g. {"2026-02": {"IG DM": 499.0}}.
     """
+    if isinstance(payments, ClientFrame):
+        return _revenue_by_source_over_time_frame(payments)
+
     result: dict[str, dict[str, float]] = {}
 
     for p in payments:
@@ -206,3 +218,46 @@ def _time_decay_weight(payment: dict) -> float:
         return max(weight, 0.1)  # Floor at 10% credit
     except (ValueError, TypeError):
         return 1.0
+
+
+# ── ClientFrame paths ────────────────────────────────────────────
+
+
+def _attribute_conversions_frame(frame: ClientFrame, model: str) -> dict[str, ChannelMetrics]:
+    codes, channels = pd.factorize(frame.labels("lead_source"))
+    paid = frame.paid
+    if model == "time_decay":
+        days_ago = frame.days_since("created")
+        credit = np.where(np.isnan(days_ago), 1.0, np.maximum(np.power(2.0, -days_ago / TIME_DECAY_HALF_LIFE), 0.1))
+    else:
+        credit = 1.0
+
+    k = len(channels)
+    leads = np.bincount(codes, minlength=k)
+    paid_count = np.bincount(codes, weights=paid, minlength=k)
+    revenue = np.bincount(codes, weights=np.where(paid, frame.amount * credit, 0.0), minlength=k)
+
+    result = {}
+    for i, channel in enumerate(channels):
+        ch = ChannelMetrics(channel=channel, lead_count=int(leads[i]), paid_count=int(paid_count[i]),
+                            revenue=float(revenue[i]))
+        if ch.paid_count > 0:
+            ch.avg_deal_size = ch.revenue / ch.paid_count
+        if ch.lead_count > 0:
+            ch.conversion_rate = (ch.paid_count / ch.lead_count) * 100
+        ch.sample_sufficient = ch.lead_count >= MIN_SAMPLE_SIZE
+        result[channel] = ch
+    return result
+
+
+def _revenue_by_source_over_time_frame(frame: ClientFrame) -> dict[str, dict[str, float]]:
+    dated = np.where(np.isnat(frame.created), frame.payment_date, frame.created)
+    keep = np.flatnonzero(frame.paid & ~np.isnat(dated))
+    months = np.datetime_as_string(dated[keep], unit="M")
+    totals = pd.Series(frame.amount[keep]).groupby(
+        [months, frame.labels("lead_source")[keep]], sort=False).sum()
+
+    result: dict[str, dict[str, float]] = {}
+    for (month, source), revenue in totals.items():
+        result.setdefault(month, {})[source] = float(revenue)
+    return dict(sorted(result.items()))
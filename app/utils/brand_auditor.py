@@ -5,12 +5,17 @@ and content signals. Returns a 0-100 composite score with per-dimension
 breakdowns, percentile ranking, and prioritized recommendations.
 
 Scoring weights defined by Growth Intelligence (Feb 2026).
+
+Word counts and phrase scans of the intake text come from the shared
+intake feature store, so re-auditing the same intake rescans nothing.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+from app.utils.intake_features import intake_features, phrase_group
+
 
 # ── Scoring Weights ──────────────────────────────────────────────
 
@@ -33,6 +38,37 @@ DIMENSION_LABELS: dict[str, str] = {
 }
 
 
+# ── Signal Phrases ───────────────────────────────────────────────
+# Each is matched (lowercase substring) against the intake fields named in
+# its group below
+
+VISUAL_WORDS = ["rebrand", "logo", "visual", "design", "aesthetic"]
+NICHE_WORDS = ["niche", "specific", "specialize", "focus on", "only work with",
+               "target audience", "ideal client", "our people"]
+COMPETITIVE_WORDS = ["competitor", "different from", "stand out", "unique", "unlike",
+                     "no one else", "our approach", "what sets us apart"]
+UNDIFFERENTIATED_WORDS = ["generic", "same as everyone", "look like everyone",
+                          "nothing special", "commodity", "blend in"]
+CONTENT_WORDS = ["content", "post", "blog", "newsletter", "email",
+                 "social media", "instagram", "tiktok", "youtube",
+                 "podcast", "video", "reel"]
+STRATEGY_WORDS = ["strategy", "plan", "calendar", "schedule", "consistent",
+                  "frequency", "audience", "analytics", "engagement"]
+SENIOR_ROLES = ["founder", "ceo", "director", "head of", "vp", "partner",
+                "owner", "principal", "chief"]
+MATURITY_WORDS = ["rebrand", "refresh", "next level", "scale", "grow",
+                  "expand", "launch", "pivot"]
+
+_VISUAL_TEXT = phrase_group(VISUAL_WORDS, "creative_emergency")
+_NICHE_TEXT = phrase_group(NICHE_WORDS, ("creative_emergency", "what_tried"))
+_COMPETITIVE_TEXT = phrase_group(COMPETITIVE_WORDS, ("creative_emergency", "what_tried"))
+_UNDIFFERENTIATED_TEXT = phrase_group(UNDIFFERENTIATED_WORDS, ("creative_emergency", "what_tried"))
+_CONTENT_TEXT = phrase_group(CONTENT_WORDS, ("what_tried", "creative_emergency"))
+_STRATEGY_TEXT = phrase_group(STRATEGY_WORDS, ("what_tried", "creative_emergency"))
+_SENIOR_TEXT = phrase_group(SENIOR_ROLES, "role")
+_MATURITY_TEXT = phrase_group(MATURITY_WORDS, "creative_emergency")
+
+
 # ── Data Classes ─────────────────────────────────────────────────
 
 @dataclass
@@ -147,8 +183,7 @@ def _score_visual_identity(data: dict) -> DimensionScore:
         signals.append("Social presence")
 
     # Intake mentions visual elements
-    emergency = (data.get("creative_emergency", "") or "").lower()
-    if any(w in emergency for w in ["rebrand", "logo", "visual", "design", "aesthetic"]):
+    if intake_features(data).hits(_VISUAL_TEXT):
         # They're aware of visual identity needs — indicates both awareness and gaps
         points += 10
         signals.append("Visual identity awareness")
@@ -180,10 +215,11 @@ def _score_messaging_clarity(data: dict) -> DimensionScore:
     """
     points = 0
     signals = []
+    text = intake_features(data)
 
     # Role clarity
     role = data.get("role", "")
-    if role and len(role.split()) >= 2:
+    if role and text.words("role") >= 2:
         points += 20
         signals.append("Clear role definition")
     elif role:
@@ -197,8 +233,7 @@ def _score_messaging_clarity(data: dict) -> DimensionScore:
         signals.append("Brand name defined")
 
     # Creative emergency articulation depth
-    emergency = data.get("creative_emergency", "") or ""
-    word_count = len(emergency.split())
+    word_count = text.words("creative_emergency")
     if word_count >= 50:
         points += 25
         signals.append(f"Detailed problem articulation ({word_count} words)")
@@ -219,11 +254,10 @@ def _score_messaging_clarity(data: dict) -> DimensionScore:
         signals.append("Some outcomes defined")
 
     # What they've tried — shows they can articulate their journey
-    tried = data.get("what_tried", "") or ""
-    if len(tried.split()) >= 15:
+    if text.words("what_tried") >= 15:
         points += 20
         signals.append("Clear history of attempts")
-    elif tried:
+    elif data.get("what_tried"):
         points += 10
 
     recommendation = ""
@@ -253,11 +287,10 @@ def _score_messaging_consistency(data: dict) -> DimensionScore:
     signals = []
 
     # Constraints/avoid shows brand awareness
-    constraints = data.get("constraints", "") or ""
-    if len(constraints.split()) >= 10:
+    if intake_features(data).words("constraints") >= 10:
         points += 30
         signals.append("Clear brand boundaries defined")
-    elif constraints:
+    elif data.get("constraints"):
         points += 15
         signals.append("Some constraints noted")
 
@@ -310,31 +343,22 @@ def _score_messaging_differentiation(data: dict) -> DimensionScore:
     """
     points = 0
     signals = []
-
-    emergency = (data.get("creative_emergency", "") or "").lower()
-    tried = (data.get("what_tried", "") or "").lower()
-    all_text = emergency + " " + tried
+    text = intake_features(data)
 
     # Niche specificity signals
-    niche_words = ["niche", "specific", "specialize", "focus on", "only work with",
-                   "target audience", "ideal client", "our people"]
-    niche_matches = [w for w in niche_words if w in all_text]
+    niche_matches = text.hits(_NICHE_TEXT)
     if niche_matches:
         points += 25
         signals.append("Niche awareness")
 
     # Competitive awareness
-    comp_words = ["competitor", "different from", "stand out", "unique", "unlike",
-                  "no one else", "our approach", "what sets us apart"]
-    comp_matches = [w for w in comp_words if w in all_text]
+    comp_matches = text.hits(_COMPETITIVE_TEXT)
     if comp_matches:
         points += 25
         signals.append("Competitive differentiation thinking")
 
     # If they mention being "stuck" or "same as everyone" — lower score
-    undiff_words = ["generic", "same as everyone", "look like everyone",
-                    "nothing special", "commodity", "blend in"]
-    undiff_matches = [w for w in undiff_words if w in all_text]
+    undiff_matches = text.hits(_UNDIFFERENTIATED_TEXT)
     if undiff_matches:
         points += 5  # They're aware, but the problem exists
         signals.append("Aware of differentiation gap")
@@ -380,16 +404,10 @@ def _score_content_strategy(data: dict) -> DimensionScore:
     """
     points = 0
     signals = []
-
-    tried = (data.get("what_tried", "") or "").lower()
-    emergency = (data.get("creative_emergency", "") or "").lower()
-    all_text = tried + " " + emergency
+    text = intake_features(data)
 
     # Content mentions
-    content_words = ["content", "post", "blog", "newsletter", "email",
-                     "social media", "instagram", "tiktok", "youtube",
-                     "podcast", "video", "reel"]
-    content_matches = [w for w in content_words if w in all_text]
+    content_matches = text.hits(_CONTENT_TEXT)
     if len(content_matches) >= 3:
         points += 30
         signals.append(f"Active across {len(content_matches)} content channels")
@@ -398,9 +416,7 @@ def _score_content_strategy(data: dict) -> DimensionScore:
         signals.append("Some content activity")
 
     # Strategy words
-    strategy_words = ["strategy", "plan", "calendar", "schedule", "consistent",
-                      "frequency", "audience", "analytics", "engagement"]
-    strategy_matches = [w for w in strategy_words if w in all_text]
+    strategy_matches = text.hits(_STRATEGY_TEXT)
     if len(strategy_matches) >= 2:
         points += 25
         signals.append("Strategic content thinking")
@@ -451,12 +467,11 @@ def _score_competitive_positioning(data: dict) -> DimensionScore:
     """
     points = 0
     signals = []
+    text = intake_features(data)
 
     # Role seniority suggests market position awareness
-    role = (data.get("role", "") or "").lower()
-    senior_roles = ["founder", "ceo", "director", "head of", "vp", "partner",
-                    "owner", "principal", "chief"]
-    if any(r in role for r in senior_roles):
+    role = data.get("role", "") or ""
+    if text.hits(_SENIOR_TEXT):
         points += 25
         signals.append("Senior decision-maker")
     elif role:
@@ -476,20 +491,15 @@ def _score_competitive_positioning(data: dict) -> DimensionScore:
         signals.append("Entry-tier investment")
 
     # Brand maturity signals
-    emergency = (data.get("creative_emergency", "") or "").lower()
-    maturity_words = ["rebrand", "refresh", "next level", "scale", "grow",
-                      "expand", "launch", "pivot"]
-    maturity_matches = [w for w in maturity_words if w in emergency]
-    if maturity_matches:
+    if text.hits(_MATURITY_TEXT):
         points += 20
         signals.append("Growth-stage brand")
 
     # Tried things = market experience
-    tried = data.get("what_tried", "") or ""
-    if len(tried.split()) >= 20:
+    if text.words("what_tried") >= 20:
         points += 15
         signals.append("Market-tested approaches")
-    elif tried:
+    elif data.get("what_tried"):
         points += 8
 
     # Website existence
@@ -0,0 +1,208 @@
+"""Columnar view of the client list for the analytics modules.
+
+Every analytics function used to walk the raw payment dicts, redoing the
+.get() lookups, email normalisation and date parsing on each call. A
+ClientFrame does that work once per data refresh (see
+app.services.derived.client_frame) and keeps the result as NumPy arrays:
+
+    amount                      float64, payment_amount or 0
+    email                       stripped, lowercased ("" when missing)
+    email_code                  group id per distinct email, -1 when missing
+    status, lead_source,        pandas Categoricals of the raw values
+    product                     ("" when missing)
+    created, payment_date,      datetime64[us], NaT when missing/unparsable
+    call_date, purchased        (purchased = payment_date or created)
+
+Timestamps are parsed as lead_scorer._parse_date parses them: naive
+wall-clock values with "Z" and "+hh:mm" suffixes dropped (Notion and
+Stripe both report UTC).
+
+The functions in lead_scorer, ltv_calculator, attribution,
+segment_builder, sequence_tracker, referral_tracker and revenue_modeler
+accept a ClientFrame anywhere they accept a payment list, and return the
+same results.
+"""
+
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+DATE_COLUMNS = {"created": "created", "payment_date": "payment_date", "call_date": "call_date"}
+
+_UTC_OFFSET = r"[+-]\d{2}:?\d{2}$"
+_ISO = r"^\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?)?$"
+
+
+@dataclass(frozen=True)
+class EmailGroups:
+    """Paid records grouped by email, groups in order of first appearance.
+
+    rows lists record positions group by group, each group sorted by
+    purchase date (undated first, ties in input order); starts[g] is where
+    group g begins in rows.
+    """
+    emails: np.ndarray
+    rows: np.ndarray
+    starts: np.ndarray
+    counts: np.ndarray
+    totals: np.ndarray
+    first_seen: np.ndarray  # earliest record position per group
+    entry: np.ndarray       # earliest-dated record position per group
+
+    def __len__(self) -> int:
+        return len(self.emails)
+
+    @property
+    def second(self) -> np.ndarray:
+        """Second-dated record position per group, -1 for single purchases."""
+        second = np.full(len(self.counts), -1, dtype=np.int64)
+        multi = self.counts > 1
+        second[multi] = self.rows[self.starts[multi] + 1]
+        return second
+
+    def members(self, g: int) -> np.ndarray:
+        """Record positions of group g, date-sorted."""
+        return self.rows[self.starts[g]:self.starts[g] + self.counts[g]]
+
+
+class ClientFrame:
+    """Columnar, pre-parsed client records (one row per payment)."""
+
+    def __init__(self, payments: list[dict], intakes: list[dict | None] | None = None):
+        self.records = list(payments)
+        self.intakes = list(intakes) if intakes is not None else [None] * len(self.records)
+        n = len(self.records)
+
+        self.amount = np.fromiter(
+            ((p.get("payment_amount", 0) or 0) for p in self.records), dtype=np.float64, count=n)
+        self.email = np.array([(p.get("email") or "").strip().lower() for p in self.records], dtype=object)
+        codes, self.emails = pd.factorize(np.where(self.email == "", None, self.email))
+        self.email_code = codes.astype(np.int64)
+
+        self.status = _categorical(self.records, "status")
+        self.lead_source = _categorical(self.records, "lead_source")
+        self.product = _categorical(self.records, "product_purchased")
+
+        for attr, field in DATE_COLUMNS.items():
+            setattr(self, attr, parse_timestamps([p.get(field) for p in self.records]))
+        self.purchased = np.where(np.isnat(self.payment_date), self.created, self.payment_date)
+
+    @classmethod
+    def from_merged(cls, merged: list[dict]) -> "ClientFrame":
+        """Build from NotionService.get_merged_clients() output."""
+        return cls([c["payment"] for c in merged], [c.get("intake") for c in merged])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def with_intakes(self, intakes: list[dict | None]) -> "ClientFrame":
+        """The same columns, joined row by row to the given intake records."""
+        if len(intakes) != len(self.records):
+            raise ValueError(f"Expected {len(self.records)} intakes, got {len(intakes)}")
+        frame = copy.copy(self)
+        frame.intakes = list(intakes)
+        return frame
+
+    def take(self, rows: list[int] | np.ndarray) -> "ClientFrame":
+        """A frame of just the given row positions, in that order."""
+        rows = np.asarray(rows, dtype=np.int64)
+        frame = copy.copy(self)
+        frame.__dict__.pop("email_groups", None)
+        frame.records = [self.records[i] for i in rows]
+        frame.intakes = [self.intakes[i] for i in rows]
+        for attr in ("amount", "email", "email_code", "status", "lead_source", "product", *DATE_COLUMNS, "purchased"):
+            setattr(frame, attr, getattr(self, attr)[rows])
+        return frame
+
+    @property
+    def merged(self) -> list[dict]:
+        return [{"payment": p, "intake": i} for p, i in zip(self.records, self.intakes)]
+
+    @property
+    def paid(self) -> np.ndarray:
+        return self.amount > 0
+
+    def is_status(self, *statuses: str) -> np.ndarray:
+        return _isin(self.status, statuses)
+
+    def is_source(self, *sources: str) -> np.ndarray:
+        return _isin(self.lead_source, sources)
+
+    def is_product(self, *products: str) -> np.ndarray:
+        return _isin(self.product, products)
+
+    def where(self, column: str, predicate) -> np.ndarray:
+        """Rows whose categorical value satisfies predicate (evaluated once per category)."""
+        cat = getattr(self, column)
+        hits = np.array([bool(predicate(c)) for c in cat.categories] + [False], dtype=bool)
+        return hits[cat.codes]
+
+    def labels(self, column: str, default: str = "Unknown") -> np.ndarray:
+        """Values of a categorical column, with default for missing."""
+        cat = getattr(self, column)
+        categories = np.array([c or default for c in cat.categories] + [default], dtype=object)
+        return categories[cat.codes]
+
+    def days_since(self, column: str, now: datetime | None = None) -> np.ndarray:
+        """Fractional days from each timestamp to now (NaN where missing)."""
+        now64 = np.datetime64(now or datetime.now(), "us")
+        return (now64 - getattr(self, column)) / np.timedelta64(1, "D")
+
+    def rows(self, mask: np.ndarray) -> list[dict]:
+        """The raw records selected by a boolean mask, in input order."""
+        return [self.records[i] for i in np.flatnonzero(mask)]
+
+    @cached_property
+    def email_groups(self) -> EmailGroups:
+        """Paid records with an email, grouped as ltv_calculator groups them."""
+        selected = np.flatnonzero(self.paid & (self.email_code >= 0))
+        # Renumber groups by first appearance among the selected records
+        first_seen_codes = pd.unique(self.email_code[selected])
+        group_of_code = np.empty(len(self.emails), dtype=np.int64)
+        group_of_code[first_seen_codes] = np.arange(len(first_seen_codes))
+        group = group_of_code[self.email_code[selected]]
+
+        # NaT is the smallest int64, so undated records sort first (as "" does)
+        date_key = self.purchased[selected].view(np.int64)
+        rows = selected[np.lexsort((date_key, group))]
+        counts = np.bincount(group, minlength=len(first_seen_codes))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64) if len(counts) else counts
+        has_rows = len(rows) > 0
+        return EmailGroups(
+            emails=np.asarray(self.emails, dtype=object)[first_seen_codes],
+            rows=rows,
+            starts=starts,
+            counts=counts,
+            totals=np.add.reduceat(self.amount[rows], starts) if has_rows else np.zeros(0),
+            first_seen=np.minimum.reduceat(rows, starts) if has_rows else np.zeros(0, dtype=np.int64),
+            entry=rows[starts] if has_rows else np.zeros(0, dtype=np.int64),
+        )
+
+
+def _categorical(records: list[dict], field: str) -> pd.Categorical:
+    return pd.Categorical([r.get(field) or "" for r in records])
+
+
+def _isin(cat: pd.Categorical, values) -> np.ndarray:
+    codes = [cat.categories.get_loc(v) for v in values if v in cat.categories]
+    return np.isin(cat.codes, codes)
+
+
+def parse_timestamps(values: list) -> np.ndarray:
+    """Vectorized lead_scorer._parse_date: naive datetime64[us], NaT if unparsable.
+
+    Trailing "Z"s and a "+hh:mm" or "-hh:mm" offset are dropped; strings that
+    aren't a plain ISO date or datetime fall back to their first ten characters.
+    """
+    codes, uniques = pd.factorize(pd.Series([v.strip() if isinstance(v, str) else "" for v in values], dtype=object))
+    strings = pd.Series(uniques, dtype=object).str.rstrip("Z")
+    strings = strings.str[:10] + strings.str[10:].str.replace(_UTC_OFFSET, "", regex=True)
+    strings = strings.where(strings.str.match(_ISO).fillna(False).astype(bool), strings.str[:10])
+    parsed = pd.to_datetime(strings.where(strings != ""), format="ISO8601", errors="coerce")
+    return parsed.to_numpy(dtype="datetime64[us]")[codes]
@@ -0,0 +1,196 @@
+"""Intake text features, computed once per intake and shared.
+
+lead_scorer, keyword_extractor and brand_auditor all read the same intake
+text fields — lowercasing, splitting and scanning them for their phrase
+lists. intake_features(intake) returns the intake's IntakeFeatures from a
+process-wide store keyed by the intake id plus the text fields themselves,
+so every module gets the work done on the first call and a dict lookup
+after that. Editing an intake changes its key; the stale entry for that id
+is dropped.
+
+Features are computed lazily, each at most once per intake:
+
+    words(field)         whitespace word count (0 when empty)
+    text(group)          the group's fields joined and lowercased
+    found(group)         every registered phrase in that text
+    hits(group)          the group's phrases found in that text, in order
+    derived(key, fn)     fn(features) — a module's own bundle of signals
+
+A PhraseGroup names the fields it reads and how they're joined, so each
+module keeps matching exactly the text it always matched. Every group's
+phrases are compiled into one PhraseMatcher automaton and each field is
+scanned once; a group's joined text only resumes the scan across each
+join, for phrases that run from one field into the next.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from app.utils.phrase_matcher import PhraseMatcher
+
+# The intake fields text features are read from (the store key covers all of them)
+TEXT_FIELDS = ("role", "brand", "creative_emergency", "what_tried", "deadline", "constraints")
+
+MAX_ENTRIES = 100_000
+
+# Every PhraseGroup's phrases, matched in one pass per field
+matcher = PhraseMatcher()
+
+
+@dataclass(frozen=True, eq=False)
+class PhraseGroup:
+    """Phrases matched (as lowercase substrings) against some intake fields.
+
+    The fields are joined with single spaces; with skip_empty, empty fields
+    are left out of the join instead of contributing an empty string.
+    """
+    phrases: tuple[str, ...]
+    fields: tuple[str, ...]
+    skip_empty: bool = False
+
+    def __post_init__(self):
+        unknown = set(self.fields) - set(TEXT_FIELDS)
+        if unknown:
+            raise ValueError(f"Not intake text fields: {', '.join(sorted(unknown))}")
+        matcher.add(self.phrases)
+
+
+def phrase_group(phrases, fields: tuple[str, ...] | str, skip_empty: bool = False) -> PhraseGroup:
+    return PhraseGroup(tuple(phrases), (fields,) if isinstance(fields, str) else tuple(fields), skip_empty)
+
+
+class IntakeFeatures:
+    """Text features of one intake's TEXT_FIELDS, each computed on first use."""
+
+    __slots__ = ("values", "_memo")
+
+    def __init__(self, values: dict[str, Any]):
+        self.values = values
+        self._memo: dict = {}
+
+    def raw(self, field: str) -> str:
+        return self.values.get(field) or ""
+
+    def words(self, field: str) -> int:
+        key = ("words", field)
+        count = self._memo.get(key)
+        if count is None:
+            value = self.values.get(field)
+            count = self._memo[key] = len(value.split()) if value else 0
+        return count
+
+    def lower(self, field: str) -> str:
+        key = ("lower", field)
+        text = self._memo.get(key)
+        if text is None:
+            text = self._memo[key] = self.raw(field).lower()
+        return text
+
+    def text(self, group: PhraseGroup) -> str:
+        key = (group.fields, group.skip_empty)
+        text = self._memo.get(key)
+        if text is None:
+            text = self._memo[key] = " ".join(self.lower(f) for f in self._joined(group))
+        return text
+
+    def found(self, group: PhraseGroup) -> frozenset[str]:
+        key = ("found", group.fields, group.skip_empty)
+        memo = self._memo.get(key)
+        if memo is None or memo[0] != matcher.version:  # Rescan if groups were added since
+            found, state = frozenset(), 0
+            for n, f in enumerate(self._joined(group)):
+                field_found, field_state = self._field_scan(f)
+                if n:
+                    across, state = matcher.resume(state, " " + self.lower(f), skip=1)
+                    found |= across
+                found |= field_found
+                if not n or state is None:
+                    state = field_state
+            memo = self._memo[key] = (matcher.version, found)
+        return memo[1]
+
+    def hits(self, group: PhraseGroup) -> tuple[str, ...]:
+        hits = self._memo.get(group)
+        if hits is None:
+            hits = self._memo[group] = tuple(filter(self.found(group).__contains__, group.phrases))
+        return hits
+
+    def _joined(self, group: PhraseGroup) -> tuple[str, ...]:
+        if group.skip_empty:
+            return tuple(f for f in group.fields if self.raw(f))
+        return group.fields
+
+    def _field_scan(self, field: str) -> tuple[frozenset[str], int]:
+        key = ("found", field)
+        memo = self._memo.get(key)
+        if memo is None or memo[0] != matcher.version:
+            memo = self._memo[key] = (matcher.version, *matcher.scan(self.lower(field)))
+        return memo[1], memo[2]
+
+    def derived(self, key: Any, compute: Callable[["IntakeFeatures"], Any]) -> Any:
+        """compute(self), memoized under key (use a module-level constant)."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = compute(self)
+            return value
+
+
+class IntakeFeatureStore:
+    """IntakeFeatures by (intake id, text field values), oldest evicted past max_entries."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: dict[tuple, IntakeFeatures] = {}
+        self._key_by_id: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, intake: dict) -> IntakeFeatures:
+        values = tuple(map(intake.get, TEXT_FIELDS))
+        intake_id = intake.get("id") or ""
+        key = (intake_id, values)
+        try:
+            features = self._entries.get(key)
+        except TypeError:  # An unhashable field value: compute without caching
+            return IntakeFeatures(dict(zip(TEXT_FIELDS, values)))
+        if features is not None:
+            self.hits += 1
+            return features
+
+        features = IntakeFeatures(dict(zip(TEXT_FIELDS, values)))
+        with self._lock:
+            self.misses += 1
+            if intake_id:
+                stale = self._key_by_id.get(intake_id)
+                if stale is not None:
+                    self._entries.pop(stale, None)
+                self._key_by_id[intake_id] = key
+            while len(self._entries) >= self.max_entries:
+                oldest = next(iter(self._entries))
+                del self._entries[oldest]
+                if oldest[0] and self._key_by_id.get(oldest[0]) == oldest:
+                    del self._key_by_id[oldest[0]]
+            self._entries[key] = features
+        return features
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_by_id.clear()
+            self.hits = self.misses = 0
+
+
+store = IntakeFeatureStore()
+
+
+def intake_features(intake: dict) -> IntakeFeatures:
+    """The shared store's features for an intake dict."""
+    return store.get(intake)
@@ -1,13 +1,17 @@
 """Intake text mining — extract themes, pain points, and industry signals.
 
 Uses domain-specific keyword dictionaries (no ML dependencies).
-All functions operate on parsed intake dicts from NotionService.
+All functions operate on parsed intake dicts from NotionService; the
+keyword scans are read from the shared intake feature store, so each
+intake is scanned once however many of these functions see it.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 
+from app.utils.intake_features import intake_features, phrase_group
+
 
 # ── Domain Dictionaries ───────────────────────────────────────────
 
@@ -95,6 +99,19 @@ INDUSTRY_KEYWORDS = {
 }
 
 
+# What each dictionary is matched against: the free-text fields (joined,
+# skipping empty ones) or role + brand. Keywords match as lowercase
+# substrings, which also catches variants like "launched" for "launch".
+_INTAKE_TEXT_FIELDS = ("creative_emergency", "what_tried", "constraints", "role", "brand")
+_THEME_TEXT = {
+    theme: phrase_group(keywords, _INTAKE_TEXT_FIELDS, skip_empty=True)
+    for theme, keywords in CREATIVE_THEMES.items()
+}
+_PAIN_POINT_TEXT = phrase_group(PAIN_POINT_KEYWORDS, _INTAKE_TEXT_FIELDS, skip_empty=True)
+_INDUSTRY_TEXT = {industry: phrase_group(keywords, ("role", "brand")) for industry, keywords in INDUSTRY_KEYWORDS.items()}
+_ROLE_BRAND = phrase_group((), ("role", "brand"))
+
+
 # ── Data Classes ──────────────────────────────────────────────────
 
 @dataclass
@@ -128,28 +145,22 @@ def extract_themes(intakes: list[dict]) -> list[ThemeResult]:
         return []
 
     theme_counts: dict[str, set[str]] = {theme: set() for theme in CREATIVE_THEMES}
+    # How many intakes mention at least one keyword from each theme
+    intake_counts = dict.fromkeys(CREATIVE_THEMES, 0)
 
     for intake in intakes:
-        text = _get_intake_text(intake).lower()
-        if not text:
-            continue
-
-        for theme, keywords in CREATIVE_THEMES.items():
-            for kw in keywords:
-                if _keyword_match(kw, text):
-                    theme_counts[theme].add(kw)
+        features = intake_features(intake)
+        for theme, group in _THEME_TEXT.items():
+            found = features.hits(group)
+            if found:
+                theme_counts[theme].update(found)
+                intake_counts[theme] += 1
 
     total = len(intakes)
     results = []
     for theme, found_keywords in theme_counts.items():
         if found_keywords:
-            # Count how many intakes mention at least one keyword from this theme
-            count = 0
-            for intake in intakes:
-                text = _get_intake_text(intake).lower()
-                if any(_keyword_match(kw, text) for kw in CREATIVE_THEMES[theme]):
-                    count += 1
-
+            count = intake_counts[theme]
             results.append(ThemeResult(
                 theme=theme,
                 count=count,
@@ -166,11 +177,7 @@ def extract_pain_points(intake: dict) -> list[str]:
 
     Returns list of matching pain point phrases.
     """
-    text = _get_intake_text(intake).lower()
-    if not text:
-        return []
-
-    return [pp for pp in PAIN_POINT_KEYWORDS if _keyword_match(pp, text)]
+    return list(intake_features(intake).hits(_PAIN_POINT_TEXT))
 
 
 def extract_all_pain_points(intakes: list[dict]) -> dict[str, int]:
@@ -194,21 +201,26 @@ def get_industry_distribution(intakes: list[dict]) -> dict[str, int]:
     counts: dict[str, int] = {}
 
     for intake in intakes:
-        role = (intake.get("role") or "").lower()
-        brand = (intake.get("brand") or "").lower()
-        combined = role + " " + brand
+        industry = get_industry(intake)
+        if industry:
+            counts[industry] = counts.get(industry, 0) + 1
 
-        matched = False
-        for industry, keywords in INDUSTRY_KEYWORDS.items():
-            if any(_keyword_match(kw, combined) for kw in keywords):
-                counts[industry] = counts.get(industry, 0) + 1
-                matched = True
-                break  # One industry per client
+    return dict(sorted(counts.items(), key=lambda x: x[1], reverse=True))
 
-        if not matched and combined.strip():
-            counts["Other"] = counts.get("Other", 0) + 1
 
-    return dict(sorted(counts.items(), key=lambda x: x[1], reverse=True))
+def get_industry(intake: dict) -> str:
+    """The first INDUSTRY_KEYWORDS industry matching Role + Brand.
+
+    "Other" when neither matches anything, "" when both are empty.
+    """
+    return intake_features(intake).derived(get_industry, _industry)
+
+
+def _industry(features) -> str:
+    for industry, group in _INDUSTRY_TEXT.items():
+        if features.hits(group):
+            return industry  # One industry per client
+    return "Other" if features.text(_ROLE_BRAND).strip() else ""
 
 
 def get_outcome_demand(intakes: list[dict]) -> dict[str, int]:
@@ -226,33 +238,3 @@ def get_outcome_demand(intakes: list[dict]) -> dict[str, int]:
 
     return dict(sorted(counts.items(), key=lambda x: x[1], reverse=True))
 
-
-# ── Helpers ───────────────────────────────────────────────────────
-
-
-def _keyword_match(keyword: str, text: str) -> bool:
-    """Check if keyword matches in text using substring or word-prefix matching.
-
-    Handles morphological variants like 'launched' matching 'launch'
-    by checking if any word in the text starts with the keyword.
-    """
-    if keyword in text:
-        return True
-    # Word-prefix check: does any word start with this keyword?
-    # Handles: "launching" matches "launch", "rebranded" matches "rebrand"
-    if len(keyword) >= 4:  # Only for keywords long enough to be meaningful
-        words = text.split()
-        return any(w.startswith(keyword) for w in words)
-    return False
-
-
-def _get_intake_text(intake: dict) -> str:
-    """Concatenate all text fields from an intake for analysis."""
-    fields = [
-        intake.get("creative_emergency", ""),
-        intake.get("what_tried", ""),
-        intake.get("constraints", ""),
-        intake.get("role", ""),
-        intake.get("brand", ""),
-    ]
-    return " ".join(f for f in fields if f)
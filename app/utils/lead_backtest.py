@@ -0,0 +1,327 @@
+"""Backtest the lead scorer against what clients actually did next.
+
+For each past date D, every client created by D is scored as they stood on
+D, and counted as converted if they paid (first or repeat purchase) or
+completed a call within horizon_days after D. Tier precision — the share of
+each tier's clients that converted — shows whether Hot leads really are the
+ones worth calling, and lets a rule change be checked against history
+before it ships.
+
+Notion keeps only the current record, so the state on D is reconstructed
+from its dates (see snapshot_as_of): the payment counts from its payment
+date, the call from its call date, the intake from its creation date, and
+the status is the furthest stage those imply (never past the current one).
+
+History scores each client's distinct states once with score_batch();
+its sweep then applies the date-dependent negative-signal cap and recency
+decay to the whole dates × clients grid as array operations.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
+
+import numpy as np
+
+from app.config import PIPELINE_STATUSES
+from app.utils import lead_scorer
+from app.utils.client_frame import ClientFrame, parse_timestamps
+from app.utils.lead_scorer import TIERS
+
+POST_CALL_STATUSES = ("Call Complete", "Follow-Up Sent")
+
+# Dates × clients cells evaluated per chunk of the sweep
+CHUNK_CELLS = 1_000_000
+
+
+@dataclass
+class TierPrecision:
+    tier: str
+    scored: int = 0     # client-dates scored into the tier
+    converted: int = 0  # of those, converted within the horizon
+
+    @property
+    def precision(self) -> float:
+        return self.converted / self.scored if self.scored else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "tier": self.tier,
+            "scored": self.scored,
+            "converted": self.converted,
+            "precision": round(self.precision * 100, 1),
+        }
+
+
+@dataclass
+class BacktestResult:
+    """Per-date, per-tier counts; rows follow dates, columns follow TIERS."""
+    dates: list[datetime]
+    horizon_days: int
+    scored: np.ndarray
+    converted: np.ndarray
+
+    @property
+    def tiers(self) -> list[TierPrecision]:
+        scored, converted = self.scored.sum(axis=0), self.converted.sum(axis=0)
+        return [TierPrecision(t, int(scored[k]), int(converted[k])) for k, t in enumerate(TIERS)]
+
+    @property
+    def base_rate(self) -> float:
+        total = self.scored.sum()
+        return float(self.converted.sum() / total) if total else 0.0
+
+    def as_dict(self) -> dict:
+        base = self.base_rate
+        return {
+            "dates": len(self.dates),
+            "first_date": self.dates[0].strftime("%Y-%m-%d") if self.dates else "",
+            "last_date": self.dates[-1].strftime("%Y-%m-%d") if self.dates else "",
+            "horizon_days": self.horizon_days,
+            "base_rate": round(base * 100, 1),
+            "tiers": [
+                {**t.as_dict(), "lift": round(t.precision / base, 2) if base else 0.0}
+                for t in self.tiers
+            ],
+        }
+
+
+def snapshot_as_of(payment: dict, intake: dict | None, as_of: datetime) -> tuple[dict, dict | None] | None:
+    """The client as they stood at as_of, or None if not yet created.
+
+    score_client(*snapshot_as_of(p, i, d), as_of=d) is the score the
+    backtest gives the client on d.
+    """
+    created = _timestamp(payment.get("created"))
+    if created is None or created > as_of:
+        return None
+    paid_at = None
+    if (payment.get("payment_amount", 0) or 0) > 0:
+        paid_at = _timestamp(payment.get("payment_date")) or created
+    call_at = _timestamp(payment.get("call_date"))
+    intake_at = (_timestamp(intake.get("created")) or created) if intake else None
+    return _state(
+        payment,
+        intake,
+        paid=paid_at is not None and paid_at <= as_of,
+        call=call_at is not None and call_at <= as_of,
+        has_intake=intake_at is not None and intake_at <= as_of,
+    )
+
+
+def backtest_dates(
+    clients: list[dict] | ClientFrame,
+    horizon_days: int = 30,
+    step_days: int = 1,
+    end: datetime | None = None,
+) -> list[datetime]:
+    """Midnights from the first client's creation to horizon_days before end (default: now)."""
+    frame = _frame(clients)
+    created = frame.created[~np.isnat(frame.created)]
+    if not len(created):
+        return []
+    first = created.min().astype("datetime64[D]") + np.timedelta64(1, "D")
+    last = np.datetime64(end or datetime.now(), "us") - np.timedelta64(horizon_days, "D")
+    days = np.arange(first, last.astype("datetime64[D]") + np.timedelta64(1, "D"), np.timedelta64(step_days, "D"))
+    return [d.astype("datetime64[us]").item() for d in days if d <= last]
+
+
+def backtest(
+    clients: list[dict] | ClientFrame,
+    dates: list[datetime] | None = None,
+    horizon_days: int = 30,
+) -> BacktestResult:
+    """Score every client at every date and tally tier precision.
+
+    clients is the merged client list (or a ClientFrame with intakes);
+    dates default to backtest_dates(clients, horizon_days).
+    """
+    history = History.build(clients)
+    if dates is None:
+        dates = backtest_dates(history.frame, horizon_days)
+    scored = np.zeros((len(dates), len(TIERS)), dtype=np.int64)
+    converted = np.zeros_like(scored)
+    k = len(TIERS)
+    for chunk in history.sweep(dates, horizon_days):
+        cells = np.arange(len(chunk.exists))[:, None] * k + chunk.tier
+        size = len(chunk.exists) * k
+        scored[chunk.rows] = np.bincount(cells[chunk.exists], minlength=size).reshape(-1, k)
+        converted[chunk.rows] = np.bincount(cells[chunk.exists & chunk.converted], minlength=size).reshape(-1, k)
+    return BacktestResult(dates=list(dates), horizon_days=horizon_days, scored=scored, converted=converted)
+
+
+@dataclass
+class SweepChunk:
+    """One chunk of History.sweep(): arrays are dates-in-chunk × clients.
+
+    exists marks clients created by the date; the other arrays are only
+    meaningful there. state is the row of History.states each client was
+    in on that date.
+    """
+    rows: slice
+    exists: np.ndarray
+    state: np.ndarray
+    days: np.ndarray
+    capped: np.ndarray
+    multiplier: np.ndarray
+    total: np.ndarray
+    tier: np.ndarray       # index into TIERS
+    converted: np.ndarray
+
+
+@dataclass
+class History:
+    """Clients' reconstructed states over time, scored once and ready to sweep.
+
+    A client's state changes only at its payment, call and intake dates, so
+    it has at most four: one at creation and one after each later event.
+    states scores each (client, visible events) state that occurs with
+    score_batch(); state_of maps client × visibility code (4·paid + 2·call
+    + intake) to its row there.
+    """
+    frame: ClientFrame
+    created: np.ndarray
+    paid_at: np.ndarray
+    call_at: np.ndarray
+    intake_at: np.ndarray
+    states: lead_scorer.BatchScores
+    state_of: np.ndarray
+    base: np.ndarray     # per state: category points + frequency bonus
+    stale: np.ndarray    # per state: eligible for the stale-lead cap
+    stalled: np.ndarray  # per state: eligible for the paid-but-stalled cap
+
+    @classmethod
+    def build(cls, clients: list[dict] | ClientFrame) -> "History":
+        frame = _frame(clients)
+        n = len(frame)
+        created = frame.created
+        paid_at = np.where(frame.paid, frame.purchased, np.datetime64("NaT", "us"))
+        call_at = frame.call_date
+        has_intake = np.array([bool(i) for i in frame.intakes], dtype=bool)
+        intake_at = parse_timestamps([i.get("created") if i else None for i in frame.intakes])
+        intake_at = np.where(has_intake & np.isnat(intake_at), created, intake_at)
+
+        checkpoints = np.stack([created, paid_at, call_at, intake_at])
+        occurs = ~np.isnat(checkpoints) & (checkpoints >= created) & ~np.isnat(created)
+        occurs[0] = ~np.isnat(created)
+        code = (paid_at <= checkpoints) * 4 + (call_at <= checkpoints) * 2 + (intake_at <= checkpoints)
+        pairs = np.unique((np.arange(n) * 8 + code)[occurs])
+        client, code = pairs // 8, pairs % 8
+
+        payments, intakes = [], []
+        for i, c in zip(client.tolist(), code.tolist()):
+            payment, intake = _state(frame.records[i], frame.intakes[i], paid=bool(c & 4), call=bool(c & 2),
+                                     has_intake=bool(c & 1))
+            payments.append(payment)
+            intakes.append(intake)
+        state_frame = ClientFrame(payments, intakes)
+        states = lead_scorer.score_batch(state_frame)
+
+        state_of = np.zeros((n, 8), dtype=np.int64)
+        state_of[client, code] = np.arange(len(pairs))
+        intake_present = np.array([bool(i) for i in intakes], dtype=bool)
+        return cls(
+            frame=frame,
+            created=created,
+            paid_at=paid_at,
+            call_at=call_at,
+            intake_at=intake_at,
+            states=states,
+            state_of=state_of,
+            base=(states.engagement + states.velocity + states.urgency + states.source + states.upsell
+                  + states.frequency).astype(np.int64),
+            stale=state_frame.is_status("Lead - Laylo") & (state_frame.amount == 0) & ~intake_present,
+            stalled=state_frame.is_status("Paid - Needs Booking"),
+        )
+
+    def sweep(self, dates: list[datetime], horizon_days: int) -> Iterator[SweepChunk]:
+        """Score every client at every date, CHUNK_CELLS cells at a time."""
+        n = len(self.frame)
+        created = self.created
+        group = _client_groups(self.frame)
+        event_group, event_time = _conversion_events(self.frame, group, self.paid_at, self.call_at)
+
+        at_all = np.array(dates, dtype="datetime64[us]")
+        horizon = np.timedelta64(horizon_days, "D")
+        times = np.unique(np.concatenate([event_time, at_all, at_all + horizon]))
+        stride = len(times) + 1
+        event_keys = np.sort(event_group * stride + np.searchsorted(times, event_time))
+
+        columns = np.arange(n)
+        step = max(1, CHUNK_CELLS // max(n, 1))
+        for start in range(0, len(dates), step):
+            rows = slice(start, start + step)
+            at = at_all[rows][:, None]
+            exists = created <= at
+            code = (self.paid_at <= at) * 4 + (self.call_at <= at) * 2 + (self.intake_at <= at)
+            state = np.where(exists, self.state_of[columns, code], 0)
+
+            days = (at - created).astype(np.int64).astype(np.float64) / 1e6 / 86400
+            capped = (self.stale[state] & (days > 30)) | (self.stalled[state] & (days > 14))
+            multiplier = np.where(capped, 1.0, np.select([days < 7, days < 14, days < 30], [1.0, 0.95, 0.85], 0.7))
+            base = self.base[state]
+            total = np.where(capped, np.minimum(base, 40), np.round(base * multiplier)).astype(np.int64)
+            total = np.clip(total, 0, 100)
+            tier = np.select(
+                [total >= lead_scorer.TIER_HOT, total >= lead_scorer.TIER_WARM, total >= lead_scorer.TIER_COOL],
+                [0, 1, 2], 3)
+
+            lo = group * stride + np.searchsorted(times, at)
+            hi = group * stride + np.searchsorted(times, at + horizon)
+            converted = np.searchsorted(event_keys, hi, "right") > np.searchsorted(event_keys, lo, "right")
+            yield SweepChunk(rows, exists, state, days, capped, multiplier, total, tier, converted)
+
+
+def _client_groups(frame: ClientFrame) -> np.ndarray:
+    """Records of the same email share a group; records without one stand alone."""
+    return np.where(frame.email_code >= 0, frame.email_code, len(frame.emails) + np.arange(len(frame)))
+
+
+def _conversion_events(frame, group, paid_at, call_at):
+    """(group, time) of every purchase and every completed call."""
+    paid = ~np.isnat(paid_at)
+    called = frame.is_status(*POST_CALL_STATUSES) & ~np.isnat(call_at)
+    return (
+        np.concatenate([group[paid], group[called]]),
+        np.concatenate([paid_at[paid], call_at[called]]),
+    )
+
+
+def _state(payment: dict, intake: dict | None, paid: bool, call: bool, has_intake: bool) -> tuple[dict, dict | None]:
+    snapshot = dict(payment)
+    if not paid:
+        snapshot.update(payment_amount=0, product_purchased="", payment_date="")
+    if not call:
+        snapshot["call_date"] = ""
+    snapshot["status"] = _status(payment.get("status", ""), paid, call, has_intake)
+    return snapshot, (intake if has_intake else None)
+
+
+def _status(current: str, paid: bool, call: bool, has_intake: bool) -> str:
+    """The furthest stage the visible events imply, capped at the current status."""
+    if call:
+        implied = current if current in POST_CALL_STATUSES else "Call Complete"
+    elif has_intake:
+        implied = "Intake Complete"
+    elif paid:
+        implied = "Paid - Needs Booking"
+    else:
+        implied = "Lead - Laylo"
+    if current in PIPELINE_STATUSES and PIPELINE_STATUSES.index(current) < PIPELINE_STATUSES.index(implied):
+        return current
+    return implied
+
+
+def _timestamp(value) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return lead_scorer._parse_date(value)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _frame(clients: list[dict] | ClientFrame) -> ClientFrame:
+    return clients if isinstance(clients, ClientFrame) else ClientFrame.from_merged(clients)
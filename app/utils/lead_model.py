@@ -0,0 +1,244 @@
+"""Learned lead scoring: a regularized logistic model over the heuristic's signals.
+
+lead_scorer adds hand-set points per signal. train() fits weights for the
+same signals to what clients actually did next: it replays history with
+lead_backtest.History, labels every client-date by whether that client
+completed a call or bought within horizon_days (the backtest's
+conversion), and fits an L2-regularized logistic regression by Newton's
+method on a seeded sample of those client-dates. Everything is NumPy.
+
+Inference is one matrix multiply over the score_batch() features, so the
+model scores a whole ClientFrame for little more than the heuristic costs.
+The fitted model is a small JSON artifact (MODEL_FILE) carrying
+MODEL_VERSION and the feature list; load() ignores files that don't match.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.utils.client_frame import ClientFrame
+from app.utils.lead_backtest import History, backtest_dates
+from app.utils.lead_scorer import BatchScores, score_batch
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODEL_FILE = os.getenv("LEAD_MODEL_PATH") or os.path.join(_PROJECT_ROOT, "plans", "lead_model.json")
+
+MODEL_VERSION = 1
+
+FEATURES = (
+    "engagement", "velocity", "urgency", "source", "upsell", "frequency",
+    "paid", "has_intake", "filled", "deadline_level", "urgency_matches", "multi_matches", "outcomes",
+    "capped", "multiplier", "log_days",
+)
+
+
+@dataclass
+class LeadModel:
+    """Fitted weights over standardized FEATURES, plus how they were fitted."""
+    weights: list[float]
+    bias: float
+    mean: list[float]
+    scale: list[float]
+    features: list[str] = field(default_factory=lambda: list(FEATURES))
+    version: int = MODEL_VERSION
+    trained_at: str = ""
+    horizon_days: int = 30
+    l2: float = 1.0
+    samples: int = 0
+    positive_rate: float = 0.0
+    metrics: dict = field(default_factory=dict)  # holdout AUC of the model and the heuristic
+
+    def probability(self, X: np.ndarray) -> np.ndarray:
+        """Conversion probability per row of a raw (unstandardized) feature matrix."""
+        z = ((X - np.asarray(self.mean)) / np.asarray(self.scale)) @ np.asarray(self.weights) + self.bias
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def predict(self, batch: BatchScores) -> np.ndarray:
+        """Conversion probability for every row of a score_batch() result."""
+        f = batch.features
+        return self.probability(feature_matrix(
+            _static_features(batch), batch.capped, batch.multiplier, np.asarray(f["days_since_created"])))
+
+    def score(self, frame: ClientFrame, as_of: datetime | None = None) -> np.ndarray:
+        """0–100 model scores for a frame (probability × 100, rounded)."""
+        return np.round(self.predict(score_batch(frame, as_of=as_of)) * 100).astype(np.int64)
+
+    def save(self, path: str = MODEL_FILE) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(asdict(self), f, indent=1)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = MODEL_FILE) -> "LeadModel | None":
+        """The saved model, or None if missing, unreadable or from another version."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read lead model {path}: {e}")
+            return None
+        if data.get("version") != MODEL_VERSION or data.get("features") != list(FEATURES):
+            logger.warning(f"Ignoring lead model {path}: version {data.get('version')} does not match "
+                           f"{MODEL_VERSION}; retrain it")
+            return None
+        try:
+            return cls(**data)
+        except TypeError as e:
+            logger.error(f"Could not load lead model {path}: {e}")
+            return None
+
+
+def feature_matrix(static: np.ndarray, capped, multiplier, days) -> np.ndarray:
+    """FEATURES columns: per-state signals plus the date-dependent ones."""
+    days = np.nan_to_num(np.maximum(np.asarray(days, dtype=np.float64), 0))
+    return np.column_stack([static, np.asarray(capped, dtype=np.float64), multiplier, np.log1p(days)])
+
+
+def _static_features(batch: BatchScores) -> np.ndarray:
+    f = batch.features
+    return np.column_stack([
+        batch.engagement, batch.velocity, batch.urgency, batch.source, batch.upsell, batch.frequency,
+        batch.frame.paid, f["has_intake"], f["filled"], f["deadline_level"],
+        np.minimum(f["urgency_matches"], 3), np.minimum(f["multi_matches"], 2), np.minimum(f["outcomes"], 4),
+    ]).astype(np.float64)
+
+
+# ── Training ───────────────────────────────────────────────────────
+
+
+@dataclass
+class TrainingSet:
+    """Sampled client-dates: features X, conversion labels y, heuristic totals."""
+    X: np.ndarray
+    y: np.ndarray
+    heuristic: np.ndarray
+    date: np.ndarray  # datetime64 of each sample's as-of date
+
+
+def training_set(
+    clients: list[dict] | ClientFrame,
+    dates: list[datetime] | None = None,
+    horizon_days: int = 30,
+    max_samples: int = 200_000,
+    seed: int = 0,
+) -> TrainingSet:
+    """Every existing client at every date, sampled down to about max_samples."""
+    history = History.build(clients)
+    if dates is None:
+        dates = backtest_dates(history.frame, horizon_days)
+    static = _static_features(history.states)
+
+    created = np.sort(history.created[~np.isnat(history.created)])
+    at = np.array(dates, dtype="datetime64[us]")
+    cells = int(np.searchsorted(created, at, "right").sum())
+    rate = min(1.0, max_samples / cells) if cells else 1.0
+
+    rng = np.random.default_rng(seed)
+    parts = []
+    for chunk in history.sweep(dates, horizon_days):
+        keep = chunk.exists & (rng.random(chunk.exists.shape) < rate)
+        j, i = np.nonzero(keep)
+        parts.append((
+            feature_matrix(static[chunk.state[j, i]], chunk.capped[j, i], chunk.multiplier[j, i], chunk.days[j, i]),
+            chunk.converted[j, i],
+            chunk.total[j, i],
+            at[chunk.rows][j],
+        ))
+    if not parts:
+        return TrainingSet(np.zeros((0, len(FEATURES))), np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64),
+                           np.zeros(0, dtype="datetime64[us]"))
+    X, y, heuristic, date = (np.concatenate(p) for p in zip(*parts))
+    return TrainingSet(X, y, heuristic, date)
+
+
+def fit(X: np.ndarray, y: np.ndarray, l2: float = 1.0, max_iter: int = 25, tol: float = 1e-8) -> LeadModel:
+    """L2-regularized logistic regression by Newton's method (the bias is not penalized)."""
+    mean = X.mean(axis=0) if len(X) else np.zeros(X.shape[1])
+    scale = X.std(axis=0) if len(X) else np.ones(X.shape[1])
+    scale = np.where(scale > 0, scale, 1.0)
+    Z = np.column_stack([(X - mean) / scale, np.ones(len(X))])
+    y = y.astype(np.float64)
+    penalty = np.full(Z.shape[1], l2)
+    penalty[-1] = 0.0
+
+    w = np.zeros(Z.shape[1])
+    if len(y):
+        rate = np.clip(y.mean(), 1e-6, 1 - 1e-6)
+        w[-1] = np.log(rate / (1 - rate))
+    for _ in range(max_iter):
+        p = 1.0 / (1.0 + np.exp(-(Z @ w)))
+        gradient = Z.T @ (p - y) + penalty * w
+        hessian = (Z * (p * (1 - p))[:, None]).T @ Z + np.diag(penalty) + 1e-9 * np.eye(len(w))
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.abs(step).max() < tol:
+            break
+
+    return LeadModel(
+        weights=w[:-1].tolist(),
+        bias=float(w[-1]),
+        mean=mean.tolist(),
+        scale=scale.tolist(),
+        l2=l2,
+        samples=len(y),
+        positive_rate=round(float(y.mean()), 6) if len(y) else 0.0,
+    )
+
+
+def auc(scores: np.ndarray, labels: np.ndarray) -> float:
+    """Area under the ROC curve (ties count half); 0.5 when one class is missing."""
+    labels = np.asarray(labels, dtype=bool)
+    positives, negatives = int(labels.sum()), int((~labels).sum())
+    if not positives or not negatives:
+        return 0.5
+    ranks = pd.Series(scores).rank().to_numpy()
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def train(
+    clients: list[dict] | ClientFrame,
+    dates: list[datetime] | None = None,
+    horizon_days: int = 30,
+    l2: float = 1.0,
+    holdout: float = 0.2,
+    max_samples: int = 200_000,
+    seed: int = 0,
+) -> LeadModel:
+    """Fit on the full history; metrics come from a refit that holds out the latest dates.
+
+    The holdout is the last `holdout` share of the date range, and the
+    evaluation fit only sees dates at least horizon_days before it, so no
+    training label looks into the holdout period.
+    """
+    data = training_set(clients, dates, horizon_days, max_samples, seed)
+    model = fit(data.X, data.y, l2)
+    model.horizon_days = horizon_days
+    model.trained_at = datetime.now().isoformat(timespec="seconds")
+
+    if len(data.date) and holdout > 0:
+        first, last = data.date.min(), data.date.max()
+        split = last - (last - first) * holdout
+        train_rows = data.date <= split - np.timedelta64(horizon_days, "D")
+        test_rows = data.date > split
+        if train_rows.any() and test_rows.any():
+            evaluation = fit(data.X[train_rows], data.y[train_rows], l2)
+            model.metrics = {
+                "auc": round(auc(evaluation.probability(data.X[test_rows]), data.y[test_rows]), 4),
+                "heuristic_auc": round(auc(data.heuristic[test_rows], data.y[test_rows]), 4),
+                "holdout_samples": int(test_rows.sum()),
+            }
+    return model
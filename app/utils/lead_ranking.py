@@ -0,0 +1,190 @@
+"""Scored leads kept in rank order, updated one client at a time.
+
+score_all_clients() returns a freshly sorted list, so every "who should we
+call next" view re-sorts the whole lead pool. A LeadRanking keeps the
+order instead: totals are whole points from 0 to 100, so clients live in
+one bucket per score, each bucket a sorted list of (arrival, key). Arrival
+is when the client first entered the ranking, so a ranking built from
+score_all_clients() output starts in exactly its order, and ties keep
+ranking the longer-known client first as scores move.
+
+    update / remove     bisect into one bucket: O(log n) comparisons
+    top(k, tiers)       walks buckets from 100 down: O(k) plus 101 buckets
+    rank(key)           bucket sizes above the score + a bisect
+    between(lo, hi)     the buckets in the range, already in order
+    copy()              a detached ranking that later updates don't move
+
+A ranking pickles (for the cache's disk tier) as that same copy, without
+its lock.
+
+sync() applies a new scored list by updating only the clients whose total
+changed, which is how webhook upserts reach it: the ScoreMemo re-scores the
+edited client and the ranking moves just that one.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Iterable, Iterator
+
+from app.utils.lead_scorer import TIER_COOL, TIER_HOT, TIER_WARM, TIERS
+
+MAX_SCORE = 100
+
+# score -> tier, with the scorer's thresholds
+_TIER_OF = [
+    TIERS[0] if s >= TIER_HOT else TIERS[1] if s >= TIER_WARM else TIERS[2] if s >= TIER_COOL else TIERS[3]
+    for s in range(MAX_SCORE + 1)
+]
+
+
+def client_key(payment: dict) -> str:
+    """Identity of a scored client: Notion page id, else Stripe session, else email."""
+    return str(payment.get("id") or payment.get("stripe_session_id") or (payment.get("email") or "").lower())
+
+
+class LeadRanking:
+    """Scored clients ranked by total (highest first), ties in arrival order.
+
+    Items are score_all_clients() entries ({"payment", "intake", "score"});
+    any dict works with update() as long as the total is given.
+    """
+
+    def __init__(self, scored: list[dict] | None = None):
+        self._buckets: list[list[tuple[int, str]]] = [[] for _ in range(MAX_SCORE + 1)]
+        self._entries: dict[str, tuple[int, int, dict]] = {}  # key -> (score, arrival, item)
+        self._arrivals = 0
+        self._lock = threading.Lock()
+        if scored:
+            self.sync(scored)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    # ── Updates ────────────────────────────────────────────────────
+
+    def update(self, key: str, total: int, item: dict | None = None) -> None:
+        """Insert a client or move it to a new total."""
+        total = min(max(int(total), 0), MAX_SCORE)
+        with self._lock:
+            self._update(key, total, item)
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def sync(self, scored: Iterable[dict]) -> int:
+        """Match the ranking to a scored list; returns how many clients moved, arrived or left."""
+        changed = 0
+        with self._lock:
+            seen = set()
+            for item in scored:
+                key = client_key(item["payment"])
+                if key in seen:
+                    continue  # Duplicate records of one client rank once, as the first
+                seen.add(key)
+                total = min(max(int(item["score"]["total"]), 0), MAX_SCORE)
+                entry = self._entries.get(key)
+                if entry is None or entry[0] != total:
+                    changed += 1
+                self._update(key, total, item)
+            for key in [k for k in self._entries if k not in seen]:
+                self._remove(key)
+                changed += 1
+        return changed
+
+    def _update(self, key: str, total: int, item: dict | None) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            arrival = self._arrivals
+            self._arrivals += 1
+        else:
+            arrival = entry[1]
+            if item is None:
+                item = entry[2]
+            if entry[0] == total:
+                self._entries[key] = (total, arrival, item)
+                return
+            bucket = self._buckets[entry[0]]
+            del bucket[bisect.bisect_left(bucket, (arrival, key))]
+        bisect.insort(self._buckets[total], (arrival, key))
+        self._entries[key] = (total, arrival, item if item is not None else {})
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        bucket = self._buckets[entry[0]]
+        del bucket[bisect.bisect_left(bucket, (entry[1], key))]
+        return True
+
+    def copy(self) -> LeadRanking:
+        """This ranking as it stands now; updates to either one leave the other as it was."""
+        clone = LeadRanking.__new__(LeadRanking)
+        clone.__setstate__(self.__getstate__())
+        return clone
+
+    def __getstate__(self) -> dict:
+        with self._lock:
+            return {
+                "_buckets": [list(b) for b in self._buckets],
+                "_entries": dict(self._entries),
+                "_arrivals": self._arrivals,
+            }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # ── Queries ────────────────────────────────────────────────────
+
+    def score(self, key: str) -> int | None:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def item(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        return entry[2] if entry else None
+
+    def rank(self, key: str) -> int | None:
+        """1-based position in the ranking, or None if the client isn't ranked."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            score, arrival, _ = entry
+            above = sum(len(b) for b in self._buckets[score + 1:])
+            return above + bisect.bisect_left(self._buckets[score], (arrival, key)) + 1
+
+    def top(self, k: int | None = None, tiers: Iterable[str] | None = None) -> list[dict]:
+        """The k highest-ranked items (all when k is None), optionally only from some tiers."""
+        wanted = set(tiers) if tiers else None
+        scores = [s for s in range(MAX_SCORE, -1, -1) if wanted is None or _TIER_OF[s] in wanted]
+        return self._take(scores, k)
+
+    def between(self, lo: int, hi: int, k: int | None = None) -> list[dict]:
+        """Items scoring lo..hi inclusive, in rank order."""
+        return self._take(range(min(hi, MAX_SCORE), max(lo, 0) - 1, -1), k)
+
+    def tier_counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(TIERS, 0)
+        for score, bucket in enumerate(self._buckets):
+            counts[_TIER_OF[score]] += len(bucket)
+        return counts
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.top())
+
+    def _take(self, scores: Iterable[int], k: int | None) -> list[dict]:
+        out: list[dict] = []
+        with self._lock:
+            for score in scores:
+                for _, key in self._buckets[score]:
+                    if k is not None and len(out) >= k:
+                        return out
+                    out.append(self._entries[key][2])
+        return out
@@ -6,90 +6,105 @@ Scoring breakdown (100 points total):
   Urgency Signals:    20 pts — Keywords in intake: deadline, launch, urgent, ASAP
   Lead Source Quality: 15 pts — Referral source, ManyChat keyword, direct vs funnel
   Upsell Potential:   10 pts — Multiple brands, ongoing needs, team size
+
+score_client() scores one client. score_batch() applies the same rules as
+array operations over a ClientFrame; score_all_clients() uses it when given
+a frame, and produces the same breakdowns either way. Given a ScoreMemo,
+score_all_clients() re-scores only the clients whose records changed since
+the previous pass.
 """
 
 from __future__ import annotations
 
+import math
 import re
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.utils.client_frame import ClientFrame, parse_timestamps
+from app.utils.intake_features import IntakeFeatures, intake_features, phrase_group
 
 
 # Score tier thresholds (aligned with CLAUDE.md docs)
 TIER_HOT = 70
 TIER_WARM = 40
 TIER_COOL = 20
-
-
-def score_client(payment: dict, intake: dict | None) -> dict:
+TIERS = ("Hot", "Warm", "Cool", "Cold")
+
+# Points each category is worth; ScoreMatrix.reweight() takes the same shape
+CATEGORY_MAX = {"engagement": 30, "velocity": 25, "urgency": 20, "source": 15, "upsell": 10}
+
+ENGAGEMENT_FIELDS = ["role", "brand", "creative_emergency", "what_tried", "deadline", "constraints"]
+URGENT_DEADLINE = ["asap", "urgent", "immediately", "this week", "tomorrow"]
+SOON_DEADLINE = ["next week", "2 weeks", "two weeks", "end of month"]
+TIMELINE_DEADLINE = ["month", "quarter", "weeks"]
+URGENCY_PHRASES = [
+    "launch", "deadline", "urgent", "asap", "running out of time",
+    "need help now", "stuck", "behind schedule", "can't wait",
+    "time sensitive", "crunch", "last minute",
+]
+SOURCE_SCORES = {
+    "Referral": 14,
+    "Direct": 12,
+    "Website": 10,
+    "IG DM": 9,
+    "IG Story": 8,
+    "IG Comment": 7,
+    "LinkedIn": 8,
+    "Meta Ad": 5,
+}
+MULTI_PROJECT_SIGNALS = [
+    "multiple", "several projects", "ongoing", "long-term",
+    "team", "rebrand", "full brand", "website and",
+    "social media and", "everything",
+]
+
+# Intake text is scanned through the shared feature store (see intake_features)
+_URGENCY_TEXT = phrase_group(URGENCY_PHRASES, "creative_emergency")
+_MULTI_PROJECT_TEXT = phrase_group(MULTI_PROJECT_SIGNALS, ("creative_emergency", "what_tried"))
+_DEADLINE_TEXT = (
+    (4, phrase_group(URGENT_DEADLINE, "deadline")),
+    (3, phrase_group(SOON_DEADLINE, "deadline")),
+    (2, phrase_group(TIMELINE_DEADLINE, "deadline")),
+)
+
+
+def score_client(payment: dict, intake: dict | None, as_of: datetime | None = None) -> dict:
     """Score a single client and return breakdown.
 
-    Returns dict with total, tier, and per-category scores.
+    Returns dict with total, tier, and per-category scores. Recency decay
+    and negative signals are measured at as_of (default: now), so a fixed
+    as_of gives reproducible scores.
     """
-    engagement = _score_engagement(intake)
-    velocity = _score_velocity(payment, intake)
-    urgency = _score_urgency(intake)
-    source = _score_source(payment)
-    upsell = _score_upsell(intake, payment)
-
-    base_total = (
-        engagement["score"]
-        + velocity["score"]
-        + urgency["score"]
-        + source["score"]
-        + upsell["score"]
-    )
-
-    # Apply modifiers
-    frequency = _frequency_bonus(payment)
-    total = base_total + frequency["bonus"]
-
-    negative = _apply_negative_signals(total, payment, intake)
-    total = negative["adjusted_score"]
+    return _finish(_score_components(payment, intake), payment, intake, as_of)
 
-    # Skip recency decay if negative signals already capped the score
-    # to avoid double-penalizing stale leads
-    if negative.get("capped"):
-        recency = {"adjusted_score": total, "multiplier": 1.0, "reason": "Skipped (negative cap active)"}
-    else:
-        recency = _apply_recency_decay(total, payment)
-        total = recency["adjusted_score"]
 
-    # Clamp to 0-100
-    total = max(0, min(100, total))
-
-    if total >= TIER_HOT:
-        tier = "Hot"
-    elif total >= TIER_WARM:
-        tier = "Warm"
-    elif total >= TIER_COOL:
-        tier = "Cool"
-    else:
-        tier = "Cold"
-
-    return {
-        "total": total,
-        "tier": tier,
-        "engagement": engagement,
-        "velocity": velocity,
-        "urgency": urgency,
-        "source": source,
-        "upsell": upsell,
-        "frequency": frequency,
-        "recency": recency,
-        "negative": negative,
-    }
-
-
-def score_all_clients(merged_clients: list[dict]) -> list[dict]:
+def score_all_clients(
+    merged_clients: list[dict] | ClientFrame,
+    memo: ScoreMemo | None = None,
+    as_of: datetime | None = None,
+) -> list[dict]:
     """Score all clients and return sorted by score descending.
 
     Each item gets a 'score' key added alongside 'payment' and 'intake'.
+    With a ScoreMemo, only clients whose records changed since the memo's
+    last pass are scored from scratch.
     """
+    if memo is not None:
+        return memo.score_all(merged_clients, as_of)
+    if isinstance(merged_clients, ClientFrame):
+        batch = score_batch(merged_clients, as_of)
+        return [
+            {"payment": merged_clients.records[i], "intake": merged_clients.intakes[i], "score": batch.breakdown(i)}
+            for i in np.argsort(-batch.total, kind="stable").tolist()
+        ]
     scored = []
     for client in merged_clients:
         payment = client["payment"]
         intake = client.get("intake")
-        result = score_client(payment, intake)
+        result = score_client(payment, intake, as_of)
         scored.append({
             "payment": payment,
             "intake": intake,
@@ -109,6 +124,51 @@ def get_tier_color(tier: str) -> str:
     }.get(tier, "#999999")
 
 
+def _score_components(payment: dict, intake: dict | None) -> dict:
+    """The category scores and frequency bonus — everything not time-dependent."""
+    return {
+        "engagement": _score_engagement(intake),
+        "velocity": _score_velocity(payment, intake),
+        "urgency": _score_urgency(intake),
+        "source": _score_source(payment),
+        "upsell": _score_upsell(intake, payment),
+        "frequency": _frequency_bonus(payment),
+    }
+
+
+def _finish(components: dict, payment: dict, intake: dict | None, as_of: datetime | None) -> dict:
+    """Apply the negative-signal cap and recency decay, and pick the tier."""
+    base_total = sum(components[c]["score"] for c in ("engagement", "velocity", "urgency", "source", "upsell"))
+
+    # Apply modifiers
+    total = base_total + components["frequency"]["bonus"]
+
+    negative = _apply_negative_signals(total, payment, intake, as_of)
+    total = negative["adjusted_score"]
+
+    # Skip recency decay if negative signals already capped the score
+    # to avoid double-penalizing stale leads
+    if negative.get("capped"):
+        recency = {"adjusted_score": total, "multiplier": 1.0, "reason": "Skipped (negative cap active)"}
+    else:
+        recency = _apply_recency_decay(total, payment, as_of)
+        total = recency["adjusted_score"]
+
+    # Clamp to 0-100
+    total = max(0, min(100, total))
+
+    if total >= TIER_HOT:
+        tier = "Hot"
+    elif total >= TIER_WARM:
+        tier = "Warm"
+    elif total >= TIER_COOL:
+        tier = "Cool"
+    else:
+        tier = "Cold"
+
+    return {"total": total, "tier": tier, **components, "recency": recency, "negative": negative}
+
+
 # ── Category Scorers ──────────────────────────────────────────────
 
 
@@ -124,11 +184,7 @@ def _score_engagement(intake: dict | None) -> dict:
     reasons = []
 
     # Field completeness (up to 12 pts — 2 per field)
-    fields = [
-        "role", "brand", "creative_emergency",
-        "what_tried", "deadline", "constraints",
-    ]
-    filled = sum(1 for f in fields if intake.get(f))
+    filled = sum(1 for f in ENGAGEMENT_FIELDS if intake.get(f))
     field_pts = min(filled * 2, 12)
     points += field_pts
     reasons.append(f"{filled}/6 fields filled")
@@ -139,8 +195,8 @@ def _score_engagement(intake: dict | None) -> dict:
     points += outcome_pts
 
     # Response depth — creative emergency length (up to 8 pts)
-    emergency = intake.get("creative_emergency", "")
-    word_count = len(emergency.split()) if emergency else 0
+    text = intake_features(intake)
+    word_count = text.words("creative_emergency")
     if word_count >= 50:
         depth_pts = 8
     elif word_count >= 30:
@@ -155,8 +211,7 @@ def _score_engagement(intake: dict | None) -> dict:
     reasons.append(f"{word_count} words in emergency")
 
     # What they've tried depth (up to 5 pts)
-    tried = intake.get("what_tried", "")
-    tried_words = len(tried.split()) if tried else 0
+    tried_words = text.words("what_tried")
     if tried_words >= 30:
         tried_pts = 5
     elif tried_words >= 15:
@@ -255,36 +310,16 @@ def _score_urgency(intake: dict | None) -> dict:
 
     points = 0
     reasons = []
+    text = intake_features(intake)
 
     # Deadline urgency (up to 12 pts)
-    deadline = intake.get("deadline", "")
-    if deadline:
-        deadline_lower = deadline.lower()
-        urgent_keywords = ["asap", "urgent", "immediately", "this week", "tomorrow"]
-        soon_keywords = ["next week", "2 weeks", "two weeks", "end of month"]
-        timeline_keywords = ["month", "quarter", "weeks"]
-
-        if any(kw in deadline_lower for kw in urgent_keywords):
-            points += 12
-            reasons.append("Urgent deadline")
-        elif any(kw in deadline_lower for kw in soon_keywords):
-            points += 8
-            reasons.append("Near-term deadline")
-        elif any(kw in deadline_lower for kw in timeline_keywords):
-            points += 5
-            reasons.append("Has timeline")
-        else:
-            points += 3
-            reasons.append("Deadline mentioned")
+    level = _deadline_level(text)
+    if level:
+        points += (0, 3, 5, 8, 12)[level]
+        reasons.append(_DEADLINE_REASONS[level])
 
     # Urgency language in creative emergency (up to 8 pts)
-    emergency = (intake.get("creative_emergency", "") or "").lower()
-    urgency_phrases = [
-        "launch", "deadline", "urgent", "asap", "running out of time",
-        "need help now", "stuck", "behind schedule", "can't wait",
-        "time sensitive", "crunch", "last minute",
-    ]
-    matches = [p for p in urgency_phrases if p in emergency]
+    matches = text.hits(_URGENCY_TEXT)
     if len(matches) >= 3:
         points += 8
         reasons.append(f"{len(matches)} urgency signals")
@@ -309,18 +344,7 @@ def _score_source(payment: dict) -> dict:
     if purchase_count > 1:
         return {"score": 15, "max": 15, "reason": f"Returning client ({purchase_count} purchases)"}
 
-    source_scores = {
-        "Referral": 14,
-        "Direct": 12,
-        "Website": 10,
-        "IG DM": 9,
-        "IG Story": 8,
-        "IG Comment": 7,
-        "LinkedIn": 8,
-        "Meta Ad": 5,
-    }
-
-    score = source_scores.get(source, 3)
+    score = SOURCE_SCORES.get(source, 3)
     reason = f"Source: {source}" if source else "Unknown source"
 
     return {"score": min(score, 15), "max": 15, "reason": reason}
@@ -344,16 +368,7 @@ def _score_upsell(intake: dict | None, payment: dict) -> dict:
 
     # Intake signals for ongoing work
     if intake:
-        emergency = (intake.get("creative_emergency", "") or "").lower()
-        tried = (intake.get("what_tried", "") or "").lower()
-        all_text = emergency + " " + tried
-
-        multi_signals = [
-            "multiple", "several projects", "ongoing", "long-term",
-            "team", "rebrand", "full brand", "website and",
-            "social media and", "everything",
-        ]
-        matches = [s for s in multi_signals if s in all_text]
+        matches = intake_features(intake).hits(_MULTI_PROJECT_TEXT)
         if len(matches) >= 2:
             points += 5
             reasons.append("Multi-project signals")
@@ -384,7 +399,7 @@ def _frequency_bonus(payment: dict) -> dict:
     return {"bonus": 0, "reason": ""}
 
 
-def _apply_recency_decay(score: float, payment: dict) -> dict:
+def _apply_recency_decay(score: float, payment: dict, as_of: datetime | None = None) -> dict:
     """Recency decay — multiplier based on how recently the lead was active.
 
     <7 days: 1.0x, 7-14 days: 0.95x, 14-30 days: 0.85x, >30 days: 0.7x.
@@ -395,7 +410,7 @@ def _apply_recency_decay(score: float, payment: dict) -> dict:
 
     try:
         created_dt = _parse_date(created)
-        now = datetime.now()
+        now = as_of or datetime.now()
         days = (now - created_dt).total_seconds() / 86400
 
         if days < 7:
@@ -420,7 +435,9 @@ def _apply_recency_decay(score: float, payment: dict) -> dict:
         return {"adjusted_score": score, "multiplier": 1.0, "reason": "Parse error"}
 
 
-def _apply_negative_signals(score: float, payment: dict, intake: dict | None) -> dict:
+def _apply_negative_signals(
+    score: float, payment: dict, intake: dict | None, as_of: datetime | None = None
+) -> dict:
     """Detect red flags that cap the score at 40.
 
     Triggers: stale >30 days with no pipeline progress, or lead with
@@ -435,7 +452,7 @@ def _apply_negative_signals(score: float, payment: dict, intake: dict | None) ->
 
     try:
         created_dt = _parse_date(created)
-        now = datetime.now()
+        now = as_of or datetime.now()
         days = (now - created_dt).total_seconds() / 86400
     except (ValueError, TypeError):
         return {"adjusted_score": score, "capped": False, "reason": ""}
@@ -464,15 +481,484 @@ def _apply_negative_signals(score: float, payment: dict, intake: dict | None) ->
     return {"adjusted_score": score, "capped": False, "reason": ""}
 
 
+# ── Batch Scoring ──────────────────────────────────────────────────
+
+
+@dataclass
+class BatchScores:
+    """score_batch() output: one entry per frame row in every array.
+
+    The category arrays hold each category's points; breakdown(i) rebuilds
+    score_client()'s dict for row i from them.
+    """
+    frame: ClientFrame
+    engagement: np.ndarray
+    velocity: np.ndarray
+    urgency: np.ndarray
+    source: np.ndarray
+    upsell: np.ndarray
+    frequency: np.ndarray
+    capped: np.ndarray
+    multiplier: np.ndarray
+    total: np.ndarray
+    tier: np.ndarray
+    features: dict[str, np.ndarray]
+
+    def breakdown(self, i: int) -> dict:
+        f = {k: v[i] for k, v in self.features.items()}
+        payment = self.frame.records[i]
+        base = int(self.engagement[i] + self.velocity[i] + self.urgency[i] + self.source[i] + self.upsell[i])
+        bonus = int(self.frequency[i])
+        capped = bool(self.capped[i])
+        after_negative = min(base + bonus, 40) if capped else base + bonus
+
+        if not f["has_intake"]:
+            engagement_reason = "No intake submitted"
+        else:
+            engagement_reason = f"{f['filled']}/6 fields filled; {f['emergency_words']} words in emergency"
+
+        if not f["has_created"]:
+            velocity_reason = "No creation date"
+        elif not f["created_ok"]:
+            velocity_reason = "Invalid creation date"
+        else:
+            reasons = []
+            if f["paid_ok"] and f["hours_to_pay"] < 24:
+                reasons.append(f"Paid in {f['hours_to_pay']:.0f}h")
+            if f["booked_ok"] and f["days_to_book"] <= 3:
+                reasons.append(f"Booked {int(f['days_to_book'])}d after payment")
+            if f["intake_ok"] and f["hours_before_call"] > 24:
+                reasons.append("Intake >24h before call")
+            velocity_reason = "; ".join(reasons) or "Calculating..."
+
+        if not f["has_intake"]:
+            urgency_reason = "No intake data"
+        else:
+            reasons = [_DEADLINE_REASONS[f["deadline_level"]]] if f["deadline_level"] else []
+            if f["urgency_matches"] >= 3:
+                reasons.append(f"{f['urgency_matches']} urgency signals")
+            urgency_reason = "; ".join(reasons) or "No urgency detected"
+
+        lead_source = payment.get("lead_source", "")
+        if f["purchase_count"] > 1:
+            source_reason = f"Returning client ({payment.get('purchase_count', 1)} purchases)"
+        else:
+            source_reason = f"Source: {lead_source}" if lead_source else "Unknown source"
+
+        reasons = ["Entry-tier purchase"] if f["entry_tier"] else []
+        if f["has_intake"] and f["multi_matches"] >= 2:
+            reasons.append("Multi-project signals")
+        if f["has_intake"] and f["outcomes"] >= 3:
+            reasons.append(f"{f['outcomes']} desired outcomes")
+        upsell_reason = "; ".join(reasons) or "Low upsell signal"
+
+        if capped:
+            negative = {"adjusted_score": after_negative, "capped": True, "reason": _NEGATIVE_REASONS[f["negative"]]}
+            recency = {"adjusted_score": after_negative, "multiplier": 1.0, "reason": "Skipped (negative cap active)"}
+        else:
+            negative = {"adjusted_score": after_negative, "capped": False, "reason": ""}
+            if not f["has_created"]:
+                recency = {"adjusted_score": after_negative, "multiplier": 1.0, "reason": "No date"}
+            elif not f["created_ok"]:
+                recency = {"adjusted_score": after_negative, "multiplier": 1.0, "reason": "Parse error"}
+            else:
+                mult = float(self.multiplier[i])
+                recency = {
+                    "adjusted_score": round(after_negative * mult),
+                    "multiplier": mult,
+                    "reason": f"{_RECENCY_LABELS[mult]} ({f['days_since_created']:.0f}d ago)",
+                }
+
+        return {
+            "total": int(self.total[i]),
+            "tier": str(self.tier[i]),
+            "engagement": {"score": int(self.engagement[i]), "max": 30, "reason": engagement_reason},
+            "velocity": {"score": int(self.velocity[i]), "max": 25, "reason": velocity_reason},
+            "urgency": {"score": int(self.urgency[i]), "max": 20, "reason": urgency_reason},
+            "source": {"score": int(self.source[i]), "max": 15, "reason": source_reason},
+            "upsell": {"score": int(self.upsell[i]), "max": 10, "reason": upsell_reason},
+            "frequency": {"bonus": bonus, "reason": _FREQUENCY_REASONS[bonus]},
+            "recency": recency,
+            "negative": negative,
+        }
+
+
+_DEADLINE_REASONS = {1: "Deadline mentioned", 2: "Has timeline", 3: "Near-term deadline", 4: "Urgent deadline"}
+_NEGATIVE_REASONS = {1: "Stale 30d+ with no progress", 2: "Paid but stalled 14d+"}
+_FREQUENCY_REASONS = {5: "Sprint/repeat purchaser", 2: "Single Call tier client", 0: ""}
+_RECENCY_LABELS = {1.0: "Active", 0.95: "Recent", 0.85: "Aging", 0.7: "Stale"}
+
+
+def score_batch(frame: ClientFrame, as_of: datetime | None = None) -> BatchScores:
+    """Score every client in a frame at once, with score_client()'s rules.
+
+    Intakes come from frame.intakes (see ClientFrame.with_intakes).
+    """
+    now64 = np.datetime64(as_of or datetime.now(), "us")
+    records, intakes = frame.records, frame.intakes
+    hour, day = np.timedelta64(3600_000_000, "us"), np.timedelta64(1, "D")
+
+    # ── Intake columns (text features come from the shared intake feature store)
+    has_intake = np.array([bool(i) for i in intakes], dtype=bool)
+    signals = np.array([_text_signals(i) if i else (0, 0, 0, 0, 0) for i in intakes], dtype=np.int64)
+    emergency_words, tried_words, deadline_level, urgency_matches, multi_matches = signals.reshape(-1, 5).T
+    filled = sum(np.array([bool(i.get(f)) if i else False for i in intakes], dtype=np.int64)
+                 for f in ENGAGEMENT_FIELDS)
+    outcomes = np.array([len(i.get("desired_outcome", [])) if i else 0 for i in intakes], dtype=np.int64)
+    intake_created_raw = [(i.get("created", "") if i else "") for i in intakes]
+    intake_created = parse_timestamps(intake_created_raw)
+
+    # ── Engagement (30)
+    engagement = (
+        np.minimum(filled * 2, 12)
+        + np.minimum(outcomes * 2, 5)
+        + np.select([emergency_words >= 50, emergency_words >= 30, emergency_words >= 15, emergency_words > 0],
+                    [8, 6, 4, 2], 0)
+        + np.select([tried_words >= 30, tried_words >= 15, tried_words > 0], [5, 3, 1], 0)
+    )
+    engagement = np.where(has_intake, np.minimum(engagement, 30), 0)
+
+    # ── Velocity (25)
+    has_created = _truthy(records, "created")
+    has_payment_date = _truthy(records, "payment_date")
+    has_call_date = _truthy(records, "call_date")
+    created_ok = has_created & ~np.isnat(frame.created)
+    paid_ok = has_payment_date & ~np.isnat(frame.payment_date)
+    booked_ok = has_call_date & paid_ok & ~np.isnat(frame.call_date)
+    intake_ok = (np.array([bool(v) for v in intake_created_raw], dtype=bool) & has_call_date
+                 & ~np.isnat(intake_created) & ~np.isnat(frame.call_date))
+
+    hours_to_pay = _span(frame.payment_date - frame.created, hour, paid_ok)
+    days_to_book = np.where(booked_ok, _span(frame.call_date - frame.payment_date, day, booked_ok), 0)
+    days_to_book = np.floor(days_to_book).astype(np.int64)
+    hours_before_call = _span(frame.call_date - intake_created, hour, intake_ok)
+    velocity = (
+        np.where(paid_ok, np.select([hours_to_pay < 24, hours_to_pay < 48, hours_to_pay < 168], [10, 7, 4], 1), 0)
+        + np.where(booked_ok, np.select([days_to_book <= 3, days_to_book <= 7, days_to_book <= 14], [8, 5, 3], 1), 0)
+        + np.where(intake_ok, np.select([hours_before_call > 24, hours_before_call > 0], [7, 4], 1), 0)
+    )
+    velocity = np.where(created_ok, np.minimum(velocity, 25), 0)
+
+    # ── Urgency (20)
+    urgency = (
+        np.choose(deadline_level, [0, 3, 5, 8, 12])
+        + np.select([urgency_matches >= 3, urgency_matches >= 2, urgency_matches >= 1], [8, 5, 3], 0)
+    )
+    urgency = np.where(has_intake, np.minimum(urgency, 20), 0)
+
+    # ── Source (15)
+    purchase_count = np.array([p.get("purchase_count", 1) for p in records], dtype=np.float64)
+    category_scores = np.array([SOURCE_SCORES.get(c, 3) for c in frame.lead_source.categories] + [3])
+    source = np.where(purchase_count > 1, 15, np.minimum(category_scores[frame.lead_source.codes], 15))
+
+    # ── Upsell (10)
+    amount = frame.amount
+    entry_tier = frame.is_product("First Call") | ((amount > 0) & (amount < 600))
+    upsell = (
+        np.where(entry_tier, 3, 0)
+        + np.where(has_intake, np.select([multi_matches >= 2, multi_matches >= 1], [5, 3], 0), 0)
+        + np.where(has_intake & (outcomes >= 3), 2, 0)
+    )
+    upsell = np.minimum(upsell, 10)
+
+    # ── Modifiers
+    frequency = np.select(
+        [frame.is_product("3-Session Clarity Sprint") | (amount >= 1495),
+         frame.is_product("Single Call") | ((amount >= 699) & (amount < 1495))],
+        [5, 2], 0)
+    total = engagement + velocity + urgency + source + upsell + frequency
+
+    days_since_created = _span(now64 - frame.created, day, created_ok)
+    stale = frame.is_status("Lead - Laylo") & (amount == 0) & ~has_intake & (days_since_created > 30)
+    stalled = frame.is_status("Paid - Needs Booking") & (days_since_created > 14)
+    negative = np.where(created_ok, np.select([stale, stalled], [1, 2], 0), 0)
+    capped = negative > 0
+    total = np.where(capped, np.minimum(total, 40), total)
+
+    multiplier = np.select(
+        [days_since_created < 7, days_since_created < 14, days_since_created < 30], [1.0, 0.95, 0.85], 0.7)
+    multiplier = np.where(created_ok & ~capped, multiplier, 1.0)
+    total = np.where(created_ok & ~capped, np.round(total * multiplier), total).astype(np.int64)
+    total = np.clip(total, 0, 100)
+    tier = np.select([total >= TIER_HOT, total >= TIER_WARM, total >= TIER_COOL], ["Hot", "Warm", "Cool"], "Cold")
+
+    return BatchScores(
+        frame=frame,
+        engagement=engagement,
+        velocity=velocity,
+        urgency=urgency,
+        source=source,
+        upsell=upsell,
+        frequency=frequency,
+        capped=capped,
+        multiplier=multiplier,
+        total=total,
+        tier=tier,
+        features={
+            "has_intake": has_intake.tolist(),
+            "filled": filled.tolist(),
+            "emergency_words": emergency_words.tolist(),
+            "has_created": has_created.tolist(),
+            "created_ok": created_ok.tolist(),
+            "paid_ok": paid_ok.tolist(),
+            "hours_to_pay": hours_to_pay.tolist(),
+            "booked_ok": booked_ok.tolist(),
+            "days_to_book": days_to_book.tolist(),
+            "intake_ok": intake_ok.tolist(),
+            "hours_before_call": hours_before_call.tolist(),
+            "deadline_level": deadline_level.tolist(),
+            "urgency_matches": urgency_matches.tolist(),
+            "purchase_count": purchase_count.tolist(),
+            "entry_tier": entry_tier.tolist(),
+            "multi_matches": multi_matches.tolist(),
+            "outcomes": outcomes.tolist(),
+            "negative": negative.tolist(),
+            "days_since_created": days_since_created.tolist(),
+        },
+    )
+
+
+def _truthy(records: list[dict], field: str) -> np.ndarray:
+    return np.array([bool(r.get(field, "")) for r in records], dtype=bool)
+
+
+def _span(delta: np.ndarray, unit: np.timedelta64, valid: np.ndarray) -> np.ndarray:
+    """delta / unit as floats where valid, NaN elsewhere (and for NaT)."""
+    seconds = delta.astype("timedelta64[us]").astype(np.int64).astype(np.float64) / 1e6
+    return np.where(valid, seconds / (unit / np.timedelta64(1, "s")), np.nan)
+
+
+def _deadline_level(text: IntakeFeatures) -> int:
+    """_score_urgency's deadline branch: 0 none, 1 mentioned .. 4 urgent."""
+    if not text.raw("deadline"):
+        return 0
+    for level, group in _DEADLINE_TEXT:
+        if text.hits(group):
+            return level
+    return 1
+
+
+def _text_signals(intake: dict) -> tuple[int, int, int, int, int]:
+    """Emergency/tried word counts, deadline level, urgency and multi-project hit counts."""
+    return intake_features(intake).derived(_text_signals, _compute_text_signals)
+
+
+def _compute_text_signals(text: IntakeFeatures) -> tuple[int, int, int, int, int]:
+    return (
+        text.words("creative_emergency"),
+        text.words("what_tried"),
+        _deadline_level(text),
+        len(text.hits(_URGENCY_TEXT)),
+        len(text.hits(_MULTI_PROJECT_TEXT)),
+    )
+
+
+# ── Incremental Scoring ────────────────────────────────────────────
+
+# Fields the scorer reads; a client is re-scored only when one of them changes
+SCORED_PAYMENT_FIELDS = (
+    "created", "payment_date", "call_date", "status", "lead_source",
+    "product_purchased", "payment_amount", "purchase_count",
+)
+SCORED_INTAKE_FIELDS = (*ENGAGEMENT_FIELDS, "created")  # plus len(desired_outcome)
+
+# Below this many changed clients, score_client() beats building a frame
+BATCH_MIN_CHANGED = 256
+
+_COMPONENTS = ("engagement", "velocity", "urgency", "source", "upsell", "frequency")
+
+
+@dataclass
+class _Memoized:
+    components: dict
+    result: dict
+    scored_at: datetime
+    expires: datetime | None  # when the time-dependent terms can next change
+
+
+class ScoreMemo:
+    """Per-client scores kept between score_all_clients() passes.
+
+    Entries are keyed by a fingerprint of the payment/intake fields the
+    scorer reads. For a client whose fingerprint was seen in the previous
+    pass, the category scores are reused and only the negative-signal cap
+    and recency decay are recomputed — and only once they can have changed
+    (the next 7/14/30-day band or the next whole day shown in the recency
+    reason). New or edited clients are scored in full, with score_batch()
+    when there are many of them.
+
+    rescored and refreshed count the clients scored in full and the
+    clients whose time terms were recomputed during the last pass.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple, _Memoized] = {}
+        self.rescored = 0
+        self.refreshed = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def score_all(self, clients: list[dict] | ClientFrame, as_of: datetime | None = None) -> list[dict]:
+        """score_all_clients(clients, as_of=as_of), reusing the previous pass's work."""
+        now = as_of or datetime.now()
+        if isinstance(clients, ClientFrame):
+            payments, intakes = clients.records, clients.intakes
+        else:
+            payments = [c["payment"] for c in clients]
+            intakes = [c.get("intake") for c in clients]
+
+        keys = [_fingerprint(p, i) for p, i in zip(payments, intakes)]
+        entries: dict[tuple, _Memoized] = {}
+        results: list[dict | None] = [None] * len(payments)
+        changed: dict[tuple, list[int]] = {}
+        self.rescored = self.refreshed = 0
+        for i, key in enumerate(keys):
+            entry = self._entries.get(key)
+            if entry is None:
+                changed.setdefault(key, []).append(i)
+                continue
+            if now < entry.scored_at or (entry.expires is not None and now >= entry.expires):
+                result = _finish(entry.components, payments[i], intakes[i], now)
+                entry = _Memoized(entry.components, result, now, _expires(result, payments[i], now))
+                self.refreshed += 1
+            entries[key] = entry
+            results[i] = entry.result
+
+        if changed:
+            firsts = [rows[0] for rows in changed.values()]
+            for key, result in zip(changed, self._score_changed(clients, payments, intakes, firsts, now)):
+                rows = changed[key]
+                entries[key] = _Memoized(
+                    {c: result[c] for c in _COMPONENTS}, result, now, _expires(result, payments[rows[0]], now))
+                for i in rows:
+                    results[i] = result
+            self.rescored = len(firsts)
+
+        self._entries = entries
+        order = sorted(range(len(results)), key=lambda i: results[i]["total"], reverse=True)
+        return [{"payment": payments[i], "intake": intakes[i], "score": results[i]} for i in order]
+
+    @staticmethod
+    def _score_changed(clients, payments, intakes, rows: list[int], now: datetime) -> list[dict]:
+        if len(rows) < BATCH_MIN_CHANGED:
+            return [score_client(payments[i], intakes[i], now) for i in rows]
+        if isinstance(clients, ClientFrame):
+            frame = clients.take(rows)
+        else:
+            frame = ClientFrame([payments[i] for i in rows], [intakes[i] for i in rows])
+        batch = score_batch(frame, now)
+        return [batch.breakdown(j) for j in range(len(rows))]
+
+
+def _fingerprint(payment: dict, intake: dict | None) -> tuple:
+    # Missing and None fields score alike; only the outcome count is scored
+    return (
+        *map(payment.get, SCORED_PAYMENT_FIELDS),
+        (*map(intake.get, SCORED_INTAKE_FIELDS), len(intake.get("desired_outcome") or ())) if intake else None,
+    )
+
+
+def _expires(result: dict, payment: dict, now: datetime) -> datetime | None:
+    """When result's negative-signal/recency terms can next change (None: never)."""
+    if result["negative"]["capped"]:
+        return None  # Caps only depend on thresholds already passed
+    try:
+        created_dt = _parse_date(payment.get("created", ""))
+    except (ValueError, TypeError, AttributeError):
+        return None  # No usable creation date: no decay
+    days = (now - created_dt).total_seconds() / 86400
+    # The recency reason rounds days (changes at each half day); the bands
+    # and caps change at 7, 14 and 30 days
+    boundary = min([math.ceil(days - 0.5) + 0.5] + [t for t in (7, 14, 30) if t >= days])
+    return created_dt + timedelta(days=boundary)
+
+
+# ── What-if Reweighting ───────────────────────────────────────────
+
+
+@dataclass
+class Reweighted:
+    """Totals and tiers under other category weights, one entry per client."""
+    total: np.ndarray
+    tier: np.ndarray
+    order: np.ndarray  # client positions, highest total first (ties keep list order)
+
+    @classmethod
+    def from_totals(
+        cls, total: np.ndarray, thresholds: tuple[float, float, float] = (TIER_HOT, TIER_WARM, TIER_COOL)
+    ) -> "Reweighted":
+        """Tiers and ranking for 0-100 totals from any scorer."""
+        total = np.asarray(total, dtype=np.int64)
+        hot, warm, cool = thresholds
+        tier = np.select([total >= hot, total >= warm, total >= cool], list(TIERS[:3]), TIERS[3])
+        return cls(total=total, tier=tier, order=np.argsort(-total, kind="stable"))
+
+    def tier_counts(self) -> dict[str, int]:
+        return {t: int(np.count_nonzero(self.tier == t)) for t in TIERS}
+
+
+@dataclass
+class ScoreMatrix:
+    """Scored clients as a clients × categories matrix, for what-if reweighting.
+
+    categories holds each category score over its maximum (0-1, columns in
+    CATEGORY_MAX order); bonus, capped and multiplier are the frequency
+    bonus, negative-signal cap and recency decay already applied to each
+    client. Reweighting is then one matrix-vector product — nobody is
+    re-scored.
+    """
+    categories: np.ndarray
+    bonus: np.ndarray
+    capped: np.ndarray
+    multiplier: np.ndarray
+
+    @classmethod
+    def from_scored(cls, scored: list[dict]) -> "ScoreMatrix":
+        """From score_all_clients() output (rows keep its order)."""
+        scores = [item["score"] for item in scored]
+        categories = np.array(
+            [[s[c]["score"] for c in CATEGORY_MAX] for s in scores], dtype=np.float64).reshape(-1, len(CATEGORY_MAX))
+        return cls(
+            categories=categories / np.array(list(CATEGORY_MAX.values()), dtype=np.float64),
+            bonus=np.array([s["frequency"]["bonus"] for s in scores], dtype=np.float64),
+            capped=np.array([bool(s["negative"]["capped"]) for s in scores], dtype=bool),
+            multiplier=np.array([s["recency"]["multiplier"] for s in scores], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def reweight(
+        self,
+        weights: dict[str, float] | None = None,
+        thresholds: tuple[float, float, float] = (TIER_HOT, TIER_WARM, TIER_COOL),
+    ) -> Reweighted:
+        """Totals with each category worth weights[category] points.
+
+        Missing categories keep their CATEGORY_MAX points; thresholds are
+        the Hot/Warm/Cool cut-offs. With the defaults this reproduces the
+        scorer's totals and tiers exactly.
+        """
+        weights = {**CATEGORY_MAX, **(weights or {})}
+        vector = np.array([weights[c] for c in CATEGORY_MAX], dtype=np.float64)
+        # Rounded so the default weights give back whole points before the modifiers
+        base = np.round(self.categories @ vector, 6) + self.bonus
+        total = np.where(self.capped, np.minimum(base, 40), base * self.multiplier)
+        return Reweighted.from_totals(np.clip(np.round(total), 0, 100), thresholds)
+
+
 # ── Helpers ────────────────────────────────────────────────────────
 
 
+_UTC_OFFSET = re.compile(r"[+-]\d{2}:?\d{2}$")
+
+
 def _parse_date(date_str: str) -> datetime:
     """Parse ISO date string, always returns naive (tz-unaware) datetime."""
     date_str = date_str.strip().rstrip("Z")
-    # Strip timezone offset (+00:00, +0000) if present after the date portion
-    if "+" in date_str[10:]:
-        date_str = date_str[:date_str.rindex("+")]
+    # Strip timezone offset (+00:00, -0500) if present after the date portion
+    date_str = date_str[:10] + _UTC_OFFSET.sub("", date_str[10:])
     for fmt in ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
         try:
             return datetime.strptime(date_str, fmt)
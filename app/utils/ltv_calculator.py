@@ -7,15 +7,24 @@ projected LTV using observed upsell rates.
 Note: With small client counts (<20), these metrics are directional
 rather than statistically significant. Cohort analysis requires
 MIN_COHORT_SIZE clients per bucket to be meaningful.
+
+Every function also accepts a ClientFrame, grouping with array operations
+over its pre-parsed columns instead of walking the payment dicts.
 """
 
 from __future__ import annotations
 
+import re
 import statistics
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from app.utils.client_frame import ClientFrame
+
 # Minimum clients in a cohort before stats are meaningful
 MIN_COHORT_SIZE = 5
 
@@ -67,10 +76,12 @@ class CohortLTV:
 
 
 def _parse_date(date_str: str | None) -> datetime | None:
-    """Parse ISO date string to datetime."""
+    """Parse ISO date string to a naive datetime (any UTC offset dropped)."""
     if not date_str:
         return None
-    for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d"):
+    date_str = date_str.strip()
+    date_str = date_str[:10] + re.sub(r"(?:Z|[+-]\d{2}:?\d{2})$", "", date_str[10:])
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
         try:
             return datetime.strptime(date_str, fmt)
         except (ValueError, TypeError):
@@ -92,7 +103,7 @@ def _group_by_email(payments: list[dict]) -> dict[str, list[dict]]:
     return dict(groups)
 
 
-def calculate_ltv(payments: list[dict]) -> list[ClientLTV]:
+def calculate_ltv(payments: list[dict] | ClientFrame) -> list[ClientLTV]:
     """Calculate per-client revenue to date and projected LTV.
 
     projected_ltv = total_revenue * (1 + upsell_probability) where
@@ -100,6 +111,8 @@ def calculate_ltv(payments: list[dict]) -> list[ClientLTV]:
     all clients. For single-purchase clients, this adds the expected
     value of a future purchase.
     """
+    if isinstance(payments, ClientFrame):
+        return _calculate_ltv_frame(payments)
     groups = _group_by_email(payments)
     now = datetime.now()
 
@@ -143,8 +156,10 @@ def calculate_ltv(payments: list[dict]) -> list[ClientLTV]:
     return results
 
 
-def ltv_by_source(payments: list[dict]) -> dict[str, dict]:
+def ltv_by_source(payments: list[dict] | ClientFrame) -> dict[str, dict]:
     """Average and median LTV per lead source."""
+    if isinstance(payments, ClientFrame):
+        return _ltv_by_source_frame(payments)
     groups = _group_by_email(payments)
     source_ltvs: dict[str, list[float]] = defaultdict(list)
 
@@ -165,8 +180,10 @@ def ltv_by_source(payments: list[dict]) -> dict[str, dict]:
     return result
 
 
-def ltv_by_entry_product(payments: list[dict]) -> dict[str, dict]:
+def ltv_by_entry_product(payments: list[dict] | ClientFrame) -> dict[str, dict]:
     """Average LTV grouped by first product purchased."""
+    if isinstance(payments, ClientFrame):
+        return _ltv_by_entry_product_frame(payments)
     groups = _group_by_email(payments)
     product_ltvs: dict[str, list[dict]] = defaultdict(list)
 
@@ -192,7 +209,7 @@ def ltv_by_entry_product(payments: list[dict]) -> dict[str, dict]:
 
 
 def ltv_by_cohort(
-    payments: list[dict], period: str = "monthly"
+    payments: list[dict] | ClientFrame, period: str = "monthly"
 ) -> list[CohortLTV]:
     """LTV by signup cohort.
 
@@ -204,6 +221,8 @@ def ltv_by_cohort(
     but flagged with sample_sufficient=False to indicate the stats
     are directional only.
     """
+    if isinstance(payments, ClientFrame):
+        return _ltv_by_cohort_frame(payments, period)
     groups = _group_by_email(payments)
     cohort_data: dict[str, list[dict]] = defaultdict(list)
 
@@ -240,8 +259,10 @@ def ltv_by_cohort(
     return results
 
 
-def upsell_rate(payments: list[dict]) -> dict:
+def upsell_rate(payments: list[dict] | ClientFrame) -> dict:
     """Calculate upsell/repeat purchase rate."""
+    if isinstance(payments, ClientFrame):
+        return _upsell_rate_frame(payments)
     groups = _group_by_email(payments)
     if not groups:
         return {"total_clients": 0, "upsell_clients": 0, "upsell_rate": 0.0, "upgrade_paths": {}}
@@ -267,8 +288,10 @@ def upsell_rate(payments: list[dict]) -> dict:
     }
 
 
-def expansion_revenue(payments: list[dict]) -> dict:
+def expansion_revenue(payments: list[dict] | ClientFrame) -> dict:
     """Split revenue into new client vs expansion (repeat/upsell)."""
+    if isinstance(payments, ClientFrame):
+        return _expansion_revenue_frame(payments)
     groups = _group_by_email(payments)
     new_rev = 0.0
     exp_rev = 0.0
@@ -315,7 +338,7 @@ class CohortRetention:
 
 
 def retention_by_cohort(
-    payments: list[dict], period: str = "monthly"
+    payments: list[dict] | ClientFrame, period: str = "monthly"
 ) -> list[CohortRetention]:
     """Retention analysis by signup cohort.
 
@@ -325,6 +348,8 @@ def retention_by_cohort(
         payments: Payment records.
         period: "monthly" or "quarterly" grouping.
     """
+    if isinstance(payments, ClientFrame):
+        return _retention_by_cohort_frame(payments, period)
     groups = _group_by_email(payments)
     cohort_data: dict[str, list[dict]] = defaultdict(list)
 
@@ -379,7 +404,7 @@ def retention_by_cohort(
 
 
 def payback_period(
-    payments: list[dict], channel_costs: dict[str, float] | None = None
+    payments: list[dict] | ClientFrame, channel_costs: dict[str, float] | None = None
 ) -> dict[str, dict]:
     """Payback analysis per channel.
 
@@ -394,13 +419,16 @@ def payback_period(
     source_data = ltv_by_source(payments)
 
     # Compute average first-purchase value per source
-    groups = _group_by_email(payments)
-    source_first_vals: dict[str, list[float]] = defaultdict(list)
-    for email, records in groups.items():
-        source = records[0].get("lead_source") or "Unknown"
-        sorted_recs = sorted(records, key=lambda r: r.get("payment_date") or r.get("created") or "")
-        first_val = sorted_recs[0].get("payment_amount", 0) or 0
-        source_first_vals[source].append(first_val)
+    if isinstance(payments, ClientFrame):
+        source_first_vals = _first_purchase_by_source_frame(payments)
+    else:
+        groups = _group_by_email(payments)
+        source_first_vals: dict[str, list[float]] = defaultdict(list)
+        for email, records in groups.items():
+            source = records[0].get("lead_source") or "Unknown"
+            sorted_recs = sorted(records, key=lambda r: r.get("payment_date") or r.get("created") or "")
+            first_val = sorted_recs[0].get("payment_amount", 0) or 0
+            source_first_vals[source].append(first_val)
 
     result = {}
     for channel, cost in channel_costs.items():
@@ -437,3 +465,190 @@ def payback_period(
         }
 
     return result
+
+
+# ── ClientFrame paths ────────────────────────────────────────────
+
+
+def _calculate_ltv_frame(frame: ClientFrame) -> list[ClientLTV]:
+    g = frame.email_groups
+    now = np.datetime64(datetime.now(), "us")
+    upsell_prob = float(np.mean(g.counts > 1)) if len(g) else 0.0
+
+    # Earliest and latest purchase per group, ignoring undated records
+    dates = frame.purchased[g.rows].view(np.int64)
+    undated = np.isnat(frame.purchased[g.rows])
+    first = np.minimum.reduceat(np.where(undated, np.iinfo(np.int64).max, dates), g.starts) if len(g) else dates
+    last = np.maximum.reduceat(dates, g.starts) if len(g) else dates
+    has_date = first != np.iinfo(np.int64).max
+    first, last = first.view("datetime64[us]"), last.view("datetime64[us]")
+    first_str = np.datetime_as_string(first, unit="D")
+    last_str = np.datetime_as_string(last, unit="D")
+    days = (now - first) // np.timedelta64(1, "D")
+
+    # Products are listed in input order, not date order
+    group_of_row = np.repeat(np.arange(len(g)), g.counts)
+    in_input_order = g.rows[np.lexsort((g.rows, group_of_row))]
+    products = np.asarray(frame.product.categories, dtype=object)[frame.product.codes[in_input_order]]
+
+    # Build the objects from plain lists; indexing NumPy scalars per client is slow
+    order = np.argsort(-g.totals, kind="stable")
+    ends = (g.starts + g.counts).tolist()
+    totals, counts, starts = g.totals.tolist(), g.counts.tolist(), g.starts.tolist()
+    emails, dated = g.emails.tolist(), has_date.tolist()
+    first_str, last_str, days = first_str.tolist(), last_str.tolist(), days.astype(np.int64).tolist()
+    products = products.tolist()
+
+    results = []
+    for i in order.tolist():
+        total, count = totals[i], counts[i]
+        results.append(ClientLTV(
+            email=emails[i],
+            total_revenue=total,
+            purchase_count=count,
+            first_purchase_date=first_str[i] if dated[i] else "",
+            last_purchase_date=last_str[i] if dated[i] else "",
+            products=[p for p in products[starts[i]:ends[i]] if p],
+            days_as_client=days[i] if dated[i] else 0.0,
+            projected_ltv=round(total * (1 + upsell_prob) if count == 1 else total, 2),
+        ))
+    return results
+
+
+def _ltv_by_source_frame(frame: ClientFrame) -> dict[str, dict]:
+    g = frame.email_groups
+    sources = frame.labels("lead_source")[g.first_seen]
+    stats = pd.Series(g.totals).groupby(sources, sort=False).agg(["sum", "count", "median"])
+    return {
+        source: {
+            "avg_ltv": float(row["sum"]) / int(row["count"]),
+            "median_ltv": float(row["median"]),
+            "client_count": int(row["count"]),
+            "total_revenue": float(row["sum"]),
+            "sample_sufficient": int(row["count"]) >= MIN_COHORT_SIZE,
+        }
+        for source, row in stats.iterrows()
+    }
+
+
+def _ltv_by_entry_product_frame(frame: ClientFrame) -> dict[str, dict]:
+    g = frame.email_groups
+    products = frame.labels("product")[g.entry]
+    stats = pd.DataFrame({"ltv": g.totals, "upsold": g.counts > 1}).groupby(products, sort=False).agg(
+        total=("ltv", "sum"), count=("ltv", "count"), upsold=("upsold", "sum"))
+    return {
+        product: {
+            "avg_ltv": float(row["total"]) / int(row["count"]),
+            "count": int(row["count"]),
+            "total_revenue": float(row["total"]),
+            "upsell_rate": int(row["upsold"]) / int(row["count"]) * 100,
+        }
+        for product, row in stats.iterrows()
+    }
+
+
+def _cohort_keys(dates: np.ndarray, period: str) -> list[str]:
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    years, month = months // 12 + 1970, months % 12 + 1
+    if period == "quarterly":
+        return [f"{y}-Q{(m - 1) // 3 + 1}" for y, m in zip(years, month)]
+    return [f"{y}-{m:02d}" for y, m in zip(years, month)]
+
+
+def _dated_entry_groups(frame: ClientFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Groups whose first record is dated, and those first dates."""
+    g = frame.email_groups
+    first = frame.purchased[g.entry]
+    keep = np.flatnonzero(~np.isnat(first))
+    return keep, first[keep]
+
+
+def _ltv_by_cohort_frame(frame: ClientFrame, period: str) -> list[CohortLTV]:
+    g = frame.email_groups
+    keep, first = _dated_entry_groups(frame)
+    stats = pd.DataFrame({"ltv": g.totals[keep], "upsold": g.counts[keep] > 1}).groupby(
+        _cohort_keys(first, period), sort=True).agg(
+        total=("ltv", "sum"), count=("ltv", "count"), median=("ltv", "median"), upsold=("upsold", "sum"))
+    return [
+        CohortLTV(
+            cohort_month=key,
+            client_count=int(row["count"]),
+            total_revenue=float(row["total"]),
+            avg_ltv=float(row["total"]) / int(row["count"]),
+            median_ltv=float(row["median"]),
+            upsell_count=int(row["upsold"]),
+            sample_sufficient=int(row["count"]) >= MIN_COHORT_SIZE,
+        )
+        for key, row in stats.iterrows()
+    ]
+
+
+def _upsell_rate_frame(frame: ClientFrame) -> dict:
+    g = frame.email_groups
+    if not len(g):
+        return {"total_clients": 0, "upsell_clients": 0, "upsell_rate": 0.0, "upgrade_paths": {}}
+
+    total = len(g)
+    upsold = int(np.sum(g.counts > 1))
+    # Consecutive purchases within a group, in date order
+    group_of_row = np.repeat(np.arange(total), g.counts)
+    step = np.flatnonzero(group_of_row[1:] == group_of_row[:-1])
+    products = frame.labels("product")[g.rows]
+    paths = Counter(products[step] + " -> " + products[step + 1])
+    return {
+        "total_clients": total,
+        "upsell_clients": upsold,
+        "upsell_rate": upsold / total * 100,
+        "upgrade_paths": dict(paths),
+    }
+
+
+def _expansion_revenue_frame(frame: ClientFrame) -> dict:
+    g = frame.email_groups
+    repeat = np.ones(len(g.rows), dtype=bool)
+    repeat[g.starts] = False
+    new_rev = float(frame.amount[g.entry].sum())
+    exp_rev = float(frame.amount[g.rows[repeat]].sum())
+    total = new_rev + exp_rev
+    return {
+        "new_revenue": new_rev,
+        "expansion_revenue": exp_rev,
+        "total_revenue": total,
+        "expansion_pct": (exp_rev / total * 100) if total > 0 else 0.0,
+    }
+
+
+def _retention_by_cohort_frame(frame: ClientFrame, period: str) -> list[CohortRetention]:
+    g = frame.email_groups
+    keep, first = _dated_entry_groups(frame)
+    counts = g.counts[keep]
+    second = g.second[keep]
+    # Days from first to second purchase; only positive gaps count toward the average
+    repeat = np.flatnonzero(second >= 0)
+    days_to_repeat = (frame.purchased[second[repeat]] - first[repeat]) // np.timedelta64(1, "D")
+    repeat_days = np.full(len(keep), np.nan)
+    repeat_days[repeat[days_to_repeat > 0]] = days_to_repeat[days_to_repeat > 0]
+
+    stats = pd.DataFrame({"purchases": counts, "repeat": counts > 1, "days": repeat_days}).groupby(
+        _cohort_keys(first, period), sort=True).agg(
+        count=("purchases", "count"), purchases=("purchases", "sum"), repeat=("repeat", "sum"),
+        days=("days", "mean"))
+    return [
+        CohortRetention(
+            cohort_month=key,
+            client_count=int(row["count"]),
+            repeat_count=int(row["repeat"]),
+            repeat_rate=int(row["repeat"]) / int(row["count"]),
+            avg_purchases=int(row["purchases"]) / int(row["count"]),
+            avg_days_to_repeat=0 if pd.isna(row["days"]) else float(row["days"]),
+            sample_sufficient=int(row["count"]) >= MIN_COHORT_SIZE,
+        )
+        for key, row in stats.iterrows()
+    ]
+
+
+def _first_purchase_by_source_frame(frame: ClientFrame) -> dict[str, list[float]]:
+    g = frame.email_groups
+    sources = frame.labels("lead_source")[g.first_seen]
+    first_vals = pd.Series(frame.amount[g.entry]).groupby(sources, sort=False)
+    return {source: vals.tolist() for source, vals in first_vals}
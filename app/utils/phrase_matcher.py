@@ -0,0 +1,123 @@
+"""Multi-phrase matching: every phrase found in a text in one linear pass.
+
+An Aho-Corasick automaton over all the phrase lists the intake modules
+use (themes, pain points, industries, the lead scorer's urgency and
+deadline phrases, the brand audit's signal words). A keyword list of k
+phrases checked one `in` at a time costs O(k × text); find() walks the
+text once and reports every phrase that occurs in it, however many lists
+are compiled in.
+
+Matching is the same as `phrase in text`: a phrase counts wherever it
+appears, including as the start of a longer word ("launch" is found in
+"launching"), so results are identical to the substring scans it
+replaces. The automaton is compiled to a complete transition table on
+first use and recompiled when phrases are added.
+
+Joined texts needn't be rescanned: scan() each part once, then resume()
+from one part's end state across the separator into the next. The resumed
+scan stops as soon as it is in the state a fresh scan of the next part
+would be in (no partial match reaches back across the join), which is
+usually a few characters.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Iterable
+
+
+class PhraseMatcher:
+    """The set of registered phrases that occur in a text."""
+
+    def __init__(self, phrases: Iterable[str] = ()):
+        self._phrases: dict[str, None] = {}  # Insertion-ordered set
+        self._lock = threading.Lock()
+        self._compiled: tuple[list[dict[str, int]], list[tuple[str, ...]], list[int]] | None = None
+        self.version = 0
+        self.add(phrases)
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def __contains__(self, phrase: str) -> bool:
+        return phrase in self._phrases
+
+    def add(self, phrases: Iterable[str]) -> None:
+        """Register phrases; the automaton is rebuilt on the next find() if any are new."""
+        with self._lock:
+            new = [p for p in phrases if p and p not in self._phrases]
+            if new:
+                self._phrases.update(dict.fromkeys(new))
+                self._compiled = None
+                self.version += 1
+
+    def find(self, text: str) -> frozenset[str]:
+        """Every registered phrase occurring in text (as `phrase in text` would find it)."""
+        return self.scan(text)[0]
+
+    def scan(self, text: str) -> tuple[frozenset[str], int]:
+        """find(text), plus the automaton state at the end of text for resume()."""
+        delta, out, _ = self._compiled or self._compile()
+        state = 0
+        found: set[str] = set()
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return frozenset(found), state
+
+    def resume(self, state: int, text: str, skip: int = 0) -> tuple[frozenset[str], int | None]:
+        """Continue a scan that ended in state over text, until it rejoins a fresh scan of text[skip:].
+
+        Returns the phrases found on the way, and the state reached if text
+        ran out first — or None once rejoined, since from there on the scan
+        is the fresh one (whose own found set and end state apply). The
+        found set of the whole join is this one plus the fresh scan's.
+        """
+        delta, out, depth = self._compiled or self._compile()
+        found: set[str] = set()
+        for consumed, ch in enumerate(text, 1 - skip):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+            if depth[state] <= consumed:
+                return frozenset(found), None
+        return frozenset(found), state
+
+    def _compile(self) -> tuple[list[dict[str, int]], list[tuple[str, ...]], list[int]]:
+        with self._lock:
+            if self._compiled is not None:
+                return self._compiled
+
+            # Trie of the phrases; out[s] lists the phrases ending at state s
+            goto: list[dict[str, int]] = [{}]
+            out: list[tuple[str, ...]] = [()]
+            depth = [0]
+            for phrase in self._phrases:
+                state = 0
+                for ch in phrase:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = goto[state][ch] = len(goto)
+                        goto.append({})
+                        out.append(())
+                        depth.append(depth[state] + 1)
+                    state = nxt
+                out[state] += (phrase,)
+
+            # Breadth-first: each state's failure link is shallower, so its
+            # transitions (already complete) seed this state's
+            delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+            fail = [0] * len(goto)
+            queue = deque(goto[0].values())
+            while queue:
+                state = queue.popleft()
+                delta[state] = {**delta[fail[state]], **goto[state]}
+                out[state] += out[fail[state]]
+                for ch, nxt in goto[state].items():
+                    fail[nxt] = delta[fail[state]].get(ch, 0)
+                    queue.append(nxt)
+
+            self._compiled = (delta, out, depth)
+            return self._compiled
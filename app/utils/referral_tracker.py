@@ -1,21 +1,31 @@
 """Referral tracking and attribution.
 
 Tracks referral source performance, identifies top referrers,
-and calculates referral revenue share.
+and calculates referral revenue share. Accepts payment lists or a
+ClientFrame.
 """
 
 from __future__ import annotations
 
 from collections import defaultdict
 
+import numpy as np
 
-def identify_referral_clients(payments: list[dict]) -> list[dict]:
+from app.utils.client_frame import ClientFrame
+
+
+def identify_referral_clients(payments: list[dict] | ClientFrame) -> list[dict]:
     """Filter payments where lead_source is Referral."""
+    if isinstance(payments, ClientFrame):
+        return payments.rows(_referral_mask(payments))
     return [p for p in payments if (p.get("lead_source") or "").lower() == "referral"]
 
 
-def referral_conversion_rate(payments: list[dict]) -> dict:
+def referral_conversion_rate(payments: list[dict] | ClientFrame) -> dict:
     """Compare Referral leads vs other sources on conversion and deal size."""
+    if isinstance(payments, ClientFrame):
+        return _referral_conversion_rate_frame(payments)
+
     referral_leads = 0
     referral_paid = 0
     referral_revenue = 0.0
@@ -54,7 +64,7 @@ def referral_conversion_rate(payments: list[dict]) -> dict:
 
 
 def top_referrers(
-    payments: list[dict], referral_map: dict[str, str] | None = None
+    payments: list[dict] | ClientFrame, referral_map: dict[str, str] | None = None
 ) -> list[dict]:
     """Identify top referrers.
 
@@ -97,8 +107,18 @@ def top_referrers(
     return result
 
 
-def referral_revenue_share(payments: list[dict]) -> dict:
+def referral_revenue_share(payments: list[dict] | ClientFrame) -> dict:
     """Calculate what % of total revenue comes from referrals."""
+    if isinstance(payments, ClientFrame):
+        paid = payments.paid
+        total = float(payments.amount[paid].sum())
+        referral = float(payments.amount[paid & _referral_mask(payments)].sum())
+        return {
+            "referral_revenue": referral,
+            "total_revenue": total,
+            "referral_pct": (referral / total * 100) if total > 0 else 0,
+        }
+
     total = 0.0
     referral = 0.0
 
@@ -115,3 +135,33 @@ def referral_revenue_share(payments: list[dict]) -> dict:
         "total_revenue": total,
         "referral_pct": (referral / total * 100) if total > 0 else 0,
     }
+
+
+# ── ClientFrame paths ────────────────────────────────────────────
+
+
+def _referral_mask(frame: ClientFrame) -> np.ndarray:
+    return frame.where("lead_source", lambda source: source.lower() == "referral")
+
+
+def _referral_conversion_rate_frame(frame: ClientFrame) -> dict:
+    referral, paid = _referral_mask(frame), frame.paid
+    referral_leads = int(referral.sum())
+    referral_paid = int((referral & paid).sum())
+    referral_revenue = float(frame.amount[referral & paid].sum())
+    other_leads = len(frame) - referral_leads
+    other_paid = int((~referral & paid).sum())
+    other_revenue = float(frame.amount[~referral & paid].sum())
+
+    return {
+        "referral_leads": referral_leads,
+        "referral_paid": referral_paid,
+        "referral_conversion": (referral_paid / referral_leads * 100) if referral_leads > 0 else 0,
+        "referral_avg_deal": (referral_revenue / referral_paid) if referral_paid > 0 else 0,
+        "referral_revenue": referral_revenue,
+        "other_leads": other_leads,
+        "other_paid": other_paid,
+        "other_conversion": (other_paid / other_leads * 100) if other_leads > 0 else 0,
+        "other_avg_deal": (other_revenue / other_paid) if other_paid > 0 else 0,
+        "other_revenue": other_revenue,
+    }
@@ -10,7 +10,10 @@ import math
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+
 from app.config import PRODUCT_TYPES
+from app.utils.client_frame import ClientFrame
 
 
 # Products that involve scheduled calls (affects capacity calculation)
@@ -129,23 +132,26 @@ def compare_scenarios(scenarios: list[Scenario]) -> dict:
 
 
 def product_ladder(
-    payments: list[dict], proposed_products: dict[str, int] | None = None
+    payments: list[dict] | ClientFrame, proposed_products: dict[str, int] | None = None
 ) -> list[dict]:
     """Build the value ladder showing volume + conversion at each tier."""
     # Count current volume per product
     product_counts: dict[str, dict] = {}
     product_revenue: dict[str, float] = {}
 
-    for p in payments:
-        product = p.get("product_purchased")
-        amount = p.get("payment_amount", 0) or 0
-        if not product or amount <= 0:
-            continue
-        if product not in product_counts:
-            product_counts[product] = {"count": 0, "emails": set()}
-        product_counts[product]["count"] += 1
-        product_counts[product]["emails"].add((p.get("email") or "").lower())
-        product_revenue[product] = product_revenue.get(product, 0) + amount
+    if isinstance(payments, ClientFrame):
+        product_counts, product_revenue = _product_volume_frame(payments)
+    else:
+        for p in payments:
+            product = p.get("product_purchased")
+            amount = p.get("payment_amount", 0) or 0
+            if not product or amount <= 0:
+                continue
+            if product not in product_counts:
+                product_counts[product] = {"count": 0, "emails": set()}
+            product_counts[product]["count"] += 1
+            product_counts[product]["emails"].add((p.get("email") or "").lower())
+            product_revenue[product] = product_revenue.get(product, 0) + amount
 
     # Build ladder from existing products
     all_products = dict(PRODUCT_TYPES)
@@ -184,6 +190,23 @@ def product_ladder(
     return ladder
 
 
+def _product_volume_frame(frame: ClientFrame) -> tuple[dict[str, dict], dict[str, float]]:
+    """product_ladder's per-product sale counts, buyer emails and revenue."""
+    sold = frame.paid & frame.where("product", bool)
+    codes = frame.product.codes[sold]
+    k = len(frame.product.categories)
+    counts = np.bincount(codes, minlength=k)
+    revenue = np.bincount(codes, weights=frame.amount[sold], minlength=k)
+    emails = frame.email[sold]
+
+    product_counts, product_revenue = {}, {}
+    for c in np.flatnonzero(counts):
+        product = frame.product.categories[c]
+        product_counts[product] = {"count": int(counts[c]), "emails": set(emails[codes == c])}
+        product_revenue[product] = float(revenue[c])
+    return product_counts, product_revenue
+
+
 def monthly_targets(
     annual_goal: float,
     start_month: str,
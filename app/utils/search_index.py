@@ -0,0 +1,309 @@
+"""Full-text client search: an inverted index ranked by BM25.
+
+Finding "everyone who mentioned rebrand and a launch deadline" used to
+mean rescanning every intake. A SearchIndex keeps a posting list per
+term (client -> term frequency) over each client's name and intake text
+(TEXT_FIELDS: role, brand, creative emergency, what they tried, deadline,
+constraints), so a query only touches the clients containing its terms.
+
+    search(query, k)        BM25 (k1=1.2, b=0.75), best k first
+    search(..., match_all)  only clients matching every query term
+    search_page(query, k)   search(), plus how many clients matched in all
+
+Terms are lowercase runs of letters and digits. A query term of four or
+more characters also matches the longer words it starts, the same
+word-prefix rule the keyword extractor used ("launch" finds "launching");
+a term's variants are scored together, as one term.
+
+Each client has a slot in NumPy arrays of document lengths and arrival
+order, and a term's postings become slot/frequency arrays the first time
+a query needs them, so scoring a common term is vectorized rather than a
+loop over tens of thousands of clients. Re-indexing a client only drops
+the arrays of its own terms.
+
+sync() applies the current client list by re-indexing only the clients
+whose text changed, so the index is kept across refreshes like the lead
+ranking and a webhook upsert costs one client's tokens.
+
+An index pickles (for the cache's disk tier) from a copy taken under its
+lock, without the lock or the term arrays, which are rebuilt on demand.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from app.utils.intake_features import TEXT_FIELDS
+from app.utils.lead_ranking import client_key
+
+K1 = 1.2
+B = 0.75
+PREFIX_MIN = 4
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def client_text(client: dict) -> tuple[str, ...]:
+    """The indexed text of a merged client: name, then the intake's TEXT_FIELDS."""
+    intake = client.get("intake") or {}
+    values = [client["payment"].get("client_name")] + [intake.get(f) for f in TEXT_FIELDS]
+    return tuple(v if isinstance(v, str) else "" for v in values)
+
+
+@dataclass
+class _Doc:
+    slot: int
+    text: tuple[str, ...]
+    terms: Counter
+    item: dict
+
+
+@dataclass
+class SearchHit:
+    key: str
+    score: float
+    item: dict
+    matched: tuple[str, ...]  # The query terms this client matched
+
+
+class SearchIndex:
+    """BM25 search over merged clients ({"payment", "intake"}), keyed by client_key()."""
+
+    def __init__(self, clients: list[dict] | None = None):
+        self._docs: dict[str, _Doc] = {}
+        self._keys: list[str | None] = []  # slot -> key (None when free)
+        self._free: list[int] = []
+        self._lengths = np.zeros(0, dtype=np.float64)
+        self._arrivals = np.zeros(0, dtype=np.int64)
+        self._postings: dict[str, dict[int, int]] = {}  # term -> slot -> frequency
+        self._arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}  # term -> (slots, frequencies)
+        self._vocabulary: list[str] | None = []  # Sorted terms for prefix lookups; None until re-sorted
+        self._total_terms = 0
+        self._arrived = 0
+        self._digest = 0
+        self._lock = threading.Lock()
+        if clients:
+            self.sync(clients)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._docs
+
+    @property
+    def digest(self) -> str:
+        """Hash of the indexed text (order-independent), for ETags."""
+        return f"{self._digest:016x}"
+
+    def __getstate__(self) -> dict:
+        with self._lock:
+            state = dict(self.__dict__)
+            del state["_lock"]
+            state["_docs"] = dict(self._docs)
+            state["_keys"] = list(self._keys)
+            state["_free"] = list(self._free)
+            state["_lengths"] = self._lengths.copy()
+            state["_arrivals"] = self._arrivals.copy()
+            state["_postings"] = {term: dict(postings) for term, postings in self._postings.items()}
+            state["_arrays"] = {}
+            state["_vocabulary"] = None
+            return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # ── Updates ────────────────────────────────────────────────────
+
+    def update(self, key: str, text: Iterable[str], item: dict | None = None) -> None:
+        """Index a client's text fields, replacing what was indexed for it."""
+        with self._lock:
+            self._update(key, tuple(text), item)
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def sync(self, clients: Iterable[dict]) -> int:
+        """Match the index to a merged client list; returns how many clients were (re/de-)indexed."""
+        changed = 0
+        with self._lock:
+            seen = set()
+            for client in clients:
+                key = client_key(client["payment"])
+                if key in seen:
+                    continue  # Duplicate records of one client are indexed once, as the first
+                seen.add(key)
+                text = client_text(client)
+                doc = self._docs.get(key)
+                if doc is None or doc.text != text:
+                    changed += 1
+                self._update(key, text, client)
+            for key in [k for k in self._docs if k not in seen]:
+                self._remove(key)
+                changed += 1
+        return changed
+
+    def _update(self, key: str, text: tuple[str, ...], item: dict | None) -> None:
+        doc = self._docs.get(key)
+        if doc is not None:
+            if doc.text == text:
+                if item is not None:
+                    doc.item = item
+                return
+            arrival = int(self._arrivals[doc.slot])
+            if item is None:
+                item = doc.item
+            self._remove(key)
+        else:
+            arrival = self._arrived
+            self._arrived += 1
+
+        slot = self._free.pop() if self._free else self._grow()
+        terms = Counter(tokenize(" ".join(text)))
+        index = self._postings
+        for term, count in terms.items():
+            postings = index.get(term)
+            if postings is None:
+                postings = index[term] = {}
+                self._vocabulary = None
+            postings[slot] = count
+        if self._arrays:
+            for term in terms:
+                self._arrays.pop(term, None)
+        length = sum(terms.values())
+        self._keys[slot] = key
+        self._lengths[slot] = length
+        self._arrivals[slot] = arrival
+        self._docs[key] = _Doc(slot, text, terms, item if item is not None else {})
+        self._total_terms += length
+        self._digest ^= _doc_hash(key, text)
+
+    def _remove(self, key: str) -> bool:
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return False
+        for term in doc.terms:
+            postings = self._postings[term]
+            del postings[doc.slot]
+            self._arrays.pop(term, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+        self._keys[doc.slot] = None
+        self._total_terms -= int(self._lengths[doc.slot])
+        self._lengths[doc.slot] = 0
+        self._free.append(doc.slot)
+        self._digest ^= _doc_hash(key, doc.text)
+        return True
+
+    def _grow(self) -> int:
+        slot = len(self._keys)
+        self._keys.append(None)
+        if slot >= len(self._lengths):
+            size = max(64, 2 * len(self._lengths))
+            self._lengths = np.resize(self._lengths, size)
+            self._arrivals = np.resize(self._arrivals, size)
+        return slot
+
+    # ── Queries ────────────────────────────────────────────────────
+
+    def search(self, query: str, k: int | None = 20, match_all: bool = False) -> list[SearchHit]:
+        """Clients matching any (or, with match_all, every) query term, best BM25 score first.
+
+        k=None returns every match. Ties keep the order clients were indexed in.
+        """
+        return self.search_page(query, k, match_all)[0]
+
+    def search_page(self, query: str, k: int | None = 20, match_all: bool = False) -> tuple[list[SearchHit], int]:
+        """search(), and the number of clients matching before the cut to k."""
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return [], 0
+        with self._lock:
+            n = len(self._docs)
+            if not n:
+                return [], 0
+            size = len(self._keys)
+            average = self._total_terms / n or 1
+            scores = np.zeros(size)
+            matches = np.zeros(size, dtype=np.int64)
+            expansions = []
+            for word in words:
+                terms = self._expand(word)
+                expansions.append(terms)
+                if not terms:
+                    if match_all:
+                        return [], 0
+                    continue
+                slots, tf = self._term_arrays(terms[0])
+                if len(terms) > 1:
+                    # Variants of one word count as one term: sum their frequencies per client
+                    merged = np.zeros(size)
+                    for term in terms:
+                        s, f = self._term_arrays(term)
+                        merged[s] += f
+                    slots = np.flatnonzero(merged)
+                    tf = merged[slots]
+                idf = math.log(1 + (n - len(slots) + 0.5) / (len(slots) + 0.5))
+                norm = K1 * (1 - B + B * self._lengths[slots] / average)
+                scores[slots] += idf * tf * (K1 + 1) / (tf + norm)
+                matches[slots] += 1
+
+            found = np.flatnonzero(matches == len(words) if match_all else matches)
+            total = len(found)
+            if k == 0:
+                return [], total
+            if k is not None and len(found) > k:
+                # Everything scoring at least the k-th best, so ties at the cut are ordered too
+                cut = np.partition(scores[found], len(found) - k)[len(found) - k]
+                found = found[scores[found] >= cut]
+            found = found[np.lexsort((self._arrivals[found], -scores[found]))][:k]
+
+            hits = []
+            for slot in found.tolist():
+                key = self._keys[slot]
+                doc = self._docs[key]
+                matched = tuple(w for w, terms in zip(words, expansions) if any(t in doc.terms for t in terms))
+                hits.append(SearchHit(key, float(scores[slot]), doc.item, matched))
+            return hits, total
+
+    def _expand(self, word: str) -> list[str]:
+        """Indexed terms a query word matches: itself, plus longer words it starts (4+ characters)."""
+        if len(word) < PREFIX_MIN:
+            return [word] if word in self._postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        start = end = bisect.bisect_left(vocabulary, word)
+        while end < len(vocabulary) and vocabulary[end].startswith(word):
+            end += 1
+        return vocabulary[start:end]
+
+    def _term_arrays(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings[term]
+            arrays = self._arrays[term] = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings)),
+            )
+        return arrays
+
+
+def _doc_hash(key: str, text: tuple[str, ...]) -> int:
+    return int.from_bytes(hashlib.blake2b("\x1f".join((key,) + text).encode(), digest_size=8).digest(), "big")
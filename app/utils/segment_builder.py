@@ -2,6 +2,9 @@
 
 Builds named segments of leads based on pipeline status, timing, and score.
 Each segment includes a suggested action for follow-up.
+
+Given a ClientFrame instead of a payment list, each segment is one boolean
+mask over its columns.
 """
 
 from __future__ import annotations
@@ -9,6 +12,11 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from app.utils.client_frame import ClientFrame
+
 
 @dataclass
 class Segment:
@@ -100,7 +108,7 @@ SEGMENT_DEFS = [
 
 
 def build_all_segments(
-    payments: list[dict],
+    payments: list[dict] | ClientFrame,
     scores: list[dict] | None = None,
 ) -> list[Segment]:
     """Build all 6 segments from payment data and optional scores.
@@ -142,7 +150,7 @@ def build_all_segments(
 
 def get_segment(
     name: str,
-    payments: list[dict],
+    payments: list[dict] | ClientFrame,
     scores: list[dict] | None = None,
 ) -> Segment | None:
     """Get a single segment by name."""
@@ -181,11 +189,15 @@ def segment_summary(segments: list[Segment]) -> dict:
 
 def _match_segment(
     name: str,
-    payments: list[dict],
+    payments: list[dict] | ClientFrame,
     score_map: dict[str, float],
     now: datetime,
 ) -> list[dict]:
     """Match payments to a named segment."""
+    if isinstance(payments, ClientFrame):
+        mask = _segment_mask(name, payments, score_map, now)
+        return payments.rows(mask) if mask is not None else []
+
     matchers = {
         "Stale Leads": _match_stale_leads,
         "Window Shoppers": _match_window_shoppers,
@@ -291,6 +303,32 @@ def _match_high_value_prospects(
     return results
 
 
+def _segment_mask(
+    name: str, frame: ClientFrame, score_map: dict[str, float], now: datetime
+) -> np.ndarray | None:
+    """The _match_* rules as one mask over a ClientFrame."""
+    unpaid = frame.amount <= 0
+    # NaN (no date) fails every comparison, as a None day count does
+    days = frame.days_since("created", now)
+
+    if name == "Stale Leads":
+        return frame.is_status("Lead - Laylo") & unpaid & (days >= 7) & (days < 14)
+    if name == "Window Shoppers":
+        return frame.is_status("Lead - Laylo") & unpaid & (days >= 14)
+    if name == "Booking Ghosts":
+        return frame.is_status("Paid - Needs Booking") & frame.paid & (days >= 5)
+    if name == "Intake Dropoffs":
+        return frame.is_status("Booked - Needs Intake")
+    if name == "Comeback Kids":
+        recent_call = frame.days_since("call_date", now) < COMEBACK_MIN_DAYS
+        return frame.is_status("Call Complete") & ~frame.is_product("3-Session Clarity Sprint") & ~recent_call
+    if name == "High-Value Prospects":
+        normalized = {email.strip(): score for email, score in score_map.items()}
+        scores = pd.Series(frame.email).map(normalized).fillna(0).to_numpy()
+        return unpaid & (scores >= 70)
+    return None
+
+
 # ── Helpers ───────────────────────────────────────────────────────
 
 
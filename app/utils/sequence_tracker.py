@@ -2,6 +2,7 @@
 
 Maps Notion checkbox fields to email sequence steps.
 Tracks which sequence each client is in and their progress.
+Accepts payment lists or a ClientFrame.
 """
 
 from __future__ import annotations
@@ -9,7 +10,10 @@ from __future__ import annotations
 from collections import defaultdict
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.config import PIPELINE_STATUSES
+from app.utils.client_frame import ClientFrame
 
 
 # Sequence definitions: maps status → sequence with checkbox steps
@@ -108,10 +112,13 @@ def get_client_sequence(payment: dict) -> SequencePosition | None:
 
 
 def build_sequence_map(
-    payments: list[dict],
+    payments: list[dict] | ClientFrame,
 ) -> dict[str, list[SequencePosition]]:
     """Group all clients by their current sequence."""
     result: dict[str, list[SequencePosition]] = defaultdict(list)
+    if isinstance(payments, ClientFrame):
+        # Only clients in a sequence's trigger status need their checkboxes read
+        payments = payments.rows(payments.is_status(*STATUS_TO_SEQUENCE))
 
     for p in payments:
         pos = get_client_sequence(p)
@@ -121,7 +128,7 @@ def build_sequence_map(
     return dict(result)
 
 
-def sequence_completion_rates(payments: list[dict]) -> dict[str, dict]:
+def sequence_completion_rates(payments: list[dict] | ClientFrame) -> dict[str, dict]:
     """Calculate completion rate per sequence."""
     seq_map = build_sequence_map(payments)
     result = {}
@@ -138,19 +145,23 @@ def sequence_completion_rates(payments: list[dict]) -> dict[str, dict]:
     return result
 
 
-def sequence_conversion_rates(payments: list[dict]) -> dict[str, dict]:
+def sequence_conversion_rates(payments: list[dict] | ClientFrame) -> dict[str, dict]:
     """Calculate what % of clients who completed a sequence advanced to next stage."""
     seq_map = build_sequence_map(payments)
 
     # Build email→status lookup from ALL payments
-    email_status: dict[str, str] = {}
-    for p in payments:
-        email = (p.get("email") or "").lower()
-        if email:
-            status = p.get("status", "")
-            # Keep the most advanced status
-            if email not in email_status or STATUS_ORDER.get(status, 0) > STATUS_ORDER.get(email_status[email], 0):
-                email_status[email] = status
+    if isinstance(payments, ClientFrame):
+        email_order = _most_advanced_order(payments)
+    else:
+        email_status: dict[str, str] = {}
+        for p in payments:
+            email = (p.get("email") or "").strip().lower()
+            if email:
+                status = p.get("status", "")
+                # Keep the most advanced status
+                if email not in email_status or STATUS_ORDER.get(status, 0) > STATUS_ORDER.get(email_status[email], 0):
+                    email_status[email] = status
+        email_order = {email: STATUS_ORDER.get(status, 0) for email, status in email_status.items()}
 
     result = {}
     for seq_name, positions in seq_map.items():
@@ -164,8 +175,7 @@ def sequence_conversion_rates(payments: list[dict]) -> dict[str, dict]:
 
         advanced = 0
         for pos in completed:
-            current_status = email_status.get(pos.email.lower(), "")
-            if STATUS_ORDER.get(current_status, 0) > trigger_order:
+            if email_order.get(pos.email.strip().lower(), 0) > trigger_order:
                 advanced += 1
 
         result[seq_name] = {
@@ -175,3 +185,12 @@ def sequence_conversion_rates(payments: list[dict]) -> dict[str, dict]:
         }
 
     return result
+
+
+def _most_advanced_order(frame: ClientFrame) -> dict[str, int]:
+    """email -> STATUS_ORDER of the furthest status any of its records reached."""
+    order = np.array([STATUS_ORDER.get(s, 0) for s in frame.status.categories] + [0])[frame.status.codes]
+    has_email = frame.email_code >= 0
+    best = np.zeros(len(frame.emails), dtype=np.int64)
+    np.maximum.at(best, frame.email_code[has_email], order[has_email])
+    return dict(zip(frame.emails, best.tolist()))
@@ -0,0 +1,109 @@
+"""Benchmark API payload encoding and compression at scale.
+
+Builds synthetic /api/clients/scored payloads and reports encode time and
+payload bytes for the stdlib encoder, orjson (when installed), and the
+gzip / brotli bodies the API would send.
+
+    python scripts/bench_api_payloads.py                 # 10k and 100k clients
+    python scripts/bench_api_payloads.py --sizes 1000 50000 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api import encoding  # noqa: E402
+
+STATUSES = ["Lead - Laylo", "Paid - Needs Booking", "Booked - Needs Intake", "Intake Complete",
+            "Ready for Call", "Call Complete", "Follow-Up Sent"]
+SOURCES = ["IG DM", "Meta Ad", "Website", "Referral", "LinkedIn", "Direct"]
+PRODUCTS = ["First Call", "Single Call", "3-Session Clarity Sprint"]
+TIERS = ["Hot", "Warm", "Cool", "Cold"]
+
+
+def synthetic_scored_clients(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    clients = []
+    for i in range(n):
+        day = rng.randint(1, 28)
+        clients.append({
+            "id": f"cs_live_{i:08d}",
+            "name": f"Client {i}",
+            "email": f"client{i}@example.com",
+            "phone": "",
+            "status": rng.choice(STATUSES),
+            "product": rng.choice(PRODUCTS),
+            "amount": rng.choice([0, 499, 699, 1495]),
+            "payment_date": f"2026-0{rng.randint(1, 9)}-{day:02d}",
+            "call_date": "",
+            "lead_source": rng.choice(SOURCES),
+            "days_to_convert": rng.randint(0, 30),
+            "created": f"2026-01-{day:02d}T12:00:00.000Z",
+            "score": rng.randint(0, 100),
+            "tier": rng.choice(TIERS),
+            "engagement": rng.randint(0, 25),
+            "recency": rng.randint(0, 25),
+            "value": rng.randint(0, 25),
+            "fit": rng.randint(0, 25),
+        })
+    return clients
+
+
+def _timed(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def bench(n: int, repeat: int) -> dict:
+    payload = synthetic_scored_clients(n)
+    row: dict = {"clients": n}
+
+    ms, body = _timed(lambda: json.dumps(payload, separators=(",", ":"), default=str).encode(), repeat)
+    row["stdlib_encode_ms"] = round(ms, 1)
+    row["json_bytes"] = len(body)
+
+    if encoding.orjson is not None:
+        ms, _ = _timed(lambda: encoding.orjson.dumps(payload, default=str), repeat)
+        row["orjson_encode_ms"] = round(ms, 1)
+
+    ms, gz = _timed(lambda: gzip.compress(body, compresslevel=encoding.GZIP_LEVEL, mtime=0), repeat)
+    row["gzip_ms"] = round(ms, 1)
+    row["gzip_bytes"] = len(gz)
+
+    if encoding.brotli is not None:
+        ms, br = _timed(lambda: encoding.brotli.compress(body, quality=encoding.BROTLI_QUALITY), repeat)
+        row["brotli_ms"] = round(ms, 1)
+        row["brotli_bytes"] = len(br)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    rows = [bench(n, args.repeat) for n in args.sizes]
+    columns = list(dict.fromkeys(k for row in rows for k in row))
+    print("  ".join(f"{c:>16}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{row.get(c, '-'):>16}" for c in columns))
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
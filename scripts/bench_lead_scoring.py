@@ -0,0 +1,181 @@
+"""Benchmark scalar vs batch lead scoring at scale.
+
+Replicates the demo clients (payments joined to intakes) to N leads and
+times score_all_clients() over the merged list (score_client() per lead)
+against score_batch() over a ClientFrame, plus the full batch
+score_all_clients() that also builds every breakdown dict. Checks that both
+paths agree on every total and tier. Then times a ScoreMemo pass over a
+refetch (every record a new dict) in which --changed clients were edited,
+a backtest over --backtest-days daily dates, training the learned model
+over those dates plus its inference per lead, single-client updates
+and top-10 reads of a LeadRanking against re-sorting the scored list, and
+building a SearchIndex plus a ranked query against scanning every
+client's text for the query words.
+
+    python scripts/bench_lead_scoring.py                 # 100k leads
+    python scripts/bench_lead_scoring.py --sizes 10000 100000 --json out.json
+    python scripts/bench_lead_scoring.py --changed 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.client_frame import ClientFrame  # noqa: E402
+from app.utils.demo_data import DEMO_INTAKES, DEMO_PAYMENTS  # noqa: E402
+from app.utils.lead_backtest import backtest  # noqa: E402
+from app.utils.lead_model import train  # noqa: E402
+from app.utils.lead_ranking import LeadRanking, client_key  # noqa: E402
+from app.utils.lead_scorer import ScoreMemo, score_all_clients, score_batch  # noqa: E402
+from app.utils.search_index import SearchIndex, client_text  # noqa: E402
+
+SEARCH_QUERY = "rebrand launch deadline"
+
+
+def synthetic_merged(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    intake_by_email = {i["email"].lower(): i for i in DEMO_INTAKES}
+    today = datetime.now()
+    merged = []
+    for i in range(n):
+        base = DEMO_PAYMENTS[i % len(DEMO_PAYMENTS)]
+        created = today - timedelta(days=rng.randint(0, 120), hours=rng.randint(0, 23))
+        payment = {
+            **base,
+            "id": f"lead-{i}",
+            "email": f"lead{i}@example.com",
+            "created": created.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "payment_date": (created + timedelta(days=rng.randint(0, 3))).strftime("%Y-%m-%d")
+            if base.get("payment_date") else "",
+            "call_date": (created + timedelta(days=rng.randint(2, 20))).strftime("%Y-%m-%d")
+            if base.get("call_date") else "",
+        }
+        intake = intake_by_email.get(base["email"].lower())
+        if intake is not None:
+            intake = {**intake, "email": payment["email"],
+                      "created": (created + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%S.000Z")}
+        merged.append({"payment": payment, "intake": intake})
+    return merged
+
+
+def _timed(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def refetched(merged: list[dict], changed: int, seed: int = 7) -> list[dict]:
+    """A copy of merged as a refetch returns it, with `changed` statuses edited."""
+    copy = [{"payment": dict(c["payment"]), "intake": c["intake"] and dict(c["intake"])} for c in merged]
+    for i in random.Random(seed).sample(range(len(copy)), min(changed, len(copy))):
+        copy[i]["payment"]["status"] = "Call Complete"
+    return copy
+
+
+def bench(n: int, repeat: int, changed: int, backtest_days: int) -> dict:
+    merged = synthetic_merged(n)
+    row: dict = {"leads": n}
+
+    ms, scalar = _timed(lambda: score_all_clients(merged), repeat)
+    row["scalar_ms"] = round(ms, 1)
+
+    ms, frame = _timed(lambda: ClientFrame.from_merged(merged), repeat)
+    row["frame_build_ms"] = round(ms, 1)
+    ms, batch = _timed(lambda: score_batch(frame), repeat)
+    row["batch_ms"] = round(ms, 1)
+    ms, _ = _timed(lambda: score_all_clients(frame), repeat)
+    row["batch_with_breakdowns_ms"] = round(ms, 1)
+    row["speedup"] = round(row["scalar_ms"] / row["batch_ms"], 1)
+
+    # score_all_clients sorts; compare per lead via the payment dicts' identity
+    expected = {id(s["payment"]): (s["score"]["total"], s["score"]["tier"]) for s in scalar}
+    actual = {id(p): (int(t), str(tier)) for p, t, tier in zip(frame.records, batch.total, batch.tier)}
+    row["identical"] = expected == actual
+
+    ms, _ = _timed(lambda: score_all_clients(merged, memo=ScoreMemo()), repeat)
+    row["memo_cold_ms"] = round(ms, 1)
+    memo = ScoreMemo()
+    score_all_clients(merged, memo=memo)
+    refetch = refetched(merged, changed)
+    # Each repeat starts from the pre-refetch memo state
+    ms, _ = _timed(lambda: score_all_clients(refetch, memo=_copy_memo(memo)), repeat)
+    row[f"memo_{changed}_changed_ms"] = round(ms, 1)
+    row["memo_rescored"] = _rescored(memo, refetch)
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    dates = [today - timedelta(days=d) for d in range(backtest_days, 0, -1)]
+    ms, _ = _timed(lambda: backtest(merged, dates), repeat)
+    row[f"backtest_{backtest_days}d_ms"] = round(ms, 1)
+
+    ms, model = _timed(lambda: train(merged, dates), repeat)
+    row["train_ms"] = round(ms, 1)
+    row["model_auc"] = model.metrics.get("auc", "-")
+    row["heuristic_auc"] = model.metrics.get("heuristic_auc", "-")
+    ms, _ = _timed(lambda: model.predict(batch), repeat)
+    row["inference_us_per_lead"] = round(ms * 1000 / n, 3)
+
+    ms, ranking = _timed(lambda: LeadRanking(scalar), repeat)
+    row["ranking_build_ms"] = round(ms, 1)
+    rng = random.Random(3)
+    moves = [(client_key(item["payment"]), rng.randint(0, 100)) for item in rng.sample(scalar, min(1000, n))]
+    ms, _ = _timed(lambda: [ranking.update(key, total) for key, total in moves], repeat)
+    row["ranking_update_us"] = round(ms * 1000 / len(moves), 2)
+    ms, _ = _timed(lambda: ranking.top(10), repeat)
+    row["ranking_top10_us"] = round(ms * 1000, 1)
+    ms, _ = _timed(lambda: sorted(scalar, key=lambda item: item["score"]["total"], reverse=True)[:10], repeat)
+    row["resort_top10_us"] = round(ms * 1000, 1)
+
+    ms, index = _timed(lambda: SearchIndex(merged), repeat)
+    row["search_build_ms"] = round(ms, 1)
+    index.search(SEARCH_QUERY)  # Postings arrays are built on first use
+    ms, _ = _timed(lambda: index.search(SEARCH_QUERY, match_all=True), repeat)
+    row["search_query_ms"] = round(ms, 2)
+    words = SEARCH_QUERY.split()
+    ms, _ = _timed(lambda: [c for c in merged if all(w in " ".join(client_text(c)).lower() for w in words)], repeat)
+    row["scan_query_ms"] = round(ms, 1)
+    return row
+
+
+def _copy_memo(memo: ScoreMemo) -> ScoreMemo:
+    copy = ScoreMemo()
+    copy._entries = dict(memo._entries)
+    return copy
+
+
+def _rescored(memo: ScoreMemo, merged: list[dict]) -> int:
+    copy = _copy_memo(memo)
+    score_all_clients(merged, memo=copy)
+    return copy.rescored
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing")
+    parser.add_argument("--changed", type=int, default=100, help="Clients edited between memo passes")
+    parser.add_argument("--backtest-days", type=int, default=365, help="Dates in the backtest sweep")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    rows = [bench(n, args.repeat, args.changed, args.backtest_days) for n in args.sizes]
+    columns = list(dict.fromkeys(k for row in rows for k in row))
+    print("  ".join(f"{c:>24}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{row.get(c, '-')!s:>24}" for c in columns))
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Load-test harness for the FastAPI app.
+
+Starts the API under uvicorn on a local port, backed by a synthetic Notion
+stand-in with N clients (the demo clients replicated with unique ids,
+emails and dates), and drives a weighted mix of endpoint calls at each
+concurrency level. Reports p50/p95/p99 latency, throughput and error rate
+per endpoint and overall, plus the cold snapshot build time per scale.
+
+    python scripts/load_test.py                                  # 1k/10k/100k clients
+    python scripts/load_test.py --clients 10000 --concurrency 1 16 64 --duration 20
+    python scripts/load_test.py --mix dashboard=5,clients_page=1 --out results.json
+
+The artifact (--out, default plans/load_test_results.json) is one JSON
+object per (clients, concurrency) run.
+
+The load generator shares the server's process, so absolute numbers
+include its overhead. Compare runs made on the same machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from api.main import app  # noqa: E402
+from api.services import _demo_services  # noqa: E402
+from app.services.cache_manager import cache  # noqa: E402
+from app.services.demo_service import DemoNotionService  # noqa: E402
+from app.services.derived import INTAKES_KEY, PAYMENTS_KEY  # noqa: E402
+from app.utils.demo_data import DEMO_INTAKES, DEMO_PAYMENTS  # noqa: E402
+
+ENDPOINTS = {
+    "dashboard": "/api/dashboard",
+    "kpis": "/api/kpis",
+    "clients": "/api/clients",
+    "clients_page": "/api/clients?limit=25&sort=-created",
+    "clients_filtered": "/api/clients?status=Call%20Complete,Follow-Up%20Sent&limit=25",
+    "scored_page": "/api/clients/scored?limit=25&sort=-score",
+    "pipeline": "/api/pipeline?clients_limit=25",
+    "funnel": "/api/funnel",
+    "channels": "/api/channels",
+    "health": "/api/health",
+}
+DEFAULT_MIX = "dashboard=4,clients_page=3,scored_page=2,clients_filtered=1,pipeline=1,health=1"
+
+
+class SyntheticNotionService(DemoNotionService):
+    """Demo clients replicated to n records, cached like NotionService."""
+
+    def __init__(self, n: int, seed: int = 7):
+        self._payments, self._intakes = synthetic_clients(n, seed)
+
+    def get_all_payments(self) -> list:
+        return self._cached(PAYMENTS_KEY, self._payments)
+
+    def get_all_intakes(self) -> list:
+        return self._cached(INTAKES_KEY, self._intakes)
+
+    def get_merged_clients(self) -> list:
+        by_email = {i["email"]: i for i in self.get_all_intakes()}
+        return [{"payment": p, "intake": by_email.get(p["email"])} for p in self.get_all_payments()]
+
+    @staticmethod
+    def _cached(key: str, records: list[dict]) -> list:
+        cached = cache.get(key)
+        if cached is None:
+            cached = list(records)
+            cache.set(key, cached, tier="warm")
+        return cached
+
+
+def synthetic_clients(n: int, seed: int = 7) -> tuple[list[dict], list[dict]]:
+    rng = random.Random(seed)
+    intake_by_email = {i["email"].lower(): i for i in DEMO_INTAKES}
+    today = datetime.now()
+    payments, intakes = [], []
+    for i in range(n):
+        base = DEMO_PAYMENTS[i % len(DEMO_PAYMENTS)]
+        local, _, domain = base["email"].partition("@")
+        email = f"{local}+{i}@{domain}"
+        paid_on = today - timedelta(days=rng.randint(0, 365))
+        payment = {
+            **base,
+            "id": f"synth-p{i}",
+            "client_name": f"{base['client_name']} {i}",
+            "email": email,
+            "stripe_session_id": f"cs_synth_{i:07d}",
+            "payment_date": paid_on.strftime("%Y-%m-%d") if base.get("payment_date") else "",
+            "call_date": (paid_on + timedelta(days=rng.randint(1, 14))).strftime("%Y-%m-%d")
+            if base.get("call_date") else "",
+            "created": (paid_on - timedelta(days=rng.randint(0, 5))).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        }
+        payments.append(payment)
+        intake = intake_by_email.get(base["email"].lower())
+        if intake is not None:
+            intakes.append({**intake, "id": f"synth-i{i}", "email": email, "client_name": payment["client_name"]})
+    return payments, intakes
+
+
+@contextmanager
+def serve(n_clients: int):
+    """Run the app on a free local port with the synthetic data layer."""
+    services = _demo_services()
+    services.notion = SyntheticNotionService(n_clients)
+    cache.invalidate_all()
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    with patch("api.snapshot.get_services", return_value=services), \
+            patch("api.routers.health.get_services", return_value=services):
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+        try:
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(samples: list[tuple[str, float, bool]], elapsed: float) -> dict:
+    latencies = sorted(s[1] for s in samples)
+    errors = sum(1 for s in samples if not s[2])
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def drive(base_url: str, mix: dict[str, int], concurrency: int, duration: float, seed: int) -> dict:
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    samples: list[tuple[str, float, bool]] = []
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60,
+                                 headers={"Accept-Encoding": "gzip"}) as client:
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(seed + worker_id)
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(ENDPOINTS[name])
+                    await resp.aread()
+                    ok = resp.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                samples.append((name, time.perf_counter() - start, ok))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        **summarize(samples, elapsed),
+        "endpoints": {n: summarize([s for s in samples if s[0] == n], elapsed) for n in names},
+    }
+
+
+def run(n_clients: int, levels: list[int], mix: dict[str, int], duration: float, seed: int) -> list[dict]:
+    results = []
+    with serve(n_clients) as base_url:
+        start = time.perf_counter()
+        httpx.get(f"{base_url}/api/dashboard", timeout=600).raise_for_status()
+        cold_build = time.perf_counter() - start
+        for concurrency in levels:
+            result = asyncio.run(drive(base_url, mix, concurrency, duration, seed))
+            results.append({
+                "clients": n_clients,
+                "concurrency": concurrency,
+                "duration_s": duration,
+                "cold_snapshot_ms": round(cold_build * 1000, 1),
+                **result,
+            })
+            print(f"{n_clients:>7} clients  c={concurrency:<4} {result['throughput_rps']:>8} rps  "
+                  f"p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+                  f"errors {result['error_rate']:.2%}", flush=True)
+    return results
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight,... (see ENDPOINTS)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", type=Path, default=ROOT / "plans" / "load_test_results.json")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    results = []
+    for n in args.clients:
+        results += run(n, args.concurrency, mix, args.duration, args.seed)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps({
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "mix": mix,
+        "runs": results,
+    }, indent=2))
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,20 @@
 
 from __future__ import annotations
 
+import random
+from datetime import datetime, timedelta
+
 import pytest
 
+from app.utils.demo_data import DEMO_INTAKES
+
+_RANDOM_NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+_STATUSES = ["Lead - Laylo", "Paid - Needs Booking", "Booked - Needs Intake", "Intake Complete",
+             "Call Complete", "Follow-Up Sent"]
+_SOURCES = ["Referral", "Direct", "Website", "IG DM", "IG Story", "Meta Ad", "TikTok", "", None]
+_DEADLINES = ["", None, "ASAP", "tomorrow!", "next week", "end of month", "this quarter", "6 weeks", "someday"]
+
 
 @pytest.fixture
 def hot_payment():
@@ -114,3 +126,54 @@ def sample_merged(hot_payment, hot_intake, cold_payment):
         {"payment": hot_payment, "intake": hot_intake},
         {"payment": cold_payment, "intake": None},
     ]
+
+
+def _stamp(rng, days_back, formats=("%Y-%m-%dT%H:%M:%S.000Z", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")):
+    return (_RANDOM_NOW - timedelta(days=days_back, hours=rng.randint(0, 23))).strftime(rng.choice(formats))
+
+
+def _random_merged(n=1500, seed=11):
+    """Every branch of every category: missing/invalid dates, intakes, keywords, repeat buyers."""
+    rng = random.Random(seed)
+    merged = []
+    for i in range(n):
+        created_days = rng.choice([0, 3, 8, 20, 31, 45, 90])
+        amount = rng.choice([0, 0, 499, 599, 699, 1000, 1495, 2000])
+        payment = {
+            "email": f"lead{i}@test.com",
+            "status": rng.choice(_STATUSES),
+            "lead_source": rng.choice(_SOURCES),
+            "product_purchased": rng.choice(["", "First Call", "Single Call", "3-Session Clarity Sprint"]),
+            "payment_amount": amount,
+            "created": rng.choice([_stamp(rng, created_days)] * 8 + ["", "garbage"]),
+            "payment_date": _stamp(rng, max(created_days - rng.choice([0, 1, 2, 5, 10]), 0))
+            if rng.random() < 0.7 else rng.choice(["", "nope"]),
+            "call_date": _stamp(rng, rng.randint(-10, 20), ("%Y-%m-%d",)) if rng.random() < 0.6 else "",
+        }
+        if rng.random() < 0.05:
+            payment["purchase_count"] = rng.choice([1, 2, 3])
+        intake = None
+        if rng.random() < 0.6:
+            base = rng.choice(DEMO_INTAKES)
+            intake = {
+                **base,
+                "role": rng.choice([base.get("role"), "", None]),
+                "deadline": rng.choice(_DEADLINES),
+                "creative_emergency": rng.choice([
+                    base.get("creative_emergency"), "", None,
+                    "Launch deadline is urgent and we're stuck, ASAP please " * rng.randint(1, 12),
+                ]),
+                "what_tried": rng.choice([base.get("what_tried"), "", "ongoing team rebrand, website and more " * 5]),
+                "desired_outcome": rng.sample(["a", "b", "c", "d"], rng.randint(0, 4)),
+                "created": rng.choice(["", "bad", _stamp(rng, rng.randint(0, 30))]),
+            }
+            if rng.random() < 0.05:
+                intake = {}
+        merged.append({"payment": payment, "intake": intake})
+    return merged
+
+
+@pytest.fixture
+def random_merged():
+    """Factory for randomized merged clients: random_merged(n=1500, seed=11)."""
+    return _random_merged
@@ -0,0 +1,626 @@
+"""Tests for the FastAPI backend (snapshot-backed routers)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import snapshot
+from api.main import app
+from api.services import _demo_services
+from app.services.cache_manager import cache
+from app.services.derived import INTAKES_KEY, PAYMENTS_KEY
+
+ENDPOINTS = [
+    "/api/dashboard", "/api/kpis", "/api/clients", "/api/clients/scored", "/api/pipeline",
+    "/api/channels", "/api/revenue/monthly", "/api/funnel", "/api/ltv", "/api/health",
+]
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+class FakeNotion:
+    """Notion stand-in that caches its sources like NotionService does."""
+
+    def __init__(self, payments):
+        self.payments = payments
+        self.fetches = 0
+
+    def get_all_payments(self):
+        cached = cache.get(PAYMENTS_KEY)
+        if cached is None:
+            self.fetches += 1
+            cached = list(self.payments)
+            cache.set(PAYMENTS_KEY, cached, tier="warm")
+        return cached
+
+    def get_all_intakes(self):
+        cached = cache.get(INTAKES_KEY)
+        if cached is None:
+            cached = []
+            cache.set(INTAKES_KEY, cached, tier="warm")
+        return cached
+
+    def get_merged_clients(self):
+        return [{"payment": p, "intake": None} for p in self.get_all_payments()]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.invalidate_all()
+    yield
+    cache.invalidate_all()
+
+
+@pytest.fixture
+def services():
+    svc = _demo_services()
+    with patch("api.snapshot.get_services", return_value=svc), \
+            patch("api.routers.health.get_services", return_value=svc):
+        yield svc
+
+
+@pytest.fixture
+def client(services):
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_endpoint_serves_json_with_etag(client, path):
+    resp = client.get(path, headers=IDENTITY)
+    assert resp.status_code == 200
+    assert resp.headers["etag"].startswith('"')
+    assert resp.json() is not None
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_if_none_match_returns_304(client, path):
+    etag = client.get(path, headers=IDENTITY).headers["etag"]
+    resp = client.get(path, headers={**IDENTITY, "If-None-Match": f'W/{etag}, "other"'})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+
+def test_stale_etag_gets_full_body(client):
+    resp = client.get("/api/kpis", headers={"If-None-Match": '"not-current"'})
+    assert resp.status_code == 200
+    assert resp.json()["total_clients"] > 0
+
+
+def test_snapshot_built_once_per_data_change(client, services, sample_payments):
+    services.notion = FakeNotion(sample_payments)
+    with patch("api.snapshot.build_snapshot", wraps=snapshot.build_snapshot) as build:
+        for path in ENDPOINTS[:-1]:
+            client.get(path)
+        assert build.call_count == 1
+
+        # A webhook/refresh invalidates the payments source
+        cache.invalidate(PAYMENTS_KEY)
+        services.notion.payments = sample_payments[:2]
+        assert client.get("/api/kpis").json()["total_clients"] == 2
+        assert build.call_count == 2
+    assert services.notion.fetches == 2
+
+
+def test_unchanged_section_keeps_etag_across_rebuilds(client, services, sample_payments):
+    services.notion = FakeNotion(sample_payments)
+    etag = client.get("/api/funnel").headers["etag"]
+    cache.invalidate(PAYMENTS_KEY)
+    assert client.get("/api/funnel", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_no_notion_serves_empty_sections(client, services):
+    services.notion = None
+    assert client.get("/api/clients").json() == []
+    assert client.get("/api/kpis").json()["total_revenue"] == 0
+
+
+def test_health_reports_live_checks(client, services):
+    class Down:
+        def is_healthy(self):
+            raise ConnectionError("timeout")
+
+    services.stripe = Down()
+    by_service = {row["service"]: row for row in client.get("/api/health").json()}
+    assert by_service["Notion"]["status"] == "healthy"
+    assert by_service["Stripe"] == {
+        "service": "Stripe", "status": "down",
+        "latency_ms": by_service["Stripe"]["latency_ms"], "message": "timeout",
+    }
+    assert by_service["ManyChat"]["status"] == "not_configured"
+
+
+def test_build_snapshot_sections(sample_payments, sample_merged):
+    snap = snapshot.build_snapshot(sample_payments, sample_merged, now=datetime(2026, 3, 1))
+    kpis = snap.data["kpis"]
+    assert kpis["total_clients"] == 6
+    assert kpis["total_revenue"] == 699 * 3 + 499 + 1495
+    assert kpis["booking_rate"] == 1.0
+    assert kpis["monthly_revenue"] == kpis["total_revenue"]
+    assert [s["stage"] for s in snap.data["pipeline"]] == snapshot.PIPELINE_ORDER
+    assert {c["channel"] for c in snap.data["channels"]} == {"Referral", "IG DM", "Website", "Meta Ad", "LinkedIn"}
+    assert all(0 <= c["conversion_rate"] <= 1 for c in snap.data["channels"])
+    assert snap.data["ltv"]["by_product"]["First Call"] == 499
+    scored = snap.data["clients_scored"]
+    assert all(isinstance(c["engagement"], int) for c in scored)
+    assert set(snap.bodies) == set(snap.etags) == set(snap.data)
+
+
+def test_dashboard_matches_individual_endpoints(client):
+    dashboard = client.get("/api/dashboard").json()
+    assert set(dashboard) == set(snapshot.DASHBOARD_SECTIONS)
+    for section, path in [("kpis", "/api/kpis"), ("funnel", "/api/funnel"),
+                          ("channels", "/api/channels"), ("revenue_monthly", "/api/revenue/monthly")]:
+        assert dashboard[section] == client.get(path).json()
+    pipeline = client.get("/api/pipeline").json()
+    assert dashboard["pipeline"] == [{k: v for k, v in s.items() if k != "clients"} for s in pipeline]
+
+
+def test_aggregate_funnel_and_pipeline(sample_payments):
+    snap = snapshot.build_snapshot(sample_payments, [], scored=[], channel_metrics={}, now=datetime(2026, 3, 1))
+    funnel = {row["stage"]: row["count"] for row in snap.data["funnel"]}
+    assert funnel["Leads"] == 6
+    assert (funnel["Intake Done"], funnel["Call Complete"]) == (3, 2)
+    assert funnel["Follow-Up Sent"] == 1
+    stages = {s["stage"]: s for s in snap.data["pipeline"]}
+    assert stages["Paid - Needs Booking"]["value"] == 499
+    assert stages["Call Complete"]["clients"][0]["status"] == "Call Complete"
+
+
+# ── Encoding and response models ─────────────────────────────────────
+
+
+def test_large_sections_are_compressed_and_revalidate(client):
+    resp = client.get("/api/clients/scored", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert resp.headers["etag"].startswith('W/"')
+    assert resp.json() == client.get("/api/clients/scored", headers=IDENTITY).json()
+    again = client.get("/api/clients/scored", headers={"Accept-Encoding": "gzip",
+                                                        "If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+
+    small = client.get("/api/kpis", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_negotiate_respects_q_values():
+    from api.encoding import negotiate
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") == ""
+    assert negotiate("*") in ("br", "gzip")
+    assert negotiate("identity") == ""
+    assert negotiate(None) == ""
+
+
+def test_sections_match_response_models(services):
+    from api.models import SECTION_MODELS
+    from pydantic import TypeAdapter
+    snap = snapshot.get_snapshot()
+    for name, model in SECTION_MODELS.items():
+        TypeAdapter(model).validate_json(snap.bodies[name])
+
+
+# ── Non-blocking upstream calls ──────────────────────────────────────
+
+
+def _run_async(fn):
+    import anyio
+    return anyio.run(fn)
+
+
+def test_cached_requests_do_not_wait_for_slow_upstream(services):
+    import time
+
+    import anyio
+    import httpx
+
+    class Slow:
+        def is_healthy(self):
+            time.sleep(0.6)
+            return True
+
+    services.stripe = Slow()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            await ac.get("/api/kpis")  # warm the snapshot
+            timings = {}
+
+            async def timed(path):
+                start = time.perf_counter()
+                resp = await ac.get(path)
+                timings[path] = time.perf_counter() - start
+                assert resp.status_code == 200
+
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(timed, "/api/health")
+                await anyio.sleep(0.05)
+                for path in ("/api/kpis", "/api/clients", "/api/funnel"):
+                    tg.start_soon(timed, path)
+        return timings
+
+    timings = _run_async(scenario)
+    assert timings["/api/health"] >= 0.6
+    assert max(timings[p] for p in ("/api/kpis", "/api/clients", "/api/funnel")) < 0.3
+
+
+def test_health_checks_run_concurrently_and_once(services):
+    import threading
+    import time
+
+    import anyio
+    import httpx
+
+    calls = []
+    lock = threading.Lock()
+
+    class Slow:
+        def is_healthy(self):
+            with lock:
+                calls.append(1)
+            time.sleep(0.3)
+            return True
+
+    services.stripe = services.calendly = services.n8n = Slow()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            start = time.perf_counter()
+            async with anyio.create_task_group() as tg:
+                for _ in range(5):
+                    tg.start_soon(ac.get, "/api/health")
+            return time.perf_counter() - start
+
+    elapsed = _run_async(scenario)
+    assert elapsed < 0.8  # three 0.3s checks in parallel, not in series
+    assert len(calls) == 3  # five concurrent requests share one round of checks
+
+
+def test_webhook_events_are_applied_off_the_event_loop(services):
+    import threading
+
+    snapshot.get_snapshot()  # Cached, so only the journal poll could block
+    polled = []
+
+    async def scenario():
+        with patch.object(cache, "events_due", return_value=True), \
+                patch.object(cache, "poll_events", side_effect=lambda: polled.append(threading.get_ident())):
+            await snapshot.get_snapshot_async()
+        return threading.get_ident()
+
+    loop_thread = _run_async(scenario)
+    assert polled and polled[0] != loop_thread
+
+
+def test_upstream_limiter_bounds_concurrency():
+    import threading
+    import time
+
+    import anyio
+
+    from api import concurrency
+
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+
+    async def scenario():
+        async with anyio.create_task_group() as tg:
+            for _ in range(12):
+                tg.start_soon(concurrency.run_upstream, work)
+
+    with patch.object(concurrency, "UPSTREAM_CONCURRENCY", 3):
+        _run_async(scenario)
+    assert max(peak) == 3
+
+
+# ── Indexed client queries ───────────────────────────────────────────
+
+
+def _index(n=60):
+    from api.query import ClientIndex
+    statuses = ["Paid - Needs Booking", "Call Complete", "Lead - Laylo"]
+    rows = [
+        {
+            "id": f"c{i:03d}", "name": f"Client {i}", "email": f"c{i}@example.com",
+            "status": statuses[i % 3], "product": "First Call", "amount": i * 10,
+            "payment_date": f"2026-01-{i % 28 + 1:02d}", "call_date": "", "lead_source": "IG DM" if i % 2 else "Website",
+            "days_to_convert": None, "created": f"2025-12-{i % 28 + 1:02d}", "score": i % 100, "tier": "Hot" if i > 40 else "Cold",
+        }
+        for i in range(n)
+    ]
+    return ClientIndex(rows)
+
+
+def _page(index, default_sort="-score", **kwargs):
+    import json
+    from api.query import ClientQuery
+    page = index.query(ClientQuery(**kwargs), default_sort)
+    return json.loads(page.body), page
+
+
+def test_index_filters_by_postings_and_ranges():
+    index = _index()
+    rows, page = _page(index, status=["call complete"], lead_source=["IG DM"], min_score=10, max_score=40)
+    assert page.total == len(rows)
+    assert rows and all(
+        r["status"] == "Call Complete" and r["lead_source"] == "IG DM" and 10 <= r["score"] <= 40 for r in rows
+    )
+    assert [r["score"] for r in rows] == sorted((r["score"] for r in rows), reverse=True)
+
+    rows, _ = _page(index, date_field="payment_date", date_from="2026-01-05", date_to="2026-01-06")
+    assert {r["payment_date"] for r in rows} == {"2026-01-05", "2026-01-06"}
+
+    rows, _ = _page(index, q="client 42")
+    assert [r["id"] for r in rows] == ["c042"]
+
+
+def test_cursor_pages_cover_everything_once():
+    index = _index()
+    seen, cursor = [], ""
+    while True:
+        rows, page = _page(index, sort="amount", limit=25, cursor=cursor)
+        seen += [r["id"] for r in rows]
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+    assert seen == [f"c{i:03d}" for i in range(60)]
+
+
+def test_cursor_is_stable_when_rows_are_inserted():
+    from api.query import ClientIndex
+    index = _index()
+    first, page = _page(index, sort="-amount", limit=10)
+    # A new top row arrives before the next page is requested
+    rows = index.rows + [{**index.rows[0], "id": "new", "amount": 10_000}]
+    second, _ = _page(ClientIndex(rows), sort="-amount", limit=10, cursor=page.next_cursor)
+    assert second[0]["amount"] == first[-1]["amount"] - 10
+    assert "new" not in {r["id"] for r in second}
+
+
+def test_field_selection_and_bad_queries():
+    from api.query import QueryError
+    index = _index()
+    rows, _ = _page(index, fields=["id", "score"], limit=2)
+    assert rows == [{"id": "c059", "score": 59}, {"id": "c058", "score": 58}]
+    for bad in ({"sort": "phone"}, {"fields": ["nope"]}, {"limit": 0}, {"cursor": "!!", "limit": 5}):
+        with pytest.raises(QueryError):
+            _page(index, **bad)
+
+
+def test_bad_cursors_are_rejected():
+    import base64
+    import json
+
+    from api.query import QueryError
+
+    def crafted(*parts):
+        return base64.urlsafe_b64encode(json.dumps(list(parts)).encode()).decode().rstrip("=")
+
+    index = _index()
+    _, page = _page(index, sort="amount", limit=5)
+    for sort in ("name", "-amount"):  # Reused under another sort
+        with pytest.raises(QueryError, match="sort"):
+            _page(index, sort=sort, limit=5, cursor=page.next_cursor)
+    for cursor in (crafted("score", "abc", "x", 0), crafted("score", [5], "x", 0), crafted("score", 5, "x", "0"),
+                   crafted("score", True, "x", 0), crafted("abc", "x", 0)):
+        with pytest.raises(QueryError, match="Invalid cursor"):
+            _page(index, sort="score", limit=5, cursor=cursor)
+
+
+def test_total_counts_filter_and_text_matches():
+    index = _index()
+    rows, page = _page(index, status=["Call Complete"], q="client 1", limit=2)
+    expected = [r for r in index.rows if r["status"] == "Call Complete" and "client 1" in r["name"].lower()]
+    assert page.total == len(expected) and len(rows) == 2
+
+
+def test_clients_endpoint_paginates_with_headers(client):
+    full = client.get("/api/clients").json()
+    resp = client.get("/api/clients?limit=5&fields=id,name,status")
+    assert resp.status_code == 200
+    assert len(resp.json()) == 5
+    assert set(resp.json()[0]) == {"id", "name", "status"}
+    assert resp.headers["x-total-count"] == str(len(full))
+    nxt = client.get(f"/api/clients?limit=5&fields=id,name,status&cursor={resp.headers['x-next-cursor']}")
+    assert [r["id"] for r in resp.json() + nxt.json()] == [r["id"] for r in
+                                                           client.get("/api/clients?limit=10&fields=id").json()]
+
+    again = client.get("/api/clients?limit=5&fields=id,name,status", headers={"If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+    assert client.get("/api/clients?sort=phone").status_code == 400
+    assert client.get(f"/api/clients?limit=5&sort=-amount&cursor={resp.headers['x-next-cursor']}").status_code == 400
+
+
+def test_scored_clients_filter_by_tier(client):
+    resp = client.get("/api/clients/scored?tier=Hot,Warm&sort=-score")
+    assert resp.status_code == 200
+    assert all(r["tier"] in ("Hot", "Warm") for r in resp.json())
+
+
+def test_next_leads_come_from_the_ranking(client):
+    scored = client.get("/api/clients/scored?sort=-score").json()
+    resp = client.get("/api/leads/next?limit=3")
+    assert resp.status_code == 200
+    leads = resp.json()
+    assert [lead["score"] for lead in leads] == [s["score"] for s in scored[:3]]
+    assert [lead["rank"] for lead in leads] == [1, 2, 3]
+
+    warm = client.get("/api/leads/next?tier=Warm,Cool").json()
+    assert warm and all(lead["tier"] in ("Warm", "Cool") for lead in warm)
+    assert warm[0]["rank"] == sum(s["tier"] == "Hot" for s in scored) + 1
+    again = client.get("/api/leads/next?limit=3", headers={"If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+    assert client.get("/api/leads/next?tier=Lukewarm").status_code == 400
+    assert client.get("/api/leads/next?limit=0").status_code == 422
+
+
+def test_snapshot_ranking_is_not_moved_by_later_syncs(sample_merged):
+    from app.utils.lead_ranking import LeadRanking
+    from app.utils.lead_scorer import score_all_clients
+    scored = score_all_clients(sample_merged)
+    shared = LeadRanking(scored)
+    snap = snapshot.build_snapshot([], sample_merged, scored=scored, channel_metrics={}, ranking=shared)
+    shared.sync(list(reversed([{**s, "score": {**s["score"], "total": 100 - s["score"]["total"]}} for s in scored])))
+    assert snap.ranking.top() == scored
+
+
+def test_search_ranks_clients_by_intake_text(client):
+    resp = client.get("/api/clients/search?q=rebrand launch")
+    assert resp.status_code == 200
+    results = resp.json()
+    assert results and resp.headers["x-total-count"] == str(len(results))
+    assert [r["relevance"] for r in results] == sorted((r["relevance"] for r in results), reverse=True)
+    assert all(set(r["matched"]) <= {"rebrand", "launch"} and r["matched"] for r in results)
+
+    one = client.get("/api/clients/search?q=rebrand launch&limit=1")
+    assert len(one.json()) == 1 and one.headers["x-total-count"] == str(len(results)) != "1"
+    both = client.get("/api/clients/search?q=rebrand launch&all=true&limit=2").json()
+    assert 1 <= len(both) <= 2 and all(r["matched"] == ["rebrand", "launch"] for r in both)
+    again = client.get("/api/clients/search?q=rebrand launch", headers={"If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+    assert client.get("/api/clients/search?q=zzzz").json() == []
+    assert client.get("/api/clients/search").status_code == 422
+
+
+def test_pipeline_limits_embedded_clients(client):
+    full = client.get("/api/pipeline").json()
+    limited = client.get("/api/pipeline?clients_limit=1&fields=id,name").json()
+    assert [s["count"] for s in limited] == [s["count"] for s in full]
+    assert all(len(s["clients"]) <= 1 for s in limited)
+    assert all(set(c) == {"id", "name"} for s in limited for c in s["clients"])
+
+
+# ── Change stream ────────────────────────────────────────────────────
+
+
+def _snap(payments):
+    return snapshot.build_snapshot(payments, [], scored=[], channel_metrics={}, now=datetime(2026, 3, 1))
+
+
+def test_feed_diffs_snapshots_into_typed_events(sample_payments):
+    from api.stream import ChangeFeed
+    sample_payments = [{**p, "stripe_session_id": f"cs_{i}"} for i, p in enumerate(sample_payments)]
+    feed = ChangeFeed()
+    assert feed.observe(_snap(sample_payments)) == []
+    start = feed.last_id
+
+    moved = [{**p, "status": "Call Complete"} if p["email"] == "paid@example.com" else p for p in sample_payments]
+    events = feed.observe(_snap(moved))
+    types = [e.type for e in events]
+    assert types == ["client.upserted", "client.stage_changed", "kpi.delta"]
+    assert events[1].data["from"] == "Paid - Needs Booking" and events[1].data["to"] == "Call Complete"
+    assert "active_pipeline" in events[2].data["changes"]
+    assert events[0].encode().startswith(f"id: {events[0].id}\nevent: client.upserted\ndata: ".encode())
+
+    assert [e.id for e in feed.since(start)] == [e.id for e in events]
+    assert feed.since(events[-1].id) == []
+    assert feed.since("otherboot-1") is None
+
+
+def test_feed_resync_after_eviction(sample_payments):
+    from api.stream import ChangeFeed
+    sample_payments = [{**p, "stripe_session_id": f"cs_{i}"} for i, p in enumerate(sample_payments)]
+    feed = ChangeFeed(buffer_size=2)
+    feed.observe(_snap(sample_payments))
+    start = feed.last_id
+    feed.observe(_snap(sample_payments[:2]))  # four removals
+    assert feed.since(start) is None
+    assert len(feed.since(feed.last_id)) == 0
+
+
+def test_event_stream_resumes_and_pushes_changes(services, sample_payments):
+    import anyio
+    from api import stream
+
+    services.notion = FakeNotion(sample_payments)
+    feed = stream.ChangeFeed()
+
+    class Request:
+        async def is_disconnected(self):
+            return False
+
+    async def main():
+        with patch.object(stream, "feed", feed), patch.object(stream, "STREAM_POLL_SECONDS", 0.01):
+            body = stream.event_stream(Request(), "stale-3")
+            assert await body.__anext__() == b"retry: 3000\n\n"
+            assert b"event: resync" in await body.__anext__()
+
+            # Baseline, then a webhook-driven refetch with a new client
+            while feed._snapshot is None:
+                await anyio.sleep(0.01)
+            services.notion.payments = sample_payments + [{**sample_payments[2], "email": "new@example.com",
+                                                           "stripe_session_id": "cs_new"}]
+            cache.invalidate(PAYMENTS_KEY)
+            with anyio.fail_after(2):
+                chunk = await body.__anext__()
+            assert b"event: client.upserted" in chunk and b"cs_new" in chunk
+            await body.aclose()
+        assert stream._producer().subscribers == 0
+
+    anyio.run(main)
+
+
+# ── Metrics ──────────────────────────────────────────────────────────
+
+
+def test_metrics_endpoint_reports_requests_by_route(client):
+    client.get("/api/kpis")
+    client.get("/api/clients?limit=2")
+    client.get("/api/nope")
+    text = client.get("/api/metrics").text
+    assert "# TYPE api_request_duration_seconds histogram" in text
+    assert 'api_requests_total{method="GET",route="/api/kpis",status="200"}' in text
+    assert 'route="/api/clients"' in text and "limit=2" not in text
+    assert 'api_requests_total{method="GET",route="unmatched",status="404"}' in text
+    assert 'api_request_duration_seconds_bucket{method="GET",route="/api/kpis",le="+Inf"}' in text
+    assert "api_snapshot_build_seconds_count" in text
+    assert 'cache_lookups_total{tier="cold",result="hit"}' in text
+    assert 'cache_stale_lookups_total{tier="cold"}' in text and 'result="stale"' not in text
+    assert "api_requests_in_flight" in text
+
+
+def test_registry_histogram_and_label_escaping():
+    from api.metrics import Registry
+    registry = Registry()
+    h = registry.histogram("x_seconds", "X.", ("path",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5):
+        h.observe(v, path='a"b')
+    text = registry.exposition()
+    assert 'x_seconds_bucket{path="a\\"b",le="0.1"} 1' in text
+    assert 'x_seconds_bucket{path="a\\"b",le="1"} 2' in text
+    assert 'x_seconds_bucket{path="a\\"b",le="+Inf"} 3' in text
+    assert 'x_seconds_sum{path="a\\"b"} 5.55' in text
+
+
+def test_upstream_calls_are_counted_by_outcome():
+    from types import SimpleNamespace
+
+    from api.metrics import UPSTREAM_CALLS
+    from app.services import upstream
+
+    def counted(outcome):
+        labels = {"service": "Test", "method": "ping", "outcome": outcome}
+        return sum(v for _, l, v in UPSTREAM_CALLS.samples() if l == labels)
+
+    ok, error = counted("ok"), counted("error")
+    upstream.call("Test", "ping", lambda: SimpleNamespace(status_code=200))
+    upstream.call("Test", "ping", lambda: SimpleNamespace(status_code=503))
+    with pytest.raises(ZeroDivisionError):
+        upstream.call("Test", "ping", lambda: 1 / 0)
+    assert (counted("ok") - ok, counted("error") - error) == (1, 2)
@@ -1,8 +1,10 @@
 """Tests for the cache manager."""
 
+import threading
 import time
+from unittest.mock import patch
 
-from app.services.cache_manager import CacheManager
+from app.services.cache_manager import CacheManager, _estimate_bytes
 
 
 def test_set_and_get():
@@ -67,3 +69,333 @@ def test_get_with_age_miss():
     data, age = c.get_with_age("missing")
     assert data is None
     assert age == 0
+
+
+def test_metrics_hits_and_misses():
+    c = CacheManager()
+    c.get("key")  # miss
+    c.set("key", "value", tier="hot")
+    c.get("key")  # hit
+    c.get("key")  # hit
+    m = c.metrics()
+    assert m["keys"]["key"]["hits"] == 2
+    assert m["keys"]["key"]["misses"] == 1
+    assert m["keys"]["key"]["tier"] == "hot"
+    assert m["tiers"]["hot"]["hit_ratio"] == round(2 / 3, 4)
+    assert m["totals"]["hits"] == 2
+
+
+def test_metrics_stale_lookup_counts_as_miss():
+    c = CacheManager(hot_ttl=0.05)
+    c.set("key", "value", tier="hot")
+    time.sleep(0.06)
+    assert c.get("key") is None
+    m = c.metrics()["keys"]["key"]
+    assert m["stale"] == 1
+    assert m["misses"] == 1
+
+
+def test_metrics_loader_latency_recorded_between_miss_and_set():
+    c = CacheManager()
+    c.get("slow")
+    time.sleep(0.02)
+    c.set("slow", [1, 2, 3])
+    m = c.metrics()["keys"]["slow"]
+    assert m["loads"] == 1
+    assert m["load_avg_ms"] >= 20
+    assert sum(m["load_buckets"]) == 1
+
+
+def test_metrics_set_without_miss_is_not_a_load():
+    c = CacheManager()
+    c.set("key", "value")
+    assert c.metrics()["keys"]["key"]["loads"] == 0
+
+
+def test_metrics_bytes_tracked_and_dropped_on_invalidate():
+    c = CacheManager()
+    c.set("big", list(range(1000)))
+    assert c.metrics()["keys"]["big"]["bytes"] > 1000
+    c.invalidate("big")
+    assert c.metrics()["keys"]["big"]["bytes"] == 0
+    assert c.metrics()["totals"]["bytes"] == 0
+
+
+def test_metrics_bytes_measured_lazily_and_after_upsert():
+    c = CacheManager()
+    with patch("app.services.cache_manager._estimate_bytes", wraps=_estimate_bytes) as estimate:
+        c.set("rows", [{"id": "a", "v": "x"}])
+        assert estimate.call_count == 0
+        before = c.metrics()["keys"]["rows"]["bytes"]
+        c.metrics()
+        assert estimate.call_count == 1
+        c.upsert("rows", {"id": "b", "v": "y" * 500})
+        assert estimate.call_count == 1
+        assert c.metrics()["keys"]["rows"]["bytes"] > before + 500
+
+
+def test_metrics_bytes_walk_unpicklable_objects():
+    class Holder:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.rows = [f"{i:0100d}" for i in range(100)]
+
+    c = CacheManager()
+    c.set("holder", Holder())
+    assert c.metrics()["keys"]["holder"]["bytes"] > 100 * 100
+
+
+def test_reset_metrics_keeps_entries():
+    c = CacheManager()
+    c.set("key", "value")
+    c.get("key")
+    c.reset_metrics()
+    assert c.metrics()["keys"]["key"]["hits"] == 0
+    assert c.get("key") == "value"
+
+
+def test_invalidating_source_drops_derived():
+    c = CacheManager()
+    c.set("notion_payments", [1, 2])
+    c.set("scores", [10, 20], tier="cold", depends_on=["notion_payments"])
+    c.invalidate("notion_payments")
+    assert c.get("scores") is None
+
+
+def test_setting_source_drops_derived():
+    c = CacheManager()
+    c.set("notion_payments", [1, 2])
+    c.set("scores", [10, 20], tier="cold", depends_on=["notion_payments"])
+    c.set("notion_payments", [1, 2, 3])
+    assert c.get("scores") is None
+    assert c.get("notion_payments") == [1, 2, 3]
+
+
+def test_dependency_invalidation_is_transitive_and_precise():
+    c = CacheManager()
+    c.set("notion_payments", [1])
+    c.set("notion_intakes", [2])
+    c.set("scores", "s", tier="cold", depends_on=["notion_payments", "notion_intakes"])
+    c.set("segments", "seg", tier="cold", depends_on=["scores"])
+    c.set("ltv", "l", tier="cold", depends_on=["notion_payments"])
+
+    c.invalidate("notion_intakes")
+
+    assert c.get("scores") is None
+    assert c.get("segments") is None
+    assert c.get("ltv") == "l"
+    assert c.get("notion_payments") == [1]
+
+
+def test_invalidate_tier_cascades_to_other_tiers():
+    c = CacheManager()
+    c.set("notion_payments", [1], tier="warm")
+    c.set("scores", "s", tier="cold", depends_on=["notion_payments"])
+    c.set("history", "h", tier="cold")
+    c.invalidate_tier("warm")
+    assert c.get("scores") is None
+    assert c.get("history") == "h"
+
+
+def test_invalidate_tier_matches_tier_not_ttl():
+    c = CacheManager(hot_ttl=300, warm_ttl=300)
+    c.set("h", 1, tier="hot")
+    c.set("w", 2, tier="warm")
+    c.invalidate_tier("hot")
+    assert c.get("h") is None
+    assert c.get("w") == 2
+
+
+def test_get_or_compute_runs_once_per_source_change():
+    c = CacheManager()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    c.set("src", "v1")
+    assert c.get_or_compute("derived", compute, depends_on=["src"]) == 1
+    assert c.get_or_compute("derived", compute, depends_on=["src"]) == 1
+    c.set("src", "v2")
+    assert c.get_or_compute("derived", compute, depends_on=["src"]) == 2
+    assert len(calls) == 2
+
+
+def test_reset_derived_key_replaces_dependency_edges():
+    c = CacheManager()
+    c.set("a", 1)
+    c.set("b", 2)
+    c.set("d", "x", depends_on=["a"])
+    c.set("d", "y", depends_on=["b"])
+    assert c.dependents("a") == set()
+    c.invalidate("a")
+    assert c.get("d") == "y"
+
+
+def test_journal_events_all_applied_in_order(tmp_path):
+    from app.services.event_journal import EventJournal, JournalReader
+
+    journal = EventJournal(str(tmp_path / "events.jsonl"))
+    c = CacheManager(journal=JournalReader(journal.path))
+    c.set("hot_key", 1, tier="hot")
+    c.set("warm_key", 2, tier="warm")
+    c.set("cold_key", 3, tier="cold")
+
+    # Two events in one burst: neither may be dropped
+    journal.append("intake_submitted")
+    journal.append("payment_completed")
+    journal.close()
+
+    c._last_signal_check = 0
+    c._check_webhook_signal()
+    assert c.get("hot_key") is None
+    assert c.get("warm_key") is None
+    assert c.get("cold_key") == 3
+
+
+def test_upsert_replaces_and_appends_copy_on_write():
+    c = CacheManager()
+    original = [{"id": "a", "v": 1}, {"id": "b", "v": 2}]
+    c.set("rows", original)
+    assert c.upsert("rows", {"id": "b", "v": 3})
+    assert c.upsert("rows", {"id": "c", "v": 4})
+    assert c.get("rows") == [{"id": "a", "v": 1}, {"id": "b", "v": 3}, {"id": "c", "v": 4}]
+    assert original[1]["v"] == 2
+
+
+def test_upsert_missing_key_returns_false():
+    c = CacheManager()
+    assert c.upsert("rows", {"id": "a"}) is False
+
+
+def test_upsert_invalidates_dependents_and_keeps_timestamp():
+    c = CacheManager()
+    c.set("rows", [{"id": "a"}])
+    c.set("derived", "x", depends_on=["rows"])
+    ts = c._store["rows"].timestamp
+    c.upsert("rows", {"id": "b"})
+    assert c.get("derived") is None
+    assert c._store["rows"].timestamp == ts
+
+
+def test_find_uses_case_insensitive_index_first_match():
+    c = CacheManager()
+    c.set("rows", [{"id": "1", "email": "A@x.com"}, {"id": "2", "email": "a@x.com"}])
+    assert c.find("rows", "email", "a@X.com")["id"] == "1"
+    assert c.find("rows", "email", "missing") is None
+
+
+def test_find_after_upsert_moving_duplicate_value():
+    c = CacheManager()
+    c.set("rows", [{"id": "1", "email": "a@x.com"}, {"id": "2", "email": "a@x.com"}])
+    assert c.find("rows", "email", "a@x.com")["id"] == "1"
+    c.upsert("rows", {"id": "1", "email": "z@x.com"})
+    assert c.find("rows", "email", "a@x.com")["id"] == "2"
+    assert c.find("rows", "email", "z@x.com")["id"] == "1"
+
+
+def test_event_handler_failure_falls_back_to_invalidation():
+    c = CacheManager()
+    c.set("warm_key", 1, tier="warm")
+
+    def boom(event, data):
+        raise RuntimeError("down")
+
+    c.register_event_handler("broken", boom)
+    c.apply_event("intake_submitted", {"record": {"id": "x"}})
+    assert c.get("warm_key") is None
+
+
+def test_stripe_event_only_drops_stripe_keys():
+    c = CacheManager()
+    c.set("stripe_sessions_30", [1], tier="hot")
+    c.set("stripe_refunds_30", [2], tier="warm")
+    c.set("calendly_events", [3], tier="hot")
+    c.set("notion_payments", [4], tier="warm")
+    c.apply_event("stripe.charge.refunded", {"type": "charge.refunded"})
+    assert c.get("stripe_sessions_30") is None
+    assert c.get("stripe_refunds_30") is None
+    assert c.get("calendly_events") == [3]
+    assert c.get("notion_payments") == [4]
+
+
+def test_provider_events_drop_their_own_source():
+    c = CacheManager()
+    c.set("calendly_events_30_0", [1], tier="hot")
+    c.set("manychat_new_subs_30", [2], tier="warm")
+    c.apply_event("calendly.invitee.canceled", {"type": "invitee.canceled"})
+    assert c.get("calendly_events_30_0") is None
+    assert c.get("manychat_new_subs_30") == [2]
+
+
+def test_concurrent_writers_and_metrics_readers():
+    c = CacheManager()
+    c.set("rows", [{"id": 0}])
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(300):
+                c.set(f"k{n}-{i}", [i], depends_on=("rows",))
+                c.upsert("rows", {"id": i % 20, "n": n})
+                if i % 7 == 0:
+                    c.invalidate(f"k{n}-{i - 1}")
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        try:
+            for _ in range(200):
+                c.metrics()
+                c.stats()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)] + [threading.Thread(target=read)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(c.get("rows")) == 20
+
+
+def test_peek_never_polls_or_reads_disk(tmp_path):
+    from app.services.disk_cache import DiskCache
+
+    c = CacheManager(disk=DiskCache(str(tmp_path)))
+    c.set("cold", [1], tier="cold")
+    c.set("warm", [2])
+    with patch.object(c, "_check_webhook_signal") as poll:
+        assert c.peek("warm") == [2]
+        c._store.pop("cold")
+        assert c.peek("cold") is None  # Only on disk
+    poll.assert_not_called()
+    assert c.metrics()["keys"]["warm"]["hits"] == 1
+    assert c.metrics()["keys"]["cold"]["misses"] == 0
+
+
+def test_get_or_compute_drops_results_of_sources_changed_meanwhile():
+    cache = CacheManager()
+    cache.set("src", [{"id": 1, "v": "old"}])
+    computing, upserted = threading.Event(), threading.Event()
+
+    def compute():
+        data = [r["v"] for r in cache.get("src")]
+        computing.set()
+        upserted.wait(5)
+        return data
+
+    def upsert():
+        computing.wait(5)
+        cache.upsert("src", {"id": 1, "v": "new"})
+        upserted.set()
+
+    writer = threading.Thread(target=upsert)
+    writer.start()
+    assert cache.get_or_compute("derived", compute, depends_on=("src",)) == ["old"]
+    writer.join()
+    assert cache.get("derived") is None
+    assert cache.get_or_compute("derived", lambda: [r["v"] for r in cache.get("src")], depends_on=("src",)) == ["new"]
+    assert cache.get("derived") == ["new"]
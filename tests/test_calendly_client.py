@@ -330,3 +330,141 @@ def test_parse_event_no_uri():
     event["uri"] = ""
     result = CalendlyService._parse_event(event)
     assert result["uuid"] == ""
+
+
+# ── Signed webhooks + local store ────────────────────────────────────
+
+WEBHOOK_SECRET = "calendly-signing-key"
+
+
+@pytest.fixture
+def store(tmp_path):
+    from app.services.local_store import LocalStore
+    return LocalStore(str(tmp_path / "store.db"))
+
+
+def _iso(dt) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.000000Z")
+
+
+def _signed(body: dict, secret: str = WEBHOOK_SECRET, ts: int | None = None) -> tuple[bytes, str]:
+    import hashlib
+    import hmac
+    import json
+    import time
+
+    payload = json.dumps(body).encode()
+    ts = int(time.time()) if ts is None else ts
+    sig = hmac.new(secret.encode(), f"{ts}.".encode() + payload, hashlib.sha256).hexdigest()
+    return payload, f"t={ts},v1={sig}"
+
+
+def _invitee_event(event: str, uuid: str, created, start, email: str = "jo@example.com") -> dict:
+    return {
+        "event": event,
+        "created_at": _iso(created),
+        "payload": {
+            "uri": f"https://api.calendly.com/scheduled_events/{uuid}/invitees/inv-{uuid}",
+            "email": email,
+            "name": "Jo",
+            "created_at": _iso(created),
+            "rescheduled": False,
+            "scheduled_event": {
+                "uri": f"https://api.calendly.com/scheduled_events/{uuid}",
+                "name": "Creative Hotline Call",
+                "start_time": _iso(start),
+                "end_time": _iso(start),
+                "status": "canceled" if event == "invitee.canceled" else "active",
+            },
+        },
+    }
+
+
+def test_ingest_webhook_records_booking_and_cancel(store):
+    from datetime import datetime, timedelta
+
+    from app.services.calendly_client import ingest_webhook
+
+    now = datetime.utcnow()
+    created = _invitee_event("invitee.created", "e1", now - timedelta(days=3), now - timedelta(days=1))
+    assert ingest_webhook(*_signed(created), WEBHOOK_SECRET, store) == "invitee.created"
+    [booking] = store.calendly_bookings()
+    assert booking["status"] == "active"
+    assert booking["email"] == "jo@example.com"
+
+    canceled = _invitee_event("invitee.canceled", "e1", now, now - timedelta(days=1))
+    canceled["payload"]["created_at"] = _iso(now)
+    ingest_webhook(*_signed(canceled), WEBHOOK_SECRET, store)
+    [booking] = store.calendly_bookings()
+    assert booking["status"] == "canceled"
+    # Original booking time survives the cancellation
+    assert booking["created_at"] == _iso(now - timedelta(days=3))
+    assert booking["canceled_at"] == _iso(now)
+
+
+@pytest.mark.parametrize("secret,ts_offset", [("wrong-key", 0), (WEBHOOK_SECRET, -600)])
+def test_ingest_webhook_rejects_bad_or_stale_signature(store, secret, ts_offset):
+    import time
+    from datetime import datetime
+
+    from app.services.calendly_client import ingest_webhook
+
+    body = _invitee_event("invitee.created", "e1", datetime.utcnow(), datetime.utcnow())
+    payload, header = _signed(body, secret=secret, ts=int(time.time()) + ts_offset)
+    with pytest.raises(ValueError):
+        ingest_webhook(payload, header, WEBHOOK_SECRET, store)
+    with pytest.raises(ValueError):
+        ingest_webhook(payload, "garbage", WEBHOOK_SECRET, store)
+    assert store.calendly_bookings() == []
+
+
+@patch("app.services.calendly_client.requests.get")
+def test_metrics_come_from_local_bookings(mock_get, store):
+    from datetime import datetime, timedelta
+
+    from app.services.calendly_client import ingest_webhook
+
+    now = datetime.utcnow()
+    for uuid, booked_days_ago, start_days_ago in (("e1", 5, 3), ("e2", 4, 2), ("e3", 3, 1)):
+        body = _invitee_event("invitee.created", uuid, now - timedelta(days=booked_days_ago),
+                              now - timedelta(days=start_days_ago))
+        ingest_webhook(*_signed(body), WEBHOOK_SECRET, store)
+    ingest_webhook(*_signed(_invitee_event("invitee.canceled", "e3", now, now - timedelta(days=1))),
+                   WEBHOOK_SECRET, store)
+    store.mark_synced("calendly_bookings", days=90)
+
+    service = CalendlyService(
+        api_key="test-key", org_uri="https://api.calendly.com/organizations/org-123",
+        webhook_secret=WEBHOOK_SECRET, store=store,
+    )
+    rate = service.get_booking_rate(days=30)
+    assert rate == {"booked": 2, "cancelled": 1, "total": 3, "rate": pytest.approx(200 / 3)}
+    assert service.get_avg_time_to_book() == pytest.approx(48.0, abs=0.1)
+    mock_get.assert_not_called()
+
+
+@patch("app.services.calendly_client.requests.get")
+def test_stale_store_is_reconciled_with_pagination(mock_get, store):
+    first = _ok_response({
+        "collection": [_make_event(uuid="a1", start_time="2099-01-01T10:00:00Z")],
+        "pagination": {"next_page": "https://api.calendly.com/scheduled_events?page_token=x"},
+    })
+    second = _ok_response({"collection": [_make_event(uuid="a2", start_time="2099-01-02T10:00:00Z")],
+                           "pagination": {"next_page": None}})
+    canceled = _ok_response({"collection": [_make_event(uuid="c1", status="canceled",
+                                                        start_time="2099-01-03T10:00:00Z")]})
+    mock_get.side_effect = [first, second, canceled]
+
+    service = CalendlyService(
+        api_key="test-key", org_uri="https://api.calendly.com/organizations/org-123",
+        webhook_secret=WEBHOOK_SECRET, store=store,
+    )
+    assert service.reconcile(days=30) is True
+    assert mock_get.call_count == 3
+    assert [b["status"] for b in store.calendly_bookings()] == ["active", "active", "canceled"]
+    assert store.is_synced("calendly_bookings", 60, days=30)
+
+
+def test_without_webhook_secret_store_is_ignored(store):
+    service = CalendlyService(api_key="test-key", store=store)
+    assert service.reconcile() is False
@@ -0,0 +1,205 @@
+"""Tests for ClientFrame and the analytics functions' frame paths."""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.utils import attribution, ltv_calculator, referral_tracker, revenue_modeler, sequence_tracker
+from app.utils.client_frame import ClientFrame
+from app.utils.demo_data import get_demo_payments
+from app.utils.lead_scorer import score_all_clients
+from app.utils.segment_builder import build_all_segments
+
+STATUSES = ["Lead - Laylo", "Paid - Needs Booking", "Booked - Needs Intake", "Intake Complete",
+            "Ready for Call", "Call Complete", "Follow-Up Sent"]
+SOURCES = ["IG DM", "Referral", "referral", "Website", "Meta Ad", "", None]
+PRODUCTS = ["First Call", "Single Call", "3-Session Clarity Sprint", ""]
+
+
+def _mixed_payments(n=400, seed=3):
+    """Repeat buyers, unpaid leads, missing emails/dates and mixed timestamp formats."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    payments = []
+    for i in range(n):
+        created = now - timedelta(days=rng.uniform(0, 200))
+        paid = rng.random() < 0.6
+        fmt = rng.choice(["%Y-%m-%dT%H:%M:%S.000Z", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"])
+        paid_fmt = rng.choice(["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S.000-05:00", "%Y-%m-%dT%H:%M:%S+0200"])
+        payments.append({
+            "email": rng.choice([f"client{rng.randint(0, n // 3)}@test.com", " Upper@Test.com", ""]),
+            "client_name": f"Client {i}",
+            "status": rng.choice(STATUSES),
+            "lead_source": rng.choice(SOURCES),
+            "product_purchased": rng.choice(PRODUCTS) if paid else "",
+            "payment_amount": rng.choice([499, 699, 1495]) if paid else 0,
+            "payment_date": (created + timedelta(days=rng.randint(0, 9))).strftime(paid_fmt)
+            if paid and rng.random() < 0.8 else "",
+            "created": created.strftime(fmt) if rng.random() < 0.95 else "",
+            "call_date": (now - timedelta(days=rng.randint(-5, 30))).strftime("%Y-%m-%d")
+            if rng.random() < 0.5 else "",
+            "nurture_email_sent": rng.random() < 0.5,
+            "booking_reminder_sent": rng.random() < 0.5,
+            "intake_reminder_sent": rng.random() < 0.5,
+        })
+    return payments
+
+
+@pytest.fixture(params=["demo", "mixed"])
+def payments(request):
+    return get_demo_payments() if request.param == "demo" else _mixed_payments()
+
+
+def _plain(value):
+    """Comparable form: dataclasses as dicts, floats rounded."""
+    if hasattr(value, "as_dict"):
+        return _plain(value.as_dict())
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+
+def _same(fn, payments, *args, **kwargs):
+    expected = fn(payments, *args, **kwargs)
+    actual = fn(ClientFrame(payments), *args, **kwargs)
+    assert _plain(actual) == _plain(expected)
+
+
+# ── Columns ───────────────────────────────────────────────────────
+
+
+def test_columns_are_parsed_once():
+    frame = ClientFrame([
+        {"email": " A@X.com ", "payment_amount": None, "status": "Call Complete",
+         "created": "2026-02-01T10:30:00.000Z", "payment_date": "2026-02-03"},
+        {"email": "", "payment_amount": 499, "lead_source": "IG DM",
+         "created": "2026-02-05T08:00:00+00:00", "call_date": "not a date"},
+    ])
+    assert frame.email.tolist() == ["a@x.com", ""]
+    assert frame.email_code.tolist() == [0, -1]
+    assert frame.amount.tolist() == [0.0, 499.0]
+    assert frame.created[0] == np.datetime64("2026-02-01T10:30:00")
+    assert frame.created[1] == np.datetime64("2026-02-05T08:00:00")
+    assert frame.purchased[0] == np.datetime64("2026-02-03")
+    assert np.isnat(frame.call_date).all()
+    assert frame.is_status("Call Complete").tolist() == [True, False]
+    assert frame.labels("lead_source").tolist() == ["Unknown", "IG DM"]
+
+
+def test_email_groups_order_and_dates():
+    frame = ClientFrame([
+        {"email": "b@x.com", "payment_amount": 100, "payment_date": "2026-03-01"},
+        {"email": "a@x.com", "payment_amount": 200, "payment_date": "2026-02-01"},
+        {"email": "B@x.com", "payment_amount": 300, "payment_date": "2026-01-01"},
+        {"email": "a@x.com", "payment_amount": 0, "payment_date": "2026-01-01"},
+    ])
+    groups = frame.email_groups
+    assert groups.emails.tolist() == ["b@x.com", "a@x.com"]
+    assert groups.counts.tolist() == [2, 1]
+    assert groups.totals.tolist() == [400.0, 200.0]
+    assert groups.first_seen.tolist() == [0, 1]
+    assert groups.entry.tolist() == [2, 1]
+    assert groups.second.tolist() == [0, -1]
+
+
+def test_with_intakes_shares_columns(sample_payments, hot_intake):
+    frame = ClientFrame(sample_payments)
+    merged = frame.with_intakes([hot_intake] + [None] * (len(frame) - 1))
+    assert merged.amount is frame.amount
+    assert merged.merged[0]["intake"] is hot_intake
+    assert frame.intakes == [None] * len(frame)
+    with pytest.raises(ValueError):
+        frame.with_intakes([])
+
+
+def test_empty_frame():
+    frame = ClientFrame([])
+    assert len(frame.email_groups) == 0
+    assert ltv_calculator.calculate_ltv(frame) == []
+    assert attribution.attribute_conversions(frame) == {}
+    assert ltv_calculator.upsell_rate(frame)["total_clients"] == 0
+
+
+# ── Equivalence with the list-of-dicts API ────────────────────────
+
+
+@pytest.mark.parametrize("fn", [
+    ltv_calculator.calculate_ltv,
+    ltv_calculator.ltv_by_source,
+    ltv_calculator.ltv_by_entry_product,
+    ltv_calculator.ltv_by_cohort,
+    ltv_calculator.upsell_rate,
+    ltv_calculator.expansion_revenue,
+    ltv_calculator.retention_by_cohort,
+])
+def test_ltv_functions_match(fn, payments):
+    _same(fn, payments)
+
+
+@pytest.mark.parametrize("period", ["monthly", "quarterly"])
+def test_cohorts_match_by_period(payments, period):
+    _same(ltv_calculator.ltv_by_cohort, payments, period)
+    _same(ltv_calculator.retention_by_cohort, payments, period)
+
+
+def test_payback_period_matches(payments):
+    _same(ltv_calculator.payback_period, payments, {"IG DM": 900, "Referral": 100, "Website": 5000})
+
+
+@pytest.mark.parametrize("model", attribution.ATTRIBUTION_MODELS)
+def test_attribution_matches(payments, model):
+    expected = attribution.attribute_conversions(payments, model)
+    actual = attribution.attribute_conversions(ClientFrame(payments), model)
+    assert list(actual) == list(expected)
+    for channel, metrics in expected.items():
+        # Time decay weights depend on the moment they're computed
+        assert actual[channel].as_dict() == pytest.approx(metrics.as_dict(), rel=1e-4)
+
+
+def test_attribution_helpers_match(payments):
+    _same(attribution.channel_roi, payments, {"IG DM": 500})
+    _same(attribution.get_revenue_by_source_over_time, payments)
+
+
+@pytest.mark.parametrize("fn", [
+    referral_tracker.identify_referral_clients,
+    referral_tracker.referral_conversion_rate,
+    referral_tracker.referral_revenue_share,
+    referral_tracker.top_referrers,
+])
+def test_referral_functions_match(fn, payments):
+    _same(fn, payments)
+
+
+def test_segments_match(payments):
+    scores = [{"payment": p, "score": {"total": 75 if i % 4 == 0 else 30}} for i, p in enumerate(payments)]
+    expected = build_all_segments(payments, scores=scores)
+    actual = build_all_segments(ClientFrame(payments), scores=scores)
+    assert [s.name for s in actual] == [s.name for s in expected]
+    for a, e in zip(actual, expected):
+        assert a.clients == e.clients, a.name
+        assert a.estimated_value == pytest.approx(e.estimated_value)
+
+
+@pytest.mark.parametrize("fn", [
+    sequence_tracker.build_sequence_map,
+    sequence_tracker.sequence_completion_rates,
+    sequence_tracker.sequence_conversion_rates,
+])
+def test_sequence_functions_match(fn, payments):
+    _same(fn, payments)
+
+
+def test_product_ladder_matches(payments):
+    _same(revenue_modeler.product_ladder, payments, {"VIP Day": 2500})
+
+
+def test_score_all_clients_accepts_frame(sample_merged):
+    frame = ClientFrame.from_merged(sample_merged)
+    assert _plain(score_all_clients(frame)) == _plain(score_all_clients(sample_merged))
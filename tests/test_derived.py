@@ -0,0 +1,138 @@
+"""Tests for cached derived analytics."""
+
+import numpy as np
+
+from app.services import derived
+from app.services.cache_manager import CacheManager
+from app.utils.lead_model import FEATURES, fit
+
+
+class _FakeNotion:
+    """Notion-like service that caches its sources like NotionService does."""
+
+    def __init__(self, cache, payments, intakes):
+        self._cache = cache
+        self.payments = payments
+        self.intakes = intakes
+        self.fetches = 0
+
+    def get_all_payments(self):
+        cached = self._cache.get(derived.PAYMENTS_KEY)
+        if cached is not None:
+            return cached
+        self.fetches += 1
+        self._cache.set(derived.PAYMENTS_KEY, self.payments, tier="warm")
+        return self.payments
+
+    def get_all_intakes(self):
+        cached = self._cache.get(derived.INTAKES_KEY)
+        if cached is not None:
+            return cached
+        self._cache.set(derived.INTAKES_KEY, self.intakes, tier="warm")
+        return self.intakes
+
+    def get_merged_clients(self):
+        by_email = {i["email"]: i for i in self.get_all_intakes()}
+        return [{"payment": p, "intake": by_email.get(p["email"])} for p in self.get_all_payments()]
+
+
+def _setup(monkeypatch, sample_payments, hot_intake):
+    cache = CacheManager()
+    monkeypatch.setattr(derived, "cache", cache)
+    return cache, _FakeNotion(cache, sample_payments, [hot_intake])
+
+
+def test_scored_clients_cached_until_source_changes(monkeypatch, sample_payments, hot_intake):
+    cache, notion = _setup(monkeypatch, sample_payments, hot_intake)
+    calls = []
+    real = derived.score_all_clients
+    monkeypatch.setattr(derived, "score_all_clients", lambda m, **kw: calls.append(1) or real(m, **kw))
+
+    first = derived.scored_clients(notion)
+    second = derived.scored_clients(notion)
+    assert first is second
+    assert len(calls) == 1
+
+    cache.invalidate(derived.PAYMENTS_KEY)
+    derived.scored_clients(notion)
+    assert len(calls) == 2
+
+
+def test_segments_follow_scores(monkeypatch, sample_payments, hot_intake):
+    cache, notion = _setup(monkeypatch, sample_payments, hot_intake)
+    derived.client_segments(notion)
+    seg_key = derived.derived_key(notion, "segments")
+    assert cache.get(seg_key) is not None
+
+    cache.invalidate(derived.INTAKES_KEY)
+    assert cache.get(seg_key) is None
+
+
+def test_ltv_not_dropped_by_intake_change(monkeypatch, sample_payments, hot_intake):
+    cache, notion = _setup(monkeypatch, sample_payments, hot_intake)
+    ltv = derived.client_ltv(notion)
+    cache.invalidate(derived.INTAKES_KEY)
+    assert derived.client_ltv(notion) is ltv
+
+
+def test_attribution_comparison_has_all_models(monkeypatch, sample_payments, hot_intake):
+    _, notion = _setup(monkeypatch, sample_payments, hot_intake)
+    models = derived.attribution_comparison(notion)
+    assert set(models) == {"first_touch", "last_touch", "linear", "time_decay"}
+
+
+def test_keys_namespaced_by_service_class():
+    class A:
+        pass
+
+    class B:
+        pass
+
+    assert derived.derived_key(A(), "x") != derived.derived_key(B(), "x")
+
+
+def test_score_matrix_follows_scores(monkeypatch, sample_payments, hot_intake):
+    cache, notion = _setup(monkeypatch, sample_payments, hot_intake)
+    matrix = derived.score_matrix(notion)
+    scored = derived.scored_clients(notion)
+    assert matrix.reweight().total.tolist() == [s["score"]["total"] for s in scored]
+
+    cache.invalidate(derived.INTAKES_KEY)
+    assert cache.get(derived.derived_key(notion, "score_matrix")) is None
+
+
+def test_lead_ranking_survives_refreshes(monkeypatch, sample_payments, hot_intake):
+    cache, notion = _setup(monkeypatch, sample_payments, hot_intake)
+    ranking = derived.lead_ranking(notion)
+    assert ranking.top() == derived.scored_clients(notion)
+
+    cache.invalidate(derived.PAYMENTS_KEY)
+    notion.payments = notion.payments[1:]
+    again = derived.lead_ranking(notion)
+    assert again is ranking
+    assert again.top() == derived.scored_clients(notion)
+
+
+def test_search_index_survives_refreshes(monkeypatch, sample_payments, hot_intake):
+    cache, notion = _setup(monkeypatch, sample_payments, hot_intake)
+    index = derived.search_index(notion)
+    assert [h.item["intake"]["id"] for h in index.search("rebrand")] == ["i-hot"]
+
+    cache.invalidate(derived.INTAKES_KEY)
+    notion.intakes = [{**hot_intake, "creative_emergency": "Launching a podcast"}]
+    again = derived.search_index(notion)
+    assert again is index and len(again) == len(derived.scored_clients(notion))
+    assert again.search("rebrand") == [] and again.search("launch")[0].item["intake"]["id"] == "i-hot"
+
+
+def test_learned_scores_follow_scores(monkeypatch, sample_payments, hot_intake):
+    cache, notion = _setup(monkeypatch, sample_payments, hot_intake)
+    scored = derived.scored_clients(notion)
+    X = np.arange(4 * len(FEATURES), dtype=float).reshape(4, -1)
+    model = fit(X, np.array([0, 1, 0, 1]))
+    scores = derived.learned_scores(notion, model)
+    assert len(scores) == len(scored) and ((scores >= 0) & (scores <= 100)).all()
+    assert derived.learned_scores(notion, model) is scores
+
+    cache.invalidate(derived.PAYMENTS_KEY)
+    assert derived.learned_scores(notion, model) is not scores
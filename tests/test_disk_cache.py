@@ -0,0 +1,206 @@
+"""Tests for the on-disk L2 cache tier."""
+
+import os
+import threading
+from unittest.mock import patch
+
+from app.services.cache_manager import CacheManager
+from app.services.disk_cache import DiskCache
+
+
+class _SlowPickle:
+    """Pickles as value, once released."""
+
+    def __init__(self, value):
+        self.value = value
+        self.pickling = threading.Event()
+        self.release = threading.Event()
+
+    def __reduce__(self):
+        self.pickling.set()
+        self.release.wait(5)
+        return str, (self.value,)
+
+
+def test_write_and_read_roundtrip(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    disk.write("key", {"a": [1, 2, 3]}, timestamp=123.0, ttl=60, tier="cold", depends_on=("src",))
+    record = disk.read("key")
+    assert record.data == {"a": [1, 2, 3]}
+    assert record.timestamp == 123.0
+    assert record.ttl == 60
+    assert record.tier == "cold"
+    assert record.depends_on == ("src",)
+    assert disk.timestamp("key") == 123.0
+    assert disk.keys() == ["key"]
+
+
+def test_spilled_entry_size_comes_from_disk(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    c = CacheManager(disk=disk)
+    c.set("big", list(range(1000)), tier="cold")
+    size = disk.size("big")
+    assert size > 1000
+    with patch("app.services.cache_manager._estimate_bytes") as estimate:
+        assert c.metrics()["keys"]["big"]["bytes"] == size
+    estimate.assert_not_called()
+    assert disk.size("nope") is None
+
+
+def test_read_missing_returns_none(tmp_path):
+    assert DiskCache(str(tmp_path)).read("nope") is None
+
+
+def test_corrupt_file_is_dropped(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    disk.write("key", [1], timestamp=1.0, ttl=60, tier="cold")
+    path = disk._path("key")
+    with open(path, "r+b") as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b"\x00\x00")
+    assert disk.read("key") is None
+    assert not os.path.exists(path)
+
+
+def test_unpicklable_data_is_skipped(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    assert disk.write("key", lambda: 1, timestamp=1.0, ttl=60, tier="cold") is False
+    assert disk.keys() == []
+
+
+def test_cold_entries_survive_restart(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    CacheManager(disk=disk).set("history", [1, 2, 3], tier="cold")
+
+    restarted = CacheManager(disk=DiskCache(str(tmp_path)))
+    assert restarted.get("history") == [1, 2, 3]
+    assert restarted.metrics()["keys"]["history"]["disk_hits"] == 1
+
+
+def test_reloaded_entry_keeps_original_timestamp(tmp_path):
+    base = 1_000_000.0
+    with patch("app.services.cache_manager.time") as mock_time:
+        mock_time.time.return_value = base
+        CacheManager(cold_ttl=100, disk=DiskCache(str(tmp_path))).set("k", "v", tier="cold")
+
+        mock_time.time.return_value = base + 50
+        c = CacheManager(cold_ttl=100, disk=DiskCache(str(tmp_path)))
+        data, age = c.get_with_age("k")
+        assert data == "v"
+        assert age == 50
+
+        mock_time.time.return_value = base + 150
+        c = CacheManager(cold_ttl=100, disk=DiskCache(str(tmp_path)))
+        assert c.get("k") is None
+    assert DiskCache(str(tmp_path)).keys() == []
+
+
+def test_fast_warm_entries_stay_in_memory_only(tmp_path):
+    c = CacheManager(disk=DiskCache(str(tmp_path)), spill_min_load_seconds=60)
+    c.set("stripe", [1], tier="hot")
+    assert DiskCache(str(tmp_path)).keys() == []
+
+
+def test_slow_loads_spill_regardless_of_tier(tmp_path):
+    c = CacheManager(disk=DiskCache(str(tmp_path)), spill_min_load_seconds=0)
+    c.get("notion_payments")
+    c.set("notion_payments", [1], tier="warm")
+    assert DiskCache(str(tmp_path)).keys() == ["notion_payments"]
+
+
+def test_invalidate_removes_disk_copy(tmp_path):
+    c = CacheManager(disk=DiskCache(str(tmp_path)))
+    c.set("a", 1, tier="cold")
+    c.set("b", 2, tier="cold")
+    c.invalidate("a")
+    assert DiskCache(str(tmp_path)).keys() == ["b"]
+    c.invalidate_all()
+    assert DiskCache(str(tmp_path)).keys() == []
+
+
+def test_derived_entry_rejected_when_source_is_newer(tmp_path):
+    c = CacheManager(disk=DiskCache(str(tmp_path)), spill_min_load_seconds=0)
+    c.get("src")
+    c.set("src", [1], tier="warm")
+    c.set("derived", "d", tier="cold", depends_on=["src"])
+
+    restarted = CacheManager(disk=DiskCache(str(tmp_path)))
+    assert restarted.get("derived") == "d"
+
+    restarted = CacheManager(disk=DiskCache(str(tmp_path)))
+    restarted.set("src", [1, 2], tier="warm")  # refetched after restart
+    assert restarted.get("derived") is None
+
+
+def test_derived_entry_rejected_without_source(tmp_path):
+    c = CacheManager(disk=DiskCache(str(tmp_path)))
+    c.set("derived", "d", tier="cold", depends_on=["src"])
+    assert CacheManager(disk=DiskCache(str(tmp_path))).get("derived") is None
+
+
+def test_spilling_does_not_hold_the_cache_lock(tmp_path):
+    c = CacheManager(disk=DiskCache(str(tmp_path)))
+    c.set("other", "x", tier="warm")
+    slow = _SlowPickle("old")
+    writer = threading.Thread(target=c.set, args=("history", slow), kwargs={"tier": "cold"})
+    writer.start()
+    assert slow.pickling.wait(5)
+    got = []
+    reader = threading.Thread(target=lambda: got.extend([c.get("other"), c.get("history")]))
+    reader.start()
+    reader.join(1)
+    slow.release.set()
+    writer.join()
+    assert got == ["x", slow]  # Read while the write was still pickling
+    assert CacheManager(disk=DiskCache(str(tmp_path))).get("history") == "old"
+
+
+def test_overtaken_spill_leaves_no_stale_copy(tmp_path):
+    c = CacheManager(disk=DiskCache(str(tmp_path)))
+    slow = _SlowPickle("old")
+    writer = threading.Thread(target=c.set, args=("history", slow), kwargs={"tier": "cold"})
+    writer.start()
+    assert slow.pickling.wait(5)
+    c.set("history", "new", tier="cold")
+    assert CacheManager(disk=DiskCache(str(tmp_path))).get("history") == "new"
+    slow.release.set()
+    writer.join()
+    assert c.get("history") == "new"
+    assert CacheManager(disk=DiskCache(str(tmp_path))).get("history") is None
+
+
+def test_promotion_skips_keys_with_writes_in_flight(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    CacheManager(disk=disk).set("history", "old", tier="cold")
+    c = CacheManager(disk=disk)
+    slow = _SlowPickle("new")
+    writer = threading.Thread(target=c.set, args=("history", slow), kwargs={"tier": "cold"})
+    writer.start()
+    assert slow.pickling.wait(5)
+    c.invalidate("history")
+    assert c.get("history") is None
+    slow.release.set()
+    writer.join()
+    assert c.get("history") is None and disk.read("history") is None
+
+
+def test_lead_ranking_spills_and_reloads(tmp_path):
+    from app.utils.lead_ranking import LeadRanking
+    ranking = LeadRanking([{"payment": {"id": f"c{i}"}, "score": {"total": i}} for i in range(5)])
+    c = CacheManager(disk=DiskCache(str(tmp_path)))
+    with patch("app.services.disk_cache.logger") as log:
+        c.set("lead_ranking", ranking, tier="cold")
+    assert not log.warning.called
+    reloaded = CacheManager(disk=DiskCache(str(tmp_path))).get("lead_ranking")
+    assert reloaded.top() == ranking.top() and reloaded.rank("c4") == 1
+
+
+def test_search_index_spills_and_reloads(tmp_path):
+    from app.utils.search_index import SearchIndex
+    index = SearchIndex([{"payment": {"id": "a", "client_name": "Ana"}, "intake": {"brand": "Launchpad"}}])
+    c = CacheManager(disk=DiskCache(str(tmp_path)))
+    with patch("app.services.disk_cache.logger") as log:
+        c.set("search_index", index, tier="cold")
+    assert not log.warning.called
+    reloaded = CacheManager(disk=DiskCache(str(tmp_path))).get("search_index")
+    assert [h.key for h in reloaded.search("launchpad")] == ["a"]
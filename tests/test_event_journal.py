@@ -0,0 +1,208 @@
+"""Tests for the durable webhook event journal."""
+
+import json
+import os
+import threading
+from unittest.mock import patch
+
+from app.services.event_journal import GAP_EVENT, EventJournal, JournalReader, iter_events, replay, _last_seq
+
+
+def test_append_assigns_increasing_seq(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"))
+    assert j.append("payment_completed", {"a": 1}) == 1
+    assert j.append("intake_submitted") == 2
+    j.close()
+    events = list(iter_events(j.path))
+    assert [e["seq"] for e in events] == [1, 2]
+    assert events[0]["data"] == {"a": 1}
+
+
+def test_seq_survives_reopen(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    j = EventJournal(path)
+    j.append("a")
+    j.append("b")
+    j.close()
+    j = EventJournal(path)
+    assert j.append("c") == 3
+    j.close()
+
+
+def test_sync_append_waits_for_fsync(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"), fsync_interval=10)
+    seq = j.append("a", sync=True)
+    assert j._synced_seq >= seq
+    j.close()
+
+
+def test_concurrent_appends_are_all_recorded(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"))
+
+    def burst():
+        for _ in range(50):
+            j.append("payment_completed")
+
+    threads = [threading.Thread(target=burst) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    j.close()
+    seqs = [e["seq"] for e in iter_events(j.path)]
+    assert seqs == list(range(1, 401))
+
+
+def test_reader_starts_at_end_by_default(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"))
+    j.append("old")
+    reader = JournalReader(j.path)
+    assert reader.poll() == []
+    j.append("new")
+    assert [e["event"] for e in reader.poll()] == ["new"]
+    assert reader.poll() == []
+    j.close()
+
+
+def test_reader_from_start(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"))
+    j.append("a")
+    j.append("b")
+    assert [e["event"] for e in JournalReader(j.path, from_start=True).poll()] == ["a", "b"]
+    j.close()
+
+
+def test_reader_resumes_from_saved_offset(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"))
+    offset = str(tmp_path / "offset.json")
+    reader = JournalReader(j.path, offset_file=offset, from_start=True)
+    j.append("a")
+    assert len(reader.poll()) == 1
+    j.append("b")
+    j.append("c")
+
+    resumed = JournalReader(j.path, offset_file=offset)
+    assert [e["event"] for e in resumed.poll()] == ["b", "c"]
+    assert json.load(open(offset))["seq"] == 3
+    j.close()
+
+
+def test_reader_skips_partial_line(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(b'{"seq":1,"ts":0,"event":"a","data":{}}\n{"seq":2,"ts"')
+    reader = JournalReader(str(path), from_start=True)
+    assert [e["seq"] for e in reader.poll()] == [1]
+    with open(path, "ab") as f:
+        f.write(b':0,"event":"b","data":{}}\n')
+    assert [e["seq"] for e in reader.poll()] == [2]
+
+
+def test_reader_limit(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"))
+    for _ in range(5):
+        j.append("a")
+    reader = JournalReader(j.path, from_start=True)
+    assert len(reader.poll(limit=2)) == 2
+    assert len(reader.poll()) == 3
+    j.close()
+
+
+def test_replay_from_seq(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"))
+    for name in ("a", "b", "c"):
+        j.append(name)
+    j.close()
+    seen = []
+    last = replay(lambda r: seen.append(r["event"]), path=j.path, from_seq=1)
+    assert seen == ["b", "c"]
+    assert last == 3
+
+
+def test_last_seq_missing_and_garbage(tmp_path):
+    assert _last_seq(str(tmp_path / "missing.jsonl")) == 0
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(b'{"seq":7,"ts":0,"event":"a","data":{}}\nnot json\n')
+    assert _last_seq(str(path)) == 7
+
+
+def test_append_does_not_wait_for_fsync(tmp_path):
+    j = EventJournal(str(tmp_path / "events.jsonl"), fsync_interval=0.001)
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_fsync(fd):
+        entered.set()
+        release.wait(5)
+
+    with patch("app.services.event_journal.os.fsync", slow_fsync):
+        j.append("a")
+        assert entered.wait(5)
+        done = threading.Event()
+        threading.Thread(target=lambda: (j.append("b"), done.set())).start()
+        assert done.wait(1)
+        release.set()
+    j.close()
+    assert [e["event"] for e in iter_events(j.path)] == ["a", "b"]
+
+
+def test_rotation_keeps_seq_and_replay(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    j = EventJournal(path, max_bytes=100, keep_segments=10)
+    for i in range(10):
+        j.append("a", {"i": i})
+    assert len(j.segments()) == 5  # Two events per segment
+    assert os.path.getsize(path) == 0
+    j.close()
+    assert [e["seq"] for e in iter_events(path)] == list(range(1, 11))
+    assert [e["seq"] for e in iter_events(path, from_seq=7)] == [8, 9, 10]
+
+    os.remove(path)
+    j = EventJournal(path)
+    assert j.append("b") == 11  # seq continues from the newest segment
+    j.close()
+
+
+def test_reader_follows_rotation(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    offset = str(tmp_path / "offset.json")
+    j = EventJournal(path, max_bytes=100, keep_segments=10)
+    reader = JournalReader(path, offset_file=offset, from_start=True)
+    j.append("a")
+    assert [e["seq"] for e in reader.poll()] == [1]
+    for _ in range(9):
+        j.append("b")
+    assert j.segments()
+    assert [e["seq"] for e in reader.poll(limit=4)] == [2, 3, 4, 5]
+    assert [e["seq"] for e in JournalReader(path, offset_file=offset).poll()] == [6, 7, 8, 9, 10]
+    j.close()
+
+
+def test_segments_pruned_past_consumers_and_cap(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    offset = str(tmp_path / "offset.json")
+    reader = JournalReader(path, offset_file=offset, from_start=True)
+    j = EventJournal(path, max_bytes=1, keep_segments=3, consumers=(offset,))
+    for _ in range(3):
+        j.append("a")
+    assert len(j.segments()) == 3  # Unread, so kept
+    reader.poll()
+    j.append("a")
+    assert [os.path.basename(s) for s in j.segments()] == ["events.jsonl.000000000004"]
+    for _ in range(10):
+        j.append("a")
+    assert len(j.segments()) == 3  # The cap applies to unread segments too
+    j.close()
+
+
+def test_reader_reports_events_rotated_away(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    j = EventJournal(path, max_bytes=1, keep_segments=1)
+    reader = JournalReader(path, from_start=True)
+    j.append("a")
+    assert [e["seq"] for e in reader.poll()] == [1]
+    for _ in range(5):
+        j.append("b")
+    events = reader.poll()
+    assert events[0]["event"] == GAP_EVENT
+    assert events[0]["data"] == {"after": 1, "resumed": 6}
+    assert [e["seq"] for e in events[1:]] == [6]
+    j.close()
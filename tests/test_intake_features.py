@@ -0,0 +1,84 @@
+"""Tests for the shared intake text feature store."""
+
+import pytest
+
+from app.utils.intake_features import IntakeFeatureStore, IntakeFeatures, phrase_group
+
+INTAKE = {
+    "id": "i1",
+    "role": "Founder & CEO",
+    "brand": "Acme",
+    "creative_emergency": "We need a Rebrand before our launch",
+    "what_tried": "",
+    "deadline": "ASAP",
+}
+
+
+def test_features_are_computed_once_per_intake():
+    store = IntakeFeatureStore()
+    first = store.get(INTAKE)
+    assert store.get(dict(INTAKE)) is first
+    assert (store.hits, store.misses) == (1, 1)
+
+    calls = []
+    def compute(features):
+        calls.append(1)
+        return features.words("creative_emergency")
+    assert first.derived("n", compute) == first.derived("n", compute) == 7
+    assert len(calls) == 1
+
+
+def test_editing_an_intake_replaces_its_entry():
+    store = IntakeFeatureStore()
+    old = store.get(INTAKE)
+    new = store.get({**INTAKE, "deadline": "next month"})
+    assert new is not old and len(store) == 1
+    assert store.get({**INTAKE, "deadline": "next month", "payment": 500}) is new  # Only text fields key it
+
+    store.get({**INTAKE, "id": ""})
+    store.get({**INTAKE, "id": ""})
+    assert len(store) == 2 and store.hits == 2
+
+
+def test_oldest_entries_are_evicted():
+    store = IntakeFeatureStore(max_entries=3)
+    for i in range(5):
+        store.get({"id": f"i{i}", "role": str(i)})
+    assert len(store) == 3
+    store.get({"id": "i4", "role": "4"})
+    store.get({"id": "i0", "role": "0"})
+    assert (store.hits, store.misses) == (1, 6)
+    store.clear()
+    assert len(store) == 0 and store.hits == store.misses == 0
+
+
+def test_unhashable_values_are_computed_uncached():
+    store = IntakeFeatureStore()
+    features = store.get({"role": ["not", "text"], "brand": "Acme"})
+    assert isinstance(features, IntakeFeatures) and len(store) == 0
+
+
+def test_text_and_hits():
+    features = IntakeFeatureStore().get(INTAKE)
+    group = phrase_group(["launch", "rebrand", "logo"], ("creative_emergency", "what_tried"))
+    assert features.text(group) == "we need a rebrand before our launch "
+    assert features.hits(group) == ("launch", "rebrand")
+    skipping = phrase_group([], ("what_tried", "brand"), skip_empty=True)
+    assert features.text(skipping) == "acme"
+    assert features.words("role") == 3 and features.words("what_tried") == 0
+    assert features.raw("constraints") == ""
+
+
+def test_groups_only_read_text_fields():
+    with pytest.raises(ValueError, match="website"):
+        phrase_group(["x"], ("role", "website"))
+
+
+def test_hits_span_field_joins():
+    group = phrase_group(["rebrand launch", "launch", "acme founder"], ("creative_emergency", "what_tried", "role"))
+    features = IntakeFeatureStore().get({"creative_emergency": "Big REBRAND", "what_tried": "", "role": "Launch"})
+    assert features.text(group) == "big rebrand  launch"
+    assert features.hits(group) == ("launch",)
+    features = IntakeFeatureStore().get({"creative_emergency": "a rebrand", "what_tried": "launch", "role": ""})
+    assert features.hits(group) == ("rebrand launch", "launch")
+    assert features.found(group) >= {"rebrand launch", "launch"}
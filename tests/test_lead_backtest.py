@@ -0,0 +1,87 @@
+"""Tests for the lead-scoring backtest."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.utils.client_frame import ClientFrame
+from app.utils.lead_backtest import TIERS, History, backtest, backtest_dates, snapshot_as_of
+from app.utils.lead_scorer import score_client
+
+START = datetime(2026, 1, 1)
+
+
+def _client(created, payment_date="", call_date="", intake_created=None, status="Lead - Laylo", amount=0,
+            email="a@test.com"):
+    payment = {
+        "email": email, "status": status, "payment_amount": amount, "lead_source": "IG DM",
+        "product_purchased": "Single Call" if amount else "", "created": created,
+        "payment_date": payment_date, "call_date": call_date,
+    }
+    intake = {"email": email, "role": "Founder", "created": intake_created} if intake_created else None
+    return {"payment": payment, "intake": intake}
+
+
+def test_snapshot_reconstructs_past_state():
+    client = _client("2026-01-01", "2026-01-05", "2026-01-12", "2026-01-08", status="Follow-Up Sent", amount=699)
+    assert snapshot_as_of(client["payment"], client["intake"], datetime(2025, 12, 31)) is None
+
+    payment, intake = snapshot_as_of(client["payment"], client["intake"], datetime(2026, 1, 2))
+    assert (payment["status"], payment["payment_amount"], payment["payment_date"], intake) == \
+        ("Lead - Laylo", 0, "", None)
+
+    payment, intake = snapshot_as_of(client["payment"], client["intake"], datetime(2026, 1, 6))
+    assert (payment["status"], payment["payment_amount"], payment["call_date"]) == ("Paid - Needs Booking", 699, "")
+
+    payment, intake = snapshot_as_of(client["payment"], client["intake"], datetime(2026, 1, 9))
+    assert payment["status"] == "Intake Complete" and intake is client["intake"]
+
+    payment, _ = snapshot_as_of(client["payment"], client["intake"], datetime(2026, 1, 13))
+    assert payment["status"] == "Follow-Up Sent"
+
+
+def test_snapshot_status_never_passes_current():
+    client = _client("2026-01-01", "2026-01-02", "2026-01-03", status="Paid - Needs Booking", amount=699)
+    payment, _ = snapshot_as_of(client["payment"], None, datetime(2026, 1, 10))
+    assert payment["status"] == "Paid - Needs Booking"
+
+
+def test_sweep_matches_scalar_scores(random_merged):
+    merged = random_merged(300)
+    dates = [START + timedelta(days=d, hours=h) for d in range(0, 70, 7) for h in (0, 13)]
+    checked = 0
+    for chunk in History.build(ClientFrame.from_merged(merged)).sweep(dates, 30):
+        for j, as_of in enumerate(dates[chunk.rows]):
+            for i, client in enumerate(merged):
+                snapshot = snapshot_as_of(client["payment"], client["intake"], as_of)
+                assert (snapshot is not None) == chunk.exists[j, i]
+                if snapshot is not None:
+                    score = score_client(*snapshot, as_of=as_of)
+                    assert (score["total"], score["tier"], score["recency"]["multiplier"]) == \
+                        (chunk.total[j, i], TIERS[chunk.tier[j, i]], chunk.multiplier[j, i]), (as_of, i)
+                    checked += 1
+    assert checked > 1000
+
+
+def test_conversions_within_horizon():
+    merged = [
+        _client("2026-01-01T10:00:00", "2026-01-20", amount=699, email="buyer@test.com"),
+        _client("2026-01-01T10:00:00", email="never@test.com"),
+        # Repeat purchase by the first client's email, months later
+        _client("2026-04-01", "2026-04-01", amount=1495, email="BUYER@test.com "),
+    ]
+    result = backtest(merged, [datetime(2026, 1, 2), datetime(2026, 1, 25), datetime(2026, 3, 20)], horizon_days=30)
+    assert result.scored.sum(axis=1).tolist() == [2, 2, 2]
+    assert result.converted.sum(axis=1).tolist() == [1, 0, 1]
+    assert sum(t.scored for t in result.tiers) == 6
+    assert result.base_rate == pytest.approx(2 / 6)
+    assert result.as_dict()["dates"] == 3
+
+
+def test_backtest_dates_span_history():
+    merged = [_client("2026-01-01T10:00:00"), _client("2026-02-01")]
+    dates = backtest_dates(merged, horizon_days=30, end=datetime(2026, 3, 3, 12))
+    assert dates[0] == datetime(2026, 1, 2)
+    assert dates[-1] == datetime(2026, 2, 1)
+    assert backtest_dates([], end=datetime(2026, 3, 3)) == []
+    assert backtest([]).as_dict()["dates"] == 0
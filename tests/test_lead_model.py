@@ -0,0 +1,87 @@
+"""Tests for the learned lead-scoring model."""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.utils.client_frame import ClientFrame
+from app.utils.lead_model import FEATURES, MODEL_VERSION, LeadModel, auc, fit, train, training_set
+from app.utils.lead_scorer import score_batch
+
+END = datetime(2026, 3, 1)
+
+
+def _dates(days=60):
+    return [END - timedelta(days=d) for d in range(days, 0, -1)]
+
+
+def test_fit_recovers_signal():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(20_000, 3)) * [1.0, 5.0, 0.1] + [0.0, 10.0, 1.0]
+    z = 2.0 * (X[:, 0]) - 0.4 * (X[:, 1] - 10)
+    y = rng.random(len(X)) < 1 / (1 + np.exp(-z))
+    model = fit(X, y, l2=0.1)
+    assert auc(model.probability(X), y) > 0.85
+    assert model.weights[0] > 1.5 and model.weights[1] < -1.5 and abs(model.weights[2]) < 0.1
+    assert model.positive_rate == pytest.approx(y.mean(), abs=1e-6)
+
+
+def test_auc_ranks_and_ties():
+    assert auc(np.array([0.1, 0.4, 0.35, 0.8]), np.array([0, 0, 1, 1])) == 0.75
+    assert auc(np.array([1, 1, 1]), np.array([0, 1, 0])) == 0.5
+    assert auc(np.array([1, 2]), np.array([1, 1])) == 0.5
+
+
+def test_training_set_matches_sweep_labels(random_merged):
+    merged = random_merged(300)
+    data = training_set(merged, _dates(), horizon_days=30)
+    assert data.X.shape == (len(data.y), len(FEATURES))
+    assert not np.isnan(data.X).any()
+    assert 0 < data.y.mean() < 1
+    capped = data.X[:, FEATURES.index("capped")].astype(bool)
+    assert (data.heuristic[capped] <= 40).all()
+
+    sampled = training_set(merged, _dates(), horizon_days=30, max_samples=500)
+    assert 300 < len(sampled.y) < 700
+
+
+def test_train_beats_chance_and_reports_holdout(random_merged):
+    model = train(random_merged(600), _dates(90), horizon_days=14)
+    assert model.samples > 0 and model.trained_at
+    assert set(model.metrics) == {"auc", "heuristic_auc", "holdout_samples"}
+    assert model.metrics["auc"] > 0.6
+
+
+def test_predict_is_one_pass_over_the_frame(random_merged):
+    merged = random_merged(400)
+    model = train(merged, _dates(), horizon_days=14)
+    frame = ClientFrame.from_merged(merged)
+    batch = score_batch(frame, as_of=END)
+    p = model.predict(batch)
+    assert p.shape == (len(frame),) and ((p > 0) & (p < 1)).all()
+    assert model.score(frame, as_of=END).tolist() == np.round(p * 100).astype(int).tolist()
+
+
+def test_save_load_roundtrip(tmp_path, random_merged):
+    model = train(random_merged(200), _dates(), horizon_days=14)
+    path = str(tmp_path / "nested" / "model.json")
+    model.save(path)
+    loaded = LeadModel.load(path)
+    assert loaded == model
+    X = np.random.default_rng(0).normal(size=(5, len(FEATURES)))
+    assert loaded.probability(X).tolist() == model.probability(X).tolist()
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / "model.json"
+    assert LeadModel.load(str(path)) is None
+    model = fit(np.zeros((4, len(FEATURES))), np.array([0, 1, 0, 1]))
+    data = {**model.__dict__, "version": MODEL_VERSION + 1}
+    path.write_text(json.dumps(data))
+    assert LeadModel.load(str(path)) is None
+    path.write_text(json.dumps({**data, "version": MODEL_VERSION, "features": ["engagement"]}))
+    assert LeadModel.load(str(path)) is None
+    path.write_text("{not json")
+    assert LeadModel.load(str(path)) is None
@@ -0,0 +1,101 @@
+"""Tests for the incrementally maintained lead ranking."""
+
+import pickle
+import random
+
+from app.utils.demo_data import get_demo_merged_clients
+from app.utils.lead_ranking import LeadRanking, client_key
+from app.utils.lead_scorer import TIERS, score_all_clients
+
+
+def _items(n=300, seed=5):
+    rng = random.Random(seed)
+    return [{"payment": {"id": f"c{i}"}, "score": {"total": rng.randint(0, 100)}} for i in range(n)]
+
+
+def _sorted(items):
+    return sorted(items, key=lambda item: item["score"]["total"], reverse=True)
+
+
+def test_built_from_scored_keeps_its_order():
+    scored = score_all_clients(get_demo_merged_clients())
+    ranking = LeadRanking(scored)
+    assert ranking.top() == scored
+    assert [ranking.rank(client_key(s["payment"])) for s in scored] == list(range(1, len(scored) + 1))
+
+
+def test_updates_match_a_full_sort():
+    items = _items()
+    ranking = LeadRanking(_sorted(items))
+    rng = random.Random(9)
+    for _ in range(500):
+        item = rng.choice(items)
+        item["score"] = {"total": rng.randint(0, 100)}
+        ranking.update(item["payment"]["id"], item["score"]["total"], item)
+    totals = [item["score"]["total"] for item in ranking.top()]
+    assert totals == sorted(totals, reverse=True)
+    assert sorted(totals) == sorted(item["score"]["total"] for item in items)
+    for position, item in enumerate(ranking.top(), 1):
+        assert ranking.rank(item["payment"]["id"]) == position
+
+
+def test_top_k_tiers_and_ranges():
+    items = _sorted(_items())
+    ranking = LeadRanking(items)
+    assert ranking.top(5) == items[:5]
+    hot_and_cold = ranking.top(tiers=["Hot", "Cold"])
+    assert hot_and_cold == [i for i in items if i["score"]["total"] >= 70 or i["score"]["total"] < 20]
+    assert ranking.between(40, 69, k=3) == [i for i in items if 40 <= i["score"]["total"] <= 69][:3]
+    counts = ranking.tier_counts()
+    assert list(counts) == list(TIERS) and sum(counts.values()) == len(items)
+    assert counts["Hot"] == sum(i["score"]["total"] >= 70 for i in items)
+
+
+def test_ties_rank_by_arrival():
+    ranking = LeadRanking()
+    for key in "abc":
+        ranking.update(key, 50, {"key": key})
+    ranking.update("a", 60)
+    ranking.update("a", 50)
+    assert [i["key"] for i in ranking.top()] == ["a", "b", "c"]
+    assert ranking.item("a") == {"key": "a"}
+
+
+def test_sync_moves_only_changed_clients():
+    items = _sorted(_items(50))
+    ranking = LeadRanking(items)
+    assert ranking.sync(items) == 0
+
+    changed = [dict(i) for i in items]
+    changed[3] = {**changed[3], "score": {"total": 100 - changed[3]["score"]["total"] + 1}}
+    changed.append({"payment": {"id": "new"}, "score": {"total": 101}})
+    removed = changed.pop(0)["payment"]["id"]
+    assert ranking.sync(_sorted(changed)) == 3
+    assert removed not in ranking and ranking.rank("new") == 1 and ranking.score("new") == 100
+    assert len(ranking) == 50
+
+
+def test_remove_and_missing_keys():
+    ranking = LeadRanking(_items(10))
+    assert ranking.remove("c3") and not ranking.remove("c3")
+    assert ranking.rank("c3") is None and ranking.score("c3") is None
+    assert len(ranking.top()) == 9
+
+
+def test_copy_is_detached():
+    items = _sorted(_items(50))
+    ranking = LeadRanking(items)
+    frozen = ranking.copy()
+    ranking.update("c0", 0)
+    ranking.update("late", 100)
+    assert frozen.top() == items and "late" not in frozen
+    frozen.remove("c1")
+    assert "c1" in ranking and ranking.rank("late") == 1
+
+
+def test_pickles_without_its_lock():
+    items = _sorted(_items(50))
+    ranking = pickle.loads(pickle.dumps(LeadRanking(items)))
+    assert ranking.top() == items
+    ranking.update("late", 100)
+    assert ranking.rank("late") == 1
@@ -0,0 +1,164 @@
+"""Tests for batch and incremental lead scoring: both must match score_client()."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.utils import lead_scorer
+from app.utils.client_frame import ClientFrame
+from app.utils.demo_data import get_demo_merged_clients
+from app.utils.lead_scorer import (
+    CATEGORY_MAX,
+    ScoreMatrix,
+    ScoreMemo,
+    score_all_clients,
+    score_batch,
+    score_client,
+)
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)  # The random_merged fixture's dates count back from here
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture(autouse=True)
+def frozen_now(monkeypatch):
+    # score_client calls datetime.now() more than once; pin it so both paths agree
+    monkeypatch.setattr(lead_scorer, "datetime", _FrozenDatetime)
+
+
+@pytest.fixture(params=["demo", "random"])
+def merged(request, random_merged):
+    return get_demo_merged_clients() if request.param == "demo" else random_merged()
+
+
+def test_batch_matches_scalar_breakdowns(merged):
+    batch = score_batch(ClientFrame.from_merged(merged))
+    for i, client in enumerate(merged):
+        assert batch.breakdown(i) == score_client(client["payment"], client.get("intake")), i
+
+
+def test_batch_totals_and_tiers(merged):
+    batch = score_batch(ClientFrame.from_merged(merged))
+    expected = [score_client(c["payment"], c.get("intake")) for c in merged]
+    assert batch.total.tolist() == [s["total"] for s in expected]
+    assert batch.tier.tolist() == [s["tier"] for s in expected]
+
+
+def test_score_all_clients_same_order(merged):
+    from_list = score_all_clients(merged)
+    from_frame = score_all_clients(ClientFrame.from_merged(merged))
+    assert [s["score"] for s in from_frame] == [s["score"] for s in from_list]
+    assert [s["payment"] for s in from_frame] == [s["payment"] for s in from_list]
+
+
+def test_explicit_as_of_drives_recency():
+    payment = {"created": "2026-02-27T12:00:00.000Z", "payment_amount": 0, "status": "Intake Complete"}
+    frame = ClientFrame([payment])
+    assert score_batch(frame, as_of=NOW).multiplier.tolist() == [1.0]
+    assert score_batch(frame, as_of=NOW + timedelta(days=40)).multiplier.tolist() == [0.7]
+
+
+def test_empty_batch():
+    batch = score_batch(ClientFrame([]))
+    assert batch.total.tolist() == []
+    assert score_all_clients(ClientFrame([])) == []
+
+
+# ── Incremental re-scoring ────────────────────────────────────────
+
+# The generated dates sit exactly on half-day boundaries at NOW, where the
+# memo conservatively refreshes every time
+LATER = NOW + timedelta(minutes=1)
+
+
+def _assert_fresh(scored, merged, now):
+    expected = score_all_clients(merged, as_of=now)
+    assert [s["score"] for s in scored] == [s["score"] for s in expected]
+    assert [s["payment"] for s in scored] == [s["payment"] for s in expected]
+
+
+def test_memo_rescores_only_changed_clients(random_merged):
+    merged = random_merged(600)
+    memo = ScoreMemo()
+    _assert_fresh(score_all_clients(merged, memo=memo, as_of=LATER), merged, LATER)
+    assert memo.rescored == len(memo)
+
+    _assert_fresh(score_all_clients(merged, memo=memo, as_of=LATER), merged, LATER)
+    assert (memo.rescored, memo.refreshed) == (0, 0)
+
+    # Refetched records are new dicts; only content changes count
+    merged = [{"payment": dict(c["payment"]), "intake": c["intake"] and dict(c["intake"])} for c in merged]
+    merged[5]["payment"]["status"] = "Ready for Call"
+    merged[9]["payment"]["notes"] = "not a scored field"
+    merged.append({"payment": {"email": "new@test.com", "created": "2026-02-28", "payment_amount": 499},
+                   "intake": None})
+    del merged[0]
+    _assert_fresh(score_all_clients(merged, memo=memo, as_of=LATER), merged, LATER)
+    assert memo.rescored == 2
+
+
+@pytest.mark.parametrize("later", [
+    timedelta(minutes=5), timedelta(hours=13), timedelta(days=1), timedelta(days=8), timedelta(days=40),
+    -timedelta(days=2),
+])
+def test_memo_refreshes_time_terms(later, random_merged):
+    merged = random_merged(600)
+    memo = ScoreMemo()
+    score_all_clients(merged, memo=memo, as_of=LATER)
+    _assert_fresh(score_all_clients(merged, memo=memo, as_of=LATER + later), merged, LATER + later)
+    assert memo.rescored == 0
+
+
+def test_memo_steady_state_does_no_work(random_merged):
+    merged = random_merged(600)
+    memo = ScoreMemo()
+    score_all_clients(merged, memo=memo, as_of=LATER)
+    score_all_clients(merged, memo=memo, as_of=LATER + timedelta(minutes=5))
+    assert (memo.rescored, memo.refreshed) == (0, 0)
+
+
+def test_memo_batch_scores_many_changes(random_merged):
+    merged = random_merged(800)
+    memo = ScoreMemo()
+    _assert_fresh(score_all_clients(ClientFrame.from_merged(merged), memo=memo, as_of=LATER), merged, LATER)
+    assert memo.rescored > 256
+
+
+# ── What-if reweighting ───────────────────────────────────────────
+
+
+def test_default_weights_reproduce_scores(merged):
+    scored = score_all_clients(merged)
+    reweighted = ScoreMatrix.from_scored(scored).reweight()
+    assert reweighted.total.tolist() == [s["score"]["total"] for s in scored]
+    assert reweighted.tier.tolist() == [s["score"]["tier"] for s in scored]
+    assert reweighted.order.tolist() == list(range(len(scored)))
+
+
+def test_reweight_matches_rescoring_by_hand(random_merged):
+    scored = score_all_clients(random_merged(500))
+    weights = {"engagement": 10, "urgency": 45, "source": 0}
+    reweighted = ScoreMatrix.from_scored(scored).reweight(weights, thresholds=(60, 35, 10))
+
+    points = {**CATEGORY_MAX, **weights}
+    for i, item in enumerate(scored):
+        s = item["score"]
+        base = sum(s[c]["score"] * points[c] / CATEGORY_MAX[c] for c in CATEGORY_MAX) + s["frequency"]["bonus"]
+        total = min(base, 40) if s["negative"]["capped"] else base * s["recency"]["multiplier"]
+        expected = max(0, min(100, round(total)))
+        assert reweighted.total[i] == expected, i
+        assert reweighted.tier[i] == ("Hot" if expected >= 60 else "Warm" if expected >= 35
+                                      else "Cool" if expected >= 10 else "Cold")
+    totals = reweighted.total[reweighted.order]
+    assert (totals[:-1] >= totals[1:]).all()
+    assert sum(reweighted.tier_counts().values()) == len(scored)
+
+
+def test_empty_score_matrix():
+    reweighted = ScoreMatrix.from_scored([]).reweight()
+    assert reweighted.total.tolist() == [] and reweighted.tier_counts()["Hot"] == 0
@@ -130,3 +130,13 @@ def test_cold_lead_still_scores():
     result = score_client(payment, None)
     assert result["total"] >= 0
     assert result["source"]["score"] > 0
+
+
+def test_as_of_makes_scores_reproducible():
+    payment = {**_payment(), "created": "2026-01-10T09:00:00", "payment_date": "2026-01-10T09:00:00"}
+    as_of = datetime(2026, 1, 20, 9, 0)
+    result = score_client(payment, _intake(), as_of=as_of)
+    assert result == score_client(payment, _intake(), as_of=as_of)
+    assert result["negative"]["reason"] == ""
+    later = score_client(payment, _intake(), as_of=as_of + timedelta(days=5))
+    assert later["negative"]["reason"] == "Paid but stalled 14d+"
@@ -0,0 +1,108 @@
+"""Tests for the SQLite local store."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.services.local_store import LocalStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalStore(str(tmp_path / "store.db"))
+
+
+def _session(session_id, created, amount=499.0, status="complete"):
+    return {
+        "id": session_id, "email": "a@example.com", "name": "A", "amount": amount,
+        "product_name": "First Call", "status": status, "payment_status": "paid",
+        "created": created, "metadata": {"source": "ig"},
+    }
+
+
+def test_sessions_round_trip_and_filter(store):
+    store.upsert_stripe_sessions([
+        _session("cs_2", "2026-02-10T09:00:00"),
+        _session("cs_1", "2026-01-05T09:00:00"),
+        _session("cs_3", "2026-02-11T09:00:00", status="open"),
+    ])
+    assert [s["id"] for s in store.stripe_sessions()] == ["cs_1", "cs_2"]
+    [recent] = store.stripe_sessions(since="2026-02-01")
+    assert recent["id"] == "cs_2"
+    assert recent["metadata"] == {"source": "ig"}
+    assert recent["payment_intent"] == ""
+
+
+def test_upsert_replaces_by_id(store):
+    store.upsert_stripe_sessions([_session("cs_1", "2026-02-10T09:00:00", amount=499.0)])
+    store.upsert_stripe_sessions([_session("cs_1", "2026-02-10T09:00:00", amount=699.0)])
+    [s] = store.stripe_sessions()
+    assert s["amount"] == 699.0
+
+
+def test_refunds_round_trip(store):
+    store.upsert_stripe_refunds([{"id": "re_1", "amount": 499.0, "status": "succeeded", "created": "2026-02-20T10:00:00"}])
+    assert store.stripe_refunds(since="2026-03-01") == []
+    assert store.stripe_refunds()[0]["amount"] == 499.0
+
+
+def test_sync_state_tracks_age_and_window(store):
+    assert not store.is_synced("stripe_sessions", 3600, days=30)
+    with patch("app.services.local_store.time.time", return_value=1000.0):
+        store.mark_synced("stripe_sessions", days=90)
+    with patch("app.services.local_store.time.time", return_value=1000.0 + 60):
+        assert store.is_synced("stripe_sessions", 3600, days=30)
+        assert not store.is_synced("stripe_sessions", 3600, days=180)
+    with patch("app.services.local_store.time.time", return_value=1000.0 + 7200):
+        assert not store.is_synced("stripe_sessions", 3600, days=30)
+
+
+def test_concurrent_writers(store):
+    def write(n):
+        store.upsert_stripe_sessions([_session(f"cs_{n}_{i}", "2026-02-10T09:00:00") for i in range(20)])
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store.stripe_sessions()) == 160
+
+
+def test_reopen_keeps_data(tmp_path):
+    path = str(tmp_path / "store.db")
+    LocalStore(path).upsert_stripe_sessions([_session("cs_1", "2026-02-10T09:00:00")])
+    assert len(LocalStore(path).stripe_sessions()) == 1
+
+
+def test_booking_upsert_keeps_webhook_fields(store):
+    store.upsert_calendly_bookings([{
+        "event_uri": "evt/1", "email": "a@example.com", "status": "active",
+        "created_at": "2026-02-01T10:00:00Z", "start_time": "2026-02-03T10:00:00Z",
+    }])
+    # An API sweep knows nothing about the invitee
+    store.upsert_calendly_bookings([{"event_uri": "evt/1", "status": "canceled", "start_time": "2026-02-03T10:00:00Z"}])
+    [b] = store.calendly_bookings()
+    assert b["email"] == "a@example.com"
+    assert b["created_at"] == "2026-02-01T10:00:00Z"
+    assert b["status"] == "canceled"
+    assert store.calendly_bookings(start_after="2026-02-04") == []
+
+
+def test_subscribers_round_trip(store):
+    store.upsert_manychat_subscribers([{"id": "1", "subscribed_at": "2026-02-01T00:00:00+00:00", "tags": ["a"]}])
+    assert store.manychat_subscribers()[0]["tags"] == ["a"]
+    assert store.manychat_subscribers(since="2026-03-01") == []
+
+
+def test_in_memory_store_keeps_its_schema_and_rows():
+    store = LocalStore(":memory:")
+    store.upsert_stripe_refunds([{"id": "re_1", "amount": 499.0, "status": "succeeded", "created": "2026-02-20T10:00:00"}])
+    threads = [threading.Thread(target=store.mark_synced, args=("stripe_refunds", 30)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [r["id"] for r in store.stripe_refunds()] == ["re_1"]
+    assert store.is_synced("stripe_refunds", max_age=60, days=30)
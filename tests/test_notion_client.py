@@ -193,6 +193,21 @@ def test_get_all_payments_cached(svc, mock_notion_client):
     assert mock_notion_client.databases.query.call_count == 1
 
 
+def test_cached_payments_make_no_upstream_call(svc, mock_notion_client):
+    """Only the query that reaches Notion is reported as an upstream call."""
+    from app.services import upstream
+    calls = []
+    observer = lambda *args: calls.append(args[:3])
+    upstream.add_observer(observer)
+    try:
+        mock_notion_client.databases.query.return_value = _mock_query_response([_make_page()])
+        svc.get_all_payments()
+        svc.get_all_payments()
+    finally:
+        upstream.remove_observer(observer)
+    assert calls == [("Notion", "databases.query", "ok")]
+
+
 def test_get_all_payments_api_error(svc, mock_notion_client):
     """API errors should return empty list, not crash."""
     mock_notion_client.databases.query.side_effect = Exception("Network error")
@@ -443,3 +458,90 @@ def test_parse_empty_multi_select(svc, mock_notion_client):
     mock_notion_client.databases.query.return_value = _mock_query_response([page])
     intakes = svc.get_all_intakes()
     assert intakes[0]["desired_outcome"] == []
+
+
+# ── Webhook record upserts ───────────────────────────────────────────
+
+
+def _prime_payments(svc, mock_notion_client, pages):
+    mock_notion_client.databases.query.return_value = _mock_query_response(pages)
+    svc.get_all_payments()
+    mock_notion_client.databases.query.reset_mock()
+
+
+def test_webhook_raw_page_upserts_new_payment(svc, mock_notion_client):
+    _prime_payments(svc, mock_notion_client, [_make_page(page_id="p1")])
+    page = {**_make_page(page_id="p2", email="new@example.com"), "parent": {"database_id": "pay-db-id"}}
+
+    assert svc.apply_webhook_event("payment_completed", {"record": page}) == {"notion_payments"}
+
+    payments = svc.get_all_payments()
+    assert [p["id"] for p in payments] == ["p1", "p2"]
+    assert svc.get_client_by_email("NEW@example.com")["id"] == "p2"
+    mock_notion_client.databases.query.assert_not_called()
+
+
+def test_webhook_flat_record_replaces_existing(svc, mock_notion_client):
+    _prime_payments(svc, mock_notion_client, [_make_page(page_id="p1", status="Paid - Needs Booking")])
+
+    svc.apply_webhook_event("status_changed", {"record": {"id": "p1", "status": "Booked - Needs Intake"}})
+
+    payments = svc.get_all_payments()
+    assert len(payments) == 1
+    assert payments[0]["status"] == "Booked - Needs Intake"
+    assert "call_date" in payments[0]  # blank fields filled in
+
+
+def test_webhook_email_change_updates_index(svc, mock_notion_client):
+    _prime_payments(svc, mock_notion_client, [_make_page(page_id="p1", email="old@example.com")])
+    assert svc.get_client_by_email("old@example.com")["id"] == "p1"
+
+    svc.apply_webhook_event("status_changed", {"record": {"id": "p1", "email": "new@example.com"}})
+
+    assert svc.get_client_by_email("old@example.com") is None
+    assert svc.get_client_by_email("new@example.com")["id"] == "p1"
+
+
+def test_webhook_page_id_fetches_single_page(svc, mock_notion_client):
+    _prime_payments(svc, mock_notion_client, [_make_page(page_id="p1")])
+    mock_notion_client.pages.retrieve.return_value = {
+        **_make_page(page_id="p9", email="fetched@example.com"),
+        "parent": {"database_id": "pay-db-id"},
+    }
+
+    assert svc.apply_webhook_event("payment_completed", {"page_id": "p9"}) == {"notion_payments"}
+
+    mock_notion_client.pages.retrieve.assert_called_once_with(page_id="p9")
+    assert svc.get_client_by_email("fetched@example.com")["id"] == "p9"
+    mock_notion_client.databases.query.assert_not_called()
+
+
+def test_webhook_intake_event_targets_intakes(svc, mock_notion_client):
+    mock_notion_client.databases.query.return_value = _mock_query_response([_make_intake_page(page_id="i1")])
+    svc.get_all_intakes()
+
+    updated = svc.apply_webhook_event("intake_submitted", {"record": {"id": "i2", "email": "x@example.com"}})
+
+    assert updated == {"notion_intakes"}
+    assert [i["id"] for i in svc.get_all_intakes()] == ["i1", "i2"]
+
+
+def test_webhook_without_record_is_ignored(svc, mock_notion_client):
+    _prime_payments(svc, mock_notion_client, [_make_page(page_id="p1")])
+    assert svc.apply_webhook_event("payment_completed", {"event": "payment_completed"}) == set()
+
+
+def test_webhook_upsert_skipped_when_not_cached(svc, mock_notion_client):
+    assert svc.apply_webhook_event("payment_completed", {"record": {"id": "p1"}}) == set()
+
+
+def test_cache_event_with_record_skips_warm_invalidation(svc, mock_notion_client):
+    from app.services.cache_manager import cache
+    _prime_payments(svc, mock_notion_client, [_make_page(page_id="p1")])
+    cache.set("stripe_sessions_90", [], tier="hot")
+
+    cache.apply_event("payment_completed", {"record": {"id": "p2", "email": "b@example.com"}})
+
+    assert cache.get("stripe_sessions_90") is None
+    assert len(svc.get_all_payments()) == 2
+    mock_notion_client.databases.query.assert_not_called()
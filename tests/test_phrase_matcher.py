@@ -0,0 +1,59 @@
+"""Tests for the Aho-Corasick phrase matcher."""
+
+import random
+
+from app.utils.keyword_extractor import CREATIVE_THEMES, INDUSTRY_KEYWORDS, PAIN_POINT_KEYWORDS
+from app.utils.phrase_matcher import PhraseMatcher
+
+
+def _substring_hits(phrases, text):
+    return frozenset(p for p in phrases if p in text)
+
+
+def test_overlapping_and_nested_phrases():
+    matcher = PhraseMatcher(["he", "she", "his", "hers", "launch", "launch date", "unc"])
+    assert matcher.find("ushers") == {"she", "he", "hers"}
+    assert matcher.find("relaunching our launch dat") == {"launch", "unc"}
+    assert matcher.find("our launch date") == {"launch", "launch date", "unc"}
+    assert matcher.find("") == frozenset()
+
+
+def test_matches_substring_scans():
+    phrases = [kw for kws in CREATIVE_THEMES.values() for kw in kws] + PAIN_POINT_KEYWORDS
+    phrases += [kw for kws in INDUSTRY_KEYWORDS.values() for kw in kws]
+    matcher = PhraseMatcher(phrases)
+    rng = random.Random(4)
+    vocab = phrases + ["we", "need", "a", "the", "launching", "rebranded", "x"]
+    for _ in range(300):
+        text = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 40)))
+        assert matcher.find(text) == _substring_hits(phrases, text)
+    for _ in range(300):
+        text = "".join(rng.choice("abcdeilnorst ") for _ in range(rng.randint(0, 120)))
+        assert matcher.find(text) == _substring_hits(phrases, text)
+
+
+def test_resume_joins_scans():
+    phrases = ["brand launch", "launch", "and la", "nd", "a b", "brand"]
+    matcher = PhraseMatcher(phrases)
+    rng = random.Random(2)
+    for _ in range(500):
+        parts = ["".join(rng.choice("abdnlurch ") for _ in range(rng.randint(0, 8))) for _ in range(3)]
+        found, state = matcher.scan(parts[0])
+        for part in parts[1:]:
+            part_found, part_state = matcher.scan(part)
+            across, state = matcher.resume(state, " " + part, skip=1)
+            found |= across | part_found
+            if state is None:
+                state = part_state
+        assert found == _substring_hits(phrases, " ".join(parts))
+
+
+def test_adding_phrases_recompiles():
+    matcher = PhraseMatcher(["logo"])
+    assert matcher.find("new logo design") == {"logo"}
+    version = matcher.version
+    matcher.add(["logo", ""])
+    assert matcher.version == version and len(matcher) == 1
+    matcher.add(["design"])
+    assert matcher.version == version + 1 and "design" in matcher
+    assert matcher.find("new logo design") == {"logo", "design"}
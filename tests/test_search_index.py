@@ -0,0 +1,107 @@
+"""Tests for the BM25 client search index."""
+
+import math
+import pickle
+import random
+
+from app.utils.demo_data import get_demo_merged_clients
+from app.utils.search_index import SearchIndex, client_text, tokenize
+
+
+def _client(key, name="", **intake):
+    return {"payment": {"id": key, "client_name": name}, "intake": intake or None}
+
+
+def _bm25(docs, words, k1=1.2, b=0.75):
+    """Reference BM25 over token lists (exact terms only)."""
+    n = len(docs)
+    average = sum(map(len, docs)) / n
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for word in words:
+            df = sum(word in d for d in docs)
+            tf = doc.count(word)
+            if tf:
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / average))
+        scores.append(score)
+    return scores
+
+
+def test_scores_match_reference_bm25():
+    rng = random.Random(3)
+    vocab = ["ab", "cd", "ef", "gh", "ij", "kl"]  # Short terms: exact matching only
+    texts = [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 12))) for _ in range(200)]
+    index = SearchIndex([_client(f"c{i}", what_tried=t) for i, t in enumerate(texts)])
+    expected = _bm25([t.split() for t in texts], ["ab", "kl"])
+    hits = index.search("AB kl", k=None)
+    assert {h.key: round(h.score, 9) for h in hits} == {
+        f"c{i}": round(s, 9) for i, s in enumerate(expected) if s > 0
+    }
+    assert [h.score for h in hits] == sorted((h.score for h in hits), reverse=True)
+    assert [h.key for h in index.search("ab kl", k=5)] == [h.key for h in hits[:5]]
+    page, total = index.search_page("ab kl", k=5)
+    assert [h.key for h in page] == [h.key for h in hits[:5]] and total == len(hits)
+    assert index.search_page("ab kl", k=0) == ([], len(hits))
+
+
+def test_prefixes_and_match_all():
+    index = SearchIndex([
+        _client("a", "Ana", creative_emergency="Rebranding before our launch", deadline="2 weeks"),
+        _client("b", "Ben", what_tried="Launched twice", brand="Launchpad"),
+        _client("c", "Cy", role="Founder", constraints="rebrand budget"),
+    ])
+    assert {h.key for h in index.search("rebrand")} == {"a", "c"}
+    assert {h.key for h in index.search("launch")} == {"a", "b"}
+    assert [h.key for h in index.search("rebrand launch", match_all=True)] == ["a"]
+    assert index.search("rebrand launch")[0].matched == ("rebrand", "launch")
+    assert index.search("reb") == []  # Short words match whole terms only
+    assert index.search("ana")[0].key == "a" and index.search("") == []
+    assert index.search("launch zebra", match_all=True) == []
+
+
+def test_sync_reindexes_only_changed_clients():
+    clients = get_demo_merged_clients()
+    index = SearchIndex(clients)
+    digest = index.digest
+    assert len(index) == len(clients) and index.sync(clients) == 0
+
+    edited = [dict(c) for c in clients]
+    edited[0] = {**edited[0], "intake": {**(edited[0]["intake"] or {}), "constraints": "zebra stripes only"}}
+    removed = edited.pop()
+    assert index.sync(edited) == 2
+    assert index.search("zebra")[0].item is edited[0] and index.digest != digest
+    assert all(h.item is not removed for h in index.search(" ".join(client_text(removed)), k=None))
+
+    index.sync(clients)
+    assert index.digest == digest and index.search("zebra") == []
+
+
+def test_ties_keep_index_order_and_updates_keep_it():
+    index = SearchIndex()
+    for key in "xyz":
+        index.update(key, ["same words"], {"key": key})
+    index.update("x", ["same words", "more"])
+    index.update("x", ["same words"])
+    assert [h.key for h in index.search("same")] == ["x", "y", "z"]
+    assert index.search("same")[0].item == {"key": "x"}
+    assert index.remove("y") and not index.remove("y")
+    assert [h.key for h in index.search("words", k=1)] == ["x"]
+
+
+def test_tokenize():
+    assert tokenize("Re-brand: Q3 LAUNCH, ‘urgent’!") == ["re", "brand", "q3", "launch", "urgent"]
+
+
+def test_pickles_without_its_lock():
+    index = SearchIndex([
+        _client("a", "Ana", creative_emergency="Rebranding before our launch"),
+        _client("b", "Ben", what_tried="Launched twice"),
+    ])
+    index.search("launch")  # Builds term arrays, which aren't pickled
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored.digest == index.digest
+    assert [(h.key, h.score) for h in restored.search("launch")] == [(h.key, h.score) for h in index.search("launch")]
+    restored.update("c", ["Cy", "launch party"])
+    assert "c" in restored and "c" not in index
@@ -933,3 +933,50 @@ def test_health_checker_with_all_demo_services():
     assert all(r.healthy for r in results)
     assert hc.all_healthy is True
     assert hc.composite_score == "Green"
+
+
+# ── ManyChat webhooks + local store ──────────────────────────────────
+
+
+def test_manychat_ingest_webhook_full_contact_data(tmp_path):
+    from app.services.local_store import LocalStore
+    from app.services.manychat_client import ingest_webhook
+
+    store = LocalStore(str(tmp_path / "store.db"))
+    body = {
+        "id": 12345, "name": "Ava", "email": "ava@example.com",
+        "subscribed": "2026-02-10T12:00:00+00:00",
+        "tags": [{"id": 1, "name": "hotline"}],
+    }
+    assert ingest_webhook(json.dumps(body).encode(), "s3cret", "s3cret", store) == "subscriber.created"
+    [sub] = store.manychat_subscribers()
+    assert sub == {"id": "12345", "name": "Ava", "email": "ava@example.com",
+                   "subscribed_at": "2026-02-10T12:00:00+00:00", "tags": ["hotline"]}
+
+    with pytest.raises(ValueError):
+        ingest_webhook(json.dumps(body).encode(), "wrong", "s3cret", store)
+    with pytest.raises(ValueError):
+        ingest_webhook(b'{"event": "subscriber.created", "subscriber": {}}', "s3cret", "s3cret", store)
+
+
+@patch("app.services.manychat_client.requests.post")
+def test_manychat_new_subscribers_from_store(mock_post, tmp_path):
+    from datetime import datetime, timedelta
+
+    from app.services.cache_manager import cache
+    from app.services.local_store import LocalStore
+
+    cache.invalidate_all()
+    store = LocalStore(str(tmp_path / "store.db"))
+    recent = (datetime.utcnow() - timedelta(days=2)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    old = (datetime.utcnow() - timedelta(days=60)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    store.upsert_manychat_subscribers([
+        {"id": "1", "email": "a@example.com", "subscribed_at": recent},
+        {"id": "2", "email": "b@example.com", "subscribed_at": old},
+    ])
+    store.mark_synced("manychat_subscribers", days=30)
+
+    svc = ManyChatService(api_key="key", webhook_secret="s3cret", store=store)
+    assert [s["id"] for s in svc.get_new_subscribers(days=30)] == ["1"]
+    mock_post.assert_not_called()
+    cache.invalidate_all()
@@ -293,3 +293,191 @@ def test_get_refunds_empty(svc):
     service, mock_stripe = svc
     mock_stripe.Refund.list.return_value = _list_response([])
     assert service.get_refunds() == []
+
+
+# ── Signed webhooks + local store ────────────────────────────────────
+
+WEBHOOK_SECRET = "whsec_test_secret"
+
+
+@pytest.fixture
+def store(tmp_path):
+    from app.services.local_store import LocalStore
+    return LocalStore(str(tmp_path / "store.db"))
+
+
+def _signed(event: dict, secret: str = WEBHOOK_SECRET, ts: int | None = None) -> tuple[bytes, str]:
+    """Serialize an event and sign it the way Stripe does."""
+    import hashlib
+    import hmac
+    import json
+    import time
+
+    payload = json.dumps(event).encode()
+    ts = int(time.time()) if ts is None else ts
+    sig = hmac.new(secret.encode(), f"{ts}.".encode() + payload, hashlib.sha256).hexdigest()
+    return payload, f"t={ts},v1={sig}"
+
+
+def _session_event(session_id: str = "cs_live_1", amount_cents: int = 149500, created_ts: int | None = None) -> dict:
+    created_ts = created_ts or int(datetime.now().timestamp())
+    return {
+        "id": "evt_1",
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {"object": {
+            "id": session_id,
+            "object": "checkout.session",
+            "amount_total": amount_cents,
+            "status": "complete",
+            "payment_status": "paid",
+            "created": created_ts,
+            "payment_intent": "pi_1",
+            "metadata": {},
+            "customer_details": {"email": "jo@example.com", "name": "Jo"},
+        }},
+    }
+
+
+def test_ingest_webhook_upserts_session(store):
+    from app.services.stripe_client import ingest_webhook
+
+    payload, header = _signed(_session_event())
+    assert ingest_webhook(payload, header, WEBHOOK_SECRET, store) == "checkout.session.completed"
+    [session] = store.stripe_sessions()
+    assert session["id"] == "cs_live_1"
+    assert session["amount"] == 1495.0
+    assert session["product_name"] == "3-Session Clarity Sprint"
+    assert session["email"] == "jo@example.com"
+    assert session["payment_intent"] == "pi_1"
+
+
+def test_ingest_webhook_is_idempotent(store):
+    from app.services.stripe_client import ingest_webhook
+
+    payload, header = _signed(_session_event())
+    ingest_webhook(payload, header, WEBHOOK_SECRET, store)
+    ingest_webhook(payload, header, WEBHOOK_SECRET, store)
+    assert len(store.stripe_sessions()) == 1
+
+
+@pytest.mark.parametrize("secret,ts_offset", [("whsec_wrong", 0), (WEBHOOK_SECRET, -3600)])
+def test_ingest_webhook_rejects_bad_or_stale_signature(store, secret, ts_offset):
+    import time
+
+    from app.services.stripe_client import ingest_webhook
+
+    payload, header = _signed(_session_event(), secret=secret, ts=int(time.time()) + ts_offset)
+    with pytest.raises(ValueError):
+        ingest_webhook(payload, header, WEBHOOK_SECRET, store)
+    assert store.stripe_sessions() == []
+
+
+def test_ingest_webhook_charge_refunded(store):
+    from app.services.stripe_client import ingest_webhook
+
+    now = int(datetime.now().timestamp())
+    event = {
+        "id": "evt_2",
+        "object": "event",
+        "type": "charge.refunded",
+        "data": {"object": {
+            "id": "ch_1",
+            "object": "charge",
+            "refunds": {"object": "list", "data": [
+                {"id": "re_1", "object": "refund", "amount": 49900, "status": "succeeded",
+                 "created": now, "payment_intent": "pi_1"},
+            ]},
+        }},
+    }
+    payload, header = _signed(event)
+    ingest_webhook(payload, header, WEBHOOK_SECRET, store)
+    [refund] = store.stripe_refunds()
+    assert refund == {
+        "id": "re_1", "payment_intent": "pi_1", "amount": 499.0, "status": "succeeded",
+        "created": datetime.fromtimestamp(now).isoformat(),
+    }
+
+
+def _refunded_charge_event() -> dict:
+    # API versions since 2022-11-15 don't embed the charge's refunds
+    return {"id": "evt_4", "object": "event", "type": "charge.refunded",
+            "data": {"object": {"id": "ch_1", "object": "charge", "amount_refunded": 49900}}}
+
+
+def test_ingest_webhook_charge_refunded_lists_refunds(store):
+    from app.services import stripe_client
+
+    now = int(datetime.now().timestamp())
+    refund = SimpleNamespace(id="re_2", amount=49900, status="succeeded", created=now, payment_intent="pi_1")
+    payload, header = _signed(_refunded_charge_event())
+    with patch.object(stripe_client.stripe_sdk, "api_key", "sk_test_123"), \
+            patch.object(stripe_client.stripe_sdk.Refund, "list", return_value=_list_response([refund])) as listed:
+        stripe_client.ingest_webhook(payload, header, WEBHOOK_SECRET, store)
+    listed.assert_called_once_with(charge="ch_1", limit=100)
+    assert [r["id"] for r in store.stripe_refunds()] == ["re_2"]
+
+
+def test_ingest_webhook_charge_refunded_without_key_stores_nothing(store):
+    from app.services import stripe_client
+
+    payload, header = _signed(_refunded_charge_event())
+    with patch.object(stripe_client.stripe_sdk, "api_key", None), \
+            patch.object(stripe_client.stripe_sdk.Refund, "list") as listed:
+        assert stripe_client.ingest_webhook(payload, header, WEBHOOK_SECRET, store) == "charge.refunded"
+    listed.assert_not_called()
+    assert store.stripe_refunds() == []
+
+
+def test_ingest_webhook_ignores_other_events(store):
+    from app.services.stripe_client import ingest_webhook
+
+    payload, header = _signed({"id": "evt_3", "object": "event", "type": "customer.created",
+                               "data": {"object": {"id": "cus_1", "object": "customer"}}})
+    assert ingest_webhook(payload, header, WEBHOOK_SECRET, store) == "customer.created"
+    assert store.stripe_sessions() == []
+
+
+def test_store_backed_sessions_poll_only_to_reconcile(store):
+    from app.services.cache_manager import cache
+    from app.services.stripe_client import ingest_webhook
+
+    recent = int((datetime.now() - timedelta(days=1)).timestamp())
+    with patch("app.services.stripe_client.stripe_sdk") as mock_stripe:
+        service = StripeService(secret_key="sk_test_123", webhook_secret=WEBHOOK_SECRET, store=store)
+        mock_stripe.checkout.Session.list.return_value = _list_response([
+            _make_session(session_id="cs_1", created_ts=recent),
+        ])
+        assert [s["id"] for s in service.get_recent_sessions(days=30)] == ["cs_1"]
+
+    # A webhook lands; the cached list is dropped and rebuilt from the store
+    payload, header = _signed(_session_event(session_id="cs_2"))
+    ingest_webhook(payload, header, WEBHOOK_SECRET, store)
+    cache.apply_event("stripe.checkout.session.completed", {})
+
+    with patch("app.services.stripe_client.stripe_sdk") as mock_stripe:
+        sessions = service.get_recent_sessions(days=30)
+        mock_stripe.checkout.Session.list.assert_not_called()
+    assert [s["id"] for s in sessions] == ["cs_1", "cs_2"]
+
+
+def test_store_reconciles_when_window_not_covered(store):
+    with patch("app.services.stripe_client.stripe_sdk") as mock_stripe:
+        service = StripeService(secret_key="sk_test_123", webhook_secret=WEBHOOK_SECRET, store=store)
+        mock_stripe.checkout.Session.list.return_value = _list_response([])
+        service.get_recent_sessions(days=30)
+        service.get_recent_sessions(days=180)
+        assert mock_stripe.checkout.Session.list.call_count == 2
+
+
+def test_store_without_webhook_secret_keeps_polling(store):
+    from app.services.cache_manager import cache
+
+    with patch("app.services.stripe_client.stripe_sdk") as mock_stripe:
+        service = StripeService(secret_key="sk_test_123", store=store)
+        mock_stripe.checkout.Session.list.return_value = _list_response([_make_session()])
+        service.get_recent_sessions(days=30)
+        cache.invalidate("stripe_sessions_30")
+        with patch("app.services.local_store.time.time", return_value=datetime.now().timestamp() + 120):
+            service.get_recent_sessions(days=30)
+        assert mock_stripe.checkout.Session.list.call_count == 2
@@ -0,0 +1,233 @@
+"""Tests for the threaded webhook receiver."""
+
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import webhook_receiver
+from app.services.event_journal import iter_events
+
+
+@pytest.fixture
+def server(tmp_path):
+    srv = webhook_receiver.make_server(port=0, journal_path=str(tmp_path / "events.jsonl"))
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    srv.RequestHandlerClass.journal.close()
+
+
+def _url(srv, path):
+    return f"http://127.0.0.1:{srv.server_address[1]}{path}"
+
+
+def _post(srv, payload, path="/webhook"):
+    req = urllib.request.Request(
+        _url(srv, path),
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def test_post_appends_event(server):
+    result = _post(server, {"event": "payment_completed", "email": "a@example.com"})
+    assert result == {"status": "ok", "event": "payment_completed", "seq": 1}
+    events = list(iter_events(server.RequestHandlerClass.journal.path))
+    assert events[0]["data"]["email"] == "a@example.com"
+
+
+def test_unknown_event_is_recorded_as_unknown(server):
+    assert _post(server, {"event": "bogus"})["event"] == "unknown"
+
+
+def test_burst_is_not_collapsed(server):
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda i: _post(server, {"event": "new_lead", "i": i}), range(64)))
+    assert sorted(r["seq"] for r in results) == list(range(1, 65))
+    events = list(iter_events(server.RequestHandlerClass.journal.path))
+    assert sorted(e["data"]["i"] for e in events) == list(range(64))
+
+
+def test_journal_is_not_served_over_http(server):
+    _post(server, {"event": "intake_submitted", "record": {"email": "a@example.com"}})
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        urllib.request.urlopen(_url(server, "/events?after=0"), timeout=5)
+    assert exc.value.code == 404
+
+
+def test_health_reports_last_seq(server):
+    _post(server, {"event": "new_lead"})
+    with urllib.request.urlopen(_url(server, "/health"), timeout=5) as resp:
+        assert json.loads(resp.read()) == {"status": "healthy", "last_seq": 1}
+
+
+def test_invalid_json_rejected(server):
+    req = urllib.request.Request(_url(server, "/webhook"), data=b"{nope", method="POST")
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        urllib.request.urlopen(req, timeout=5)
+    assert exc.value.code == 400
+
+
+def _post_raw(srv, path, content_length=None, body=b""):
+    conn = http.client.HTTPConnection("127.0.0.1", srv.server_address[1], timeout=5)
+    try:
+        conn.putrequest("POST", path)
+        if content_length is not None:
+            conn.putheader("Content-Length", content_length)
+        conn.endheaders(body)
+        return conn.getresponse().status
+    finally:
+        conn.close()
+
+
+def test_bad_content_length_rejected(server):
+    assert _post_raw(server, "/webhook", "abc") == 400
+    assert _post_raw(server, "/webhook", "-1", b'{"event": "new_lead"}') == 400
+    assert _post_raw(server, "/webhook", str(webhook_receiver.MAX_BODY_BYTES + 1)) == 413
+    assert _post_raw(server, "/webhook/stripe") == 411
+    assert _post_raw(server, "/webhook") == 200  # No body: an unknown event
+    assert server.RequestHandlerClass.journal.last_seq == 1
+
+
+def test_replay_cli_prints_events(server, capsys):
+    _post(server, {"event": "new_lead"})
+    _post(server, {"event": "payment_completed"})
+    webhook_receiver.main(["--journal", server.RequestHandlerClass.journal.path, "replay", "--from", "1"])
+    out = capsys.readouterr().out.splitlines()
+    lines = [json.loads(line) for line in out if line.startswith("{")]
+    assert [r["event"] for r in lines] == ["payment_completed"]
+
+
+# ── Stripe ──────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def stripe_server(tmp_path):
+    srv = webhook_receiver.make_server(
+        port=0,
+        journal_path=str(tmp_path / "events.jsonl"),
+        secrets={"stripe": "whsec_test"},
+        store_path=str(tmp_path / "store.db"),
+    )
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    srv.RequestHandlerClass.journal.close()
+
+
+def _post_stripe(srv, payload: bytes, signature: str):
+    req = urllib.request.Request(
+        _url(srv, "/webhook/stripe"),
+        data=payload,
+        headers={"Content-Type": "application/json", "Stripe-Signature": signature},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def _stripe_event(secret="whsec_test"):
+    import hashlib
+    import hmac
+    import time
+
+    payload = json.dumps({
+        "id": "evt_1",
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {"object": {
+            "id": "cs_1", "object": "checkout.session", "amount_total": 49900,
+            "status": "complete", "payment_status": "paid", "created": int(time.time()),
+            "metadata": {}, "customer_details": {"email": "a@example.com", "name": "A"},
+        }},
+    }).encode()
+    ts = int(time.time())
+    sig = hmac.new(secret.encode(), f"{ts}.".encode() + payload, hashlib.sha256).hexdigest()
+    return payload, f"t={ts},v1={sig}"
+
+
+def test_stripe_webhook_upserts_and_journals(stripe_server):
+    status, result = _post_stripe(stripe_server, *_stripe_event())
+    assert status == 200
+    assert result == {"status": "ok", "event": "stripe.checkout.session.completed", "seq": 1}
+    assert [s["id"] for s in stripe_server.RequestHandlerClass.store.stripe_sessions()] == ["cs_1"]
+    [event] = iter_events(stripe_server.RequestHandlerClass.journal.path)
+    assert event["event"] == "stripe.checkout.session.completed"
+
+
+def test_stripe_webhook_rejects_bad_signature(stripe_server):
+    status, _ = _post_stripe(stripe_server, *_stripe_event(secret="whsec_other"))
+    assert status == 400
+    assert stripe_server.RequestHandlerClass.store.stripe_sessions() == []
+    assert stripe_server.RequestHandlerClass.journal.last_seq == 0
+
+
+def test_stripe_webhook_unconfigured(tmp_path):
+    srv = webhook_receiver.make_server(port=0, journal_path=str(tmp_path / "events.jsonl"), secrets={})
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        status, _ = _post_stripe(srv, *_stripe_event())
+        assert status == 503
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        srv.RequestHandlerClass.journal.close()
+
+
+def test_calendly_and_manychat_endpoints(tmp_path):
+    import hashlib
+    import hmac
+    import time
+
+    srv = webhook_receiver.make_server(
+        port=0,
+        journal_path=str(tmp_path / "events.jsonl"),
+        secrets={"calendly": "cal-key", "manychat": "mc-key"},
+        store_path=str(tmp_path / "store.db"),
+    )
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        payload = json.dumps({"event": "invitee.created", "payload": {
+            "email": "a@example.com", "created_at": "2026-02-01T10:00:00.000000Z",
+            "scheduled_event": {"uri": "https://api.calendly.com/scheduled_events/e1",
+                                "start_time": "2026-02-03T10:00:00.000000Z"},
+        }}).encode()
+        ts = int(time.time())
+        sig = hmac.new(b"cal-key", f"{ts}.".encode() + payload, hashlib.sha256).hexdigest()
+        req = urllib.request.Request(_url(srv, "/webhook/calendly"), data=payload, method="POST",
+                                     headers={"Calendly-Webhook-Signature": f"t={ts},v1={sig}"})
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            assert json.loads(resp.read())["event"] == "calendly.invitee.created"
+
+        req = urllib.request.Request(_url(srv, "/webhook/manychat"), method="POST",
+                                     data=json.dumps({"id": "7", "email": "b@example.com"}).encode(),
+                                     headers={"X-Webhook-Secret": "mc-key"})
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            assert json.loads(resp.read())["event"] == "manychat.subscriber.created"
+
+        store = srv.RequestHandlerClass.store
+        assert store.calendly_bookings()[0]["email"] == "a@example.com"
+        assert store.manychat_subscribers()[0]["id"] == "7"
+        # Stripe wasn't given a secret
+        assert _post_stripe(srv, b"{}", "t=1,v1=00")[0] == 503
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        srv.RequestHandlerClass.journal.close()
@@ -45,6 +45,15 @@ export interface ScoredClient extends Client {
   fit: number;
 }
 
+export interface RankedLead extends ScoredClient {
+  rank: number;
+}
+
+export interface SearchResult extends Client {
+  relevance: number;
+  matched: string[];
+}
+
 export interface PipelineStage {
   stage: string;
   count: number;
@@ -80,6 +89,14 @@ export interface LtvData {
   projected_12mo: number;
 }
 
+export interface Dashboard {
+  kpis: KpiSummary;
+  pipeline: Omit<PipelineStage, "clients">[];
+  funnel: FunnelStage[];
+  channels: ChannelMetric[];
+  revenue_monthly: MonthlyRevenue[];
+}
+
 export interface HealthCheck {
   service: string;
   status: "healthy" | "degraded" | "down" | "not_configured";
@@ -90,9 +107,16 @@ export interface HealthCheck {
 // --- API Functions ---
 
 export const api = {
+  getDashboard: () => fetchApi<Dashboard>("/dashboard"),
   getKpis: () => fetchApi<KpiSummary>("/kpis"),
   getClients: () => fetchApi<Client[]>("/clients"),
   getScoredClients: () => fetchApi<ScoredClient[]>("/clients/scored"),
+  getNextLeads: (limit = 10, tier = "") =>
+    fetchApi<RankedLead[]>(`/leads/next?limit=${limit}${tier ? `&tier=${tier}` : ""}`),
+  searchClients: (q: string, limit = 20, all = false) =>
+    fetchApi<SearchResult[]>(
+      `/clients/search?q=${encodeURIComponent(q)}&limit=${limit}${all ? "&all=true" : ""}`,
+    ),
   getPipeline: () => fetchApi<PipelineStage[]>("/pipeline"),
   getMonthlyRevenue: () => fetchApi<MonthlyRevenue[]>("/revenue/monthly"),
   getChannelMetrics: () => fetchApi<ChannelMetric[]>("/channels"),
@@ -100,3 +124,26 @@ export const api = {
   getLtv: () => fetchApi<LtvData>("/ltv"),
   getHealth: () => fetchApi<HealthCheck[]>("/health"),
 };
+
+// --- Live updates (Server-Sent Events) ---
+
+export type ChangeEvent =
+  | { type: "client.upserted"; client: Client }
+  | { type: "client.stage_changed"; id: string; name: string; from: string; to: string }
+  | { type: "client.removed"; id: string }
+  | { type: "kpi.delta"; changes: Record<string, { old: number; new: number; delta: number }> }
+  | { type: "resync" };
+
+/** Subscribe to /api/stream. EventSource resumes via Last-Event-ID on reconnect. */
+export function subscribeChanges(onChange: (event: ChangeEvent) => void): () => void {
+  const source = new EventSource(`${API_BASE}/stream`);
+  const types: ChangeEvent["type"][] = [
+    "client.upserted", "client.stage_changed", "client.removed", "kpi.delta", "resync",
+  ];
+  for (const type of types) {
+    source.addEventListener(type, (e) => {
+      onChange({ type, ...JSON.parse((e as MessageEvent).data) } as ChangeEvent);
+    });
+  }
+  return () => source.close();
+}
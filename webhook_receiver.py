@@ -1,11 +1,17 @@
-"""Lightweight webhook receiver for n8n cache invalidation.
+"""Webhook receiver for n8n events, backed by a durable event journal.
 
-n8n workflows send HTTP POST to this endpoint after key events.
-This script writes a signal file that the Streamlit app polls for
-instant cache invalidation.
+n8n workflows send HTTP POST to this endpoint after key events. Every event
+is appended to a sequence-numbered journal (plans/events.jsonl) and the
+request returns as soon as the append is written — fsyncs are batched in the
+background. Requests are handled concurrently, so bursts from WF1-WF4/WF9
+no longer queue behind each other or collapse into one signal.
+
+The Streamlit app (CacheManager) tails the journal and applies every event
+in order for cache invalidation.
 
 Usage:
-    python webhook_receiver.py
+    python webhook_receiver.py                     # serve
+    python webhook_receiver.py replay --from 120   # print events after seq 120
 
 n8n HTTP Request node config:
     URL: http://<your-server>:8765/webhook
@@ -13,14 +19,50 @@ n8n HTTP Request node config:
     Body: {"event": "payment_completed"}  (or booking_created, intake_submitted, etc.)
 
 Add an HTTP Request node at the end of WF1-WF4 and WF9 in n8n.
+
+The journal rotates at 16 MB; rotated segments are deleted once the app's
+cache (its offset file under CACHE_DISK_DIR) has read them, keeping at most
+four.
+
+To avoid a full refetch, include the changed Notion record (raw page or flat
+dict) or just its page id — it is upserted straight into the cached set:
+    Body: {"event": "payment_completed", "page_id": "{{$json.id}}"}
+    Body: {"event": "intake_submitted", "database": "intakes", "record": {...}}
+
+Providers can also post directly; each is verified, upserted into the local
+store (plans/local_store.db) and journaled as "<source>.<event type>" so the
+app re-reads the affected data immediately:
+    /webhook/stripe    Stripe-Signature checked against STRIPE_WEBHOOK_SECRET
+                       (checkout.session.completed, checkout.session.async_payment_succeeded,
+                        charge.refunded, refund.created, refund.updated)
+    /webhook/calendly  Calendly-Webhook-Signature checked against CALENDLY_WEBHOOK_SECRET
+                       (invitee.created, invitee.canceled)
+    /webhook/manychat  X-Webhook-Secret header must equal MANYCHAT_WEBHOOK_SECRET
+                       (External Request action with the full contact data body)
+A source whose secret isn't configured answers 503.
+
+Other endpoints:
+    GET /health                      receiver status + last journal seq
+
+The journal itself (which carries client details from the payloads) is
+only readable on this host: the app tails the file directly, and
+`replay` prints it.
 """
 
+import argparse
 import json
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import sys
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+from app.config import load_settings
+from app.services.event_journal import JOURNAL_FILE, OFFSET_FILE_NAME, EventJournal, replay
+from app.services import calendly_client, manychat_client, stripe_client
+from app.services.local_store import STORE_FILE, LocalStore
 
-SIGNAL_FILE = os.path.join(os.path.dirname(__file__), "plans", ".cache_signal.json")
 PORT = int(os.environ.get("WEBHOOK_PORT", 8765))
+MAX_BODY_BYTES = 1024 * 1024
 
 VALID_EVENTS = {
     "payment_completed",
@@ -31,59 +73,200 @@ VALID_EVENTS = {
     "status_changed",
 }
 
+# path → (source, auth header, ingest function)
+PROVIDER_WEBHOOKS = {
+    "/webhook/stripe": ("stripe", "Stripe-Signature", stripe_client.ingest_webhook),
+    "/webhook/calendly": ("calendly", "Calendly-Webhook-Signature", calendly_client.ingest_webhook),
+    "/webhook/manychat": ("manychat", "X-Webhook-Secret", manychat_client.ingest_webhook),
+}
+
 
 class WebhookHandler(BaseHTTPRequestHandler):
+    journal: EventJournal | None = None
+    store: LocalStore | None = None
+    secrets: dict[str, str] = {}
+
     def do_POST(self):
-        if self.path != "/webhook":
-            self.send_response(404)
-            self.end_headers()
+        if self.path != "/webhook" and self.path not in PROVIDER_WEBHOOKS:
+            self._send_json(404, {"error": "Not found"})
             return
 
-        content_length = int(self.headers.get("Content-Length", 0))
+        content_length = self._content_length(required=self.path in PROVIDER_WEBHOOKS)
+        if content_length is None:
+            return
         body = self.rfile.read(content_length)
 
+        if self.path in PROVIDER_WEBHOOKS:
+            self._handle_provider(*PROVIDER_WEBHOOKS[self.path], body)
+            return
+
         try:
             data = json.loads(body) if body else {}
         except json.JSONDecodeError:
-            self.send_response(400)
-            self.end_headers()
-            self.wfile.write(b'{"error": "Invalid JSON"}')
+            self._send_json(400, {"error": "Invalid JSON"})
+            return
+        if not isinstance(data, dict):
+            self._send_json(400, {"error": "Expected a JSON object"})
             return
 
         event = data.get("event", "unknown")
         if event not in VALID_EVENTS:
             event = "unknown"
 
-        # Write signal file for Streamlit to pick up
-        os.makedirs(os.path.dirname(SIGNAL_FILE), exist_ok=True)
-        with open(SIGNAL_FILE, "w") as f:
-            json.dump({"event": event, "data": data}, f)
+        seq = self.journal.append(event, data)
+        self._send_json(200, {"status": "ok", "event": event, "seq": seq})
 
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps({"status": "ok", "event": event}).encode())
+    def _content_length(self, required: bool) -> int | None:
+        """The request's Content-Length, or None once an error was sent.
+
+        Provider webhooks always carry a body, so for them a missing header is
+        411; elsewhere it means an empty body.
+        """
+        value = self.headers.get("Content-Length")
+        if value is None:
+            if required:
+                self._send_json(411, {"error": "Content-Length required"})
+                return None
+            return 0
+        try:
+            length = int(value)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return None
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": "Payload too large"})
+            return None
+        return length
+
+    def _handle_provider(self, source: str, header: str, ingest, body: bytes) -> None:
+        secret = self.secrets.get(source, "")
+        if not secret or self.store is None:
+            self._send_json(503, {"error": f"{source} webhooks not configured"})
+            return
+        try:
+            event_type = ingest(body, self.headers.get(header, ""), secret, self.store)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            # Store unavailable etc. — 5xx so the provider retries
+            print(f"[webhook] {source} ingest failed: {e}")
+            self._send_json(500, {"error": "ingest failed"})
+            return
+
+        event = f"{source}.{event_type}"
+        seq = self.journal.append(event, {"type": event_type})
+        self._send_json(200, {"status": "ok", "event": event, "seq": seq})
 
     def do_GET(self):
-        if self.path == "/health":
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(b'{"status": "healthy"}')
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(200, {"status": "healthy", "last_seq": self.journal.last_seq})
         else:
-            self.send_response(404)
-            self.end_headers()
+            self._send_json(404, {"error": "Not found"})
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     def log_message(self, format, *args):
         print(f"[webhook] {args[0]}")
 
 
-if __name__ == "__main__":
-    server = HTTPServer(("0.0.0.0", PORT), WebhookHandler)
-    print(f"Webhook receiver listening on port {PORT}")
-    print(f"Signal file: {SIGNAL_FILE}")
+class WebhookServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default listen backlog of 5 resets connections in a burst
+    request_queue_size = 128
+
+
+def make_server(
+    port: int = PORT,
+    journal_path: str = JOURNAL_FILE,
+    secrets: dict[str, str] | None = None,
+    store_path: str = STORE_FILE,
+) -> WebhookServer:
+    """Build a threaded server whose handlers share one journal writer.
+
+    secrets maps provider source ("stripe", "calendly", "manychat") to its
+    webhook secret and defaults to the *_WEBHOOK_SECRET settings.
+    """
+    if secrets is None:
+        settings = load_settings()
+        if settings.STRIPE_SECRET_KEY:
+            # charge.refunded events need it to list refunds the charge no longer embeds
+            stripe_client.stripe_sdk.api_key = settings.STRIPE_SECRET_KEY
+        secrets = {
+            "stripe": settings.STRIPE_WEBHOOK_SECRET,
+            "calendly": settings.CALENDLY_WEBHOOK_SECRET,
+            "manychat": settings.MANYCHAT_WEBHOOK_SECRET,
+        }
+    secrets = {source: secret for source, secret in secrets.items() if secret}
+    handler = type("BoundWebhookHandler", (WebhookHandler,), {
+        "journal": EventJournal(journal_path, consumers=_journal_consumers()),
+        "store": LocalStore(store_path) if secrets else None,
+        "secrets": secrets,
+    })
+    return WebhookServer(("0.0.0.0", port), handler)
+
+
+def _journal_consumers() -> tuple[str, ...]:
+    """Offset files of the journal's persistent readers: the app's cache, when it has an L2 tier."""
+    directory = os.getenv("CACHE_DISK_DIR", "")
+    return (os.path.join(directory, OFFSET_FILE_NAME),) if directory else ()
+
+
+def _serve(args) -> None:
+    server = make_server(args.port, args.journal)
+    print(f"Webhook receiver listening on port {args.port}")
+    print(f"Event journal: {args.journal}")
+    for path, (source, _, _) in PROVIDER_WEBHOOKS.items():
+        if source in server.RequestHandlerClass.secrets:
+            print(f"{source} webhooks: {path} → {server.RequestHandlerClass.store.path}")
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down.")
+    finally:
         server.server_close()
+        server.RequestHandlerClass.journal.close()
+
+
+def _replay(args) -> None:
+    def emit(record: dict) -> None:
+        if args.event and record.get("event") != args.event:
+            return
+        sys.stdout.write(json.dumps(record) + "\n")
+
+    last = replay(emit, path=args.journal, from_seq=args.from_seq)
+    print(f"# replayed through seq {last}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--journal", default=JOURNAL_FILE, help="Event journal path")
+    sub = parser.add_subparsers(dest="command")
+
+    serve = sub.add_parser("serve", help="Run the webhook receiver (default)")
+    serve.add_argument("--port", type=int, default=PORT)
+
+    rp = sub.add_parser("replay", help="Print journal events as JSON lines")
+    rp.add_argument("--from", dest="from_seq", type=int, default=0, help="Replay events after this seq")
+    rp.add_argument("--event", default="", help="Only this event type")
+
+    args = parser.parse_args(argv)
+    if args.command == "replay":
+        _replay(args)
+    else:
+        if args.command is None:
+            args.port = PORT
+        _serve(args)
+
+
+if __name__ == "__main__":
+    main()